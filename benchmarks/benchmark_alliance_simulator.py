@@ -0,0 +1,98 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.columnar_store import records_to_table
+from utility_functions.alliance_simulator import (
+    SCORE_PERCENTILES, SIMULATION_COLUMNS, enumerate_alliances, match_points, sample_team_points,
+    simulate_alliances
+)
+import os
+import time
+import argparse
+import numpy as np
+
+# Benchmark: alliance simulation throughput (alliance-matches per second), one alliance at a time
+# vs. chunked vectorized simulation with 1 and N worker processes
+#
+# Usage:
+#   python benchmarks/benchmark_alliance_simulator.py --teams 40 --simulations 2000 --workers 4
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+
+
+def per_alliance_loop(team_samples, alliances):
+    """
+    Simulates the alliances one at a time with a Python loop.
+
+    :param team_samples: 2D array of points (teams x simulations).
+    :param alliances: 2D array of team positions (alliances x 3).
+    :return: A dictionary of statistic name -> array (one value per alliance).
+    """
+    names = ["mean", "std"] + list(SCORE_PERCENTILES)
+    summary = {name: np.empty(len(alliances)) for name in names}
+    for index, (first, second, third) in enumerate(alliances.tolist()):
+        scores = team_samples[first] + team_samples[second] + team_samples[third]
+        summary["mean"][index] = scores.mean()
+        summary["std"][index] = scores.std()
+        for name, percentile in SCORE_PERCENTILES.items():
+            summary[name][index] = np.percentile(scores, percentile)
+    return summary
+
+
+def timed(function):
+    """
+    Runs a function once and returns its wall time and result.
+
+    :param function: Function to time.
+    :return: A tuple of (seconds, result).
+    """
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Script 07 alliance simulator.")
+    parser.add_argument("--teams", type=int, default=40, help="Number of teams on the pick list.")
+    parser.add_argument("--matches", type=int, default=12, help="Scouted matches per team.")
+    parser.add_argument("--simulations", type=int, default=2000, help="Simulated matches per alliance.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes simulating alliances.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Script 07 Alliance Simulator\n")
+
+    raw_entries = generate_raw_entries(args.teams * args.matches, team_count=args.teams, error_rate=0.0)
+    cleaned_data = [script_03.validate_and_clean_entry(entry) for entry in raw_entries]
+    table = records_to_table(cleaned_data, SIMULATION_COLUMNS)
+    teams = list(dict.fromkeys(table["columns"]["robotTeam"].tolist()))
+
+    sampling_seconds, team_samples = timed(lambda: sample_team_points(
+        teams, table["columns"]["robotTeam"], match_points(table)["total"], args.simulations, 1601
+    ))
+    alliances = enumerate_alliances(len(teams))
+    alliance_matches = len(alliances) * args.simulations
+    print(f"[INFO] {len(teams)} teams, {len(alliances)} alliances, {args.simulations} simulations each "
+          f"({alliance_matches:,} alliance-matches).\n")
+
+    loop_seconds, loop_summary = timed(lambda: per_alliance_loop(team_samples, alliances))
+    serial_seconds, serial_summary = timed(lambda: simulate_alliances(team_samples, alliances))
+    parallel_seconds, parallel_summary = timed(lambda: simulate_alliances(team_samples, alliances, args.workers))
+
+    print(f"{'Step':<40}{'Seconds':>10}{'Alliance-matches/s':>22}")
+    print(f"{'sample team points (all teams)':<40}{sampling_seconds:>10.3f}{'':>22}")
+    for label, seconds in (
+        ("one alliance at a time", loop_seconds),
+        ("vectorized chunks, 1 worker", serial_seconds),
+        (f"vectorized chunks, {args.workers} workers", parallel_seconds),
+    ):
+        print(f"{label:<40}{seconds:>10.3f}{alliance_matches / seconds:>22,.0f}")
+
+    identical = all(
+        np.array_equal(loop_summary[name], serial_summary[name])
+        and np.array_equal(serial_summary[name], parallel_summary[name])
+        for name in serial_summary
+    )
+    print(f"\n[INFO] Summaries identical across implementations and worker counts: {identical}")
+
+    print(seperation_bar)
@@ -0,0 +1,111 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.bootstrap import bootstrap_group_means, percentile_interval
+import os
+import time
+import argparse
+import numpy as np
+
+# Benchmark: bootstrap confidence intervals with one resampling loop per team vs. resample
+# indices for all teams at once (Script 05), with 1 and N worker processes
+#
+# Usage:
+#   python benchmarks/benchmark_bootstrap.py --rows 20000 --teams 400 --resamples 2000 --workers 4
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+script_04 = load_script("04_team_statistics_and_data_restructuring")
+script_05 = load_script("05_data_analysis_and_statistics_aggregation")
+
+
+def per_team_intervals(values, group_sizes, resamples, confidence, seed):
+    """
+    Bootstrap intervals with a Python loop over teams (each team's resamples drawn separately).
+
+    :param values: 2D float array (rows x metrics), rows ordered team by team.
+    :param group_sizes: Number of rows of each team.
+    :param resamples: Number of resamples.
+    :param confidence: Confidence level.
+    :param seed: Random seed.
+    :return: A tuple of (lower, upper) arrays (teams x metrics).
+    """
+    rng = np.random.default_rng(seed)
+    lower, upper = [], []
+    start = 0
+    for size in group_sizes:
+        team_values = values[start:start + size]
+        indices = rng.integers(0, size, (resamples, size))
+        means = np.nanmean(team_values[indices], axis=1)
+        team_lower, team_upper = percentile_interval(means, confidence)
+        lower.append(team_lower)
+        upper.append(team_upper)
+        start += size
+    return np.array(lower), np.array(upper)
+
+
+def timed(function):
+    """
+    Runs a function once and returns its wall time and result.
+
+    :param function: Function to time.
+    :return: A tuple of (seconds, result).
+    """
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Script 05 bootstrap confidence intervals.")
+    parser.add_argument("--rows", type=int, default=20000, help="Number of synthetic match rows.")
+    parser.add_argument("--teams", type=int, default=400, help="Number of distinct teams.")
+    parser.add_argument("--resamples", type=int, default=2000, help="Bootstrap resamples.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes drawing resamples.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Script 05 Bootstrap Confidence Intervals\n")
+
+    raw_entries = generate_raw_entries(args.rows, team_count=args.teams, error_rate=0.0)
+    cleaned_data = [script_03.validate_and_clean_entry(entry) for entry in raw_entries]
+    team_data = script_04.build_team_based_data(cleaned_data, script_04.records_to_table(
+        cleaned_data, script_04.METRIC_SOURCE_COLUMNS
+    ))
+    df = script_05.build_match_frame(team_data)
+    group_sizes = df.groupby("team", sort=False).size().to_numpy()
+    values = df[script_05.BOOTSTRAP_METRICS].to_numpy(dtype=float)
+    confidence, seed = script_05.BOOTSTRAP_CONFIDENCE, script_05.BOOTSTRAP_SEED
+    print(f"[INFO] {len(df)} match rows, {len(group_sizes)} teams, {args.resamples} resamples.\n")
+
+    loop_seconds, loop_intervals = timed(
+        lambda: per_team_intervals(values, group_sizes, args.resamples, confidence, seed)
+    )
+    serial_seconds, serial_means = timed(lambda: bootstrap_group_means(values, group_sizes, args.resamples, seed))
+    parallel_seconds, parallel_means = timed(
+        lambda: bootstrap_group_means(values, group_sizes, args.resamples, seed, args.workers)
+    )
+    statistics_seconds, _ = timed(lambda: script_05.calculate_team_statistics(team_data, args.resamples))
+
+    print(f"{'Step':<46}{'Seconds':>10}{'Resamples/s':>14}")
+    for label, seconds in (
+        ("per-team resampling loop", loop_seconds),
+        ("all teams at once, 1 worker", serial_seconds),
+        (f"all teams at once, {args.workers} workers", parallel_seconds),
+        ("Script 05 statistics with intervals", statistics_seconds),
+    ):
+        print(f"{label:<46}{seconds:>10.3f}{args.resamples / seconds:>14,.0f}")
+
+    lower, upper = percentile_interval(serial_means, confidence)
+    width = np.nanmean(upper - lower)
+    difference = np.nanmax(np.abs(np.concatenate([lower - loop_intervals[0], upper - loop_intervals[1]])))
+    print(f"\n[INFO] Same resamples for 1 and {args.workers} workers: "
+          f"{np.array_equal(serial_means, parallel_means, equal_nan=True)}")
+    print(f"[INFO] Mean interval width: {width:.3f}; largest bound difference from the per-team loop "
+          f"(different random streams): {difference:.3f}")
+
+    # No teams (e.g. an empty raw file): no resamples to draw and no intervals to add
+    empty_means = bootstrap_group_means(values[:0], group_sizes[:0], args.resamples, seed)
+    empty_statistics = script_05.calculate_team_statistics({}, args.resamples)
+    empty_handled = empty_means.shape == (args.resamples, 0, values.shape[1]) and empty_statistics == {}
+    print(f"[INFO] Empty input (no teams) handled: {empty_handled}")
+    print(seperation_bar)
@@ -0,0 +1,139 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.chart_rendering import build_chart_spec, render_charts
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+
+# Benchmark: sequential pandas/matplotlib charts vs. the chart rendering subsystem in Script 06
+#
+# Usage:
+#   python benchmarks/benchmark_chart_rendering.py --teams 60 --workers 4
+
+script_06 = load_script("06_team_comparison_analysis")
+
+
+def synthetic_team_statistics(team_count, seed=4201):
+    """
+    Builds a team statistics DataFrame with the columns Script 06 ranks on.
+
+    :param team_count: Number of teams.
+    :param seed: Random seed.
+    :return: A DataFrame indexed by team number.
+    """
+    rng = np.random.default_rng(seed)
+    total = rng.uniform(10, 40, team_count)
+    return pd.DataFrame({
+        "totalNotes_average": total,
+        "shootNotes_average": total * rng.uniform(0.5, 0.9, team_count),
+        "missedNotes_average": total * rng.uniform(0.05, 0.3, team_count),
+        "totalNotes_std_dev": rng.uniform(1, 8, team_count),
+    }, index=rng.choice(np.arange(100, 10000), team_count, replace=False))
+
+
+def legacy_generate_visualizations(team_statistics, output_dir):
+    """
+    The original Script 06 chart loop, kept here as the reference for timing.
+
+    :param team_statistics: DataFrame with one row per team and the rankable metrics.
+    :param output_dir: Directory to save the charts in.
+    """
+    import matplotlib.pyplot as plt
+
+    for metric in script_06.RANKABLE_METRICS:
+        ranked_df = team_statistics.sort_values(by=metric, ascending=metric in script_06.ASCENDING_METRICS)
+        top_n = 10
+        ranked_df.head(top_n).plot(
+            y=metric, kind="bar", title=f"Top {top_n} Teams by {metric.replace('_', ' ').title()}", legend=False
+        )
+        plt.ylabel(metric.replace("_", " ").title())
+        plt.xticks(ticks=range(top_n), labels=ranked_df.head(top_n).index, rotation=45, ha="right")
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, f"top_{top_n}_{metric}.png"))
+        plt.close()
+
+
+def timed(function):
+    """
+    Runs a function once and returns its wall time.
+
+    :param function: Function to time.
+    :return: Wall time in seconds.
+    """
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def spec_mode_import_check():
+    """
+    Checks in a fresh interpreter that writing chart specs does not import matplotlib.
+
+    :return: True if matplotlib stayed unimported.
+    """
+    code = (
+        "import sys, tempfile, pandas as pd\n"
+        "from utility_functions.chart_rendering import build_chart_spec, render_charts\n"
+        "df = pd.DataFrame({'m': [3.0, 2.0, 1.0]}, index=[1, 2, 3])\n"
+        "render_charts([build_chart_spec('m', df['m'])], tempfile.mkdtemp(), 'spec')\n"
+        "print('matplotlib' not in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip() == "True"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Script 06 chart rendering.")
+    parser.add_argument("--teams", type=int, default=60, help="Number of synthetic teams.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes for parallel rendering.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Script 06 Chart Rendering\n")
+
+    team_statistics = synthetic_team_statistics(args.teams)
+    script_06.add_calculated_metrics(team_statistics)
+    rankings = script_06.rank_teams(team_statistics)
+    specs = [
+        build_chart_spec(metric, team_statistics[metric].iloc[rankings.order(metric)[:10]])
+        for metric in rankings.metrics
+    ]
+
+    work_dir = tempfile.mkdtemp(prefix="chart_benchmark_")
+    try:
+        directories = {name: os.path.join(work_dir, name) for name in ("legacy", "serial", "parallel", "spec")}
+        for directory in directories.values():
+            os.makedirs(directory)
+
+        timings = [
+            ("legacy sequential loop", timed(
+                lambda: legacy_generate_visualizations(team_statistics, directories["legacy"])
+            )),
+            ("Agg, 1 worker", timed(lambda: render_charts(specs, directories["serial"]))),
+            (f"Agg, {args.workers} workers", timed(
+                lambda: render_charts(specs, directories["parallel"], workers=args.workers)
+            )),
+            ("unchanged data (skipped)", timed(lambda: render_charts(specs, directories["serial"]))),
+            ("spec mode (JSON + SVG)", timed(lambda: render_charts(specs, directories["spec"], "spec"))),
+        ]
+        print(f"{'Mode':<30}{'Seconds':>10}")
+        for label, seconds in timings:
+            print(f"{label:<30}{seconds:>10.3f}")
+
+        identical = all(
+            open(os.path.join(directories["legacy"], f"{spec['file_name']}.png"), "rb").read()
+            == open(os.path.join(directories["parallel"], f"{spec['file_name']}.png"), "rb").read()
+            for spec in specs
+        )
+        print(f"\n[INFO] PNGs identical to the legacy loop: {identical}")
+        print(f"[INFO] Spec mode imports matplotlib: {not spec_mode_import_check()}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(seperation_bar)
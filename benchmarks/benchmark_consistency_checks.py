@@ -0,0 +1,150 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.columnar_store import records_to_table
+from utility_functions.record_index import RecordIndex
+from utility_functions.consistency_checks import (
+    OUTLIER_ALPHA, OUTLIER_METRICS, OUTLIER_MIN_MATCHES, OUTLIER_MIN_STD, check_consistency, t_critical_value
+)
+import copy
+import math
+import time
+import random
+import argparse
+from collections import defaultdict
+
+# Benchmark: Script 03 consistency checks (duplicate submissions, conflicting match slots, teams
+# in several slots, statistical outliers) with Python dictionaries vs. the NumPy grouping in
+# utility_functions/consistency_checks.py, on a season of synthetic events with injected errors
+#
+# Usage:
+#   python benchmarks/benchmark_consistency_checks.py --events 20 --entries-per-event 600
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+
+
+def generate_season(events, entries_per_event, error_rate, seed):
+    """
+    Generates the cleaned records of several events (match numbers continue across events) with
+    injected duplicate submissions, conflicting teams and outlier note counts.
+
+    :param events: Number of events.
+    :param entries_per_event: Raw entries per event.
+    :param error_rate: Fraction of entries of each injected error kind.
+    :param seed: Random seed.
+    :return: A tuple of (cleaned records, number of injected errors of each kind).
+    """
+    rng = random.Random(seed)
+    cleaned_data, injected = [], defaultdict(int)
+    match_offset = 0
+    for event in range(events):
+        entries = generate_raw_entries(entries_per_event, error_rate=0.0, seed=seed + event)
+        for entry in entries:
+            entry["metadata"]["matchNumber"] += match_offset
+        match_offset = entries[-1]["metadata"]["matchNumber"]
+
+        for entry in list(entries):
+            roll = rng.random()
+            if roll < error_rate:
+                entries.append(copy.deepcopy(entry))
+                injected["duplicate_submission"] += 1
+            elif roll < 2 * error_rate:
+                conflict = copy.deepcopy(entry)
+                conflict["metadata"]["robotTeam"] = rng.randrange(10000, 20000)
+                entries.append(conflict)
+                injected["conflicting_teams"] += 1
+            elif roll < 3 * error_rate:
+                entry["teleNotes"]["near"] += 40
+                injected["statistical_outlier"] += 1
+        cleaned_data.extend(script_03.validate_and_clean_entry(entry) for entry in entries)
+    return cleaned_data, dict(injected)
+
+
+def python_checks(cleaned_data):
+    """
+    The same checks with dictionaries and loops over the cleaned records.
+
+    :param cleaned_data: Cleaned match records.
+    :return: Set of (kind, match, rows) tuples.
+    """
+    slots, team_matches, team_rows = defaultdict(list), defaultdict(list), defaultdict(list)
+    for row, entry in enumerate(cleaned_data):
+        metadata = entry["metadata"]
+        slots[(metadata["matchNumber"], metadata["robotPosition"])].append(row)
+        team_matches[(metadata["matchNumber"], metadata["robotTeam"])].append(row)
+        team_rows[metadata["robotTeam"]].append(row)
+
+    issues = set()
+    for (match, position), rows in slots.items():
+        if len(rows) > 1 and position != "unknown":
+            teams = {cleaned_data[row]["metadata"]["robotTeam"] for row in rows}
+            issues.add(("conflicting_teams" if len(teams) > 1 else "duplicate_submission", match, tuple(rows)))
+    for (match, team), rows in team_matches.items():
+        if len({cleaned_data[row]["metadata"]["robotPosition"] for row in rows}) > 1:
+            issues.add(("team_in_multiple_positions", match, tuple(rows)))
+
+    for metric, columns in OUTLIER_METRICS.items():
+        buckets = [column.split("_")[1] for column in columns]
+        for team, rows in team_rows.items():
+            if len(rows) < OUTLIER_MIN_MATCHES:
+                continue
+            values = [sum(cleaned_data[row].get(metric, {}).get(bucket, 0) for bucket in buckets) for row in rows]
+            critical_value = t_critical_value(OUTLIER_ALPHA, len(rows) - 2)
+            for position, row in enumerate(rows):
+                others = values[:position] + values[position + 1:]
+                mean = sum(others) / len(others)
+                std = math.sqrt(sum((value - mean) ** 2 for value in others) / (len(others) - 1))
+                scale = max(std, OUTLIER_MIN_STD) * math.sqrt(1 + 1 / len(others))
+                if abs(values[position] - mean) / scale >= critical_value:
+                    issues.add(("statistical_outlier", cleaned_data[row]["metadata"]["matchNumber"], (row,)))
+    return issues
+
+
+def timed(function):
+    """
+    Runs a function once and returns its wall time and result.
+
+    :param function: Function to time.
+    :return: A tuple of (seconds, result).
+    """
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Script 03 consistency checks.")
+    parser.add_argument("--events", type=int, default=20, help="Number of synthetic events.")
+    parser.add_argument("--entries-per-event", type=int, default=600, help="Raw entries per event.")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="Fraction of entries per injected error kind.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Script 03 Consistency Checks\n")
+
+    cleaned_data, injected = generate_season(args.events, args.entries_per_event, args.error_rate, 1901)
+    print(f"[INFO] {len(cleaned_data)} records over {args.events} events; injected: {injected}\n")
+
+    python_seconds, python_issues = timed(lambda: python_checks(cleaned_data))
+    table_seconds, table = timed(lambda: records_to_table(cleaned_data))
+    index_seconds, index = timed(lambda: RecordIndex.from_table(table))
+    check_seconds, (issues, severity) = timed(lambda: check_consistency(table, index))
+
+    print(f"{'Step':<46}{'Seconds':>10}{'Records/s':>14}")
+    for label, seconds in (
+        ("dictionaries and loops", python_seconds),
+        ("build the table (shared with the checkpoint)", table_seconds),
+        ("build the record index (saved with the data)", index_seconds),
+        ("NumPy grouping checks", check_seconds),
+    ):
+        print(f"{label:<46}{seconds:>10.3f}{len(cleaned_data) / seconds:>14,.0f}")
+
+    found = defaultdict(int)
+    for issue in issues:
+        found[issue["kind"]] += 1
+    same_issues = python_issues == {(issue["kind"], issue["match"], tuple(issue["rows"])) for issue in issues}
+    print(f"\n[INFO] Issues found: {dict(found)}")
+    print(f"[INFO] Scouters with a severity score: {len(severity)}")
+    print(f"[INFO] Same issues as the dictionary implementation: {same_issues}")
+
+    print(seperation_bar)
@@ -0,0 +1,145 @@
+from utility_functions.print_formats import seperation_bar
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# Benchmark: import time of each pipeline stage, measured like `python -X importtime`
+#
+# Every stage is loaded in a fresh interpreter with -X importtime. The report lists the load
+# time, the slowest top-level imports and which heavy libraries were imported. With --check, the
+# run fails if a stage imports a library its budget forbids or exceeds its time budget, so
+# startup regressions are caught.
+#
+# Usage:
+#   python benchmarks/benchmark_import_time.py
+#   python benchmarks/benchmark_import_time.py --check
+
+budgets_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_time_budgets.json")
+
+HEAVY_LIBRARIES = ["numpy", "pandas", "matplotlib", "scipy"]
+
+# Script modules loaded with `load_script`
+STAGE_MODULES = [
+    "01_json_structure_fixes",
+    "02_clear_outputs",
+    "03_data_cleaning_and_preprocessing",
+    "04_team_statistics_and_data_restructuring",
+    "05_data_analysis_and_statistics_aggregation",
+    "06_team_comparison_analysis",
+    "07_alliance_simulation",
+    "run_pipeline",
+    "run_ingest",
+    "run_query_service",
+]
+
+CHILD_CODE = """
+import sys, time
+start = time.perf_counter()
+from utility_functions.script_loader import load_script
+load_script({module!r})
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def parse_importtime(stderr_text):
+    """
+    Parses `-X importtime` output into the top-level imports and their cumulative times.
+
+    :param stderr_text: The interpreter's stderr.
+    :return: A list of (module name, cumulative microseconds) for top-level imports.
+    """
+    top_level = []
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # Header line
+        # Nested imports are indented by two spaces per level after the " | " separator
+        if fields[2].startswith("  "):
+            continue
+        top_level.append((fields[2].strip(), int(fields[1])))
+    return top_level
+
+
+def measure_stage(module, repeat):
+    """
+    Loads a stage in fresh interpreters and keeps the fastest run.
+
+    :param module: Script module name.
+    :param repeat: Number of interpreters to start.
+    :return: A dictionary with the load time, heavy libraries imported and slowest imports.
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", CHILD_CODE.format(module=module, heavy=HEAVY_LIBRARIES)],
+            capture_output=True, text=True, check=True
+        )
+        elapsed, heavy = (result.stdout.strip().split(" ") + [""])[:2]
+        elapsed_ms = float(elapsed) * 1000
+        if best is None or elapsed_ms < best["load_ms"]:
+            best = {
+                "load_ms": elapsed_ms,
+                "heavy": [name for name in heavy.split(",") if name],
+                "slowest": sorted(parse_importtime(result.stderr), key=lambda item: -item[1])[:3],
+            }
+    return best
+
+
+def check_budget(module, measurement, budgets):
+    """
+    Compares a stage's measurement with its budget.
+
+    :param module: Script module name.
+    :param measurement: Result of `measure_stage`.
+    :param budgets: Dictionary of module -> {"max_load_ms", "forbidden"}.
+    :return: A list of budget violation messages.
+    """
+    budget = budgets.get(module)
+    if budget is None:
+        return [f"{module}: no import budget defined"]
+
+    violations = []
+    for library in measurement["heavy"]:
+        if library in budget["forbidden"]:
+            violations.append(f"{module}: imports {library} at load time")
+    if measurement["load_ms"] > budget["max_load_ms"]:
+        violations.append(f"{module}: load took {measurement['load_ms']:.0f} ms (budget {budget['max_load_ms']} ms)")
+    return violations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark and check the import time of each pipeline stage.")
+    parser.add_argument("--repeat", type=int, default=3, help="Interpreters started per stage (fastest is kept).")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if a stage exceeds its budget.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Stage Import Time\n")
+
+    with open(budgets_path, "r") as infile:
+        budgets = json.load(infile)
+
+    violations = []
+    print(f"{'Stage':<46}{'Load (ms)':>10}  {'Heavy libraries':<22}Slowest imports (cumulative ms)")
+    for module in STAGE_MODULES:
+        measurement = measure_stage(module, args.repeat)
+        slowest = ", ".join(f"{name} {microseconds / 1000:.0f}" for name, microseconds in measurement["slowest"])
+        heavy = ",".join(measurement["heavy"]) or "-"
+        print(f"{module:<46}{measurement['load_ms']:>10.1f}  {heavy:<22}{slowest}")
+        violations.extend(check_budget(module, measurement, budgets))
+
+    if violations:
+        print("\n[WARNING] Import budget violations:")
+        for violation in violations:
+            print(f"  {violation}")
+    else:
+        print("\n[INFO] Every stage is within its import budget.")
+    print(seperation_bar)
+
+    if args.check and violations:
+        sys.exit(1)
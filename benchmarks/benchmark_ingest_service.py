@@ -0,0 +1,133 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import ROBOT_POSITIONS, generate_raw_entries
+from utility_functions.team_accumulators import TeamStatisticsTracker
+from utility_functions.tablet_client import run_tablets
+import os
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+
+# Benchmark: the live ingest service (scripts/run_ingest.py) fed by fake tablet clients, one per
+# robot position, each submitting its entries one at a time over HTTP (POST /matches) or by
+# appending NDJSON lines to its file in the watched directory. Tablets occasionally resubmit an
+# entry and send a malformed line. Reports the throughput, the submission-to-ranking latency
+# histogram, the deepest queue (bounded by --queue-size) and checks that every distinct entry
+# was accepted and that the published team statistics equal the accumulators over the entries
+# in accepted order (the standard deviations depend on the order of each team's matches).
+#
+# Usage:
+#   python benchmarks/benchmark_ingest_service.py --entries 3000 --rate 50 --modes http,files
+#   python benchmarks/benchmark_ingest_service.py --port 8765   (fake tablets only, against a running service)
+
+run_ingest = load_script("run_ingest")
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+
+
+def accepted_statistics(archive_path):
+    """
+    Computes the team statistics of the archived entries, in the order the service accepted them.
+
+    :param archive_path: Path of the service's NDJSON archive.
+    :return: A tuple of (archived entries, statistics as loaded from JSON).
+    """
+    with open(archive_path, "r") as infile:
+        accepted = [json.loads(line) for line in infile]
+    tracker = TeamStatisticsTracker()
+    tracker.add_records(script_03.validate_and_clean_entry(entry) for entry in accepted)
+    script_03.reset_tracking_state()
+    return accepted, json.loads(json.dumps(tracker.team_statistics()))
+
+
+async def benchmark_mode(mode, entries, args, work_dir):
+    """
+    Starts a service in this process, feeds it with the fake tablets and stops it once every
+    submission is published.
+
+    :param mode: "http" or "files".
+    :param entries: Raw entries of the event.
+    :param args: Parsed command line arguments.
+    :param work_dir: Directory for the service's files.
+    :return: A tuple of (service, seconds, deepest raw queue, rejected submissions).
+    """
+    mode_dir = os.path.join(work_dir, mode)
+    service = run_ingest.IngestService(
+        watch_directory=os.path.join(mode_dir, "incoming") if mode == "files" else None,
+        port=0 if mode == "http" else None, batch_window=args.batch_window, queue_size=args.queue_size,
+        poll_interval=0.05, archive_path=os.path.join(mode_dir, "live_matchapps.ndjson"),
+        statistics_path=os.path.join(mode_dir, "live_team_statistics.json"),
+        rankings_path=os.path.join(mode_dir, "live_rankings.json"), quiet=True,
+    )
+    await service.start()
+
+    deepest = 0
+
+    async def sample_queue():
+        nonlocal deepest
+        while True:
+            deepest = max(deepest, service.raw_queue.qsize())
+            await asyncio.sleep(0.005)
+
+    sampler = asyncio.create_task(sample_queue())
+    start = time.perf_counter()
+    if mode == "http":
+        rejected = await run_tablets(entries, args.rate, "127.0.0.1", service.port)
+    else:
+        rejected = await run_tablets(entries, args.rate, directory=service.watch_directory)
+    service.stop()
+    await service.join()
+    seconds = time.perf_counter() - start
+    sampler.cancel()
+    return service, seconds, deepest, rejected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the live ingest service with fake tablets.")
+    parser.add_argument("--entries", type=int, default=3000, help="Number of synthetic entries (six per match).")
+    parser.add_argument("--rate", type=float, default=50, help="Entries per second per tablet (0: as fast as possible).")
+    parser.add_argument("--modes", default="http,files", help="Comma-separated submission modes: http, files.")
+    parser.add_argument("--batch-window", type=float, default=0.25, help="Seconds records are batched for.")
+    parser.add_argument("--queue-size", type=int, default=200, help="Capacity of each service queue.")
+    parser.add_argument("--port", type=int, default=None, help="Only run the fake tablets against a running service.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Live Ingest Service\n")
+
+    entries = generate_raw_entries(args.entries, seed=2101)
+
+    if args.port is not None:
+        start = time.perf_counter()
+        rejected = asyncio.run(run_tablets(entries, args.rate, "127.0.0.1", args.port))
+        print(f"[INFO] Submitted {len(entries)} entries in {time.perf_counter() - start:.2f} s "
+              f"({rejected} rejected submissions).")
+    else:
+        work_dir = tempfile.mkdtemp(prefix="ingest_benchmark_")
+        try:
+            print(f"[INFO] {len(entries)} entries from {len(ROBOT_POSITIONS)} tablets at {args.rate:g} entries/s each, "
+                  f"batch window {args.batch_window} s, queue size {args.queue_size}.")
+            for mode in args.modes.split(","):
+                service, seconds, deepest, rejected = asyncio.run(benchmark_mode(mode, entries, args, work_dir))
+                with open(service.statistics_path, "r") as infile:
+                    published_statistics = json.load(infile)
+                accepted, reference_statistics = accepted_statistics(service.archive_path)
+                every_entry = sorted(map(json.dumps, accepted)) == sorted(map(json.dumps, entries))
+                counters = service.counters
+
+                print(f"\n[INFO] Mode: {mode}")
+                print(f"[INFO] Published {counters['published']} records in {counters['batches']} batches, "
+                      f"{seconds:.2f} s ({counters['published'] / seconds:,.0f} records/s).")
+                print(f"[INFO] Duplicates dropped: {counters['duplicates']}, malformed lines: {counters['malformed']}, "
+                      f"rejected submissions: {rejected}, deepest raw queue: {deepest}/{args.queue_size}.")
+                print("[INFO] Submission-to-ranking latency:")
+                print(service.latency.format())
+                print(f"[INFO] Every entry accepted once: {every_entry}")
+                print(f"[INFO] Published statistics identical to the accumulators over the accepted entries: "
+                      f"{published_statistics == reference_statistics}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(seperation_bar)
@@ -0,0 +1,127 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.columnar_store import columnar_path, read_table, table_to_dataframe
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+# Benchmark: JSON vs. columnar intermediate files (cleaned matches and team-based matches)
+#
+# Usage:
+#   python benchmarks/benchmark_intermediate_format.py --entries 100000
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+script_04 = load_script("04_team_statistics_and_data_restructuring")
+
+
+def path_size_mb(path):
+    """
+    Returns the size of a file, or the total size of a directory's files, in megabytes.
+
+    :param path: File or directory path.
+    :return: Size in megabytes.
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path) / (1024 * 1024)
+    return sum(
+        os.path.getsize(os.path.join(path, file_name)) for file_name in os.listdir(path)
+    ) / (1024 * 1024)
+
+
+def best_time(function, repeat):
+    """
+    Runs a function several times and returns the fastest wall time.
+
+    :param function: Function to time.
+    :param repeat: Number of runs.
+    :return: Fastest run in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def load_json(path):
+    """
+    Loads a JSON intermediate file.
+
+    :param path: Path of the JSON file.
+    :return: The parsed data.
+    """
+    with open(path, "r") as infile:
+        return json.load(infile)
+
+
+def load_columns_touched(path):
+    """
+    Loads a columnar table and reads every numeric column once. Memory-mapped columns are only
+    paged in when accessed, so this measures the cost of actually scanning the data.
+
+    :param path: Path of the table directory.
+    :return: The column sums.
+    """
+    table = read_table(path)
+    return [int(values.sum()) for values in table["columns"].values() if values.dtype.kind in "iu"]
+
+
+def run_benchmark(entry_count, repeat):
+    """
+    Writes cleaned and team-based data in both formats and compares file size and load times.
+
+    :param entry_count: Number of synthetic match entries.
+    :param repeat: Number of timed runs per measurement.
+    """
+    work_dir = tempfile.mkdtemp(prefix="format_benchmark_")
+    try:
+        cleaned_path = os.path.join(work_dir, "cleaned.json")
+        team_path = os.path.join(work_dir, "team_matches.json")
+
+        raw_entries = generate_raw_entries(entry_count, error_rate=0.0)
+        cleaned_data = [script_03.validate_and_clean_entry(entry) for entry in raw_entries]
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            script_03.save_cleaned_data(cleaned_data, cleaned_path, "columnar", export_json=True)
+            script_04.restructure_to_team_based(cleaned_path, team_path, "columnar", export_json=True)
+        print(f"[INFO] Wrote {entry_count} entries in both formats to: {work_dir}\n")
+
+        print(
+            f"{'File':<14}{'Format':<10}{'Size (MB)':>11}{'Load (ms)':>12}"
+            f"{'Load+scan (ms)':>16}{'DataFrame (ms)':>16}"
+        )
+        for label, json_path in (("cleaned", cleaned_path), ("team_matches", team_path)):
+            table_path = columnar_path(json_path)
+
+            json_load = best_time(lambda: load_json(json_path), repeat)
+            print(
+                f"{label:<14}{'json':<10}{path_size_mb(json_path):>11.2f}{json_load * 1000:>12.1f}"
+                f"{json_load * 1000:>16.1f}{'-':>16}"
+            )
+
+            columnar_load = best_time(lambda: read_table(table_path), repeat)
+            columnar_scan = best_time(lambda: load_columns_touched(table_path), repeat)
+            columnar_frame = best_time(lambda: table_to_dataframe(read_table(table_path)), repeat)
+            print(
+                f"{label:<14}{'columnar':<10}{path_size_mb(table_path):>11.2f}{columnar_load * 1000:>12.1f}"
+                f"{columnar_scan * 1000:>16.1f}{columnar_frame * 1000:>16.1f}"
+            )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON vs. columnar intermediate files.")
+    parser.add_argument("--entries", type=int, default=100000, help="Number of synthetic entries.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per measurement.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Intermediate File Formats\n")
+    run_benchmark(args.entries, args.repeat)
+    print(seperation_bar)
@@ -0,0 +1,127 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import ROBOT_POSITIONS, generate_raw_entry
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+import contextlib
+
+# Benchmark: Script 01 in-memory reformatter vs. streaming reformatter
+#
+# Usage:
+#   python benchmarks/benchmark_json_reformat.py --size-mb 300
+#
+# Each mode runs in a fresh interpreter so its peak RSS is measured in isolation.
+
+MODES = ["legacy", "streaming-array", "streaming-ndjson"]
+
+
+def generate_synthetic_ndjson(file_path, size_mb, malformed_rate=0.001, seed=4201):
+    """
+    Writes an NDJSON file of synthetic scouting entries until it reaches the requested size.
+
+    :param file_path: Path of the file to write.
+    :param size_mb: Target file size in megabytes.
+    :param malformed_rate: Fraction of lines written as truncated (malformed) JSON.
+    :param seed: Random seed for reproducible output.
+    :return: The number of lines written.
+    """
+    rng = random.Random(seed)
+    target_bytes = size_mb * 1024 * 1024
+
+    written_bytes = 0
+    line_count = 0
+    with open(file_path, "w") as outfile:
+        while written_bytes < target_bytes:
+            match_number, position_index = divmod(line_count, len(ROBOT_POSITIONS))
+            entry = generate_raw_entry(
+                rng, line_count, match_number + 1, rng.randint(1, 9999),
+                ROBOT_POSITIONS[position_index], f"scouter_{rng.randint(1, 40)}",
+            )
+            line = json.dumps(entry)
+            if rng.random() < malformed_rate:
+                line = line[: len(line) // 2]
+            line += "\n"
+            outfile.write(line)
+            written_bytes += len(line)
+            line_count += 1
+    return line_count
+
+
+def run_single_mode(mode, file_path):
+    """
+    Runs one reformatting mode on a file and prints its timing as JSON (child process entry point).
+
+    :param mode: One of MODES.
+    :param file_path: Path of the file to reformat in place.
+    """
+    script_01 = load_script("01_json_structure_fixes")
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if mode == "legacy":
+            success = script_01.reformat_json(file_path)
+        else:
+            success = script_01.reformat_json_streaming(file_path, output_format=mode.split("-", 1)[1])
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"success": success, "seconds": elapsed, "peak_rss_mb": peak_rss_mb}))
+
+
+def run_benchmark(size_mb, malformed_rate):
+    """
+    Generates a synthetic file and times every reformatting mode against a fresh copy of it.
+
+    :param size_mb: Size of the synthetic file in megabytes.
+    :param malformed_rate: Fraction of malformed lines in the synthetic file.
+    """
+    work_dir = tempfile.mkdtemp(prefix="reformat_benchmark_")
+    try:
+        source_path = os.path.join(work_dir, "source.json")
+        print(f"[INFO] Generating {size_mb} MB synthetic NDJSON file in: {work_dir}")
+        line_count = generate_synthetic_ndjson(source_path, size_mb, malformed_rate)
+        print(f"[INFO] Generated {line_count} lines.\n")
+
+        print(f"{'Mode':<20}{'Seconds':>10}{'MB/s':>10}{'Peak RSS (MB)':>16}{'Output (MB)':>14}")
+        for mode in MODES:
+            target_path = os.path.join(work_dir, f"{mode}.json")
+            shutil.copyfile(source_path, target_path)
+
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run-mode", mode, target_path],
+                capture_output=True, text=True, check=True,
+            )
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            output_mb = os.path.getsize(target_path) / (1024 * 1024)
+            print(
+                f"{mode:<20}{result['seconds']:>10.2f}{size_mb / result['seconds']:>10.1f}"
+                f"{result['peak_rss_mb']:>16.1f}{output_mb:>14.1f}"
+            )
+            os.remove(target_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Script 01 JSON reformatters.")
+    parser.add_argument("--size-mb", type=int, default=300, help="Size of the synthetic NDJSON file.")
+    parser.add_argument("--malformed-rate", type=float, default=0.001, help="Fraction of malformed lines.")
+    parser.add_argument("--run-mode", nargs=2, metavar=("MODE", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        run_single_mode(*args.run_mode)
+    else:
+        print(seperation_bar)
+        print("Benchmark: Script 01 JSON Reformatting\n")
+        run_benchmark(args.size_mb, args.malformed_rate)
+        print(seperation_bar)
@@ -0,0 +1,79 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import SCRIPTS_DIR
+from utility_functions.synthetic_data import generate_raw_entries
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+# Benchmark: Scripts 03-06 as separate interpreters vs. one pipeline runner process
+#
+# Usage:
+#   python benchmarks/benchmark_pipeline_runner.py --entries 20000
+
+STAGE_SCRIPTS = [
+    "03_data_cleaning_and_preprocessing.py",
+    "04_team_statistics_and_data_restructuring.py",
+    "05_data_analysis_and_statistics_aggregation.py",
+    "06_team_comparison_analysis.py",
+]
+
+
+def prepare_work_dir(entry_count):
+    """
+    Creates a temporary pipeline directory with synthetic raw data.
+
+    :param entry_count: Number of synthetic entries.
+    :return: Path of the work directory.
+    """
+    work_dir = tempfile.mkdtemp(prefix="runner_benchmark_")
+    os.makedirs(os.path.join(work_dir, "data", "raw"))
+    with open(os.path.join(work_dir, "data", "raw", "raw_port_h_matchapps.json"), "w") as outfile:
+        json.dump(generate_raw_entries(entry_count), outfile)
+    return work_dir
+
+
+def run_timed(commands, work_dir):
+    """
+    Runs commands one after another in a directory and times them.
+
+    :param commands: List of argument lists.
+    :param work_dir: Working directory.
+    :return: Total wall time in seconds.
+    """
+    start = time.perf_counter()
+    for command in commands:
+        subprocess.run(command, cwd=work_dir, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark separate scripts vs. the pipeline runner.")
+    parser.add_argument("--entries", type=int, default=20000, help="Number of synthetic entries.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Separate Scripts vs. Pipeline Runner (Stages 03-06)\n")
+
+    work_dir = prepare_work_dir(args.entries)
+    try:
+        separate_commands = [[sys.executable, os.path.join(SCRIPTS_DIR, script)] for script in STAGE_SCRIPTS]
+        runner = [sys.executable, os.path.join(SCRIPTS_DIR, "run_pipeline.py"), "--stages", "03-06"]
+
+        timings = [
+            ("separate scripts", run_timed(separate_commands, work_dir)),
+            ("runner", run_timed([runner], work_dir)),
+            ("runner, no checkpoints", run_timed([runner + ["--no-checkpoints"]], work_dir)),
+        ]
+        print(f"[INFO] {args.entries} synthetic entries.\n")
+        print(f"{'Mode':<28}{'Seconds':>10}")
+        for label, seconds in timings:
+            print(f"{label:<28}{seconds:>10.2f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(seperation_bar)
@@ -0,0 +1,261 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import SCRIPTS_DIR
+from utility_functions.synthetic_data import EVENTS_PER_TEAM, generate_season_entries, season_team_pool, write_raw_ndjson
+import os
+import sys
+import json
+import math
+import shutil
+import argparse
+import datetime
+import tempfile
+import subprocess
+
+# Benchmark: every pipeline stage (01 reformat, 03 clean, 04 restructure, 05 aggregate, 06 rank and
+# render) on synthetic data at several scales. 1x is the size of one regional (45 teams, 20
+# matches per team); at Nx, the export holds N such events whose teams are drawn from one season
+# pool, each team attending --events-per-team events on average, so teams have matches from
+# several events. Each stage runs as its script in a fresh interpreter, so its wall time and peak
+# RSS are its own.
+#
+# Every run is appended to a history file (benchmarks/results/pipeline_scale_history.json, not
+# versioned) with the current commit, and compared with the last run of the same configuration.
+# With --check, the run fails if a stage got slower or grew its peak RSS by more than
+# --tolerance, so regressions show up across commits.
+#
+# Usage:
+#   python benchmarks/benchmark_pipeline_scale.py --scales 1,10,100
+#   python benchmarks/benchmark_pipeline_scale.py --scales 1,10 --repeat 3 --check
+
+repository_dir = os.path.dirname(SCRIPTS_DIR)
+history_path = os.path.join(repository_dir, "benchmarks", "results", "pipeline_scale_history.json")
+
+# Stage number, script, extra arguments
+STAGE_SCRIPTS = [
+    ("01", "01_json_structure_fixes.py", []),
+    ("03", "03_data_cleaning_and_preprocessing.py", []),
+    ("04", "04_team_statistics_and_data_restructuring.py", []),
+    ("05", "05_data_analysis_and_statistics_aggregation.py", []),
+    ("06", "06_team_comparison_analysis.py", []),
+]
+
+# Smallest increases reported as regressions, below which stage timings and RSS are mostly noise
+MIN_SECONDS_INCREASE = 0.25
+MIN_RSS_INCREASE_MB = 10
+
+CHILD_CODE = """
+import io, sys, json, time, runpy, contextlib
+script_path, arguments = {script_path!r}, {arguments!r}
+sys.argv = [script_path] + arguments
+output = io.StringIO()
+start = time.perf_counter()
+with contextlib.redirect_stdout(output):
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    except SystemExit:
+        pass
+seconds = time.perf_counter() - start
+from utility_functions.instrumentation import peak_rss_mb
+peak_rss_mb = peak_rss_mb()
+print(json.dumps({{"seconds": seconds, "peak_rss_mb": peak_rss_mb, "failed": "[ERROR]" in output.getvalue()}}))
+"""
+
+
+def run_stage(script, arguments, work_dir):
+    """
+    Runs a stage script in a fresh interpreter.
+
+    :param script: Script file name.
+    :param arguments: Extra command line arguments.
+    :param work_dir: Working directory holding data/ and outputs/.
+    :return: A dictionary with the stage's "seconds", "peak_rss_mb" and "failed" flag.
+    """
+    code = CHILD_CODE.format(script_path=os.path.join(SCRIPTS_DIR, script), arguments=arguments)
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=work_dir, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def run_scale(scale, args):
+    """
+    Generates a synthetic season at a scale and runs every stage on it.
+
+    :param scale: Number of events.
+    :param args: Parsed command line options.
+    :return: A tuple of (entry count, dictionary of stage -> best measurement).
+    """
+    team_pool = season_team_pool(
+        scale, args.teams, math.ceil(scale * args.teams / args.events_per_team), team_seed=2301
+    )
+    entries = generate_season_entries(
+        scale, args.teams, args.matches_per_team, error_rate=args.error_rate, seed=2301 + scale, team_pool=team_pool
+    )
+    work_dir = tempfile.mkdtemp(prefix="scale_benchmark_")
+    try:
+        pristine_path = os.path.join(work_dir, "pristine.json")
+        write_raw_ndjson(pristine_path, entries, args.malformed_rate, seed=2301 + scale)
+        raw_path = os.path.join(work_dir, "data", "raw", "raw_port_h_matchapps.json")
+        os.makedirs(os.path.dirname(raw_path))
+
+        measurements = {}
+        for _ in range(args.repeat):
+            shutil.copyfile(pristine_path, raw_path)  # Script 01 rewrites the raw file
+            for stage, script, arguments in STAGE_SCRIPTS:
+                if stage == "06":
+                    # Without --force-charts, repetitions would skip the charts rendered by the first run
+                    arguments = ["--charts", args.charts, "--force-charts"]
+                measurement = run_stage(script, arguments, work_dir)
+                best = measurements.get(stage)
+                if best is None or measurement["seconds"] < best["seconds"]:
+                    measurements[stage] = measurement
+        return len(entries), measurements
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def current_commit():
+    """
+    :return: The short hash of the checked out commit (with "-dirty" if there are uncommitted
+             changes), or "unknown" outside a git repository.
+    """
+    try:
+        completed = subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=repository_dir, capture_output=True, text=True, check=True
+        )
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_history(file_path):
+    """
+    :param file_path: Path of the history file.
+    :return: The list of recorded runs (empty if the file does not exist).
+    """
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, "r") as infile:
+        return json.load(infile)
+
+
+def find_previous_run(history, config):
+    """
+    Finds the most recent run with the same configuration.
+
+    :param history: Recorded runs, oldest first.
+    :param config: Configuration of the current run.
+    :return: The previous run, or None.
+    """
+    for run in reversed(history):
+        if run["config"] == config:
+            return run
+    return None
+
+
+def compare_runs(results, previous, tolerance):
+    """
+    Compares each stage's time and peak RSS with the previous run. An increase is a regression
+    if it is larger than the tolerance and than the noise floor (MIN_SECONDS_INCREASE,
+    MIN_RSS_INCREASE_MB).
+
+    :param results: Dictionary of scale -> stage -> measurement of the current run.
+    :param previous: Previous run with the same configuration.
+    :param tolerance: Allowed relative increase (e.g. 0.25 for 25%).
+    :return: A list of regression messages.
+    """
+    regressions = []
+    for scale, stages in results.items():
+        for stage, measurement in stages.items():
+            before = previous["results"].get(scale, {}).get(stage)
+            if before is None:
+                continue
+            for key, label, min_increase in (
+                ("seconds", "time", MIN_SECONDS_INCREASE), ("peak_rss_mb", "peak RSS", MIN_RSS_INCREASE_MB)
+            ):
+                if measurement[key] is None or not before[key]:
+                    continue
+                change = measurement[key] / before[key] - 1
+                if change > tolerance and measurement[key] - before[key] > min_increase:
+                    regressions.append(
+                        f"{scale}x stage {stage}: {label} {before[key]:.2f} -> {measurement[key]:.2f} ({change:+.0%})"
+                    )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage at several scales.")
+    parser.add_argument("--scales", default="1,10,100", help="Comma-separated scales (numbers of events).")
+    parser.add_argument("--teams", type=int, default=45, help="Teams attending each event.")
+    parser.add_argument("--matches-per-team", type=int, default=20, help="Average matches scouted per team.")
+    parser.add_argument(
+        "--events-per-team", type=float, default=EVENTS_PER_TEAM, help="Average events attended by each team."
+    )
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of entries with a data-entry error.")
+    parser.add_argument("--malformed-rate", type=float, default=0.01, help="Fraction of truncated lines.")
+    parser.add_argument("--charts", choices=["png", "spec", "none"], default="png", help="Script 06 chart mode.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scale; the fastest run of each stage is kept.")
+    parser.add_argument("--history", default=history_path, help="History file of recorded runs.")
+    parser.add_argument("--no-record", action="store_true", help="Do not append this run to the history.")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if a stage regressed.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative increase for --check.")
+    args = parser.parse_args()
+    scales = [int(scale) for scale in args.scales.split(",")]
+
+    print(seperation_bar)
+    print("Benchmark: Pipeline Stages at Scale\n")
+
+    config = {
+        "teams": args.teams, "matches_per_team": args.matches_per_team, "events_per_team": args.events_per_team,
+        "error_rate": args.error_rate,
+        "malformed_rate": args.malformed_rate, "charts": args.charts, "scales": scales,
+    }
+    results = {}
+    failed = False
+    print(f"{'Scale':<8}{'Entries':>9}{'Stage':>7}{'Seconds':>10}{'Entries/s':>12}{'Peak RSS (MB)':>15}")
+    for scale in scales:
+        entry_count, measurements = run_scale(scale, args)
+        results[str(scale)] = {}
+        for stage, measurement in measurements.items():
+            measurement["entries_per_second"] = entry_count / measurement["seconds"]
+            results[str(scale)][stage] = measurement
+            rss = measurement["peak_rss_mb"]
+            status = "  FAILED" if measurement["failed"] else ""
+            failed = failed or measurement["failed"]
+            print(
+                f"{str(scale) + 'x':<8}{entry_count:>9}{stage:>7}{measurement['seconds']:>10.2f}"
+                f"{measurement['entries_per_second']:>12,.0f}{rss if rss is not None else float('nan'):>15.1f}{status}"
+            )
+
+    history = load_history(args.history)
+    previous = find_previous_run(history, config)
+    commit = current_commit()
+    regressions = []
+    if previous is None:
+        print("\n[INFO] No earlier run with this configuration to compare with.")
+    else:
+        regressions = compare_runs(results, previous, args.tolerance)
+        print(f"\n[INFO] Compared with {previous['commit']} ({previous['date']}), tolerance {args.tolerance:.0%}.")
+        if regressions:
+            print("[WARNING] Regressions:")
+            for message in regressions:
+                print(f"  - {message}")
+        else:
+            print("[INFO] No stage regressed.")
+
+    if not args.no_record:
+        history.append({
+            "commit": commit, "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0], "config": config, "results": results,
+        })
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, "w") as outfile:
+            json.dump(history, outfile, indent=4)
+        print(f"[INFO] Recorded this run ({commit}) in: {args.history}")
+
+    print(seperation_bar)
+    if failed:
+        print("[ERROR] A stage failed.")
+        sys.exit(1)
+    if args.check and regressions:
+        sys.exit(1)
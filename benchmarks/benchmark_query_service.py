@@ -0,0 +1,227 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import SCRIPTS_DIR, load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.team_accumulators import TeamStatisticsTracker
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from urllib.parse import parse_qs, urlsplit
+
+# Benchmark: load test of the query service (scripts/run_query_service.py) with many concurrent
+# clients issuing a mix of team summary, top N and head-to-head queries. Compares the LRU cache of
+# serialized responses with computing every response from the loaded data (--cache-size 0), and
+# with re-reading the statistics JSON for every request. Reports client and server p50/p99
+# latency, requests/s and the cache hit rate, then republishes the statistics and checks that the
+# service answers from the new data.
+#
+# Usage:
+#   python benchmarks/benchmark_query_service.py --teams 60 --clients 50 --requests 5000
+
+run_query_service = load_script("run_query_service")
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+
+
+def write_team_statistics(file_path, entries, teams, seed):
+    """
+    Writes Script 05-style team statistics of a synthetic event.
+
+    :param file_path: Destination path.
+    :param entries: Number of match entries.
+    :param teams: Number of teams.
+    :param seed: Random seed.
+    """
+    tracker = TeamStatisticsTracker()
+    tracker.add_records(
+        script_03.validate_and_clean_entry(entry)
+        for entry in generate_raw_entries(entries, team_count=teams, error_rate=0.0, seed=seed)
+    )
+    temp_path = file_path + ".tmp"
+    with open(temp_path, "w") as outfile:
+        json.dump(tracker.team_statistics(), outfile, indent=4)
+    os.replace(temp_path, file_path)
+
+
+def make_queries(count, teams, metrics, seed):
+    """
+    Builds a reproducible query mix: 60% team summaries, 25% top N and 15% head-to-head.
+
+    :param count: Number of queries.
+    :param teams: Team numbers.
+    :param metrics: Rankable metrics.
+    :param seed: Random seed.
+    :return: List of request paths.
+    """
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.6:
+            queries.append(f"/team/{rng.choice(teams)}")
+        elif roll < 0.85:
+            queries.append(f"/top?metric={rng.choice(metrics)}&n={rng.choice([5, 10, 20])}")
+        else:
+            team_a, team_b = rng.sample(teams, 2)
+            queries.append(f"/compare?a={team_a}&b={team_b}")
+    return queries
+
+
+async def get(port, path):
+    """
+    Sends a GET request.
+
+    :param port: Service port.
+    :param path: Request path.
+    :return: A tuple of (status code, parsed JSON body).
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+async def load_test(port, queries, clients):
+    """
+    Sends every query from `clients` concurrent clients.
+
+    :param port: Service port.
+    :param queries: Request paths.
+    :param clients: Number of concurrent clients.
+    :return: A tuple of (sorted latencies in ms, wall seconds, failed requests).
+    """
+    latencies, failed = [], 0
+    pending = iter(queries)
+
+    async def client():
+        nonlocal failed
+        for path in pending:
+            start = time.perf_counter()
+            status, _ = await get(port, path)
+            latencies.append((time.perf_counter() - start) * 1000)
+            failed += status != 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return sorted(latencies), time.perf_counter() - start, failed
+
+
+def percentile(sorted_values, percent):
+    """
+    :param sorted_values: Sorted list of values.
+    :param percent: Percentile between 0 and 100.
+    :return: The nearest-rank percentile.
+    """
+    return sorted_values[max(0, -(-len(sorted_values) * percent // 100) - 1)]
+
+
+def start_service(file_path, cache_size, work_dir):
+    """
+    Starts the query service in a subprocess and waits until it answers.
+
+    :param file_path: Team statistics file.
+    :param cache_size: LRU cache size.
+    :param work_dir: Working directory of the service.
+    :return: A tuple of (process, port).
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(SCRIPTS_DIR, "run_query_service.py"), "--statistics", file_path,
+         "--port", str(port), "--cache-size", str(cache_size), "--reload-interval", "0.2"],
+        cwd=work_dir, stdout=subprocess.DEVNULL,
+    )
+    for _ in range(200):
+        try:
+            asyncio.run(get(port, "/status"))
+            return process, port
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("The query service did not start.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the query service.")
+    parser.add_argument("--teams", type=int, default=60, help="Number of teams.")
+    parser.add_argument("--entries", type=int, default=3000, help="Match entries behind the statistics.")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent clients.")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per mode.")
+    parser.add_argument("--reload-requests", type=int, default=200, help="Requests timed when re-reading the JSON.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Query Service\n")
+
+    work_dir = tempfile.mkdtemp(prefix="query_benchmark_")
+    file_path = os.path.join(work_dir, "team_statistics.json")
+    write_team_statistics(file_path, args.entries, args.teams, 2201)
+    service = run_query_service.QueryService(file_path, quiet=True)
+    with contextlib.redirect_stdout(io.StringIO()):  # Script 06 logs each metric calculation
+        data = run_query_service.QueryData(file_path, 1, service.score_weights)
+    queries = make_queries(args.requests, data.teams, data.rankings.metrics, 2202)
+
+    print(f"[INFO] {len(data.teams)} teams, {args.requests} requests from {args.clients} concurrent clients "
+          f"(60% team summaries, 25% top N, 15% head-to-head).")
+    print("[INFO] Client latency includes connecting; server time is the service's handling time.\n")
+    print(f"{'Mode':<36}{'Client p50':>11}{'p99 ms':>8}{'Server p50':>12}{'p99 ms':>8}{'Requests/s':>12}{'Hit rate':>10}")
+    try:
+        # Re-reading the statistics for each request, in this process (no HTTP)
+        latencies = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for path in queries[:args.reload_requests]:
+                start = time.perf_counter()
+                service.data = run_query_service.QueryData(file_path, 1, service.score_weights)
+                url = urlsplit(path)
+                parsed, _ = service.parse_query(url.path, {name: values[-1] for name, values in parse_qs(url.query).items()})
+                service.compute_response(parsed)
+                latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        p50, p99 = percentile(latencies, 50), percentile(latencies, 99)
+        print(f"{'re-read JSON per request (no HTTP)':<36}{p50:>11.2f}{p99:>8.2f}{p50:>12.3f}{p99:>8.3f}"
+              f"{1000 / (sum(latencies) / len(latencies)):>12,.0f}{'-':>10}")
+
+        for label, cache_size in (("service, no cache", 0), ("service, LRU cache", 512)):
+            process, port = start_service(file_path, cache_size, work_dir)
+            try:
+                latencies, seconds, failed = asyncio.run(load_test(port, queries, args.clients))
+                _, status = asyncio.run(get(port, "/status"))
+                server = status["latency"]
+                print(f"{label:<36}{percentile(latencies, 50):>11.2f}{percentile(latencies, 99):>8.2f}"
+                      f"{server['p50_ms']:>12.3f}{server['p99_ms']:>8.3f}{len(queries) / seconds:>12,.0f}"
+                      f"{status['cache']['hit_rate'] or 0:>10.0%}")
+                if failed:
+                    print(f"[WARNING] {failed} requests failed.")
+
+                if cache_size:
+                    # Republish the statistics: the service must answer from the new data
+                    write_team_statistics(file_path, args.entries, args.teams, 2203)
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        expected = run_query_service.QueryData(file_path, 2, service.score_weights)
+                    for _ in range(100):
+                        _, top = asyncio.run(get(port, "/top?metric=performance_score&n=10"))
+                        if top["version"] == 2:
+                            break
+                        time.sleep(0.05)
+                    print(f"\n[INFO] Answers from the republished statistics after a reload: "
+                          f"{top['version'] == 2 and top['teams'] == expected.top('performance_score', 10)['teams']}")
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(seperation_bar)
@@ -0,0 +1,123 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.columnar_store import records_to_table
+from utility_functions.record_index import INDEX_COLUMNS, RecordIndex
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+
+# Benchmark: single lookups ("all matches of a team", "who scouted a match position", "every
+# record of a scouter") by reloading and scanning the cleaned JSON vs. the persisted record index
+#
+# Usage:
+#   python benchmarks/benchmark_record_index.py --entries 100000 --queries 200
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+
+
+def scan_lookups(cleaned_file_path, queries):
+    """
+    Answers the queries the way the pipeline would without an index: load the cleaned JSON and
+    scan every record.
+
+    :param cleaned_file_path: Path of the cleaned JSON file.
+    :param queries: List of (kind, key) tuples.
+    :return: List of row id lists, one per query.
+    """
+    with open(cleaned_file_path, "r") as infile:
+        cleaned_data = json.load(infile)
+
+    results = []
+    for kind, key in queries:
+        if kind == "team":
+            rows = [row for row, entry in enumerate(cleaned_data) if entry["metadata"]["robotTeam"] == key]
+        elif kind == "match":
+            rows = [
+                row for row, entry in enumerate(cleaned_data)
+                if (entry["metadata"]["matchNumber"], entry["metadata"]["robotPosition"]) == key
+            ]
+        else:
+            rows = [row for row, entry in enumerate(cleaned_data) if entry["metadata"]["scouterName"] == key]
+        results.append(rows)
+    return results
+
+
+def index_lookups(index_directory, queries):
+    """
+    Answers the queries from the persisted record index (loaded memory-mapped).
+
+    :param index_directory: Path of the record index directory.
+    :param queries: List of (kind, key) tuples.
+    :return: List of row id lists, one per query.
+    """
+    index = RecordIndex.load(index_directory)
+    results = []
+    for kind, key in queries:
+        if kind == "team":
+            results.append(index.team_rows(key).tolist())
+        elif kind == "match":
+            results.append(index.match_rows(*key).tolist())
+        else:
+            results.append(index.scouter_rows(key).tolist())
+    return results
+
+
+def timed(function):
+    """
+    Runs a function once and returns its wall time and result.
+
+    :param function: Function to time.
+    :return: A tuple of (seconds, result).
+    """
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Script 03 record index.")
+    parser.add_argument("--entries", type=int, default=100000, help="Number of synthetic match entries.")
+    parser.add_argument("--queries", type=int, default=200, help="Number of lookups of each kind.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Script 03 Record Index\n")
+
+    cleaned_data = [script_03.validate_and_clean_entry(entry) for entry in generate_raw_entries(args.entries)]
+    metadata = [entry["metadata"] for entry in cleaned_data]
+    rng = random.Random(1701)
+    queries = (
+        [("team", rng.choice(metadata)["robotTeam"]) for _ in range(args.queries)]
+        + [("match", (entry["matchNumber"], entry["robotPosition"]))
+           for entry in (rng.choice(metadata) for _ in range(args.queries))]
+        + [("scouter", rng.choice(metadata)["scouterName"]) for _ in range(args.queries)]
+    )
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        cleaned_file_path = os.path.join(temp_directory, "cleaned.json")
+        index_directory = os.path.join(temp_directory, "cleaned.index")
+        with open(cleaned_file_path, "w") as outfile:
+            json.dump(cleaned_data, outfile, indent=4)
+
+        build_seconds, _ = timed(
+            lambda: RecordIndex.from_table(records_to_table(cleaned_data, INDEX_COLUMNS)).save(index_directory)
+        )
+        scan_seconds, scan_results = timed(lambda: scan_lookups(cleaned_file_path, queries))
+        index_seconds, index_results = timed(lambda: index_lookups(index_directory, queries))
+
+        print(f"[INFO] {args.entries} entries, {len(queries)} lookups ({args.queries} per kind).\n")
+        print(f"{'Step':<46}{'Seconds':>10}{'Lookups/s':>14}")
+        print(f"{'build and save the index (once)':<46}{build_seconds:>10.3f}{'':>14}")
+        for label, seconds in (
+            ("reload the JSON and scan", scan_seconds),
+            ("load the index and binary search", index_seconds),
+        ):
+            print(f"{label:<46}{seconds:>10.3f}{len(queries) / seconds:>14,.0f}")
+
+    print(f"\n[INFO] Index lookups identical to the scans: {scan_results == index_results}")
+
+    print(seperation_bar)
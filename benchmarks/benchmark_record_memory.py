@@ -0,0 +1,105 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.columnar_store import COLUMN_DTYPES, records_to_table, table_to_records
+import time
+import argparse
+import tracemalloc
+
+# Benchmark: memory of the match records passed from Script 03 to Script 04 as nested
+# dictionaries (the JSON shape, before and after Script 04 adds the derived metrics) vs. the
+# compact columnar table, including lossless round-trip checks
+#
+# Usage:
+#   python benchmarks/benchmark_record_memory.py --entries 200000
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+script_04 = load_script("04_team_statistics_and_data_restructuring")
+
+
+def traced(function):
+    """
+    Runs a function and measures the memory still allocated by its result.
+
+    :param function: Function to run.
+    :return: A tuple of (result, bytes allocated, seconds).
+    """
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    return result, tracemalloc.get_traced_memory()[0] - start_bytes, seconds
+
+
+def table_bytes(table):
+    """
+    Size of a table's columns.
+
+    :param table: A table dictionary.
+    :return: Number of bytes.
+    """
+    return sum(values.nbytes for values in table["columns"].values())
+
+
+def wide_table_bytes(table):
+    """
+    Size of a table's columns with the regular (non-compact) dtypes and unicode strings.
+
+    :param table: A table dictionary.
+    :return: Number of bytes.
+    """
+    total = 0
+    for name, values in table["columns"].items():
+        kind = table["kinds"][name]
+        if kind == "string":
+            total += len(values) * values.dtype.itemsize * (4 if values.dtype.kind == "S" else 1)
+        else:
+            total += values.astype(COLUMN_DTYPES[kind]).nbytes
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the memory of the match record representations.")
+    parser.add_argument("--entries", type=int, default=200000, help="Number of synthetic match entries.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Match Record Memory\n")
+
+    raw_entries = generate_raw_entries(args.entries)
+
+    # Dictionaries resize as keys are added, so both dictionary sizes come from one trace
+    tracemalloc.start()
+    cleaned_data, dict_bytes, _ = traced(lambda: [script_03.validate_and_clean_entry(entry) for entry in raw_entries])
+    table = records_to_table(cleaned_data)
+    records_identical = table_to_records(table) == cleaned_data
+
+    # Script 04 adds the derived metrics to every dictionary, and as columns to the table
+    team_data, derived_dict_bytes, _ = traced(lambda: script_04.build_team_based_data(
+        cleaned_data, records_to_table(cleaned_data, script_04.METRIC_SOURCE_COLUMNS)
+    ))
+    tracemalloc.stop()
+
+    team_table = script_04.build_team_based_table(table)
+    team_matches = [match for team in team_data.values() for match in team["matches"]]
+    team_records_identical = table_to_records(team_table) == team_matches
+
+    _, _, to_table_seconds = traced(lambda: records_to_table(cleaned_data))
+    _, _, to_records_seconds = traced(lambda: table_to_records(table))
+
+    print(f"[INFO] {args.entries} cleaned match records.\n")
+    print(f"{'Representation':<52}{'MB':>10}{'Bytes/record':>14}")
+    for label, size in (
+        ("cleaned records as dictionaries", dict_bytes),
+        ("  + derived metrics (Script 04)", dict_bytes + derived_dict_bytes),
+        ("table, int32/int16 codes and unicode ids", wide_table_bytes(table)),
+        ("compact table", table_bytes(table)),
+        ("  + derived metric columns (Script 04)", table_bytes(team_table)),
+    ):
+        print(f"{label:<52}{size / 1e6:>10.1f}{size / args.entries:>14.0f}")
+
+    print(f"\n[INFO] Conversion: {to_table_seconds:.3f} s to the table, {to_records_seconds:.3f} s back to records.")
+    print(f"[INFO] Cleaned records identical after a round trip: {records_identical}")
+    print(f"[INFO] Team-based records identical after a round trip: {team_records_identical}")
+
+    print(seperation_bar)
@@ -0,0 +1,100 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.columnar_store import records_to_table
+import copy
+import json
+import time
+import argparse
+
+# Benchmark: Script 04 per-match loops vs. vectorized derived metrics
+#
+# Usage:
+#   python benchmarks/benchmark_restructure.py --rows 100000
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+script_04 = load_script("04_team_statistics_and_data_restructuring")
+
+
+def legacy_build_team_based_data(cleaned_data):
+    """
+    The original Script 04 restructuring (dict-of-lists grouping and per-match sums), kept here
+    as the reference implementation for timing and output comparison.
+
+    :param cleaned_data: Cleaned match records.
+    :return: A dictionary of team -> {"matches": [...]}.
+    """
+    team_data = {}
+    for match in cleaned_data:
+        team = match["metadata"]["robotTeam"]
+        if team not in team_data:
+            team_data[team] = {"matches": []}
+        team_data[team]["matches"].append(match)
+
+    for team, data in team_data.items():
+        for match in data["matches"]:
+            auto_notes = match["autoNotes"]
+            tele_notes = match["teleNotes"]
+
+            match["autoNotesSum"] = sum(auto_notes.values())
+            match["teleopNotesSum"] = sum(tele_notes.values())
+            match["totalNotes"] = match["autoNotesSum"] + match["teleopNotesSum"]
+
+            match["autoShootNotes"] = auto_notes["near"] + auto_notes["mid"] + auto_notes["far"]
+            match["teleopShootNotes"] = tele_notes["near"] + tele_notes["mid"] + tele_notes["far"]
+
+            match["autoMissedNotes"] = auto_notes["miss"]
+            match["teleopMissedNotes"] = tele_notes["miss"]
+
+            match["missedNotes"] = match["autoMissedNotes"] + match["teleopMissedNotes"]
+
+            match["shootNotes"] = match["autoShootNotes"] + match["teleopShootNotes"]
+    return team_data
+
+
+def time_call(function, *args):
+    """
+    Times a single call.
+
+    :param function: Function to call.
+    :param args: Arguments for the call.
+    :return: A tuple of (seconds, result).
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Script 04 restructuring.")
+    parser.add_argument("--rows", type=int, default=100000, help="Number of synthetic match rows.")
+    parser.add_argument("--teams", type=int, default=400, help="Number of distinct teams.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Script 04 Team Based Restructuring\n")
+
+    raw_entries = generate_raw_entries(args.rows, team_count=args.teams, error_rate=0.0)
+    cleaned_data = [script_03.validate_and_clean_entry(entry) for entry in raw_entries]
+    print(f"[INFO] Generated {len(cleaned_data)} cleaned rows for {args.teams} teams.\n")
+
+    legacy_seconds, legacy_team_data = time_call(legacy_build_team_based_data, copy.deepcopy(cleaned_data))
+    flatten_seconds, metric_table = time_call(records_to_table, cleaned_data, script_04.METRIC_SOURCE_COLUMNS)
+    derived_seconds, _ = time_call(script_04.compute_derived_metrics, metric_table)
+    json_seconds, team_data = time_call(script_04.build_team_based_data, cleaned_data, metric_table)
+    columnar_seconds, _ = time_call(script_04.build_team_based_table, records_to_table(cleaned_data))
+
+    print(f"{'Step':<44}{'Seconds':>10}{'Rows/s':>14}")
+    for label, seconds in (
+        ("legacy loops (JSON shape)", legacy_seconds),
+        ("flatten metric source columns", flatten_seconds),
+        ("vectorized derived metrics only", derived_seconds),
+        ("vectorized metrics + grouping (JSON shape)", json_seconds),
+        ("vectorized metrics + grouping (columnar)", columnar_seconds),
+    ):
+        print(f"{label:<44}{seconds:>10.4f}{args.rows / seconds:>14,.0f}")
+
+    identical = json.dumps(legacy_team_data) == json.dumps(team_data)
+    print(f"\n[INFO] JSON output identical: {identical}")
+
+    print(seperation_bar)
@@ -0,0 +1,115 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import SCRIPTS_DIR
+from utility_functions.synthetic_data import generate_raw_entries, season_team_pool
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+# Benchmark: season-wide team statistics by re-running Scripts 03-05 over every event's records
+# in one file vs. the season runner (one partition per event, 1 and N workers), and after one
+# event changes (only that partition is re-cleaned; the others' saved accumulators are merged).
+# The events draw their teams from one season pool, so most teams play at several events and the
+# check below covers merging a team's statistics across partitions.
+#
+# Usage:
+#   python benchmarks/benchmark_season_partitions.py --events 6 --entries-per-event 6000 --workers 4
+
+EVENT_TEAMS = 40  # Teams attending each event
+
+
+def prepare_work_dir(events, entries_per_event):
+    """
+    Creates a temporary directory with synthetic raw data, both partitioned by event and
+    concatenated into the single raw file of the pipeline runner.
+
+    :param events: Number of events.
+    :param entries_per_event: Raw entries per event.
+    :return: A tuple of (path of the work directory, number of teams at more than one event).
+    """
+    work_dir = tempfile.mkdtemp(prefix="season_benchmark_")
+    os.makedirs(os.path.join(work_dir, "data", "raw", "events"))
+    team_pool = season_team_pool(events, EVENT_TEAMS, team_seed=2001)
+    season_entries = []
+    team_events = {}
+    for event in range(events):
+        entries = generate_raw_entries(
+            entries_per_event, team_count=EVENT_TEAMS, seed=2001 + event, team_pool=team_pool
+        )
+        for team in {entry["metadata"]["robotTeam"] for entry in entries}:
+            team_events[team] = team_events.get(team, 0) + 1
+        with open(os.path.join(work_dir, "data", "raw", "events", f"2024event{event:02d}.json"), "w") as outfile:
+            json.dump(entries, outfile)
+        season_entries.extend(entries)
+    with open(os.path.join(work_dir, "data", "raw", "raw_port_h_matchapps.json"), "w") as outfile:
+        json.dump(season_entries, outfile)
+    return work_dir, sum(count > 1 for count in team_events.values())
+
+
+def run_timed(command, work_dir):
+    """
+    Runs a command in a directory and times it.
+
+    :param command: Argument list.
+    :param work_dir: Working directory.
+    :return: Wall time in seconds.
+    """
+    start = time.perf_counter()
+    subprocess.run(command, cwd=work_dir, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the partitioned season runner.")
+    parser.add_argument("--events", type=int, default=6, help="Number of synthetic events.")
+    parser.add_argument("--entries-per-event", type=int, default=6000, help="Raw entries per event.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Partitions processed in parallel.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Season Runner (Partitioned Events)\n")
+
+    work_dir, shared_teams = prepare_work_dir(args.events, args.entries_per_event)
+    pipeline = [sys.executable, os.path.join(SCRIPTS_DIR, "run_pipeline.py"), "--stages", "03-05",
+                "--bootstrap-resamples", "0"]
+    season = [sys.executable, os.path.join(SCRIPTS_DIR, "run_season.py")]
+    try:
+        timings = [
+            ("one file, Scripts 03-05", run_timed(pipeline, work_dir)),
+            ("season runner, 1 worker", run_timed(season + ["--force"], work_dir)),
+            (f"season runner, {args.workers} workers", run_timed(season + ["--force", "--workers", str(args.workers)], work_dir)),
+        ]
+
+        # Change the last event (and the end of the single file): only its partition is cleaned again
+        for raw_path in (
+            os.path.join(work_dir, "data", "raw", "events", f"2024event{args.events - 1:02d}.json"),
+            os.path.join(work_dir, "data", "raw", "raw_port_h_matchapps.json"),
+        ):
+            with open(raw_path, "r") as infile:
+                entries = json.load(infile)
+            with open(raw_path, "w") as outfile:
+                json.dump(entries[:-6], outfile)
+        timings.append(("season runner, one event changed", run_timed(season, work_dir)))
+        timings.append(("season runner, nothing changed", run_timed(season, work_dir)))
+
+        print(f"[INFO] {args.events} events x {args.entries_per_event} entries; {shared_teams} teams at several events.\n")
+        print(f"{'Mode':<40}{'Seconds':>10}")
+        for label, seconds in timings:
+            print(f"{label:<40}{seconds:>10.2f}")
+
+        # The merged statistics match Scripts 03-05 run over every record of the season
+        subprocess.run(pipeline, cwd=work_dir, check=True, stdout=subprocess.DEVNULL)
+        with open(os.path.join(work_dir, "outputs", "team_data", "team_statistical_analysis.json")) as infile:
+            pipeline_statistics = json.load(infile)
+        with open(os.path.join(work_dir, "outputs", "team_data", "season_team_statistics.json")) as infile:
+            season_statistics = json.load(infile)
+        print(f"\n[INFO] Season statistics identical to Scripts 03-05 over all records: "
+              f"{season_statistics == pipeline_statistics}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(seperation_bar)
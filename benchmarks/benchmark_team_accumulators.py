@@ -0,0 +1,93 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.columnar_store import records_to_table
+from utility_functions.team_accumulators import TeamStatisticsTracker
+import os
+import copy
+import json
+import time
+import argparse
+import tempfile
+
+# Benchmark: per-match streaming team statistics vs. re-running Scripts 04 and 05
+#
+# Usage:
+#   python benchmarks/benchmark_team_accumulators.py --entries 20000
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+script_04 = load_script("04_team_statistics_and_data_restructuring")
+script_05 = load_script("05_data_analysis_and_statistics_aggregation")
+
+
+def recompute_team_statistics(cleaned_data):
+    """
+    Recomputes every team's statistics from scratch, like re-running Scripts 04 and 05.
+
+    :param cleaned_data: Cleaned match records.
+    :return: A dictionary with aggregated team statistics, keyed like the team-based JSON.
+    """
+    records = copy.deepcopy(cleaned_data)
+    team_data = script_04.build_team_based_data(records, records_to_table(records))
+    return script_05.calculate_team_statistics({str(team): data for team, data in team_data.items()})
+
+
+def serialized(statistics):
+    """
+    Serializes statistics the way Script 05 saves them, so NaN values compare equal.
+
+    :param statistics: Team statistics dictionary.
+    :return: The JSON text.
+    """
+    return json.dumps(script_05.convert_to_serializable(statistics))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark streaming team statistics accumulators.")
+    parser.add_argument("--entries", type=int, default=20000, help="Number of synthetic entries.")
+    parser.add_argument("--teams", type=int, default=60, help="Number of distinct teams.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Streaming Team Statistics Accumulators\n")
+
+    raw_entries = generate_raw_entries(args.entries, team_count=args.teams)
+    cleaned_data = [
+        entry for entry in (script_03.validate_and_clean_entry(entry) for entry in raw_entries) if entry
+    ]
+    print(f"[INFO] Generated {len(cleaned_data)} cleaned match records.\n")
+
+    # Feed every match through the tracker
+    tracker = TeamStatisticsTracker()
+    start = time.perf_counter()
+    tracker.add_records(cleaned_data)
+    add_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    streaming_statistics = tracker.team_statistics()
+    statistics_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    recomputed_statistics = recompute_team_statistics(cleaned_data)
+    recompute_seconds = time.perf_counter() - start
+
+    print(f"[INFO] Add one match: {add_seconds / len(cleaned_data) * 1e6:.1f} us")
+    print(f"[INFO] Statistics of every team: {statistics_seconds * 1000:.1f} ms")
+    print(f"[INFO] Re-running Scripts 04 and 05: {recompute_seconds * 1000:.1f} ms")
+    print(f"[INFO] Identical to Script 05: {serialized(streaming_statistics) == serialized(recomputed_statistics)}")
+
+    # Save, restore and keep adding matches
+    half = len(cleaned_data) // 2
+    first_half = TeamStatisticsTracker()
+    first_half.add_records(cleaned_data[:half])
+    state_fd, state_path = tempfile.mkstemp(suffix=".json")
+    os.close(state_fd)
+    try:
+        first_half.save(state_path)
+        restored = TeamStatisticsTracker.load(state_path)
+    finally:
+        os.remove(state_path)
+    restored.add_records(cleaned_data[half:])
+    print(f"[INFO] Identical after save/restore: {serialized(restored.team_statistics()) == serialized(streaming_statistics)}")
+
+    print(seperation_bar)
@@ -0,0 +1,109 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.columnar_store import records_to_table
+import math
+import time
+import argparse
+import pandas as pd
+
+# Benchmark: Script 05 per-team DataFrames vs. single groupby aggregation
+#
+# Usage:
+#   python benchmarks/benchmark_team_statistics.py --rows 100000 --teams 1000
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+script_04 = load_script("04_team_statistics_and_data_restructuring")
+script_05 = load_script("05_data_analysis_and_statistics_aggregation")
+
+
+def legacy_calculate_team_statistics(team_data):
+    """
+    The original Script 05 aggregation (one DataFrame and separate reductions per team), kept
+    here as the reference implementation for timing and output comparison.
+
+    :param team_data: Dictionary containing match data for each team.
+    :return: A dictionary with aggregated team statistics.
+    """
+    team_statistics = {}
+    for team, data in team_data.items():
+        df = pd.DataFrame(data["matches"])
+        stats = {"number_of_matches": len(df)}
+        for metric in script_05.QUANTITATIVE_METRICS:
+            if metric in df:
+                stats[f"{metric}_average"] = float(df[metric].mean())
+                stats[f"{metric}_min"] = int(df[metric].min())
+                stats[f"{metric}_max"] = int(df[metric].max())
+                stats[f"{metric}_std_dev"] = float(df[metric].std())
+        for metric in script_05.CATEGORICAL_METRICS:
+            if metric in df:
+                stats[f"{metric}_value_counts"] = df[metric].value_counts().to_dict()
+        for metric in script_05.BINARY_METRICS:
+            if metric in df:
+                stats[f"{metric}_percent_true"] = float(df[metric].mean() * 100)
+        team_statistics[team] = stats
+    return team_statistics
+
+
+def compare_statistics(expected, actual):
+    """
+    Compares two team statistics dictionaries.
+
+    :param expected: Reference statistics.
+    :param actual: Statistics to check.
+    :return: A tuple of (keys identical, largest relative difference of float values).
+    """
+    keys_identical = list(expected) == list(actual) and all(
+        list(expected[team]) == list(actual[team]) for team in expected
+    )
+    largest_difference = 0.0
+    for team, stats in expected.items():
+        for key, value in stats.items():
+            other = actual[team][key]
+            if isinstance(value, float) and not (math.isnan(value) and math.isnan(other)) and value != other:
+                largest_difference = max(largest_difference, abs(value - other) / abs(value))
+            elif not isinstance(value, float) and value != other:
+                keys_identical = False
+    return keys_identical, largest_difference
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Script 05 team statistics aggregation.")
+    parser.add_argument("--rows", type=int, default=100000, help="Number of synthetic match rows.")
+    parser.add_argument("--teams", type=int, default=1000, help="Number of distinct teams.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Script 05 Team Statistics Aggregation\n")
+
+    raw_entries = generate_raw_entries(args.rows, team_count=args.teams, error_rate=0.0)
+    cleaned_data = [script_03.validate_and_clean_entry(entry) for entry in raw_entries]
+    table = records_to_table(cleaned_data)
+    team_data = script_04.build_team_based_data(cleaned_data, table)
+    team_table = script_04.build_team_based_table(table)
+    print(f"[INFO] Generated {len(cleaned_data)} match rows for {len(team_data)} teams.\n")
+
+    timings = []
+    for label, function, argument in (
+        ("legacy per-team DataFrames", legacy_calculate_team_statistics, team_data),
+        ("groupby engine (JSON team data)", script_05.calculate_team_statistics, team_data),
+        ("groupby engine (columnar table)", script_05.calculate_team_statistics_from_table, team_table),
+    ):
+        start = time.perf_counter()
+        result = function(argument)
+        timings.append((label, time.perf_counter() - start, result))
+
+    print(f"{'Implementation':<36}{'Seconds':>10}{'Teams/s':>12}")
+    for label, seconds, _ in timings:
+        print(f"{label:<36}{seconds:>10.3f}{len(team_data) / seconds:>12,.0f}")
+
+    legacy_result = {str(team): stats for team, stats in timings[0][2].items()}
+    for label, _, result in timings[1:]:
+        engine_result = {str(team): stats for team, stats in result.items()}
+        keys_identical, largest_difference = compare_statistics(legacy_result, engine_result)
+        print(
+            f"\n[INFO] {label}: keys and exact values identical: {keys_identical}, "
+            f"largest relative float difference: {largest_difference:.1e}"
+        )
+
+    print(seperation_bar)
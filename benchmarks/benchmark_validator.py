@@ -0,0 +1,178 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+import copy
+import time
+import argparse
+from collections import defaultdict
+
+# Benchmark: Script 03 recursive validate_structure closure vs. compiled validator. The legacy
+# validator formats every warning as it goes; the compiled one records structured warnings, whose
+# messages are formatted afterwards (timed separately) to compare them.
+#
+# Usage:
+#   python benchmarks/benchmark_validator.py --entries 200000 --error-rate 0.05
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+
+# Messages per kind formatted for the capped timing (Script 03's --warnings-per-kind)
+CAPPED_WARNINGS_PER_KIND = 20
+
+# Warnings of the legacy validator, formatted when they are logged
+legacy_warnings = []
+legacy_scouter_warnings = defaultdict(int)
+
+
+def legacy_log_warning(message, scouter=None):
+    """
+    The original warning logger from Script 03: appends the message and counts it for the scouter.
+    """
+    legacy_warnings.append(message)
+    if scouter:
+        legacy_scouter_warnings[scouter] += 1
+
+
+def legacy_validate_and_clean_entry(entry):
+    """
+    The original per-entry validator from Script 03 (a recursive closure over EXPECTED_STRUCTURE),
+    kept here as the reference implementation for timing and output comparison.
+
+    :param entry: The raw data entry.
+    :return: A cleaned entry.
+    """
+    log_warning = legacy_log_warning
+    scouter = entry.get("metadata", {}).get("scouterName", "Unknown")
+    script_03.scouter_participation[scouter] += 1
+
+    def validate_structure(data, expected_structure, path=""):
+        validated = {}
+        for key, expected_type in expected_structure.items():
+            full_key_path = f"{path}.{key}" if path else key
+
+            if key not in data:
+                log_warning(f"[WARNING] Missing key '{full_key_path}'.", scouter)
+                continue
+
+            if isinstance(expected_type, dict):
+                validated[key] = validate_structure(data[key], expected_type, full_key_path)
+            else:
+                value = data[key]
+                if not isinstance(value, expected_type):
+                    log_warning(
+                        f"[WARNING] Incorrect type for '{full_key_path}'. Expected {expected_type}, got {type(value)}.",
+                        scouter,
+                    )
+                else:
+                    if key == "climb" and value not in script_03.VALID_CLIMB_VALUES:
+                        log_warning(
+                            f"[WARNING] Invalid climb value '{value}' at '{full_key_path}'. Defaulting to 'none'.",
+                            scouter,
+                        )
+                        value = "none"
+
+                    if key == "robotPosition" and value not in script_03.VALID_ROBOT_POSITIONS:
+                        log_warning(
+                            f"[WARNING] Invalid robot position '{value}' at '{full_key_path}'. Defaulting to 'unknown'.",
+                            scouter,
+                        )
+                        value = "unknown"
+
+                    if key == "trapNotes" and value > script_03.MAX_TRAP_NOTES:
+                        log_warning(
+                            f"[WARNING] Trap notes '{value}' exceeded max limit at '{full_key_path}'. Defaulting to {script_03.MAX_TRAP_NOTES}.",
+                            scouter,
+                        )
+                        value = script_03.MAX_TRAP_NOTES
+
+                    if isinstance(value, int) and value < 0:
+                        log_warning(
+                            f"[WARNING] Negative value '{value}' at '{full_key_path}'. Defaulting to 0.",
+                            scouter,
+                        )
+                        value = 0
+
+                    validated[key] = value
+
+        extra_keys = set(data.keys()) - set(expected_structure.keys())
+        for extra_key in extra_keys:
+            if extra_key != "__v":
+                log_warning(f"[WARNING] Extra key '{path}.{extra_key}' found and removed.", scouter)
+
+        return validated
+
+    cleaned_entry = validate_structure(entry, script_03.EXPECTED_STRUCTURE)
+
+    match_number = cleaned_entry["metadata"]["matchNumber"]
+    robot_team = cleaned_entry["metadata"]["robotTeam"]
+    robot_position = cleaned_entry["metadata"]["robotPosition"]
+    script_03.team_match_counts[robot_team] += 1
+    script_03.match_robot_positions[match_number].add(robot_position)
+
+    return cleaned_entry
+
+
+def reset_tracking():
+    """
+    Clears Script 03's global warning and tracking state between runs.
+    """
+    legacy_warnings.clear()
+    legacy_scouter_warnings.clear()
+    script_03.reset_tracking_state()
+    script_03.scouter_participation.clear()
+    script_03.team_match_counts.clear()
+    script_03.match_robot_positions.clear()
+
+
+def time_validator(validator, entries):
+    """
+    Runs a validator over every entry and captures its output.
+
+    :param validator: The per-entry validation function.
+    :param entries: Raw entries to validate.
+    :return: A tuple of (seconds, cleaned entries).
+    """
+    reset_tracking()
+    start = time.perf_counter()
+    cleaned_entries = [validator(entry) for entry in entries]
+    return time.perf_counter() - start, cleaned_entries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Script 03 entry validators.")
+    parser.add_argument("--entries", type=int, default=200000, help="Number of synthetic entries.")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of entries with an error.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Benchmark: Script 03 Entry Validation\n")
+
+    raw_entries = generate_raw_entries(args.entries, error_rate=args.error_rate)
+    print(f"[INFO] Generated {len(raw_entries)} entries with error rate {args.error_rate}.\n")
+
+    legacy_seconds, legacy_entries = time_validator(legacy_validate_and_clean_entry, copy.deepcopy(raw_entries))
+    legacy_messages, legacy_scouters = list(legacy_warnings), dict(legacy_scouter_warnings)
+    compiled_seconds, compiled_entries = time_validator(script_03.validate_and_clean_entry, raw_entries)
+    start = time.perf_counter()
+    compiled_messages = list(script_03.warnings.messages())
+    format_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    capped_messages = list(script_03.warnings.messages(CAPPED_WARNINGS_PER_KIND))
+    capped_seconds = time.perf_counter() - start
+
+    print(f"{'Validator':<12}{'Seconds':>10}{'Entries/s':>14}")
+    print(f"{'legacy':<12}{legacy_seconds:>10.3f}{len(raw_entries) / legacy_seconds:>14,.0f}")
+    print(f"{'compiled':<12}{compiled_seconds:>10.3f}{len(raw_entries) / compiled_seconds:>14,.0f}")
+    print(f"\n[INFO] Speedup: {legacy_seconds / compiled_seconds:.2f}x")
+    print(f"[INFO] {len(script_03.warnings)} warnings: formatting all of them took {format_seconds:.3f}s, "
+          f"the first {CAPPED_WARNINGS_PER_KIND} of each kind ({len(capped_messages)}) {capped_seconds:.4f}s.")
+
+    # Extra-key warnings come out of a set in the legacy validator, so compare order-insensitively
+    identical = (
+        legacy_entries == compiled_entries
+        and [list(entry) for entry in legacy_entries] == [list(entry) for entry in compiled_entries]
+        and sorted(message.removeprefix("[WARNING] ") for message in legacy_messages) == sorted(compiled_messages)
+        and legacy_scouters == script_03.warnings.counts_by_scouter()
+    )
+    print(f"[INFO] Outputs and warnings identical: {identical}")
+
+    print(seperation_bar)
@@ -1,23 +1,36 @@
 from utility_functions.print_formats import seperation_bar
+from utility_functions.instrumentation import logger, timed
+from utility_functions import instrumentation
+import io
 import os
 import json
+import shutil
+import argparse
+import tempfile
 import traceback
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 
-def reformat_json(file_path):
+def reformat_json(file_path, stats=None):
     """
     Reformats a JSON file with improperly separated objects into valid JSON.
 
     :param file_path: Path to the JSON file to fix.
+    :param stats: Optional dictionary that receives the "records" and "malformed_lines" counts.
     """
+    if stats is None:
+        stats = {}
+    stats["records"] = 0
+    stats["malformed_lines"] = 0
     try:
-        print(f"  [INFO] Reading file: {file_path}")
+        logger.info(f"  Reading file: {file_path}")
 
         # Read and parse each line as a separate JSON object
         with open(file_path, 'r') as infile:
             raw_lines = infile.readlines()
 
         if not raw_lines:
-            print(f"  [WARNING] File is empty: {file_path}")
+            logger.warning(f"  File is empty: {file_path}")
             return False
 
         json_objects = []
@@ -25,79 +38,243 @@ def reformat_json(file_path):
             try:
                 json_obj = json.loads(line.strip())
                 json_objects.append(json_obj)
+                stats["records"] += 1
             except json.JSONDecodeError as e:
-                print(f"    [WARNING] Skipping malformed line {i+1} in {file_path}: {line.strip()} - Error: {e}")
+                stats["malformed_lines"] += 1
+                logger.warning(f"    Skipping malformed line {i+1} in {file_path}: {line.strip()} - Error: {e}")
 
         if not json_objects:
-            print(f"  [ERROR] No valid JSON objects found in file: {file_path}")
+            logger.error(f"  No valid JSON objects found in file: {file_path}")
             return False
 
         # Write the corrected JSON objects into a valid JSON array
         with open(file_path, 'w') as outfile:
             json.dump(json_objects, outfile, indent=4)
-            print(f"  [INFO] Successfully reformatted JSON saved to: {file_path}")
+            logger.info(f"  Successfully reformatted JSON saved to: {file_path}")
         return True
 
     except FileNotFoundError:
-        print(f"  [ERROR] File not found: {file_path}")
+        logger.error(f"  File not found: {file_path}")
     except PermissionError:
-        print(f"  [ERROR] Permission denied for file: {file_path}")
+        logger.error(f"  Permission denied for file: {file_path}")
     except Exception as e:
-        print(f"  [ERROR] An unexpected error occurred while processing {file_path}: {e}")
+        logger.error(f"  An unexpected error occurred while processing {file_path}: {e}")
         print(traceback.format_exc())
     return False
 
 
-def process_json_directory(directory_path):
+def reformat_json_streaming(file_path, output_format="array", stats=None):
+    """
+    Streams a JSON file with improperly separated objects into valid JSON, one line at a time.
+
+    Unlike `reformat_json`, the file is never held in memory: every valid line is written
+    straight to a temporary file in the same directory, which atomically replaces the
+    original once the whole file has been read.
+
+    :param file_path: Path to the JSON file to fix.
+    :param output_format: "array" for a valid JSON array (one object per line),
+                          or "ndjson" for newline-delimited JSON.
+    :param stats: Optional dictionary that receives the "records" and "malformed_lines" counts.
+    """
+    if stats is None:
+        stats = {}
+    stats["records"] = 0
+    stats["malformed_lines"] = 0
+    temp_path = None
+    try:
+        logger.info(f"  Streaming file: {file_path}")
+
+        directory = os.path.dirname(os.path.abspath(file_path))
+        temp_fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".reformat_", suffix=".tmp")
+
+        line_count = 0
+        record_count = 0
+        with open(file_path, 'r') as infile, os.fdopen(temp_fd, 'w') as outfile:
+            for i, line in enumerate(infile):
+                line_count += 1
+                stripped_line = line.strip()
+                if i == 0 and stripped_line == "[":
+                    # Re-parsing an already reformatted array line by line would keep only the
+                    # objects that happen to sit alone on a line, so leave the file untouched
+                    logger.warning(f"  File is already a JSON array: {file_path}")
+                    return False
+                try:
+                    json.loads(stripped_line)
+                except json.JSONDecodeError as e:
+                    stats["malformed_lines"] += 1
+                    logger.warning(f"    Skipping malformed line {i+1} in {file_path}: {stripped_line} - Error: {e}")
+                    continue
+
+                # The line parsed, so its text can be copied through without re-serializing
+                if output_format == "array":
+                    outfile.write("[\n" if record_count == 0 else ",\n")
+                outfile.write(stripped_line)
+                if output_format == "ndjson":
+                    outfile.write("\n")
+                record_count += 1
+                stats["records"] = record_count
+
+            if output_format == "array" and record_count:
+                outfile.write("\n]\n")
+
+        if line_count == 0:
+            logger.warning(f"  File is empty: {file_path}")
+            return False
+
+        if record_count == 0:
+            logger.error(f"  No valid JSON objects found in file: {file_path}")
+            return False
+
+        # Keep the original permissions, then swap the new file in atomically
+        shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+        temp_path = None
+        logger.info(f"  Successfully reformatted JSON saved to: {file_path}")
+        return True
+
+    except FileNotFoundError:
+        logger.error(f"  File not found: {file_path}")
+    except PermissionError:
+        logger.error(f"  Permission denied for file: {file_path}")
+    except Exception as e:
+        logger.error(f"  An unexpected error occurred while processing {file_path}: {e}")
+        print(traceback.format_exc())
+    finally:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+    return False
+
+
+@timed
+def reformat_file(file_path, streaming=False, output_format="array", capture_output=False):
+    """
+    Reformats a single JSON file and returns a summary of the result.
+
+    :param file_path: Path to the JSON file to fix.
+    :param streaming: Whether to use the constant-memory streaming reformatter.
+    :param output_format: Output format for the streaming reformatter ("array" or "ndjson").
+    :param capture_output: Whether to capture the file's log lines instead of printing them,
+                           so results from worker processes can be printed in order.
+    :return: A dictionary with the file name, success flag, record and malformed line counts,
+             and the captured log text.
+    """
+    stats = {}
+    log_buffer = io.StringIO()
+    output_context = contextlib.redirect_stdout(log_buffer) if capture_output else contextlib.nullcontext()
+
+    with output_context:
+        logger.info(f"Fixing JSON file: {os.path.basename(file_path)}")
+        if streaming:
+            success = reformat_json_streaming(file_path, output_format, stats)
+        else:
+            success = reformat_json(file_path, stats)
+
+    return {
+        "file_name": os.path.basename(file_path),
+        "success": success,
+        "records": stats.get("records", 0),
+        "malformed_lines": stats.get("malformed_lines", 0),
+        "log": log_buffer.getvalue(),
+    }
+
+
+def process_json_directory(directory_path, streaming=False, output_format="array", workers=1):
     """
     Processes all JSON files in a directory.
 
+    Files are processed in sorted order. With more than one worker, files are fanned out over a
+    process pool and each file's log is printed as one block once all files are done, so the
+    output is identical from run to run.
+
     :param directory_path: Path to the directory containing JSON files.
+    :param streaming: Whether to use the constant-memory streaming reformatter.
+    :param output_format: Output format for the streaming reformatter ("array" or "ndjson").
+    :param workers: Number of worker processes.
+    :return: A list of per-file result dictionaries (see `reformat_file`).
     """
     if not os.path.exists(directory_path):
-        print(f"[ERROR] Directory does not exist: {directory_path}")
-        return
-
-    print(f"[INFO] Processing JSON files in directory: {directory_path}")
-
-    json_files_processed = 0
-    json_files_skipped = 0
-    for file_name in os.listdir(directory_path):
-        if file_name.endswith('.json'):
-            file_path = os.path.join(directory_path, file_name)
-            print(f"[INFO] Fixing JSON file: {file_name}")
-            success = reformat_json(file_path)
-            if success:
-                json_files_processed += 1
-            else:
-                json_files_skipped += 1
-
-    if json_files_processed == 0 and json_files_skipped == 0:
-        print(f"[WARNING] No JSON files found in directory: {directory_path}")
+        logger.error(f"Directory does not exist: {directory_path}")
+        return []
+
+    logger.info(f"Processing JSON files in directory: {directory_path}")
+
+    file_paths = [
+        os.path.join(directory_path, file_name)
+        for file_name in sorted(os.listdir(directory_path))
+        if file_name.endswith('.json')
+    ]
+
+    if workers > 1 and len(file_paths) > 1:
+        logger.info(f"Using {min(workers, len(file_paths))} worker processes.")
+        with ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as executor:
+            futures = [
+                executor.submit(reformat_file, file_path, streaming, output_format, True)
+                for file_path in file_paths
+            ]
+            results = [future.result() for future in futures]
+        for result in results:
+            print(result["log"], end="")
+    else:
+        results = [reformat_file(file_path, streaming, output_format) for file_path in file_paths]
+
+    json_files_processed = sum(1 for result in results if result["success"])
+    json_files_skipped = len(results) - json_files_processed
+    malformed_lines = sum(result["malformed_lines"] for result in results)
+    instrumentation.count("files_reformatted", json_files_processed)
+    instrumentation.count("records_reformatted", sum(result["records"] for result in results))
+    instrumentation.count("malformed_lines", malformed_lines)
+
+    if not results:
+        logger.warning(f"No JSON files found in directory: {directory_path}")
     else:
-        print(f"[INFO] Completed processing JSON files in: {directory_path}")
-        print(f"[INFO] Successfully processed: {json_files_processed} files")
-        print(f"[WARNING] Skipped: {json_files_skipped} files")
+        logger.info(f"Completed processing JSON files in: {directory_path}")
+        logger.info(f"Successfully processed: {json_files_processed} files")
+        logger.warning(f"Skipped: {json_files_skipped} files")
+        logger.warning(f"Malformed lines skipped: {malformed_lines}")
+        for result in results:
+            status = "processed" if result["success"] else "skipped"
+            print(
+                f"  {result['file_name']}: {status}, {result['records']} records, "
+                f"{result['malformed_lines']} malformed lines"
+            )
+
+    return results
 
 
 # MAIN SCRIPT
 
-print(seperation_bar)
-print("Script 01: JSON Reformatting Tool\n")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Script 01: JSON Reformatting Tool")
+    parser.add_argument("--directory", default="data/raw", help="Directory containing the raw JSON files.")
+    parser.add_argument(
+        "--streaming", action="store_true",
+        help="Reformat line by line into a temporary file instead of loading each file into memory."
+    )
+    parser.add_argument(
+        "--output-format", choices=["array", "ndjson"], default="array",
+        help="Output format used by --streaming: a JSON array or NDJSON."
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Number of files to reformat in parallel.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Script 01: JSON Reformatting Tool\n")
 
-try:
-    # Define the directory containing the JSON files
-    json_directory = "data/raw"
+    try:
+        # Define the directory containing the JSON files
+        json_directory = args.directory
 
-    # Process all JSON files in the specified directory
-    process_json_directory(json_directory)
+        # Process all JSON files in the specified directory
+        process_json_directory(
+            json_directory, streaming=args.streaming, output_format=args.output_format, workers=args.workers
+        )
 
-    print("\nAll JSON files have been reformatted successfully.")
-    print("Script 01: Completed.")
+        print("\nAll JSON files have been reformatted successfully.")
+        print("Script 01: Completed.")
 
-except Exception as e:
-    print(f"[ERROR] An unexpected error occurred during execution: {e}")
-    print(traceback.format_exc())
-    print("\nScript 01: Failed.")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during execution: {e}")
+        print(traceback.format_exc())
+        print("\nScript 01: Failed.")
 
-print(seperation_bar)
+    print(seperation_bar)
@@ -1,4 +1,5 @@
 from utility_functions.print_formats import seperation_bar
+from utility_functions.instrumentation import logger
 import os
 import shutil
 
@@ -11,9 +12,9 @@ def ensure_folder_exists(folder_path):
     """
     if not os.path.exists(folder_path):
         os.makedirs(folder_path, exist_ok=True)
-        print(f"Created missing folder: {folder_path}")
+        logger.info(f"Created missing folder: {folder_path}")
     else:
-        print(f"Folder exists: {folder_path}")
+        logger.info(f"Folder exists: {folder_path}")
 
 
 # Function to clear a folder while keeping specific subfolders untouched or preserved
@@ -44,43 +45,42 @@ def clear_folder_with_exceptions(folder_path, untouched_folders=None, preserved_
 
         if item in untouched_folders:
             # Skip untouched folders entirely
-            print(f"Untouched: {item_path}")
+            logger.info(f"Untouched: {item_path}")
             continue
 
         if item in preserved_folders:
             # Clear contents of preserved folders
-            print(f"Preserving folder: {item_path}")
+            logger.info(f"Preserving folder: {item_path}")
             for sub_item in os.listdir(item_path):
                 sub_item_path = os.path.join(item_path, sub_item)
                 try:
                     if os.path.isfile(sub_item_path) or os.path.islink(sub_item_path):
                         os.unlink(sub_item_path)
-                        print(f"Deleted file: {sub_item_path}")
+                        logger.info(f"Deleted file: {sub_item_path}")
                     elif os.path.isdir(sub_item_path):
                         shutil.rmtree(sub_item_path)
-                        print(f"Deleted folder: {sub_item_path}")
+                        logger.info(f"Deleted folder: {sub_item_path}")
                 except Exception as e:
-                    print(f"Failed to clear {sub_item_path}. Reason: {e}")
+                    logger.error(f"Failed to clear {sub_item_path}. Reason: {e}")
             continue
 
         # Delete everything else
         try:
             if os.path.isfile(item_path) or os.path.islink(item_path):
                 os.unlink(item_path)
-                print(f"Deleted file: {item_path}")
+                logger.info(f"Deleted file: {item_path}")
             elif os.path.isdir(item_path):
                 shutil.rmtree(item_path)
-                print(f"Deleted folder: {item_path}")
+                logger.info(f"Deleted folder: {item_path}")
         except Exception as e:
-            print(f"Failed to delete {item_path}. Reason: {e}")
+            logger.error(f"Failed to delete {item_path}. Reason: {e}")
 
 
-# MAIN SCRIPT
-
-print(seperation_bar)
-print("Script 02: Clearing Directories With Custom Exceptions\n")
-
-try:
+def clear_pipeline_directories():
+    """
+    Clears the pipeline's output and processed data folders, keeping the raw data and the
+    output folder structure.
+    """
     # Root folders
     outputs_dir = "outputs"
     data_dir = "data"
@@ -103,11 +103,20 @@ try:
         preserved_folders=["processed"]
     )
 
-    print("\nAll specified directories have been checked, cleared, or created as necessary.")
-    print("Script 02: Completed.")
 
-except Exception as e:
-    print(f"An error occurred: {e}")
-    print("\nScript 02: Failed.")
+# MAIN SCRIPT
+if __name__ == "__main__":
+    print(seperation_bar)
+    print("Script 02: Clearing Directories With Custom Exceptions\n")
+
+    try:
+        clear_pipeline_directories()
+
+        logger.info("\nAll specified directories have been checked, cleared, or created as necessary.")
+        print("Script 02: Completed.")
+
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        print("\nScript 02: Failed.")
 
-print(seperation_bar)
\ No newline at end of file
+    print(seperation_bar)
@@ -1,6 +1,17 @@
 from utility_functions.print_formats import seperation_bar
+from utility_functions.instrumentation import logger, timed
+from utility_functions import instrumentation
+from utility_functions.columnar_store import (
+    append_table, columnar_path, records_to_table, table_to_records, read_manifest, read_table, write_table
+)
+from utility_functions.build_cache import hash_file
+from utility_functions.record_index import RecordIndex, index_path
+from utility_functions.consistency_checks import SEVERITY_WEIGHTS, check_consistency, describe_issue
+from utility_functions.warning_buffer import WarningBuffer
 import os
 import json
+import hashlib
+import argparse
 import traceback
 from collections import defaultdict
 
@@ -8,6 +19,7 @@ from collections import defaultdict
 raw_data_path = "data/raw/raw_port_h_matchapps.json"
 cleaned_data_path = "data/processed/cleaned_port_h_matchapps.json"
 scouter_leaderboard_path = "outputs/statistics/scouter_error_leaderboard.txt"
+cleaning_state_path = "data/processed/cleaning_state.json"
 
 # Correct structure
 EXPECTED_STRUCTURE = {
@@ -42,105 +54,285 @@ VALID_CLIMB_VALUES = {"park", "center", "none", "amp", "source", "failed"}
 VALID_ROBOT_POSITIONS = {"red_1", "red_2", "red_3", "blue_1", "blue_2", "blue_3"}
 MAX_TRAP_NOTES = 3
 
-print(seperation_bar)
-print("Script 03: Robust Data Cleaning\n")
+# Warning kinds: field fixes made by the validation, then whole-data consistency checks
+WARNING_KINDS = [
+    "missing_key", "incorrect_type", "invalid_value", "exceeded_max", "negative_value", "extra_key",
+    "inconsistent_match_counts", "incomplete_match",
+] + list(SEVERITY_WEIGHTS)
+
+
+def describe_warning(kind, path, value, detail):
+    """
+    Formats a recorded warning as a message.
+
+    :param kind: Warning kind.
+    :param path: Field path of the warning (or None).
+    :param value: Offending value.
+    :param detail: The rule, limit or expected type involved (for consistency issues, the table).
+    :return: The warning message.
+    """
+    if kind == "missing_key":
+        return f"Missing key '{path}'."
+    if kind == "incorrect_type":
+        return f"Incorrect type for '{path}'. Expected {detail}, got {type(value)}."
+    if kind == "invalid_value":
+        value_label, default_value = detail
+        return f"Invalid {value_label} '{value}' at '{path}'. Defaulting to '{default_value}'."
+    if kind == "exceeded_max":
+        return f"Trap notes '{value}' exceeded max limit at '{path}'. Defaulting to {detail}."
+    if kind == "negative_value":
+        return f"Negative value '{value}' at '{path}'. Defaulting to 0."
+    if kind == "extra_key":
+        return f"Extra key '{path}.{value}' found and removed."
+    if kind == "inconsistent_match_counts":
+        return "Inconsistent match counts detected:\n" + "\n".join(
+            f"  Teams with {count} matches: {teams}" for count, teams in value.items()
+        )
+    if kind == "incomplete_match":
+        return f"Match {value} is missing positions: {detail}."
+    return describe_issue(detail, value)
+
 
 # Initialize tracking variables
-warnings = []
-scouter_warnings = defaultdict(int)
+warnings = WarningBuffer(WARNING_KINDS, describe_warning)
+saved_scouter_warnings = {}  # Warning counts of the records cleaned by earlier incremental runs
 scouter_participation = defaultdict(int)
 team_match_counts = defaultdict(int)
 match_robot_positions = defaultdict(set)
+scouter_consistency = {}
+
+
+def log_warning(kind, scouter=None, row=-1, path=None, value=None, detail=None):
+    """
+    Records a warning and associates it with the scouter. The message is only formatted when
+    the warnings are printed.
+
+    :param kind: Warning kind (one of WARNING_KINDS).
+    :param scouter: The scouter responsible for the data.
+    :param row: Row of the record in the cleaned data (-1 for warnings about the whole data).
+    :param path: Field path of the warning.
+    :param value: Offending value.
+    :param detail: Rule, limit or expected type needed to describe the warning.
+    """
+    warnings.add(kind, row, path, scouter or None, value, detail)
+
+
+def scouter_warning_counts():
+    """
+    :return: A dictionary of scouter -> number of warnings, including the records cleaned by
+             earlier incremental runs.
+    """
+    counts = dict(saved_scouter_warnings)
+    for scouter, count in warnings.counts_by_scouter().items():
+        counts[scouter] = counts.get(scouter, 0) + count
+    return counts
+
+
+def print_warnings(limit_per_kind=None):
+    """
+    Logs the warnings (at most `limit_per_kind` of each kind, if given), followed by a summary
+    of the warnings by kind and by scouter.
+
+    :param limit_per_kind: Maximum number of messages logged per kind (None for all).
+    """
+    if len(warnings) == 0:
+        return
+    for message in warnings.messages(limit_per_kind):
+        logger.warning(message)
+    counts = warnings.counts_by_kind()
+    if limit_per_kind is not None and any(count > limit_per_kind for count in counts.values()):
+        logger.info(f"Showing the first {limit_per_kind} warnings of each kind (--warnings-per-kind).")
+    logger.info("Warnings by kind: " + ", ".join(f"{kind} {count}" for kind, count in counts.items()))
+    by_scouter = sorted(warnings.counts_by_scouter().items(), key=lambda x: -x[1])
+    if by_scouter:
+        logger.info("Warnings by scouter: " + ", ".join(f"{scouter} {count}" for scouter, count in by_scouter))
+
+def compile_structure(expected_structure, path=""):
+    """
+    Compiles an expected structure once into flat per-level tables, with the key paths, type
+    checks and range rules for every field precomputed.
+
+    A compiled level is a tuple of (fields, expected_keys, path, checks):
+      - `fields` drives the full validation. Each field is a tuple of
+        (key, full_key_path, expected_type, nested_level, rule), where `nested_level` is the
+        compiled level of a nested dictionary (or None for a leaf), and `rule` is a tuple of
+        (allowed_values, default_value, value_label, max_value, check_negative) for a leaf.
+      - `checks` drives the fast path and groups the same rules by kind: (key_order,
+        type_checks, non_negative_keys, allowed_value_checks, max_value_checks, nested_levels,
+        counts_only), where `counts_only` marks levels whose fields are all non-negative ints.
+
+    :param expected_structure: The expected structure.
+    :param path: The path to the current level for logging purposes.
+    :return: The compiled level.
+    """
+    fields = []
+    type_checks, non_negative_keys, allowed_value_checks, max_value_checks, nested_levels = [], [], [], [], []
+    for key, expected_type in expected_structure.items():
+        full_key_path = f"{path}.{key}" if path else key
+
+        if isinstance(expected_type, dict):
+            nested_level = compile_structure(expected_type, full_key_path)
+            fields.append((key, full_key_path, dict, nested_level, None))
+            nested_levels.append((key, nested_level))
+            continue
+
+        allowed_values, default_value, value_label, max_value = None, None, None, None
+        if key == "climb":
+            allowed_values, default_value, value_label = VALID_CLIMB_VALUES, "none", "climb value"
+        elif key == "robotPosition":
+            allowed_values, default_value, value_label = VALID_ROBOT_POSITIONS, "unknown", "robot position"
+        if key == "trapNotes":
+            max_value = MAX_TRAP_NOTES
+        check_negative = issubclass(expected_type, int)
+        rule = (allowed_values, default_value, value_label, max_value, check_negative)
+        fields.append((key, full_key_path, expected_type, None, rule))
+
+        type_checks.append((key, expected_type))
+        if check_negative:
+            non_negative_keys.append(key)
+        if allowed_values is not None:
+            allowed_value_checks.append((key, allowed_values))
+        if max_value is not None:
+            max_value_checks.append((key, max_value))
+
+    counts_only = (
+        not nested_levels and not allowed_value_checks and not max_value_checks
+        and all(expected_type is int for _, expected_type in type_checks)
+    )
+    checks = (
+        tuple(expected_structure), tuple(type_checks), tuple(non_negative_keys),
+        tuple(allowed_value_checks), tuple(max_value_checks), tuple(nested_levels), counts_only,
+    )
+    return tuple(fields), frozenset(expected_structure), path, checks
+
+
+def is_valid_level(data, level, allow_version_key=False):
+    """
+    Checks whether a dictionary already matches its compiled level exactly (same keys in the
+    same order, correct types, values within range).
+
+    :param data: The input data to check.
+    :param level: The compiled level.
+    :param allow_version_key: Whether a trailing `__v` key is allowed (it is dropped silently).
+    :return: True if the data would pass validation unchanged.
+    """
+    if type(data) is not dict:
+        return False
+    key_order, type_checks, non_negative_keys, allowed_value_checks, max_value_checks, nested_levels, counts_only = level[3]
+
+    data_keys = tuple(data)
+    if data_keys != key_order and not (
+        allow_version_key and data_keys[-1:] == ("__v",) and data_keys[:-1] == key_order
+    ):
+        return False
+
+    if counts_only:
+        for value in data.values():
+            if not isinstance(value, int) or value < 0:
+                return False
+        return True
+
+    for key, expected_type in type_checks:
+        if not isinstance(data[key], expected_type):
+            return False
+    for key in non_negative_keys:
+        if data[key] < 0:
+            return False
+    for key, allowed_values in allowed_value_checks:
+        if data[key] not in allowed_values:
+            return False
+    for key, max_value in max_value_checks:
+        if data[key] > max_value:
+            return False
+    for key, nested_level in nested_levels:
+        if not is_valid_level(data[key], nested_level):
+            return False
+    return True
+
+
+def clean_valid_entry(entry):
+    """
+    Fast path for entries that are already valid: returns a shallow copy without the `__v`
+    key (nested dictionaries are shared with the raw entry), or None if the entry needs the
+    full validation.
 
+    :param entry: The raw data entry.
+    :return: The cleaned entry, or None.
+    """
+    if not is_valid_level(entry, COMPILED_STRUCTURE, allow_version_key=True):
+        return None
+
+    cleaned_entry = entry.copy()
+    cleaned_entry.pop("__v", None)
+    return cleaned_entry
 
-def log_warning(message, scouter=None):
+
+def validate_structure(data, level, scouter, row=-1):
     """
-    Logs a warning and associates it with the scouter.
+    Validates and fixes a nested structure against its compiled level, logging every fix.
 
-    :param message: The warning message to log.
+    :param data: The input data to validate.
+    :param level: The compiled level.
     :param scouter: The scouter responsible for the data.
+    :param row: Row of the record in the cleaned data, recorded with its warnings.
+    :return: A validated and cleaned version of the data.
     """
-    global warnings, scouter_warnings
-    warnings.append(message)
-    if scouter:
-        scouter_warnings[scouter] += 1
+    fields, expected_keys, path, _ = level
+    validated = {}
+    for key, full_key_path, expected_type, nested_level, rule in fields:
+        if key not in data:
+            log_warning("missing_key", scouter, row, full_key_path)
+            continue
+
+        value = data[key]
+        if nested_level is not None:
+            if not isinstance(value, dict):
+                log_warning("incorrect_type", scouter, row, full_key_path, value, dict)
+                continue
+            validated[key] = validate_structure(value, nested_level, scouter, row)
+            continue
+
+        if not isinstance(value, expected_type):
+            log_warning("incorrect_type", scouter, row, full_key_path, value, expected_type)
+            continue
+
+        allowed_values, default_value, value_label, max_value, _ = rule
+        if allowed_values is not None and value not in allowed_values:
+            log_warning("invalid_value", scouter, row, full_key_path, value, (value_label, default_value))
+            value = default_value
+
+        if max_value is not None and value > max_value:
+            log_warning("exceeded_max", scouter, row, full_key_path, value, max_value)
+            value = max_value
+
+        if isinstance(value, int) and value < 0:
+            log_warning("negative_value", scouter, row, full_key_path, value)
+            value = 0
+
+        validated[key] = value
+
+    # Remove extra keys
+    for extra_key in data:
+        if extra_key not in expected_keys and extra_key != "__v":  # Log removal of all keys except `__v`
+            log_warning("extra_key", scouter, row, path, extra_key)
+
+    return validated
+
 
-def validate_and_clean_entry(entry):
+def validate_and_clean_entry(entry, row=-1):
     """
     Validates and cleans a single entry, ensuring it adheres to the correct structure and rules.
 
     :param entry: The raw data entry.
+    :param row: Row of the entry in the cleaned data, recorded with its warnings.
     :return: A cleaned entry.
     """
     scouter = entry.get("metadata", {}).get("scouterName", "Unknown")
     scouter_participation[scouter] += 1
 
-    def validate_structure(data, expected_structure, path=""):
-        """
-        Validates and fixes a nested structure.
-
-        :param data: The input data to validate.
-        :param expected_structure: The expected structure.
-        :param path: The path to the current key for logging purposes.
-        :return: A validated and cleaned version of the data.
-        """
-        validated = {}
-        for key, expected_type in expected_structure.items():
-            full_key_path = f"{path}.{key}" if path else key
-
-            if key not in data:
-                log_warning(f"[WARNING] Missing key '{full_key_path}'.", scouter)
-                continue
-
-            if isinstance(expected_type, dict):
-                validated[key] = validate_structure(data[key], expected_type, full_key_path)
-            else:
-                value = data[key]
-                if not isinstance(value, expected_type):
-                    log_warning(
-                        f"[WARNING] Incorrect type for '{full_key_path}'. Expected {expected_type}, got {type(value)}.",
-                        scouter,
-                    )
-                else:
-                    if key == "climb" and value not in VALID_CLIMB_VALUES:
-                        log_warning(
-                            f"[WARNING] Invalid climb value '{value}' at '{full_key_path}'. Defaulting to 'none'.",
-                            scouter,
-                        )
-                        value = "none"
-
-                    if key == "robotPosition" and value not in VALID_ROBOT_POSITIONS:
-                        log_warning(
-                            f"[WARNING] Invalid robot position '{value}' at '{full_key_path}'. Defaulting to 'unknown'.",
-                            scouter,
-                        )
-                        value = "unknown"
-
-                    if key == "trapNotes" and value > MAX_TRAP_NOTES:
-                        log_warning(
-                            f"[WARNING] Trap notes '{value}' exceeded max limit at '{full_key_path}'. Defaulting to {MAX_TRAP_NOTES}.",
-                            scouter,
-                        )
-                        value = MAX_TRAP_NOTES
-
-                    if isinstance(value, int) and value < 0:
-                        log_warning(
-                            f"[WARNING] Negative value '{value}' at '{full_key_path}'. Defaulting to 0.",
-                            scouter,
-                        )
-                        value = 0
-
-                    validated[key] = value
-
-        # Remove extra keys
-        extra_keys = set(data.keys()) - set(expected_structure.keys())
-        for extra_key in extra_keys:
-            if extra_key != "__v":  # Log removal of all keys except `__v`
-                log_warning(f"[WARNING] Extra key '{path}.{extra_key}' found and removed.", scouter)
-
-        return validated
-
-    cleaned_entry = validate_structure(entry, EXPECTED_STRUCTURE)
+    cleaned_entry = clean_valid_entry(entry)
+    if cleaned_entry is None:
+        cleaned_entry = validate_structure(entry, COMPILED_STRUCTURE, scouter, row)
 
     # Record team and match consistency
     match_number = cleaned_entry["metadata"]["matchNumber"]
@@ -152,72 +344,507 @@ def validate_and_clean_entry(entry):
     return cleaned_entry
 
 
-def analyze_data_consistency():
+def load_raw_data(file_path):
+    """
+    Loads raw match entries from either a JSON array or compact NDJSON (one entry per line),
+    the two formats written by script 01.
+
+    :param file_path: Path to the raw data file.
+    :return: The parsed raw data.
     """
-    Analyzes data consistency for matches and robot teams.
+    with open(file_path, "r") as infile:
+        first_char = infile.read(1)
+        while first_char.isspace():
+            first_char = infile.read(1)
+        infile.seek(0)
+
+        if first_char == "[":
+            return json.load(infile)
+        return [json.loads(line) for line in infile if line.strip()]
+
+
+@timed
+def analyze_data_consistency(table, index):
     """
-    global warnings
+    Analyzes data consistency for matches and robot teams: match counts and completeness, then
+    duplicate submissions, conflicting match slots and statistical outliers, with each
+    scouter's severity score kept for the leaderboard.
 
+    :param table: Columnar table of the cleaned data.
+    :param index: RecordIndex of the same table.
+    """
     # Check team match counts
     match_count_groups = defaultdict(list)
     for team, count in team_match_counts.items():
         match_count_groups[count].append(team)
 
     if len(match_count_groups) > 1:
-        log_warning(
-            "[WARNING] Inconsistent match counts detected:\n"
-            + "\n".join(
-                f"  Teams with {count} matches: {teams}"
-                for count, teams in match_count_groups.items()
-            )
-        )
+        log_warning("inconsistent_match_counts", value=match_count_groups)
 
     # Check match completeness
     for match, positions in match_robot_positions.items():
         if len(positions) != 6:
             missing_positions = VALID_ROBOT_POSITIONS - positions
-            log_warning(
-                f"[WARNING] Match {match} is missing positions: {missing_positions}."
-            )
+            log_warning("incomplete_match", value=match, detail=missing_positions)
 
+    # Cross-match checks over the whole table
+    issues, severity = check_consistency(table, index)
+    for issue in issues:
+        log_warning(issue["kind"], row=issue["rows"][0], value=issue, detail=table)
+    scouter_consistency.update(severity)
 
-# Main Script Execution
-try:
-    print(f"[INFO] Loading raw data from: {raw_data_path}")
-    with open(raw_data_path, "r") as infile:
-        raw_data = json.load(infile)
 
-    if not isinstance(raw_data, list):
-        raise ValueError("Raw data must be a list of matches.")
+def schema_fingerprint():
+    """
+    Hashes the expected structure and validation constants, so saved state produced under
+    different cleaning rules can be detected and discarded.
 
-    cleaned_data = []
-    for entry in raw_data:
-        cleaned_entry = validate_and_clean_entry(entry)
-        cleaned_data.append(cleaned_entry)
+    :return: A hex digest identifying the current cleaning rules.
+    """
+    def describe(structure):
+        return {
+            key: describe(expected_type) if isinstance(expected_type, dict) else expected_type.__name__
+            for key, expected_type in structure.items()
+        }
+
+    rules = [
+        describe(EXPECTED_STRUCTURE),
+        sorted(VALID_CLIMB_VALUES),
+        sorted(VALID_ROBOT_POSITIONS),
+        MAX_TRAP_NOTES,
+    ]
+    return hashlib.sha256(json.dumps(rules).encode()).hexdigest()
+
+
+def get_record_key(entry):
+    """
+    Returns the key identifying a raw entry across runs: its `_id.$oid`, or a content hash
+    for entries without one.
+
+    :param entry: The raw data entry.
+    :return: The record key.
+    """
+    record_id = entry.get("_id")
+    if isinstance(record_id, dict) and isinstance(record_id.get("$oid"), str):
+        return record_id["$oid"]
+    return "sha256:" + hashlib.sha256(json.dumps(entry, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def append_cleaned_json(cleaned_file_path, new_entries):
+    """
+    Appends cleaned entries to a saved JSON array in place. The array is patched just before
+    its closing bracket, so the file ends up byte-identical to dumping every entry again.
+
+    :param cleaned_file_path: Path of the cleaned JSON file.
+    :param new_entries: Cleaned entries to append.
+    :return: True if the entries were appended, False if the file is missing or does not end
+             like a non-empty array written by `json.dump(..., indent=4)`.
+    """
+    if not os.path.exists(cleaned_file_path):
+        return False
+    if not new_entries:
+        return True
+
+    with open(cleaned_file_path, "rb+") as outfile:
+        size = outfile.seek(0, os.SEEK_END)
+        if size < 4:
+            return False
+        outfile.seek(size - 2)
+        if outfile.read(2) != b"\n]":
+            return False
+        # `json.dumps` of the new entries is "[\n    {...}\n]": drop its "[" and continue the array
+        outfile.seek(size - 2)
+        outfile.write(("," + json.dumps(new_entries, indent=4)[1:]).encode("ascii"))
+        outfile.truncate()
+    return True
+
+
+@timed
+def save_cleaned_data(cleaned_data, cleaned_file_path, intermediate_format="json", export_json=False, table=None,
+                      index=None, append=False):
+    """
+    Saves the cleaned data in the selected intermediate format, plus the record index of the
+    team, match/position and scouter lookups.
+
+    :param cleaned_data: The cleaned match entries (only the new ones with `append`).
+    :param cleaned_file_path: Path of the cleaned JSON file (the columnar table and the record
+                              index are saved next to it).
+    :param intermediate_format: "json" or "columnar".
+    :param export_json: Whether to also save the JSON file when using the columnar format.
+    :param table: Optional columnar table of the cleaned data, if it was already built
+                  (required with `append`: the table of every entry).
+    :param index: Optional RecordIndex of the table, if it was already built.
+    :param append: Whether `cleaned_data` only holds new entries to add to the saved JSON file
+                   (an incremental run), rather than every entry.
+    """
+    os.makedirs(os.path.dirname(cleaned_file_path), exist_ok=True)
+    if table is None:
+        table = records_to_table(cleaned_data)
+
+    if intermediate_format == "columnar":
+        table_path = columnar_path(cleaned_file_path)
+        logger.info(f"Saving cleaned data to: {table_path}")
+        write_table(table_path, table)
+
+    if intermediate_format == "json" or export_json:
+        if append and append_cleaned_json(cleaned_file_path, cleaned_data):
+            logger.info(f"Appended {len(cleaned_data)} cleaned records to: {cleaned_file_path}")
+        else:
+            if append:
+                # The saved file cannot be patched, so every entry is written again
+                cleaned_data = table_to_records(table)
+            logger.info(f"Saving cleaned data to: {cleaned_file_path}")
+            with open(cleaned_file_path, "w") as outfile:
+                json.dump(cleaned_data, outfile, indent=4)
+
+    logger.info(f"Saving record index to: {index_path(cleaned_file_path)}")
+    (index if index is not None else RecordIndex.from_table(table)).save(index_path(cleaned_file_path))
+
+
+def load_cleaned_data(cleaned_file_path, intermediate_format="json"):
+    """
+    Loads previously cleaned data from the selected intermediate format.
+
+    :param cleaned_file_path: Path of the cleaned JSON file (the columnar table is read next to it).
+    :param intermediate_format: "json" or "columnar".
+    :return: The cleaned match entries, or None if they have not been saved yet.
+    """
+    if intermediate_format == "columnar":
+        table_path = columnar_path(cleaned_file_path)
+        if not os.path.exists(table_path):
+            return None
+        return table_to_records(read_table(table_path))
+
+    if not os.path.exists(cleaned_file_path):
+        return None
+    with open(cleaned_file_path, "r") as infile:
+        return json.load(infile)
+
+
+def state_table_path(state_file_path, cleaned_file_path, intermediate_format="json"):
+    """
+    Returns the columnar table of every cleaned record that an incremental run resumes from:
+    the cleaned table itself with the columnar format, and a copy saved next to the cleaning
+    state with the JSON format (so the JSON file never has to be parsed again).
+
+    :param state_file_path: Path to the saved cleaning state.
+    :param cleaned_file_path: Path of the cleaned JSON file.
+    :param intermediate_format: "json" or "columnar".
+    :return: Path of the table directory.
+    """
+    if intermediate_format == "columnar":
+        return columnar_path(cleaned_file_path)
+    return columnar_path(state_file_path)
+
+
+def load_cleaning_state(state_file_path, cleaned_file_path, intermediate_format="json"):
+    """
+    Loads the state saved by the last run and restores the tracking variables (scouter
+    warning/participation counts, team match counts and match robot positions).
+
+    :param state_file_path: Path to the saved cleaning state.
+    :param cleaned_file_path: Path to the cleaned data the state belongs to.
+    :param intermediate_format: Format the cleaned data was saved in ("json" or "columnar").
+    :return: A tuple of (record keys already cleaned, path of the columnar table of the cleaned
+             records), or None if there is no usable state and a full run is needed.
+    """
+    if not os.path.exists(state_file_path):
+        return None
+
+    with open(state_file_path, "r") as infile:
+        state = json.load(infile)
+
+    if state.get("schema_fingerprint") != schema_fingerprint():
+        logger.info("Cleaning rules changed since the last run; ignoring saved state.")
+        return None
+
+    if state.get("intermediate_format", "json") != intermediate_format:
+        logger.info("Intermediate format changed since the last run; ignoring saved state.")
+        return None
+
+    table_path = state_table_path(state_file_path, cleaned_file_path, intermediate_format)
+    if not os.path.exists(os.path.join(table_path, "manifest.json")) or (
+        intermediate_format == "json" and not os.path.exists(cleaned_file_path)
+    ):
+        return None
+
+    if read_manifest(table_path)["row_count"] != len(state["record_keys"]) or (
+        intermediate_format == "json" and os.path.getsize(cleaned_file_path) != state.get("cleaned_bytes")
+    ):
+        logger.warning("Cleaned data does not match the saved state; ignoring saved state.")
+        return None
 
-    analyze_data_consistency()
+    saved_scouter_warnings.update(state["scouter_warnings"])
+    scouter_participation.update(state["scouter_participation"])
+    for team, count in state["team_match_counts"]:
+        team_match_counts[team] += count
+    for match, positions in state["match_robot_positions"]:
+        match_robot_positions[match].update(positions)
 
-    print(f"[INFO] Saving cleaned data to: {cleaned_data_path}")
-    os.makedirs(os.path.dirname(cleaned_data_path), exist_ok=True)
-    with open(cleaned_data_path, "w") as outfile:
-        json.dump(cleaned_data, outfile, indent=4)
+    return state["record_keys"], table_path
 
-    # Save scouter leaderboard
-    os.makedirs(os.path.dirname(scouter_leaderboard_path), exist_ok=True)
-    with open(scouter_leaderboard_path, "w") as leaderboard_file:
+
+def is_up_to_date(raw_file_path, intermediate_format="json", cleaned_file_path=None, leaderboard_file_path=None,
+                  state_file_path=None):
+    """
+    Checks whether the raw data file is unchanged since the last run, so an incremental run has
+    nothing to do. The raw file's hash is memoized in the state by size and modification time.
+
+    :param raw_file_path: Path of the raw data file.
+    :param intermediate_format: "json" or "columnar".
+    :param cleaned_file_path: Path of the cleaned JSON file (default: `cleaned_data_path`).
+    :param leaderboard_file_path: Path of the scouter leaderboard (default: `scouter_leaderboard_path`).
+    :param state_file_path: Path of the incremental cleaning state (default: `cleaning_state_path`).
+    :return: True if the state matches the raw file and the current rules, and every output exists.
+    """
+    cleaned_file_path = cleaned_file_path or cleaned_data_path
+    state_file_path = state_file_path or cleaning_state_path
+    outputs = [
+        state_file_path, leaderboard_file_path or scouter_leaderboard_path, index_path(cleaned_file_path),
+        state_table_path(state_file_path, cleaned_file_path, intermediate_format),
+    ]
+    if intermediate_format == "json":
+        outputs.append(cleaned_file_path)
+    if not os.path.exists(raw_file_path) or not all(os.path.exists(path) for path in outputs):
+        return False
+
+    with open(state_file_path, "r") as infile:
+        state = json.load(infile)
+    raw_hash = state.get("raw_hash")
+    return (
+        raw_hash is not None
+        and state.get("schema_fingerprint") == schema_fingerprint()
+        and state.get("intermediate_format", "json") == intermediate_format
+        and hash_file(raw_file_path, {"file_hashes": {raw_file_path: raw_hash}}) == raw_hash[2]
+    )
+
+
+def save_cleaning_state(state_file_path, record_keys, intermediate_format="json", cleaned_file_path=None,
+                        table=None, raw_file_path=None):
+    """
+    Saves the record keys and tracking variables needed to resume cleaning incrementally,
+    with the JSON format also the table of the cleaned records (see `state_table_path`).
+
+    Team numbers and match numbers are saved as pairs rather than JSON object keys, so they
+    come back with their original types. The size of the cleaned JSON file is saved too, so a
+    file changed or cut short after the run is detected.
+
+    :param state_file_path: Path to save the cleaning state.
+    :param record_keys: Keys of every cleaned record, in cleaned data order.
+    :param intermediate_format: Format the cleaned data was saved in ("json" or "columnar").
+    :param cleaned_file_path: Path of the cleaned JSON file (default: `cleaned_data_path`).
+    :param table: Columnar table of every cleaned record (needed with the JSON format).
+    :param raw_file_path: Path of the raw data file the records were read from, whose hash is
+                          saved for `is_up_to_date` (optional).
+    """
+    cleaned_file_path = cleaned_file_path or cleaned_data_path
+    if intermediate_format == "json" and table is not None:
+        write_table(state_table_path(state_file_path, cleaned_file_path), table)
+    state = {
+        "schema_fingerprint": schema_fingerprint(),
+        "intermediate_format": intermediate_format,
+        "cleaned_bytes": os.path.getsize(cleaned_file_path) if intermediate_format == "json" else None,
+        "raw_hash": None,
+        "record_keys": record_keys,
+        "scouter_warnings": scouter_warning_counts(),
+        "scouter_participation": scouter_participation,
+        "team_match_counts": list(team_match_counts.items()),
+        "match_robot_positions": [
+            [match, sorted(positions)] for match, positions in match_robot_positions.items()
+        ],
+    }
+    if raw_file_path is not None:
+        # [size, modification time, SHA-256], as memoized by `hash_file`
+        memo = {"file_hashes": {}}
+        hash_file(raw_file_path, memo)
+        state["raw_hash"] = memo["file_hashes"][raw_file_path]
+    os.makedirs(os.path.dirname(state_file_path), exist_ok=True)
+    temp_path = state_file_path + ".tmp"
+    with open(temp_path, "w") as outfile:
+        outfile.write(json.dumps(state))  # One C-encoded string: `json.dump` encodes in Python chunks
+    os.replace(temp_path, state_file_path)
+
+
+def save_scouter_leaderboard(leaderboard_file_path):
+    """
+    Saves the scouter error leaderboard, participation counts and consistency severity scores.
+
+    :param leaderboard_file_path: Path to save the leaderboard.
+    """
+    os.makedirs(os.path.dirname(leaderboard_file_path), exist_ok=True)
+    with open(leaderboard_file_path, "w") as leaderboard_file:
         leaderboard_file.write("Scouter Error Leaderboard:\n")
-        for scouter, count in sorted(scouter_warnings.items(), key=lambda x: -x[1]):
+        for scouter, count in sorted(scouter_warning_counts().items(), key=lambda x: -x[1]):
             leaderboard_file.write(f"{scouter}: {count} errors/warnings\n")
         leaderboard_file.write("\nScouter Participation:\n")
         for scouter, count in sorted(scouter_participation.items(), key=lambda x: -x[1]):
             leaderboard_file.write(f"{scouter}: {count} matches\n")
 
-    print("\n".join(warnings))
-    print(f"[INFO] Total warnings/errors: {len(warnings)}")
-    print("[INFO] Data cleaning completed successfully.")
+        if scouter_consistency:
+            leaderboard_file.write("\nScouter Consistency Severity:\n")
+            for scouter, entry in sorted(scouter_consistency.items(), key=lambda x: -x[1]["severity"]):
+                matches = scouter_participation.get(scouter, 0)
+                per_match = f", {entry['severity'] / matches * 100:.1f} per 100 matches" if matches else ""
+                details = ", ".join(
+                    f"{count} {kind.replace('_', ' ')}" for kind, count in sorted(entry["issues"].items())
+                )
+                leaderboard_file.write(f"{scouter}: severity {entry['severity']:g}{per_match} ({details})\n")
+
+
+def reset_tracking_state():
+    """
+    Clears the warnings and tracking variables, so data can be cleaned more than once in the
+    same process (e.g. by the pipeline runner).
+    """
+    warnings.clear()
+    saved_scouter_warnings.clear()
+    scouter_participation.clear()
+    team_match_counts.clear()
+    match_robot_positions.clear()
+    scouter_consistency.clear()
+
+
+def clean_raw_data(raw_data, incremental=False, intermediate_format="json", export_json=False, save_checkpoint=True,
+                   as_table=False, cleaned_file_path=None, leaderboard_file_path=None, state_file_path=None,
+                   return_data=True, raw_file_path=None):
+    """
+    Cleans raw match entries, checks data consistency and saves the cleaned data, the scouter
+    leaderboard and the state for the next incremental run.
+
+    An incremental run only validates the new entries, appends them to the saved cleaned data
+    and re-runs the consistency checks over the saved table plus the new rows. When there are no
+    new entries, the saved outputs are up to date and nothing is rebuilt.
+
+    :param raw_data: List of raw match entries.
+    :param incremental: Whether to only clean entries not seen by the last run (needs `save_checkpoint`).
+    :param intermediate_format: "json" or "columnar".
+    :param export_json: Whether to also save the JSON file when using the columnar format.
+    :param save_checkpoint: Whether to save the cleaned data and the cleaning state to disk.
+    :param as_table: Whether to return the cleaned entries as a compact columnar table.
+    :param cleaned_file_path: Path of the cleaned JSON file (default: `cleaned_data_path`).
+    :param leaderboard_file_path: Path of the scouter leaderboard (default: `scouter_leaderboard_path`).
+    :param state_file_path: Path of the incremental cleaning state (default: `cleaning_state_path`).
+    :param return_data: Whether to return the cleaned entries (an incremental run then has to
+                        read back the previously cleaned entries).
+    :param raw_file_path: Path of the raw data file, whose hash is saved with the state so the
+                          next incremental run can be skipped if it is unchanged (optional).
+    :return: The cleaned match entries (a list of records, or a table with `as_table`), or None
+             without `return_data`.
+    """
+    cleaned_file_path = cleaned_file_path or cleaned_data_path
+    leaderboard_file_path = leaderboard_file_path or scouter_leaderboard_path
+    state_file_path = state_file_path or cleaning_state_path
+    reset_tracking_state()
+
+    saved_state = None
+    if incremental and save_checkpoint:
+        saved_state = load_cleaning_state(state_file_path, cleaned_file_path, intermediate_format)
+    if saved_state is None:
+        record_keys, saved_table_path = [], None
+        new_entries = raw_data
+    else:
+        record_keys, saved_table_path = saved_state
+        seen_keys = set(record_keys)
+        new_entries = [entry for entry in raw_data if get_record_key(entry) not in seen_keys]
+        logger.info(f"Incremental run: {len(new_entries)} new records, {len(record_keys)} already cleaned.")
+
+    table = None
+    if saved_table_path is not None and not new_entries and os.path.exists(leaderboard_file_path) \
+            and os.path.exists(index_path(cleaned_file_path)):
+        logger.info("No new records; the cleaned data, record index and leaderboard are up to date.")
+    else:
+        cleaned_data = []
+        with instrumentation.timer("validate_entries"):
+            for row, entry in enumerate(new_entries, len(record_keys)):
+                cleaned_entry = validate_and_clean_entry(entry, row)
+                cleaned_data.append(cleaned_entry)
+                record_keys.append(get_record_key(entry))
+        instrumentation.count("entries_cleaned", len(new_entries))
+
+        # The consistency checks, the checkpoint and the returned table share one table and index
+        table = records_to_table(cleaned_data)
+        if saved_table_path is not None:
+            # Read into memory, as saving the new table replaces the directory
+            table = append_table(read_table(saved_table_path, memory_map=False), table)
+        index = RecordIndex.from_table(table)
+        analyze_data_consistency(table, index)
+
+        if save_checkpoint:
+            save_cleaned_data(
+                cleaned_data, cleaned_file_path, intermediate_format, export_json, table, index,
+                append=saved_table_path is not None
+            )
+
+        # Save scouter leaderboard and the state for the next incremental run
+        save_scouter_leaderboard(leaderboard_file_path)
+        if save_checkpoint:
+            save_cleaning_state(
+                state_file_path, record_keys, intermediate_format, cleaned_file_path, table, raw_file_path
+            )
+        instrumentation.count("warnings", len(warnings))
+        for kind, count in warnings.counts_by_kind().items():
+            instrumentation.count(f"warnings.{kind}", count)
+
+    if not return_data:
+        return None
+    if as_table:
+        return table if table is not None else read_table(saved_table_path)
+    if saved_table_path is None:
+        return cleaned_data
+    # Only the new entries were cleaned in this run, so every entry is read back
+    return load_cleaned_data(cleaned_file_path, intermediate_format)
+
+
+# Compile the expected structure once for every entry
+COMPILED_STRUCTURE = compile_structure(EXPECTED_STRUCTURE)
+
+
+# Main Script Execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Script 03: Robust Data Cleaning")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Only clean raw records not seen by the last run and merge them into the cleaned data."
+    )
+    parser.add_argument(
+        "--format", choices=["json", "columnar"], default="json", dest="intermediate_format",
+        help="Intermediate format for the cleaned data read by Script 04."
+    )
+    parser.add_argument(
+        "--export-json", action="store_true",
+        help="Also save the cleaned data as JSON when using the columnar format."
+    )
+    parser.add_argument(
+        "--warnings-per-kind", type=int, metavar="N",
+        help="Print at most N warning messages of each kind (default: every warning)."
+    )
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Script 03: Robust Data Cleaning\n")
+
+    try:
+        if args.incremental and is_up_to_date(raw_data_path, args.intermediate_format):
+            logger.info(f"Raw data unchanged since the last run: {raw_data_path}")
+            logger.info("Cleaned data is up to date.")
+        else:
+            logger.info(f"Loading raw data from: {raw_data_path}")
+            raw_data = load_raw_data(raw_data_path)
+
+            if not isinstance(raw_data, list):
+                raise ValueError("Raw data must be a list of matches.")
+
+            clean_raw_data(
+                raw_data, args.incremental, args.intermediate_format, args.export_json, return_data=False,
+                raw_file_path=raw_data_path
+            )
+
+            print_warnings(args.warnings_per_kind)
+            logger.info(f"Total warnings/errors: {len(warnings)}")
+            logger.info("Data cleaning completed successfully.")
 
-except Exception as e:
-    print(f"[ERROR] An unexpected error occurred: {e}")
-    print(traceback.format_exc())
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {e}")
+        print(traceback.format_exc())
 
-print(seperation_bar)
\ No newline at end of file
+    print(seperation_bar)
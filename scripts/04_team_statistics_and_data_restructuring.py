@@ -1,87 +1,229 @@
 from utility_functions.print_formats import seperation_bar
+from utility_functions.instrumentation import logger, timed
+from utility_functions import instrumentation
+from utility_functions.columnar_store import (
+    MISSING, columnar_path, compact_column, records_to_table, table_to_records, read_table, write_table, select_rows
+)
+from utility_functions.metric_definitions import DERIVED_METRICS
 import os
 import json
+import argparse
 import traceback
-
-print(seperation_bar)
-print("Script 04: Team Based Data Restructuring\n")
+import numpy as np
 
 # File paths
 cleaned_data_path = "data/processed/cleaned_port_h_matchapps.json"
 team_performance_path = "data/processed/cleaned_port_h_team_matches.json"
 
+# Match table columns the derived metrics (and the team grouping) are computed from
+METRIC_SOURCE_COLUMNS = list(dict.fromkeys(["robotTeam"] + [
+    term for metric, terms in DERIVED_METRICS for term in terms
+    if term not in {derived_metric for derived_metric, _ in DERIVED_METRICS}
+]))
+
 # Functions to restructure and calculate statistics
 
 
-def restructure_to_team_based(cleaned_file_path, team_file_path):
+@timed
+def compute_derived_metrics(table):
     """
-    Restructures cleaned match data into a team-based format with advanced statistics.
+    Computes every derived metric for all matches at once from the flat match table.
+
+    Note buckets dropped during cleaning count as 0.
+
+    :param table: Columnar match table.
+    :return: A dictionary of derived metric name -> NumPy array with one value per match.
+    """
+    columns = table["columns"]
+    derived = {}
+    for metric, terms in DERIVED_METRICS:
+        total = np.zeros(len(columns["robotTeam"]), dtype=np.int64)
+        for term in terms:
+            if term in derived:
+                total += derived[term]
+            else:
+                values = columns[term]
+                total += np.where(values == MISSING, 0, values)
+        derived[metric] = total
+    return derived
+
+
+def group_rows_by_team(team_column):
+    """
+    Groups match rows by team using a sort index instead of per-match dictionary lookups.
+
+    Teams are ordered by their first match, and each team's rows keep their original order.
+
+    :param team_column: Array with the team number of every match.
+    :return: A list of (team, row indices) tuples.
+    """
+    teams, first_rows, team_codes = np.unique(team_column, return_index=True, return_inverse=True)
+    team_order = np.argsort(first_rows, kind="stable")
+    team_rank = np.empty_like(team_order)
+    team_rank[team_order] = np.arange(len(team_order))
+
+    row_order = np.argsort(team_rank[team_codes], kind="stable")
+    group_sizes = np.bincount(team_rank[team_codes], minlength=len(teams))
+    group_rows = np.split(row_order, np.cumsum(group_sizes)[:-1])
+    return [(int(teams[team_index]), rows) for team_index, rows in zip(team_order, group_rows)]
+
+
+@timed
+def build_team_based_data(cleaned_data, table):
+    """
+    Builds the team-based JSON structure, adding the derived metrics to every match record.
+
+    :param cleaned_data: Cleaned match records.
+    :param table: Columnar match table for the same records.
+    :return: A dictionary of team -> {"matches": [...]}.
+    """
+    derived = compute_derived_metrics(table)
+    metric_names = [metric for metric, _ in DERIVED_METRICS]
+    metric_rows = zip(*(derived[metric].tolist() for metric in metric_names))
+    for match, metric_values in zip(cleaned_data, metric_rows):
+        match.update(zip(metric_names, metric_values))
+
+    team_data = {}
+    for team, rows in group_rows_by_team(table["columns"]["robotTeam"]):
+        team_data[team] = {"matches": [cleaned_data[row] for row in rows.tolist()]}
+    return team_data
+
+
+@timed
+def build_team_based_table(table):
+    """
+    Builds the columnar team-based table: the match table ordered team by team, with the
+    derived metrics as extra columns.
+
+    :param table: Columnar match table.
+    :return: The team-based columnar table.
+    """
+    derived = compute_derived_metrics(table)
+    team_table = {
+        "columns": dict(table["columns"]),
+        "kinds": dict(table["kinds"]),
+        "categories": dict(table["categories"]),
+        "exact_values": dict(table["exact_values"]),
+        "empty_objects": dict(table["empty_objects"]),
+    }
+    for metric, _ in DERIVED_METRICS:
+        team_table["columns"][metric] = compact_column(derived[metric], "int")
+        team_table["kinds"][metric] = "int"
+
+    grouped_rows = [rows for _, rows in group_rows_by_team(table["columns"]["robotTeam"])]
+    row_order = np.concatenate(grouped_rows) if grouped_rows else np.array([], dtype=np.int64)
+    return select_rows(team_table, row_order)
+
+
+def load_cleaned_data(cleaned_file_path, intermediate_format="json"):
+    """
+    Loads the cleaned match data saved by Script 03.
 
     :param cleaned_file_path: Path to the cleaned JSON file.
-    :param team_file_path: Path to save the team-based JSON file.
+    :param intermediate_format: "json" or "columnar" (the table is read next to the JSON path).
+    :return: A tuple of (cleaned match records, or None for the columnar format, and the match table).
     """
-    try:
-        # Load cleaned data
-        print(f"[INFO] Loading cleaned data from: {cleaned_file_path}")
-        with open(cleaned_file_path, 'r') as infile:
-            cleaned_data = json.load(infile)
+    if intermediate_format == "columnar":
+        logger.info(f"Loading cleaned data from: {columnar_path(cleaned_file_path)}")
+        return None, read_table(columnar_path(cleaned_file_path))
 
-        if not isinstance(cleaned_data, list):
-            raise ValueError("Cleaned data must be a list of matches.")
+    logger.info(f"Loading cleaned data from: {cleaned_file_path}")
+    with open(cleaned_file_path, 'r') as infile:
+        cleaned_data = json.load(infile)
 
-        # Group matches by team
-        team_data = {}
-        for match in cleaned_data:
-            team = match["metadata"]["robotTeam"]
-            if team not in team_data:
-                team_data[team] = {"matches": []}
-            team_data[team]["matches"].append(match)
+    if not isinstance(cleaned_data, list):
+        raise ValueError("Cleaned data must be a list of matches.")
+    return cleaned_data, records_to_table(cleaned_data, METRIC_SOURCE_COLUMNS)
 
-        # Add advanced statistics
-        for team, data in team_data.items():
-            for match in data["matches"]:
-                # Advanced statistics for each match
-                auto_notes = match["autoNotes"]
-                tele_notes = match["teleNotes"]
 
-                match["autoNotesSum"] = sum(auto_notes.values())
-                match["teleopNotesSum"] = sum(tele_notes.values())
-                match["totalNotes"] = match["autoNotesSum"] + match["teleopNotesSum"]
+def restructure_cleaned_data(cleaned_data, table, team_file_path, intermediate_format="json",
+                             export_json=False, save_checkpoint=True):
+    """
+    Builds and saves the team-based data in the selected intermediate format.
 
-                match["autoShootNotes"] = auto_notes["near"] + auto_notes["mid"] + auto_notes["far"]
-                match["teleopShootNotes"] = tele_notes["near"] + tele_notes["mid"] + tele_notes["far"]
+    :param cleaned_data: Cleaned match records, or None to rebuild them from the table.
+    :param table: Columnar match table for the same records.
+    :param team_file_path: Path to save the team-based JSON file.
+    :param intermediate_format: "json" or "columnar" (the table is saved next to the JSON path).
+    :param export_json: Whether to also save the team-based JSON file when using the columnar format.
+    :param save_checkpoint: Whether to save the team-based data to disk.
+    :return: A tuple of (team-based JSON data, team-based table); only the one(s) built for the
+             selected format are set, the other is None.
+    """
+    team_data, team_table = None, None
+    instrumentation.count("matches_restructured", len(table["columns"]["robotTeam"]))
+
+    if intermediate_format == "columnar":
+        team_table = build_team_based_table(table)
+        if save_checkpoint:
+            logger.info(f"Saving team-based data to: {columnar_path(team_file_path)}")
+            write_table(columnar_path(team_file_path), team_table)
+
+    if intermediate_format == "json" or export_json:
+        if cleaned_data is None:
+            cleaned_data = table_to_records(table)
+        team_data = build_team_based_data(cleaned_data, table)
 
-                match["autoMissedNotes"] = auto_notes["miss"]
-                match["teleopMissedNotes"] = tele_notes["miss"]
+        if save_checkpoint:
+            logger.info(f"Saving team-based data to: {team_file_path}")
+            with open(team_file_path, 'w') as outfile:
+                json.dump(team_data, outfile, indent=4)
 
-                match["missedNotes"] = match["autoMissedNotes"] + match["teleopMissedNotes"]
+    return team_data, team_table
 
-                match["shootNotes"] = match["autoShootNotes"] + match["teleopShootNotes"]
 
-        # Save team-based data
-        print(f"[INFO] Saving team-based data to: {team_file_path}")
-        with open(team_file_path, 'w') as outfile:
-            json.dump(team_data, outfile, indent=4)
+def restructure_to_team_based(cleaned_file_path, team_file_path, intermediate_format="json", export_json=False):
+    """
+    Restructures cleaned match data into a team-based format with advanced statistics.
 
-        print("[INFO] Team-based restructuring completed successfully.")
+    The derived metrics are computed in one vectorized pass over a flat table of all matches.
+    In the columnar format, the team-based data is saved as that table ordered team by team,
+    with the derived metrics as extra columns.
+
+    :param cleaned_file_path: Path to the cleaned JSON file.
+    :param team_file_path: Path to save the team-based JSON file.
+    :param intermediate_format: "json" or "columnar" (the tables are read and saved next to the JSON paths).
+    :param export_json: Whether to also save the team-based JSON file when using the columnar format.
+    """
+    try:
+        cleaned_data, table = load_cleaned_data(cleaned_file_path, intermediate_format)
+        restructure_cleaned_data(cleaned_data, table, team_file_path, intermediate_format, export_json)
+        logger.info("Team-based restructuring completed successfully.")
 
     except FileNotFoundError as e:
-        print(f"[ERROR] Cleaned data file not found: {e}")
+        logger.error(f"Cleaned data file not found: {e}")
     except json.JSONDecodeError as e:
-        print(f"[ERROR] Failed to decode JSON: {e}")
+        logger.error(f"Failed to decode JSON: {e}")
     except Exception as e:
-        print(f"[ERROR] An unexpected error occurred during restructuring: {e}")
+        logger.error(f"An unexpected error occurred during restructuring: {e}")
         print(traceback.format_exc())
 
 
 # Main script execution
-try:
-    os.makedirs(os.path.dirname(team_performance_path), exist_ok=True)
-    restructure_to_team_based(cleaned_data_path, team_performance_path)
-    print("\nScript 04: Completed.")
-except Exception as e:
-    print(f"[ERROR] An unexpected error occurred: {e}")
-    print(traceback.format_exc())
-    print("\nScript 04: Failed.")
-
-print(seperation_bar)
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Script 04: Team Based Data Restructuring")
+    parser.add_argument(
+        "--format", choices=["json", "columnar"], default="json", dest="intermediate_format",
+        help="Intermediate format of the cleaned data read and the team-based data saved."
+    )
+    parser.add_argument(
+        "--export-json", action="store_true",
+        help="Also save the team-based data as JSON when using the columnar format."
+    )
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Script 04: Team Based Data Restructuring\n")
+
+    try:
+        os.makedirs(os.path.dirname(team_performance_path), exist_ok=True)
+        restructure_to_team_based(
+            cleaned_data_path, team_performance_path, args.intermediate_format, args.export_json
+        )
+        print("\nScript 04: Completed.")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {e}")
+        print(traceback.format_exc())
+        print("\nScript 04: Failed.")
+
+    print(seperation_bar)
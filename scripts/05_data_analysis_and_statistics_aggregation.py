@@ -1,15 +1,19 @@
 from utility_functions.print_formats import seperation_bar
+from utility_functions.instrumentation import logger, timed
+from utility_functions import instrumentation
+from utility_functions.columnar_store import columnar_path, read_table, table_to_dataframe
+from utility_functions.scoring_model import load_scoring_config, score_teams
+from utility_functions.team_accumulators import sample_std_devs
+from utility_functions.metric_definitions import QUANTITATIVE_METRICS, CATEGORICAL_METRICS, BINARY_METRICS
 import os
 import json
+import argparse
 import traceback
-import pandas as pd
-
-print(seperation_bar)
-print("Script 05: Data Analysis & Team Statistics Aggregation\n")
 
 # File paths
 team_matches_path = "data/processed/cleaned_port_h_team_matches.json"
 team_statistics_path = "outputs/team_data/team_statistical_analysis.json"
+scoring_config_path = "config/scoring_weights.json"
 
 # Helper Functions
 
@@ -21,6 +25,8 @@ def convert_to_serializable(obj):
     :param obj: Object to convert.
     :return: Serializable object.
     """
+    import pandas as pd
+
     if isinstance(obj, (pd.Series, pd.DataFrame)):
         return obj.to_dict()
     if isinstance(obj, (pd.Timestamp, pd.Timedelta)):
@@ -34,76 +40,319 @@ def convert_to_serializable(obj):
     return obj
 
 
-def calculate_team_statistics(team_data):
+# Bootstrap confidence intervals of the per-team averages (and of the performance score)
+BOOTSTRAP_METRICS = ["totalNotes", "shootNotes", "missedNotes"]
+BOOTSTRAP_RESAMPLES = 2000
+BOOTSTRAP_CONFIDENCE = 0.95
+BOOTSTRAP_SEED = 1505
+
+
+def build_match_frame(team_data):
     """
-    Calculates advanced statistics for each team.
+    Builds one DataFrame of every team's matches, keeping only the aggregated metrics.
 
     :param team_data: Dictionary containing match data for each team.
-    :return: A dictionary with aggregated team statistics.
+    :return: A DataFrame with a "team" column (the team-based data's keys) and one column per metric.
     """
-    team_statistics = {}
+    import pandas as pd
 
+    metrics = QUANTITATIVE_METRICS + CATEGORICAL_METRICS + BINARY_METRICS
+    columns = {"team": [], **{metric: [] for metric in metrics}}
     for team, data in team_data.items():
-        matches = data["matches"]
-        df = pd.DataFrame(matches)
+        for match in data["matches"]:
+            columns["team"].append(team)
+            for metric in metrics:
+                columns[metric].append(match.get(metric))
+
+    # Binary metrics become 1.0/0.0 (NaN when missing) so they can be averaged per group
+    for metric in BINARY_METRICS:
+        columns[metric] = [float(value) if value is not None else float("nan") for value in columns[metric]]
+
+    # Drop metrics no match has, like the per-team DataFrames would
+    return pd.DataFrame({
+        name: values for name, values in columns.items()
+        if name == "team" or any(value is not None for value in values)
+    })
+
+
+@timed
+def aggregate_team_statistics(df, team_column):
+    """
+    Calculates every team's statistics from one DataFrame of all matches with a single
+    groupby aggregation (plus one grouped count for the categorical metrics).
+
+    Averages are computed from each team's exact integer count and sum, so they are correctly
+    rounded. Standard deviations are computed from each team's values like Series.std (see
+    `sample_std_devs`), with ddof=1, so teams with a single match get NaN.
+
+    :param df: DataFrame with one row per match.
+    :param team_column: Name of the column identifying the team.
+    :return: A dictionary of team -> aggregated statistics, with teams in order of first match.
+    """
+    import numpy as np
+
+    quantitative_metrics = [metric for metric in QUANTITATIVE_METRICS if metric in df]
+    categorical_metrics = [metric for metric in CATEGORICAL_METRICS if metric in df]
+    binary_metrics = [metric for metric in BINARY_METRICS if metric in df]
+
+    aggregations = {"number_of_matches": (team_column, "size")}
+    for metric in quantitative_metrics:
+        aggregations[f"{metric}_count"] = (metric, "count")
+        aggregations[f"{metric}_sum"] = (metric, "sum")
+        aggregations[f"{metric}_min"] = (metric, "min")
+        aggregations[f"{metric}_max"] = (metric, "max")
+    for metric in categorical_metrics + binary_metrics:
+        aggregations[f"{metric}_count"] = (metric, "count")
+    for metric in binary_metrics:
+        aggregations[f"{metric}_percent_true"] = (metric, "mean")
+
+    grouped = df.groupby(team_column, sort=False)
+    aggregated = grouped.agg(**aggregations)
 
-        # Initialize statistics dictionary for this team
-        stats = {}
+    for metric in quantitative_metrics:
+        count = aggregated[f"{metric}_count"].to_numpy(dtype=np.int64)
+        total = aggregated[f"{metric}_sum"].to_numpy(dtype=np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            aggregated[f"{metric}_average"] = total / count
 
-        # Number of matches played
-        stats["number_of_matches"] = len(df)
+    # Standard deviations from each team's rows, in match order, one team at a time
+    metric_values = df[quantitative_metrics].to_numpy(dtype=np.float64, na_value=np.nan).T
+    team_rows = grouped.indices
+    std_devs = np.array([
+        sample_std_devs(metric_values[:, team_rows[team]]) for team in aggregated.index
+    ]).reshape(len(aggregated), len(quantitative_metrics))
+    for index, metric in enumerate(quantitative_metrics):
+        aggregated[f"{metric}_std_dev"] = std_devs[:, index]
 
-        # Process quantitative statistics
-        quantitative_metrics = ["totalNotes", "missedNotes", "shootNotes", "autoNotesSum", "teleopNotesSum"]
+    # Categorical value counts, ordered like Series.value_counts (by count, ties by first appearance)
+    value_counts = {metric: {} for metric in categorical_metrics}
+    for metric in categorical_metrics:
+        counts = df.groupby([team_column, metric], sort=False).size().reset_index(name="count")
+        team_positions = counts[team_column].map({team: index for index, team in enumerate(aggregated.index)})
+        order = np.lexsort((np.arange(len(counts)), -counts["count"].to_numpy(), team_positions.to_numpy()))
+        for team, value, count in counts.iloc[order].itertuples(index=False):
+            value_counts[metric].setdefault(team, {})[value] = int(count)
+
+    team_statistics = {}
+    for team, row in zip(aggregated.index, aggregated.to_dict("records")):
+        stats = {"number_of_matches": int(row["number_of_matches"])}
         for metric in quantitative_metrics:
-            if metric in df:
-                stats[f"{metric}_average"] = float(df[metric].mean())
-                stats[f"{metric}_min"] = int(df[metric].min())
-                stats[f"{metric}_max"] = int(df[metric].max())
-                stats[f"{metric}_std_dev"] = float(df[metric].std())
-
-        # Process categorical statistics
-        categorical_metrics = ["climb"]
-        for metric in categorical_metrics:
-            if metric in df:
-                stats[f"{metric}_value_counts"] = df[metric].value_counts().to_dict()
+            stats[f"{metric}_average"] = float(row[f"{metric}_average"])
+            stats[f"{metric}_min"] = int(row[f"{metric}_min"])
+            stats[f"{metric}_max"] = int(row[f"{metric}_max"])
+            stats[f"{metric}_std_dev"] = float(row[f"{metric}_std_dev"])
 
-        # Process binary statistics
-        binary_metrics = ["leftStartingZone"]
+        # A team only gets categorical/binary statistics if one of its matches has the field
+        for metric in categorical_metrics:
+            if row[f"{metric}_count"]:
+                stats[f"{metric}_value_counts"] = value_counts[metric][team]
         for metric in binary_metrics:
-            if metric in df:
-                stats[f"{metric}_percent_true"] = float(df[metric].mean() * 100)
+            if row[f"{metric}_count"]:
+                stats[f"{metric}_percent_true"] = float(row[f"{metric}_percent_true"] * 100)
 
-        # Add processed statistics for the team
         team_statistics[team] = stats
 
+    instrumentation.count("teams_aggregated", len(team_statistics))
     return team_statistics
 
 
-# Main Script Execution
-try:
-    print(f"[INFO] Loading team performance data from: {team_matches_path}")
-    with open(team_matches_path, 'r') as infile:
+def resampled_score_inputs(means, metrics):
+    """
+    Builds the team metrics the performance score can use from resampled averages, calculated
+    like Script 06 calculates them from the averages.
+
+    :param means: Array of resampled averages (... x metrics).
+    :param metrics: Metric names of the last axis.
+    :return: A dictionary of Script 06 metric name -> array.
+    """
+    inputs = {f"{metric}_average": means[..., position] for position, metric in enumerate(metrics)}
+    if "totalNotes_average" in inputs and "shootNotes_average" in inputs:
+        inputs["shooting_efficiency"] = inputs["shootNotes_average"] / inputs["totalNotes_average"]
+    if "totalNotes_average" in inputs and "missedNotes_average" in inputs:
+        inputs["missed_notes_percent"] = inputs["missedNotes_average"] / inputs["totalNotes_average"] * 100
+    return inputs
+
+
+@timed
+def add_confidence_intervals(team_statistics, df, team_column, resamples=BOOTSTRAP_RESAMPLES, workers=1,
+                             score_weights=None):
+    """
+    Adds bootstrap confidence intervals of the bootstrap metrics' averages and of the performance
+    score to every team's statistics (`<metric>_ci_lower` and `<metric>_ci_upper`).
+
+    Each resample draws a team's matches with replacement from its own matches; the resample
+    indices for all teams are generated at once. The intervals are percentile intervals at
+    BOOTSTRAP_CONFIDENCE and reproducible for a given BOOTSTRAP_SEED.
+
+    :param team_statistics: Dictionary of team -> aggregated statistics (updated in place).
+    :param df: DataFrame with one row per match.
+    :param team_column: Name of the column identifying the team.
+    :param resamples: Number of bootstrap resamples.
+    :param workers: Number of processes drawing resamples.
+    :param score_weights: Performance score weights (default: the scoring config's weights).
+    """
+    import numpy as np
+    import pandas as pd
+    from utility_functions.bootstrap import bootstrap_group_means, percentile_interval
+
+    if df.empty or team_column not in df:
+        return  # No match rows, so no team to add intervals to
+
+    if score_weights is None:
+        score_weights = load_scoring_config(scoring_config_path)["weights"]
+    # Only resample the reported metrics and the averages the performance score uses
+    metrics = [
+        metric for metric in QUANTITATIVE_METRICS
+        if metric in df and (metric in BOOTSTRAP_METRICS or f"{metric}_average" in score_weights)
+    ]
+
+    # Order the rows team by team, with teams in order of first match like the statistics
+    codes, teams = pd.factorize(df[team_column], sort=False)
+    order = np.argsort(codes, kind="stable")
+    values = df[metrics].to_numpy(dtype=float)[order]
+    means = bootstrap_group_means(values, np.bincount(codes), resamples, BOOTSTRAP_SEED, workers)
+
+    intervals = {}
+    for metric in BOOTSTRAP_METRICS:
+        if metric in metrics:
+            intervals[metric] = percentile_interval(means[:, :, metrics.index(metric)], BOOTSTRAP_CONFIDENCE)
+
+    score_inputs = resampled_score_inputs(means, metrics)
+    if all(metric in score_inputs for metric in score_weights):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            intervals["performance_score"] = percentile_interval(
+                score_teams(score_inputs, score_weights), BOOTSTRAP_CONFIDENCE
+            )
+    else:
+        logger.warning("The performance score weights use metrics without match data; "
+                       "skipping its confidence interval.")
+
+    for position, team in enumerate(teams):
+        stats = team_statistics[team]
+        for metric, (lower, upper) in intervals.items():
+            stats[f"{metric}_ci_lower"] = float(lower[position])
+            stats[f"{metric}_ci_upper"] = float(upper[position])
+
+
+def calculate_team_statistics(team_data, resamples=0, bootstrap_workers=1):
+    """
+    Calculates advanced statistics for each team.
+
+    :param team_data: Dictionary containing match data for each team.
+    :param resamples: Number of bootstrap resamples for the confidence intervals (0: none).
+    :param bootstrap_workers: Number of processes drawing resamples.
+    :return: A dictionary with aggregated team statistics.
+    """
+    df = build_match_frame(team_data)
+    team_statistics = aggregate_team_statistics(df, "team")
+    if resamples > 0:
+        add_confidence_intervals(team_statistics, df, "team", resamples, bootstrap_workers)
+    return team_statistics
+
+
+def calculate_team_statistics_from_table(table, resamples=0, bootstrap_workers=1):
+    """
+    Calculates advanced statistics for each team from the columnar team-based table.
+
+    :param table: Columnar table with one row per match, ordered team by team.
+    :param resamples: Number of bootstrap resamples for the confidence intervals (0: none).
+    :param bootstrap_workers: Number of processes drawing resamples.
+    :return: A dictionary with aggregated team statistics, keyed like the JSON team-based data.
+    """
+    columns = QUANTITATIVE_METRICS + CATEGORICAL_METRICS + BINARY_METRICS
+    df = table_to_dataframe(table)
+    df = df[["robotTeam"] + [column for column in columns if column in df]]
+
+    # Binary metrics become 1.0/0.0 (NaN when missing) so they can be averaged per group
+    for metric in BINARY_METRICS:
+        if metric in df:
+            df[metric] = df[metric].astype(float)
+
+    # Team keys are strings in the JSON team-based data
+    df["robotTeam"] = df["robotTeam"].astype(int).astype(str)
+    team_statistics = aggregate_team_statistics(df, "robotTeam")
+    if resamples > 0:
+        add_confidence_intervals(team_statistics, df, "robotTeam", resamples, bootstrap_workers)
+    return team_statistics
+
+
+def load_team_data(team_file_path, intermediate_format="json"):
+    """
+    Loads the team-based data saved by Script 04.
+
+    :param team_file_path: Path to the team-based JSON file.
+    :param intermediate_format: "json" or "columnar" (the table is read next to the JSON path).
+    :return: A tuple of (team-based JSON data, team-based table); the one not used by the
+             selected format is None.
+    """
+    if intermediate_format == "columnar":
+        logger.info(f"Loading team performance data from: {columnar_path(team_file_path)}")
+        return None, read_table(columnar_path(team_file_path))
+
+    logger.info(f"Loading team performance data from: {team_file_path}")
+    with open(team_file_path, 'r') as infile:
         team_data = json.load(infile)
 
     if not isinstance(team_data, dict):
         raise ValueError("Team performance data must be a dictionary.")
+    return team_data, None
 
-    print("[INFO] Calculating team statistics.")
-    team_statistics = calculate_team_statistics(team_data)
 
+@timed
+def save_team_statistics(team_statistics, statistics_file_path):
+    """
+    Saves the team statistics as JSON.
+
+    :param team_statistics: Dictionary of team -> aggregated statistics.
+    :param statistics_file_path: Path to save the statistics.
+    :return: The serializable statistics that were saved.
+    """
     # Convert data to serializable format
     team_statistics_serializable = convert_to_serializable(team_statistics)
 
-    print(f"[INFO] Saving team statistics to: {team_statistics_path}")
-    os.makedirs(os.path.dirname(team_statistics_path), exist_ok=True)
-    with open(team_statistics_path, 'w') as outfile:
+    logger.info(f"Saving team statistics to: {statistics_file_path}")
+    os.makedirs(os.path.dirname(statistics_file_path), exist_ok=True)
+    with open(statistics_file_path, 'w') as outfile:
         json.dump(team_statistics_serializable, outfile, indent=4)
+    return team_statistics_serializable
+
+
+# Main Script Execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Script 05: Data Analysis & Team Statistics Aggregation")
+    parser.add_argument(
+        "--format", choices=["json", "columnar"], default="json", dest="intermediate_format",
+        help="Intermediate format of the team-based data read."
+    )
+    parser.add_argument(
+        "--bootstrap-resamples", type=int, default=BOOTSTRAP_RESAMPLES,
+        help="Bootstrap resamples for the confidence intervals (0 skips them)."
+    )
+    parser.add_argument(
+        "--bootstrap-workers", type=int, default=1, help="Number of processes drawing bootstrap resamples."
+    )
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Script 05: Data Analysis & Team Statistics Aggregation\n")
+
+    try:
+        team_data, team_table = load_team_data(team_matches_path, args.intermediate_format)
+
+        logger.info("Calculating team statistics.")
+        if team_table is not None:
+            team_statistics = calculate_team_statistics_from_table(
+                team_table, args.bootstrap_resamples, args.bootstrap_workers
+            )
+        else:
+            team_statistics = calculate_team_statistics(team_data, args.bootstrap_resamples, args.bootstrap_workers)
+
+        save_team_statistics(team_statistics, team_statistics_path)
 
-    print("[INFO] Team performance statistics aggregation completed successfully.")
+        logger.info("Team performance statistics aggregation completed successfully.")
 
-except Exception as e:
-    print(f"[ERROR] An unexpected error occurred: {e}")
-    print(traceback.format_exc())
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {e}")
+        print(traceback.format_exc())
 
-print(seperation_bar)
+    print(seperation_bar)
@@ -1,35 +1,97 @@
 from utility_functions.print_formats import seperation_bar
-import pandas as pd
+from utility_functions.instrumentation import logger, timed
+from utility_functions import instrumentation
+from utility_functions.chart_rendering import CHART_MODES, build_chart_spec, render_charts
+from utility_functions.ranking_engine import MetricRankings
+from utility_functions.scoring_model import DEFAULT_SCORE_WEIGHTS, load_scoring_config, rank_stability, score_teams
 import os
+import json
+import argparse
 import traceback
-import matplotlib.pyplot as plt
-from scipy.stats import zscore
-
-print(seperation_bar)
-print("Script 06: Team Comparison Analysis\n")
 
 # File paths
 team_statistics_path = "outputs/team_data/team_statistical_analysis.json"
 output_analysis_path = "outputs/team_data/team_advanced_comparative_statistical_analysis.json"
 output_statistics_path = "outputs/statistics/team_comparison_stats.txt"
 visualizations_dir = "outputs/visualizations"
+scoring_config_path = "config/scoring_weights.json"
+output_stability_path = "outputs/statistics/team_rank_stability.txt"
+
+# Metrics teams are ranked by (lower is better for the ascending ones)
+RANKABLE_METRICS = [
+    "totalNotes_average", "shooting_efficiency", "missed_notes_percent",
+    "performance_score", "consistency_metric", "performance_zscore"
+]
+ASCENDING_METRICS = ["missed_notes_percent", "consistency_metric"]
+
+
+def zscore(values):
+    """
+    Standard scores using the population standard deviation (ddof=0), like `scipy.stats.zscore`
+    with its defaults (any NaN makes every score NaN).
+
+    :param values: Array-like of numbers.
+    :return: NumPy array of standard scores.
+    """
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (values - values.mean()) / values.std()
+
 
-try:
+def load_team_statistics(statistics_file_path):
+    """
+    Loads the team statistics saved by Script 05.
+
+    :param statistics_file_path: Path to the team statistics JSON file.
+    :return: A DataFrame with one row per team.
+    """
     # Check if team statistics data file exists
-    if not os.path.exists(team_statistics_path):
-        raise FileNotFoundError(f"Team statistics data file not found: {team_statistics_path}")
+    if not os.path.exists(statistics_file_path):
+        raise FileNotFoundError(f"Team statistics data file not found: {statistics_file_path}")
+
+    import pandas as pd
 
     # Load the team statistics data
-    print(f"[INFO] Loading team statistics from: {team_statistics_path}")
-    with open(team_statistics_path, "r") as infile:
+    logger.info(f"Loading team statistics from: {statistics_file_path}")
+    with open(statistics_file_path, "r") as infile:
         team_statistics = pd.read_json(infile, orient="index")
 
     # Ensure the DataFrame is not empty
     if team_statistics.empty:
-        raise ValueError(f"Team statistics data is empty. Check the file: {team_statistics_path}")
+        raise ValueError(f"Team statistics data is empty. Check the file: {statistics_file_path}")
+    return team_statistics
 
-    # Add calculated metrics
-    print("[INFO] Calculating additional metrics.")
+
+def team_statistics_to_frame(team_statistics):
+    """
+    Builds the team statistics DataFrame from the statistics calculated by Script 05 in the same
+    process, without serializing them. The frame has the index and column types of the frame
+    `load_team_statistics` parses from the saved file (team numbers as int64). Its floats are
+    the exact values, where pandas' JSON parser can be off in the last digit.
+
+    :param team_statistics: Serializable dictionary of team -> aggregated statistics.
+    :return: A DataFrame with one row per team.
+    """
+    import pandas as pd
+
+    team_statistics = pd.DataFrame.from_dict(team_statistics, orient="index")
+    if team_statistics.empty:
+        raise ValueError("Team statistics data is empty.")
+    team_statistics.index = team_statistics.index.astype("int64")
+    return team_statistics
+
+
+@timed
+def add_calculated_metrics(team_statistics, score_weights=DEFAULT_SCORE_WEIGHTS):
+    """
+    Adds efficiency, consistency and performance metrics to the team statistics.
+
+    :param team_statistics: DataFrame with one row per team (updated in place).
+    :param score_weights: Dictionary of metric -> weight of the performance score.
+    """
+    logger.info("Calculating additional metrics.")
     team_statistics["shooting_efficiency"] = (
         team_statistics["shootNotes_average"] / team_statistics["totalNotes_average"]
     )
@@ -39,67 +101,162 @@ try:
     team_statistics["consistency_metric"] = (
         team_statistics["totalNotes_std_dev"] / team_statistics["totalNotes_average"]
     ).fillna(0)  # Handle potential division by zero
-    team_statistics["performance_score"] = (
-        0.5 * team_statistics["totalNotes_average"] +
-        0.3 * team_statistics["shootNotes_average"] -
-        0.2 * team_statistics["missed_notes_percent"]
-    )
+    team_statistics["performance_score"] = score_teams(team_statistics, score_weights)
     team_statistics["performance_zscore"] = zscore(team_statistics["performance_score"])
 
-    # Save advanced analysis as JSON
-    print(f"[INFO] Saving advanced analysis to: {output_analysis_path}")
-    os.makedirs(os.path.dirname(output_analysis_path), exist_ok=True)
-    team_statistics.to_json(output_analysis_path, orient="index", indent=4)
 
-    # Rank teams for each metric
-    print("[INFO] Ranking teams for metrics.")
-    rankable_metrics = [
-        "totalNotes_average", "shooting_efficiency", "missed_notes_percent",
-        "performance_score", "consistency_metric", "performance_zscore"
-    ]
-    rankings = {}
-    for metric in rankable_metrics:
-        ascending = metric in ["missed_notes_percent", "consistency_metric"]
-        team_statistics[f"{metric}_rank"] = team_statistics[metric].rank(ascending=ascending)
-        rankings[metric] = team_statistics.sort_values(by=metric, ascending=ascending)
-
-    # Save rankings to the text file
-    print(f"[INFO] Saving rankings to: {output_statistics_path}")
-    os.makedirs(os.path.dirname(output_statistics_path), exist_ok=True)
-    with open(output_statistics_path, 'w') as stats_file:
+@timed
+def rank_teams(team_statistics):
+    """
+    Ranks teams for every rankable metric in one pass over a matrix of the metric columns.
+
+    :param team_statistics: DataFrame with one row per team (rank columns are added in place).
+    :return: A MetricRankings with the ranks, orders and top-K queries by row position.
+    """
+    logger.info("Ranking teams for metrics.")
+    rankings = MetricRankings.from_frame(team_statistics, RANKABLE_METRICS, ASCENDING_METRICS)
+    instrumentation.count("teams_ranked", len(team_statistics))
+    for metric in RANKABLE_METRICS:
+        team_statistics[f"{metric}_rank"] = rankings.rank(metric)
+    return rankings
+
+
+@timed
+def save_rankings(team_statistics, rankings, statistics_file_path):
+    """
+    Saves the rankings to a text file.
+
+    :param team_statistics: DataFrame with one row per team and its rank columns.
+    :param rankings: MetricRankings of the teams.
+    :param statistics_file_path: Path to save the rankings.
+    """
+    logger.info(f"Saving rankings to: {statistics_file_path}")
+    os.makedirs(os.path.dirname(statistics_file_path), exist_ok=True)
+    with open(statistics_file_path, 'w') as stats_file:
         stats_file.write("Team Rankings by Various Metrics\n")
         stats_file.write("=" * 80 + "\n\n")
 
-        for metric, ranked_df in rankings.items():
+        for metric in rankings.metrics:
+            ranked_df = team_statistics[[metric, f"{metric}_rank"]].iloc[rankings.order(metric)]
             stats_file.write(f"Rankings by {metric}:\n")
-            stats_file.write(
-                ranked_df[[metric, f"{metric}_rank"]].to_string(index=True) + "\n\n"
-            )
-
-    # Generate visualizations
-    print(f"[INFO] Generating visualizations in: {visualizations_dir}")
-    os.makedirs(visualizations_dir, exist_ok=True)
-    for metric, ranked_df in rankings.items():
-        top_n = 10  # Top 10 teams for visualization
-        ranked_df.head(top_n).plot(
-            y=metric, kind="bar", title=f"Top {top_n} Teams by {metric.replace('_', ' ').title()}", legend=False
+            stats_file.write(ranked_df.to_string(index=True) + "\n\n")
+
+
+@timed
+def generate_visualizations(team_statistics, rankings, output_dir, chart_mode="png", workers=1, force=False):
+    """
+    Saves a bar chart of the top 10 teams for each ranked metric. PNGs whose top 10 data is
+    unchanged since the last render are kept.
+
+    :param team_statistics: DataFrame with one row per team.
+    :param rankings: MetricRankings of the teams.
+    :param output_dir: Directory to save the charts in.
+    :param chart_mode: "png", "spec" (JSON specs and SVG charts, without matplotlib) or "none".
+    :param workers: Number of processes rendering PNGs.
+    :param force: Whether to re-render every PNG.
+    """
+    if chart_mode == "none":
+        return
+
+    logger.info(f"Generating visualizations in: {output_dir}")
+    top_n = 10  # Top 10 teams for visualization
+    # The full orders were computed for the rankings file, so the charts take their first rows
+    # and always agree with it, including on ties
+    specs = [
+        build_chart_spec(metric, team_statistics[metric].iloc[rankings.order(metric)[:top_n]], top_n)
+        for metric in rankings.metrics
+    ]
+    written, unchanged = render_charts(specs, output_dir, chart_mode, workers, force)
+    instrumentation.count("charts_rendered", written)
+    if unchanged:
+        logger.info(f"Rendered {written} charts; {unchanged} unchanged charts kept.")
+
+
+@timed
+def save_rank_stability(team_statistics, scoring_config, stability_file_path):
+    """
+    Ranks the teams under the weight sweep and saves how stable each team's rank is.
+
+    :param team_statistics: DataFrame with one row per team.
+    :param scoring_config: Scoring config with the weights and weight sweep settings.
+    :param stability_file_path: Path to save the rank stability table.
+    """
+    weight_sweep = scoring_config["weight_sweep"]
+    logger.info(f"Ranking teams under {weight_sweep['samples']} performance score weight vectors.")
+    stability = rank_stability(team_statistics, scoring_config["weights"], **weight_sweep)
+
+    logger.info(f"Saving rank stability to: {stability_file_path}")
+    os.makedirs(os.path.dirname(stability_file_path), exist_ok=True)
+    with open(stability_file_path, "w") as stability_file:
+        stability_file.write("Team Rank Stability Across Performance Score Weights\n")
+        stability_file.write("=" * 80 + "\n\n")
+        stability_file.write(
+            f"Weights: {json.dumps(scoring_config['weights'])}\n"
+            f"Weight vectors: {weight_sweep['samples']} (each weight scaled by up to "
+            f"+/-{weight_sweep['spread']:.0%}, seed {weight_sweep['seed']})\n\n"
         )
-        plt.ylabel(metric.replace("_", " ").title())
-        plt.xticks(ticks=range(top_n), labels=ranked_df.head(top_n).index, rotation=45, ha="right")
-        plt.tight_layout()
-        plt.savefig(os.path.join(visualizations_dir, f"top_{top_n}_{metric}.png"))
-        plt.close()
-
-    print("\nScript 06: Completed.")
-
-except FileNotFoundError as fnf_error:
-    print(f"[ERROR] File not found: {fnf_error}")
-except ValueError as value_error:
-    print(f"[ERROR] Data validation error: {value_error}")
-except PermissionError as perm_error:
-    print(f"[ERROR] Permission denied while accessing a file: {perm_error}")
-except Exception as e:
-    print(f"[ERROR] An unexpected error occurred: {e}")
-    print(traceback.format_exc())
-
-print(seperation_bar)
\ No newline at end of file
+        stability_file.write(stability.to_string(index=True) + "\n")
+
+
+def run_comparison_analysis(team_statistics, chart_mode="png", chart_workers=1, force_charts=False):
+    """
+    Calculates the comparison metrics, then saves the advanced analysis, rankings and charts.
+
+    :param team_statistics: DataFrame with one row per team.
+    :param chart_mode: "png", "spec" (JSON specs and SVG charts, without matplotlib) or "none".
+    :param chart_workers: Number of processes rendering PNGs.
+    :param force_charts: Whether to re-render every PNG.
+    :return: The DataFrame with the calculated metrics and ranks.
+    """
+    scoring_config = load_scoring_config(scoring_config_path)
+
+    # Add calculated metrics
+    add_calculated_metrics(team_statistics, scoring_config["weights"])
+
+    # Save advanced analysis as JSON
+    logger.info(f"Saving advanced analysis to: {output_analysis_path}")
+    os.makedirs(os.path.dirname(output_analysis_path), exist_ok=True)
+    team_statistics.to_json(output_analysis_path, orient="index", indent=4)
+
+    # Rank teams, then save rankings and visualizations
+    rankings = rank_teams(team_statistics)
+    save_rankings(team_statistics, rankings, output_statistics_path)
+    generate_visualizations(team_statistics, rankings, visualizations_dir, chart_mode, chart_workers, force_charts)
+
+    # Check how stable the performance score ranking is under other weights
+    if scoring_config["weight_sweep"]["samples"] > 0:
+        save_rank_stability(team_statistics, scoring_config, output_stability_path)
+    return team_statistics
+
+
+# Main Script Execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Script 06: Team Comparison Analysis")
+    parser.add_argument(
+        "--charts", choices=CHART_MODES, default="png",
+        help="png: render PNG charts; spec: write JSON chart specs and SVG charts without matplotlib; none: no charts."
+    )
+    parser.add_argument("--chart-workers", type=int, default=1, help="Number of processes rendering PNG charts.")
+    parser.add_argument("--force-charts", action="store_true", help="Re-render every PNG, even if its data is unchanged.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Script 06: Team Comparison Analysis\n")
+
+    try:
+        run_comparison_analysis(
+            load_team_statistics(team_statistics_path), args.charts, args.chart_workers, args.force_charts
+        )
+        print("\nScript 06: Completed.")
+
+    except FileNotFoundError as fnf_error:
+        logger.error(f"File not found: {fnf_error}")
+    except ValueError as value_error:
+        logger.error(f"Data validation error: {value_error}")
+    except PermissionError as perm_error:
+        logger.error(f"Permission denied while accessing a file: {perm_error}")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {e}")
+        print(traceback.format_exc())
+
+    print(seperation_bar)
@@ -0,0 +1,170 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.instrumentation import logger, timed
+from utility_functions import instrumentation
+from utility_functions.columnar_store import columnar_path, read_table, records_to_table
+from utility_functions.alliance_simulator import (
+    SIMULATION_COLUMNS, enumerate_alliances, match_points, sample_team_points, simulate_alliances
+)
+import os
+import json
+import argparse
+import traceback
+
+# File paths
+cleaned_data_path = "data/processed/cleaned_port_h_matchapps.json"
+pick_list_path = "config/pick_list.json"
+alliance_predictions_path = "outputs/team_data/alliance_predictions.json"
+
+# Simulation settings
+SIMULATIONS = 2000
+SIMULATION_SEED = 1601
+TOP_ALLIANCES = 50
+
+
+def load_match_table(cleaned_file_path, intermediate_format="json"):
+    """
+    Loads the cleaned match data saved by Script 03 as a table of the columns the simulator uses.
+
+    :param cleaned_file_path: Path to the cleaned JSON file.
+    :param intermediate_format: "json" or "columnar" (the table is read next to the JSON path).
+    :return: A columnar match table.
+    """
+    if intermediate_format == "columnar":
+        logger.info(f"Loading cleaned data from: {columnar_path(cleaned_file_path)}")
+        return read_table(columnar_path(cleaned_file_path))
+
+    logger.info(f"Loading cleaned data from: {cleaned_file_path}")
+    with open(cleaned_file_path, "r") as infile:
+        cleaned_data = json.load(infile)
+
+    if not isinstance(cleaned_data, list):
+        raise ValueError("Cleaned data must be a list of matches.")
+    return records_to_table(cleaned_data, SIMULATION_COLUMNS)
+
+
+def load_pick_list(pick_list_file_path, scouted_teams):
+    """
+    Loads the teams to build alliances from: the "teams" list of the pick list config, or every
+    scouted team (in order of first match) if there is no pick list.
+
+    :param pick_list_file_path: Path of the JSON pick list.
+    :param scouted_teams: Team numbers with scouted matches, in order of first match.
+    :return: List of team numbers.
+    """
+    if not os.path.exists(pick_list_file_path):
+        logger.info("No pick list found; simulating alliances of every scouted team.")
+        return list(scouted_teams)
+
+    logger.info(f"Loading pick list from: {pick_list_file_path}")
+    with open(pick_list_file_path, "r") as infile:
+        pick_list = json.load(infile).get("teams", [])
+
+    scouted = set(scouted_teams)
+    teams = []
+    for team in dict.fromkeys(int(team) for team in pick_list):
+        if team in scouted:
+            teams.append(team)
+        else:
+            logger.warning(f"Team {team} on the pick list has no scouted matches; leaving it out.")
+    return teams
+
+
+@timed
+def simulate_pick_list(table, teams=None, simulations=SIMULATIONS, seed=SIMULATION_SEED, workers=1,
+                       top_alliances=TOP_ALLIANCES):
+    """
+    Simulates every three-team alliance of the pick list and summarizes the predicted scores.
+
+    :param table: Columnar match table with the SIMULATION_COLUMNS.
+    :param teams: Pick list team numbers (default: load the pick list config).
+    :param simulations: Number of simulated matches per alliance.
+    :param seed: Random seed.
+    :param workers: Number of processes simulating alliances.
+    :param top_alliances: Number of alliances saved, highest mean score first.
+    :return: A serializable dictionary of the team point breakdowns and the top alliances.
+    """
+    import numpy as np
+
+    match_teams = np.asarray(table["columns"]["robotTeam"])
+    scouted_teams = [int(team) for team in dict.fromkeys(match_teams.tolist()) if team >= 0]
+    if teams is None:
+        teams = load_pick_list(pick_list_path, scouted_teams)
+    if len(teams) < 3:
+        raise ValueError(f"At least 3 scouted teams are needed to build an alliance, got {len(teams)}.")
+
+    points = match_points(table)
+    team_points = {}
+    for team in teams:
+        rows = match_teams == team
+        team_points[str(team)] = {"matches": int(rows.sum())}
+        for part in ("auto", "teleop", "endgame", "total"):
+            team_points[str(team)][f"{part}_points_average"] = float(points[part][rows].mean())
+
+    alliances = enumerate_alliances(len(teams))
+    logger.info(f"Simulating {len(alliances)} alliances of {len(teams)} teams, {simulations} matches each.")
+    team_samples = sample_team_points(teams, match_teams, points["total"], simulations, seed)
+    summary = simulate_alliances(team_samples, alliances, workers)
+    instrumentation.count("alliances_simulated", len(alliances))
+
+    # Highest mean score first; ties keep the enumeration order
+    best = np.argsort(-summary["mean"], kind="stable")[:top_alliances]
+    return {
+        "simulations": simulations,
+        "seed": seed,
+        "alliances_simulated": int(len(alliances)),
+        "teams": team_points,
+        "top_alliances": [
+            {
+                "teams": [teams[position] for position in alliances[index].tolist()],
+                **{name: float(values[index]) for name, values in summary.items()},
+            }
+            for index in best.tolist()
+        ],
+    }
+
+
+def save_alliance_predictions(predictions, predictions_file_path):
+    """
+    Saves the alliance predictions as JSON.
+
+    :param predictions: Dictionary returned by `simulate_pick_list`.
+    :param predictions_file_path: Path to save the predictions.
+    """
+    logger.info(f"Saving alliance predictions to: {predictions_file_path}")
+    os.makedirs(os.path.dirname(predictions_file_path), exist_ok=True)
+    with open(predictions_file_path, "w") as outfile:
+        json.dump(predictions, outfile, indent=4)
+
+
+# Main Script Execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Script 07: Alliance Simulation")
+    parser.add_argument(
+        "--format", choices=["json", "columnar"], default="json", dest="intermediate_format",
+        help="Intermediate format of the cleaned data read."
+    )
+    parser.add_argument("--simulations", type=int, default=SIMULATIONS, help="Simulated matches per alliance.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes simulating alliances.")
+    parser.add_argument("--top", type=int, default=TOP_ALLIANCES, help="Number of best alliances saved.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Script 07: Alliance Simulation\n")
+
+    try:
+        table = load_match_table(cleaned_data_path, args.intermediate_format)
+        predictions = simulate_pick_list(
+            table, simulations=args.simulations, workers=args.workers, top_alliances=args.top
+        )
+        save_alliance_predictions(predictions, alliance_predictions_path)
+        print("\nScript 07: Completed.")
+
+    except FileNotFoundError as fnf_error:
+        logger.error(f"File not found: {fnf_error}")
+    except ValueError as value_error:
+        logger.error(f"Data validation error: {value_error}")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {e}")
+        print(traceback.format_exc())
+
+    print(seperation_bar)
@@ -0,0 +1,73 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.instrumentation import logger
+from utility_functions.synthetic_data import EVENTS_PER_TEAM, write_synthetic_events, generate_event_entries, write_raw_ndjson
+import os
+import argparse
+import traceback
+
+# Synthetic Data Generator: writes raw scouting exports (one entry per line, as Script 01 expects)
+# with the structure of Script 03's EXPECTED_STRUCTURE, for testing and benchmarking the pipeline
+# on events of any size. Entries can carry data-entry errors (caught by Script 03) and lines can
+# be truncated (skipped by Script 01).
+#
+# By default one file per event is written to data/raw/events, the season runner's partitions.
+# The events draw their teams from one season pool (--season-teams, numbered with --team-seed),
+# so teams play at several events.
+# With --file, a single event is written to that path instead, e.g. the raw file of Scripts 01-06.
+# Like real exports, the files must be reformatted by Script 01 (--directory data/raw/events for
+# the partitions) before they are cleaned.
+#
+# Usage:
+#   python scripts/generate_synthetic_data.py --events 6 --teams 45 --matches-per-team 20
+#   python scripts/generate_synthetic_data.py --events 6 --teams 45 --season-teams 90 --team-seed 7
+#   python scripts/generate_synthetic_data.py --file data/raw/raw_port_h_matchapps.json --malformed-rate 0.01
+
+events_raw_directory = "data/raw/events"
+
+
+# Main Script Execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generates synthetic raw scouting data.")
+    parser.add_argument("--directory", default=events_raw_directory, help="Directory of the event files.")
+    parser.add_argument("--file", help="Write a single event to this file instead.")
+    parser.add_argument("--events", type=int, default=1, help="Number of events.")
+    parser.add_argument("--teams", type=int, default=45, help="Teams attending each event.")
+    parser.add_argument("--matches-per-team", type=int, default=20, help="Average matches scouted per team.")
+    parser.add_argument("--scouters", type=int, default=12, help="Scouters at each event.")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of entries with a data-entry error.")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of truncated lines.")
+    parser.add_argument("--seed", type=int, default=4201, help="Random seed.")
+    parser.add_argument(
+        "--season-teams", type=int,
+        help=f"Teams in the season the events draw from (default: each team attends {EVENTS_PER_TEAM} events on average)."
+    )
+    parser.add_argument("--team-seed", type=int, help="Random seed of the season's team numbers (default: --seed).")
+    args = parser.parse_args()
+    if args.file and args.events != 1:
+        parser.error("--file writes a single event; remove --events.")
+
+    print(seperation_bar)
+    print("Synthetic Data Generator\n")
+
+    try:
+        if args.file:
+            os.makedirs(os.path.dirname(args.file) or ".", exist_ok=True)
+            entries = generate_event_entries(
+                args.teams, args.matches_per_team, args.scouters, args.error_rate, args.seed
+            )
+            written = [(args.file, len(entries), write_raw_ndjson(args.file, entries, args.malformed_rate, args.seed))]
+        else:
+            written = write_synthetic_events(
+                args.directory, args.events, args.teams, args.matches_per_team, args.scouters,
+                args.error_rate, args.malformed_rate, args.seed, args.season_teams, args.team_seed
+            )
+
+        for file_path, entry_count, malformed_lines in written:
+            logger.info(f"Wrote {entry_count} entries ({malformed_lines} truncated lines) to: {file_path}")
+        print("\nSynthetic Data Generator: Completed.")
+
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {e}")
+        print(traceback.format_exc())
+
+    print(seperation_bar)
@@ -0,0 +1,485 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.instrumentation import logger
+from utility_functions.script_loader import load_script
+from utility_functions.team_accumulators import TeamStatisticsTracker
+from utility_functions.latency_histogram import LatencyHistogram
+from utility_functions.scoring_model import load_scoring_config
+from utility_functions import http_service
+import os
+import json
+import time
+import asyncio
+import argparse
+import datetime
+import traceback
+import threading
+
+# Live Ingest Service: an asyncio daemon that takes match entries as they are scouted and keeps
+# the team statistics and rankings up to date, instead of running Scripts 01-06 by hand.
+#
+# Entries arrive from two sources:
+#   - Files in the watched directory (data/raw/incoming). New complete NDJSON lines are read as
+#     they are appended, like Script 01's `reformat_json` (malformed lines are skipped).
+#   - HTTP: tablets POST NDJSON lines or a JSON array to /matches. GET /rankings returns the
+#     latest rankings and GET /status the counters and latency histogram.
+#
+# Each entry flows through bounded queues: sources -> validation (Script 03 rules, duplicates
+# dropped by record key) -> batching (a short time window) -> the team accumulators, Script 06's
+# metrics and rankings, and the published files. When a queue is full, the sources wait: the
+# watcher stops reading and POST requests are answered only once their entries are queued.
+#
+# Accepted raw entries are appended to an NDJSON archive (data/raw/live), which Scripts 03-06
+# can process as a batch, and which restores the service's state when it restarts.
+#
+# The latency of every record, from its submission to the publication of the rankings that
+# include it, is kept in a histogram.
+#
+# Usage:
+#   python scripts/run_ingest.py --port 8765
+#   python scripts/run_ingest.py --watch data/raw/incoming --no-http
+
+# File paths
+watch_directory = "data/raw/incoming"
+archive_path = "data/raw/live/live_matchapps.ndjson"
+live_statistics_path = "outputs/team_data/live_team_statistics.json"
+live_rankings_path = "outputs/statistics/live_rankings.json"
+
+WATCHED_EXTENSIONS = (".json", ".ndjson")
+
+
+def parse_submission(text, source):
+    """
+    Parses submitted match entries: a JSON array, or one JSON object per line (NDJSON, the
+    tablets' export format) like Script 01's `reformat_json`.
+
+    :param text: Submitted text.
+    :param source: Name of the file or endpoint, for warnings.
+    :return: A tuple of (list of entry dictionaries, number of malformed lines).
+    """
+    if text.lstrip().startswith("["):
+        try:
+            entries = json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed JSON array from {source}: {e}")
+            return [], 1
+        valid = [entry for entry in entries if isinstance(entry, dict)]
+        return valid, len(entries) - len(valid)
+
+    entries, malformed = [], 0
+    for i, line in enumerate(text.splitlines()):
+        stripped_line = line.strip()
+        if not stripped_line:
+            continue
+        try:
+            entry = json.loads(stripped_line)
+        except json.JSONDecodeError as e:
+            malformed += 1
+            logger.warning(f"Skipping malformed line {i+1} from {source}: {stripped_line[:80]} - Error: {e}")
+            continue
+        if isinstance(entry, dict):
+            entries.append(entry)
+        else:
+            malformed += 1
+            logger.warning(f"Skipping line {i+1} from {source}: not a JSON object.")
+    return entries, malformed
+
+
+def write_json_atomically(data, file_path):
+    """
+    Writes JSON to a temporary file and swaps it in, so readers never see a partial file.
+
+    :param data: Serializable data.
+    :param file_path: Destination path.
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    temp_path = file_path + ".tmp"
+    with open(temp_path, "w") as outfile:
+        json.dump(data, outfile, indent=4)
+    os.replace(temp_path, file_path)
+
+
+class ThreadLogFilter:
+    """
+    Logging filter that drops the records logged by the thread that created it.
+    """
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+
+    def filter(self, record):
+        """
+        :param record: Log record.
+        :return: Whether to keep the record.
+        """
+        return record.thread != self.thread_id
+
+
+def compute_rankings(team_statistics, score_weights):
+    """
+    Calculates Script 06's metrics and ranks for the current team statistics.
+
+    :param team_statistics: Dictionary of team -> statistics (from the team accumulators).
+    :param score_weights: Performance score weights.
+    :return: List of team dictionaries (metrics and ranks), best performance score first.
+    """
+    import pandas as pd
+
+    script_06 = load_script("06_team_comparison_analysis")
+    # Script 06 logs each step. Only this thread's messages are dropped: the event loop keeps
+    # logging while a batch is published
+    thread_filter = ThreadLogFilter()
+    logger.addFilter(thread_filter)
+    try:
+        frame = script_06.team_statistics_to_frame(team_statistics)
+        script_06.add_calculated_metrics(frame, score_weights)
+        rankings = script_06.rank_teams(frame)
+    finally:
+        logger.removeFilter(thread_filter)
+
+    columns = [column for metric in rankings.metrics for column in (metric, f"{metric}_rank")]
+    ranked = frame[columns].iloc[rankings.order("performance_score")]
+    return [
+        {"team": str(team), **{column: None if pd.isna(value) else float(value) for column, value in row.items()}}
+        for team, row in ranked.iterrows()
+    ]
+
+
+class IngestService:
+    """
+    The ingest daemon: sources, bounded queues, validation, batching and publication.
+    """
+
+    def __init__(self, watch_directory=watch_directory, host="127.0.0.1", port=8765, batch_window=0.25,
+                 max_batch=500, queue_size=1000, poll_interval=0.5, archive_path=archive_path,
+                 statistics_path=live_statistics_path, rankings_path=live_rankings_path, quiet=False):
+        """
+        :param watch_directory: Directory watched for NDJSON files, or None to disable the watcher.
+        :param host: HTTP host.
+        :param port: HTTP port (0 picks a free port), or None to disable the HTTP endpoint.
+        :param batch_window: Seconds records are collected for after the first record of a batch.
+        :param max_batch: Maximum number of records of a batch.
+        :param queue_size: Capacity of each queue.
+        :param poll_interval: Seconds between scans of the watched directory.
+        :param archive_path: NDJSON archive of the accepted raw entries.
+        :param statistics_path: Path of the published team statistics.
+        :param rankings_path: Path of the published rankings.
+        :param quiet: Whether to skip the per-batch log lines.
+        """
+        self.watch_directory = watch_directory
+        self.host = host
+        self.port = port
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.archive_path = archive_path
+        self.statistics_path = statistics_path
+        self.rankings_path = rankings_path
+        self.quiet = quiet
+
+        self.script_03 = load_script("03_data_cleaning_and_preprocessing")
+        self.score_weights = load_scoring_config(load_script("06_team_comparison_analysis").scoring_config_path)["weights"]
+        self.tracker = TeamStatisticsTracker()
+        self.record_keys = set()
+        self.file_offsets = {}
+        self.latency = LatencyHistogram()
+        self.counters = {
+            "received": 0, "malformed": 0, "duplicates": 0, "accepted": 0, "published": 0, "batches": 0,
+            "warnings": 0,
+        }
+        self.latest_rankings = None
+        self.server = None
+        self.raw_queue = None
+        self.clean_queue = None
+        self.stopping = None
+        self.workers = []
+        self.watcher = None
+
+    def restore(self):
+        """
+        Rebuilds the team accumulators and the seen record keys from the archive of a previous run.
+        """
+        if not os.path.exists(self.archive_path):
+            return
+        logger.info(f"Restoring accepted entries from: {self.archive_path}")
+        with open(self.archive_path, "rb") as infile:
+            data = infile.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) < len(data):
+            # The service stopped while appending a batch: drop the partial line, so the next
+            # batch is not appended to it
+            logger.warning(f"Skipping the partial last line of the archive ({len(data) - len(complete)} bytes).")
+            with open(self.archive_path, "r+b") as archive:
+                archive.truncate(len(complete))
+        entries, _ = parse_submission(complete.decode("utf-8"), self.archive_path)
+        for entry in entries:
+            self.record_keys.add(self.script_03.get_record_key(entry))
+            self.tracker.add_record(self.script_03.validate_and_clean_entry(entry))
+        self.script_03.reset_tracking_state()
+        self.counters["accepted"] = self.counters["published"] = len(self.record_keys)
+        if os.path.exists(self.rankings_path):
+            with open(self.rankings_path, "r") as infile:
+                self.latest_rankings = json.load(infile)
+        logger.info(f"Restored {len(self.record_keys)} entries of {len(self.tracker.teams)} teams.")
+
+    async def submit(self, entries, received):
+        """
+        Queues parsed entries for validation, waiting while the queue is full.
+
+        :param entries: Raw entry dictionaries.
+        :param received: `time.perf_counter()` time the entries were submitted.
+        """
+        self.counters["received"] += len(entries)
+        for entry in entries:
+            await self.raw_queue.put((entry, received))
+
+    async def watch_files(self):
+        """
+        Reads the complete lines appended to the watched directory's files since the last scan.
+        After `stop`, the directory is scanned one last time.
+        """
+        os.makedirs(self.watch_directory, exist_ok=True)
+        while True:
+            stopping = self.stopping.is_set()
+            for name in sorted(os.listdir(self.watch_directory)):
+                file_path = os.path.join(self.watch_directory, name)
+                if not name.endswith(WATCHED_EXTENSIONS) or not os.path.isfile(file_path):
+                    continue
+                offset = self.file_offsets.get(file_path, 0)
+                if os.path.getsize(file_path) < offset:
+                    offset = 0  # The file was replaced: read it again (duplicates are dropped)
+                with open(file_path, "rb") as infile:
+                    infile.seek(offset)
+                    data = infile.read()
+                complete = data[:data.rfind(b"\n") + 1]  # A line still being written is left for the next scan
+                if not complete:
+                    continue
+                self.file_offsets[file_path] = offset + len(complete)
+                entries, malformed = parse_submission(complete.decode("utf-8"), file_path)
+                self.counters["malformed"] += malformed
+                await self.submit(entries, time.perf_counter())
+            if stopping:
+                return
+            try:
+                await asyncio.wait_for(self.stopping.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def handle_http(self, reader, writer):
+        """
+        Answers one HTTP request: POST /matches, GET /rankings or GET /status.
+        """
+        status, payload = 200, {}
+        try:
+            method, path, _, headers = await http_service.read_request(reader)
+            if method == "POST" and path == "/matches":
+                body = await http_service.read_body(reader, headers)
+                if body is None:
+                    status, payload = 413, {"error": f"Body larger than {http_service.MAX_BODY_BYTES} bytes."}
+                else:
+                    received = time.perf_counter()
+                    entries, malformed = parse_submission(body.decode("utf-8"), "POST /matches")
+                    self.counters["malformed"] += malformed
+                    await self.submit(entries, received)
+                    status, payload = 202, {"queued": len(entries), "malformed": malformed}
+            elif method == "GET" and path == "/rankings":
+                payload = self.latest_rankings or {"rankings": []}
+            elif method == "GET" and path == "/status":
+                payload = self.status()
+            else:
+                status, payload = 404, {"error": f"Unknown endpoint: {method} {path}"}
+        except (ValueError, UnicodeDecodeError, asyncio.IncompleteReadError) as e:
+            status, payload = 400, {"error": f"Malformed request: {e}"}
+        await http_service.send_response(writer, http_service.json_response(status, payload))
+
+    async def validate_entries(self):
+        """
+        Validates queued entries with Script 03's rules and drops entries already accepted.
+        """
+        while True:
+            item = await self.raw_queue.get()
+            if item is None:
+                await self.clean_queue.put(None)
+                return
+            entry, received = item
+            record_key = self.script_03.get_record_key(entry)
+            if record_key in self.record_keys:
+                self.counters["duplicates"] += 1
+                continue
+
+            try:
+                cleaned_entry = self.script_03.validate_and_clean_entry(entry)
+            except Exception as e:
+                # One entry the validator cannot handle must not stop the worker
+                self.counters["malformed"] += 1
+                logger.warning(f"Skipping an entry that failed validation: {json.dumps(entry)[:80]} - Error: {e!r}")
+                continue
+            finally:
+                # Only the number of warnings is kept: Script 03's warnings and counters would
+                # otherwise grow for the whole life of the service
+                self.counters["warnings"] += len(self.script_03.warnings)
+                self.script_03.reset_tracking_state()
+            self.record_keys.add(record_key)
+            self.counters["accepted"] += 1
+            await self.clean_queue.put((entry, cleaned_entry, received))
+
+    async def batch_records(self):
+        """
+        Collects validated records for up to `batch_window` seconds (or `max_batch` records) and
+        publishes each batch.
+        """
+        loop = asyncio.get_running_loop()
+        finished = False
+        while not finished:
+            item = await self.clean_queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                try:
+                    item = await asyncio.wait_for(self.clean_queue.get(), max(0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    finished = True
+                    break
+                batch.append(item)
+            # Archiving, ranking and writing the files block, so they run in a worker thread
+            # while the event loop keeps answering requests and validating entries
+            await loop.run_in_executor(None, self.publish_batch, batch)
+
+    def publish_batch(self, batch):
+        """
+        Archives a batch's raw entries, adds its records to the team accumulators and publishes
+        the team statistics and rankings.
+
+        :param batch: List of (raw entry, cleaned record, submission time) tuples.
+        """
+        os.makedirs(os.path.dirname(self.archive_path), exist_ok=True)
+        with open(self.archive_path, "a") as archive:
+            archive.writelines(json.dumps(entry) + "\n" for entry, _, _ in batch)
+        self.tracker.add_records(cleaned_entry for _, cleaned_entry, _ in batch)
+
+        team_statistics = self.tracker.team_statistics()
+        self.latest_rankings = {
+            "published": datetime.datetime.now().isoformat(timespec="seconds"),
+            "records": len(self.record_keys),
+            "teams": len(team_statistics),
+            "rankings": compute_rankings(team_statistics, self.score_weights),
+        }
+        write_json_atomically(team_statistics, self.statistics_path)
+        write_json_atomically(self.latest_rankings, self.rankings_path)
+
+        published = time.perf_counter()
+        for _, _, received in batch:
+            self.latency.record(published - received)
+        self.counters["published"] += len(batch)
+        self.counters["batches"] += 1
+        if not self.quiet:
+            logger.info(f"Published {len(batch)} records ({self.counters['published']} total, "
+                        f"{len(team_statistics)} teams); p50 latency {self.latency.percentile(50):.1f} ms.")
+
+    def status(self):
+        """
+        Returns the service counters, queue depths and latency summary.
+
+        :return: A serializable dictionary.
+        """
+        return {
+            **self.counters,
+            "raw_queue": self.raw_queue.qsize(),
+            "clean_queue": self.clean_queue.qsize(),
+            "latency": self.latency.summary(),
+        }
+
+    def stop(self):
+        """
+        Asks the service to stop: sources stop, and queued records are still published.
+        """
+        self.stopping.set()
+
+    async def start(self):
+        """
+        Restores the previous state, then starts the workers, the watcher and the HTTP server.
+        """
+        self.raw_queue = asyncio.Queue(self.queue_size)
+        self.clean_queue = asyncio.Queue(self.queue_size)
+        self.stopping = asyncio.Event()
+        self.restore()
+
+        self.workers = [asyncio.create_task(self.validate_entries()), asyncio.create_task(self.batch_records())]
+        self.watcher = None
+        if self.watch_directory is not None:
+            self.watcher = asyncio.create_task(self.watch_files())
+            logger.info(f"Watching for NDJSON files in: {self.watch_directory}")
+        if self.port is not None:
+            self.server = await asyncio.start_server(self.handle_http, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+            logger.info(f"Accepting POST /matches on http://{self.host}:{self.port}")
+
+    async def join(self):
+        """
+        Waits for `stop`, then stops the sources and publishes every queued record.
+        """
+        await self.stopping.wait()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.watcher is not None:
+            await self.watcher
+        await self.raw_queue.put(None)  # Drain the queues, then stop the workers
+        await asyncio.gather(*self.workers)
+
+    async def run(self):
+        """
+        Runs the service until `stop` is called.
+        """
+        await self.start()
+        await self.join()
+
+
+async def run_service(service):
+    """
+    Runs the service until SIGINT or SIGTERM.
+
+    :param service: An IngestService.
+    """
+    http_service.add_stop_handlers(service.stop)
+    await service.run()
+
+
+# Main Script Execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live Ingest Service: update team statistics and rankings as matches arrive.")
+    parser.add_argument("--watch", default=watch_directory, help="Directory watched for NDJSON files.")
+    parser.add_argument("--no-watch", action="store_true", help="Do not watch a directory.")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP host.")
+    parser.add_argument("--port", type=int, default=8765, help="HTTP port.")
+    parser.add_argument("--no-http", action="store_true", help="Do not accept HTTP submissions.")
+    parser.add_argument("--batch-window", type=float, default=0.25, help="Seconds records are batched for.")
+    parser.add_argument("--max-batch", type=int, default=500, help="Maximum records per batch.")
+    parser.add_argument("--queue-size", type=int, default=1000, help="Capacity of each queue.")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between directory scans.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Live Ingest Service\n")
+
+    try:
+        service = IngestService(
+            None if args.no_watch else args.watch, args.host, None if args.no_http else args.port,
+            args.batch_window, args.max_batch, args.queue_size, args.poll_interval,
+        )
+        asyncio.run(run_service(service))
+        logger.info("\nSubmission-to-ranking latency:")
+        print(service.latency.format())
+        logger.info(f"Counters: {service.counters}")
+
+    except OSError as os_error:
+        logger.error(f"Could not start the service: {os_error}")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {e}")
+        print(traceback.format_exc())
+
+    print(seperation_bar)
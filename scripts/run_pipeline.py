@@ -0,0 +1,452 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.script_loader import SCRIPTS_DIR, load_script
+from utility_functions.columnar_store import columnar_path, records_to_table
+from utility_functions.chart_rendering import CHART_MODES
+from utility_functions.alliance_simulator import SIMULATION_COLUMNS
+from utility_functions.record_index import index_path
+from utility_functions.instrumentation import logger, peak_rss_mb
+from utility_functions import build_cache, instrumentation
+import os
+import sys
+import glob
+import time
+import argparse
+import traceback
+
+# Pipeline Runner: runs any range of the numbered scripts in one process. Each stage hands its
+# result to the next one in memory; the files in data/processed are only written as checkpoints
+# (and read when a range starts after the stage that writes them).
+#
+# With checkpoints on, a build cache in data/processed records a hash of each stage's code,
+# options and input files. Stages whose hash and outputs are unchanged are skipped; --force
+# runs every selected stage.
+#
+# With --report, --profile or --trace-memory, each stage's time, peak memory, record counters
+# and function timings are collected (see utility_functions/instrumentation.py) and written to a
+# JSON run report in outputs/statistics.
+#
+# Usage:
+#   python scripts/run_pipeline.py --stages 03-06
+#   python scripts/run_pipeline.py --stages 03-05 --format columnar --no-checkpoints
+#   python scripts/run_pipeline.py --stages 03-06 --profile --log-level warning
+
+build_cache_path = "data/processed/build_cache.json"
+run_report_path = "outputs/statistics/run_report.json"
+profiles_directory = "outputs/statistics/profiles"
+utility_functions_dir = os.path.join(os.path.dirname(SCRIPTS_DIR), "utility_functions")
+
+
+def run_json_fixes_stage(context, options):
+    """
+    Stage 01: Reformats the raw JSON files.
+    """
+    script = load_script("01_json_structure_fixes")
+    script.process_json_directory(options.raw_directory, workers=options.workers)
+
+
+def run_clear_outputs_stage(context, options):
+    """
+    Stage 02: Clears the outputs and processed data.
+    """
+    script = load_script("02_clear_outputs")
+    script.clear_pipeline_directories()
+
+
+def run_cleaning_stage(context, options):
+    """
+    Stage 03: Cleans the raw data and hands the cleaned records to stage 04 (as a compact
+    columnar table with the columnar format).
+    """
+    script = load_script("03_data_cleaning_and_preprocessing")
+    logger.info(f"Loading raw data from: {script.raw_data_path}")
+    raw_data = script.load_raw_data(script.raw_data_path)
+
+    if not isinstance(raw_data, list):
+        raise ValueError("Raw data must be a list of matches.")
+
+    as_table = options.intermediate_format == "columnar"
+    cleaned = script.clean_raw_data(
+        raw_data, options.incremental, options.intermediate_format, options.export_json, options.checkpoints,
+        as_table, raw_file_path=script.raw_data_path
+    )
+    context["cleaned_table" if as_table else "cleaned_data"] = cleaned
+    script.print_warnings(options.warnings_per_kind)
+    logger.info(f"Total warnings/errors: {len(script.warnings)}")
+
+
+def run_restructuring_stage(context, options):
+    """
+    Stage 04: Builds the team-based data and hands it to stage 05.
+    """
+    script = load_script("04_team_statistics_and_data_restructuring")
+    # Stage 07 simulates alliances from the cleaned records too
+    if 7 in context["stages"]:
+        cleaned_data, cleaned_table = context.get("cleaned_data"), context.get("cleaned_table")
+    else:
+        cleaned_data, cleaned_table = context.pop("cleaned_data", None), context.pop("cleaned_table", None)
+    if cleaned_table is not None:
+        table = cleaned_table
+    elif cleaned_data is None:
+        cleaned_data, table = script.load_cleaned_data(script.cleaned_data_path, options.intermediate_format)
+    elif options.intermediate_format == "columnar":
+        table = records_to_table(cleaned_data)
+    else:
+        table = records_to_table(cleaned_data, script.METRIC_SOURCE_COLUMNS)
+
+    context["team_data"], context["team_table"] = script.restructure_cleaned_data(
+        cleaned_data, table, script.team_performance_path, options.intermediate_format,
+        options.export_json, options.checkpoints
+    )
+
+
+def run_aggregation_stage(context, options):
+    """
+    Stage 05: Calculates and saves the team statistics and hands them to stage 06.
+    """
+    script = load_script("05_data_analysis_and_statistics_aggregation")
+    if "team_data" in context:
+        team_data, team_table = context.pop("team_data"), context.pop("team_table")
+    else:
+        team_data, team_table = script.load_team_data(script.team_matches_path, options.intermediate_format)
+
+    logger.info("Calculating team statistics.")
+    if team_table is not None:
+        team_statistics = script.calculate_team_statistics_from_table(
+            team_table, options.bootstrap_resamples, options.bootstrap_workers
+        )
+    else:
+        team_statistics = script.calculate_team_statistics(
+            team_data, options.bootstrap_resamples, options.bootstrap_workers
+        )
+
+    context["team_statistics"] = script.save_team_statistics(team_statistics, script.team_statistics_path)
+
+
+def run_comparison_stage(context, options):
+    """
+    Stage 06: Ranks and compares teams and saves the analysis, rankings and charts.
+    """
+    script = load_script("06_team_comparison_analysis")
+    if "team_statistics" in context:
+        team_statistics = script.team_statistics_to_frame(context.pop("team_statistics"))
+    else:
+        team_statistics = script.load_team_statistics(script.team_statistics_path)
+
+    context["team_statistics_frame"] = script.run_comparison_analysis(
+        team_statistics, options.charts, options.chart_workers, options.force
+    )
+
+
+def run_simulation_stage(context, options):
+    """
+    Stage 07: Simulates every alliance of the pick list and saves the predicted scores.
+    """
+    script = load_script("07_alliance_simulation")
+    cleaned_data, table = context.pop("cleaned_data", None), context.pop("cleaned_table", None)
+    if cleaned_data is not None:
+        table = records_to_table(cleaned_data, SIMULATION_COLUMNS)
+    elif table is None:
+        table = script.load_match_table(script.cleaned_data_path, options.intermediate_format)
+
+    predictions = script.simulate_pick_list(
+        table, simulations=options.simulations, workers=options.simulation_workers
+    )
+    script.save_alliance_predictions(predictions, script.alliance_predictions_path)
+
+
+# Stage number -> (title, script name, function)
+STAGES = {
+    1: ("Script 01: JSON Reformatting Tool", "01_json_structure_fixes", run_json_fixes_stage),
+    2: ("Script 02: Clearing Directories With Custom Exceptions", "02_clear_outputs", run_clear_outputs_stage),
+    3: ("Script 03: Robust Data Cleaning", "03_data_cleaning_and_preprocessing", run_cleaning_stage),
+    4: (
+        "Script 04: Team Based Data Restructuring",
+        "04_team_statistics_and_data_restructuring", run_restructuring_stage
+    ),
+    5: (
+        "Script 05: Data Analysis & Team Statistics Aggregation",
+        "05_data_analysis_and_statistics_aggregation", run_aggregation_stage
+    ),
+    6: ("Script 06: Team Comparison Analysis", "06_team_comparison_analysis", run_comparison_stage),
+    7: ("Script 07: Alliance Simulation", "07_alliance_simulation", run_simulation_stage),
+}
+
+
+def checkpoint_paths(json_path, intermediate_format, export_json=False):
+    """
+    Returns the checkpoint files written for an intermediate JSON path in the selected format.
+
+    :param json_path: Path of the JSON checkpoint.
+    :param intermediate_format: "json" or "columnar".
+    :param export_json: Whether the JSON file is also written in the columnar format.
+    :return: List of checkpoint paths (the columnar table is a directory).
+    """
+    if intermediate_format == "columnar":
+        return [columnar_path(json_path)] + ([json_path] if export_json else [])
+    return [json_path]
+
+
+def stage_cache_files(stage, options):
+    """
+    Returns the configuration, input files and output files a stage's cache entry is based on.
+
+    :param stage: Stage number (01, 03-07).
+    :param options: Parsed command line options.
+    :return: A tuple of (configuration dictionary, input paths, output paths).
+    """
+    fmt, export_json = options.intermediate_format, options.export_json
+    script = load_script(STAGES[stage][1])
+    if stage == 1:
+        # Reformats the raw files in place, so they are both inputs and outputs
+        raw_files = sorted(glob.glob(os.path.join(options.raw_directory, "*.json")))
+        return {}, raw_files, raw_files
+    if stage == 3:
+        return (
+            {"intermediate_format": fmt, "export_json": export_json, "incremental": options.incremental},
+            [script.raw_data_path],
+            checkpoint_paths(script.cleaned_data_path, fmt, export_json)
+            + [index_path(script.cleaned_data_path), script.scouter_leaderboard_path, script.cleaning_state_path]
+            + ([script.state_table_path(script.cleaning_state_path, script.cleaned_data_path)] if fmt == "json" else []),
+        )
+    if stage == 4:
+        return (
+            {"intermediate_format": fmt, "export_json": export_json},
+            checkpoint_paths(script.cleaned_data_path, fmt),
+            checkpoint_paths(script.team_performance_path, fmt, export_json),
+        )
+    if stage == 5:
+        return (
+            {"intermediate_format": fmt, "bootstrap_resamples": options.bootstrap_resamples},
+            checkpoint_paths(script.team_matches_path, fmt) + [script.scoring_config_path],
+            [script.team_statistics_path],
+        )
+    if stage == 6:
+        return (
+            {"charts": options.charts},
+            [script.team_statistics_path, script.scoring_config_path],
+            [
+                script.output_analysis_path, script.output_statistics_path, script.output_stability_path,
+                script.visualizations_dir
+            ],
+        )
+    return (
+        {"intermediate_format": fmt, "simulations": options.simulations},
+        checkpoint_paths(script.cleaned_data_path, fmt) + [script.pick_list_path],
+        [script.alliance_predictions_path],
+    )
+
+
+def stage_cache_key(stage, options, cache):
+    """
+    Computes a stage's build cache key from its code (the script, the runner and the utility
+    modules), configuration, library versions and input files.
+
+    :param stage: Stage number.
+    :param options: Parsed command line options.
+    :param cache: Build cache dictionary.
+    :return: A tuple of (stage key, output paths).
+    """
+    config, input_paths, output_paths = stage_cache_files(stage, options)
+    code_paths = [
+        os.path.join(SCRIPTS_DIR, f"{STAGES[stage][1]}.py"),
+        os.path.abspath(__file__),
+    ] + sorted(glob.glob(os.path.join(utility_functions_dir, "*.py")))
+    config = {**config, "libraries": build_cache.library_versions()}
+    return build_cache.compute_stage_key(code_paths, config, input_paths, cache), output_paths
+
+
+def parse_stages(stage_spec):
+    """
+    Parses a stage selection such as "03-05", "3,5" or "01-02,04-06".
+
+    :param stage_spec: Comma-separated stage numbers and inclusive ranges.
+    :return: Sorted list of stage numbers.
+    """
+    stages = set()
+    for part in stage_spec.split(","):
+        first, _, last = part.strip().partition("-")
+        try:
+            first_stage = int(first)
+            last_stage = int(last) if last else first_stage
+        except ValueError:
+            raise ValueError(f"Invalid stage selection: {stage_spec}")
+
+        if first_stage > last_stage or first_stage not in STAGES or last_stage not in STAGES:
+            raise ValueError(f"Invalid stage range: {part.strip()} (stages are {min(STAGES):02d}-{max(STAGES):02d})")
+        stages.update(range(first_stage, last_stage + 1))
+    return sorted(stages)
+
+
+def run_pipeline(stages, options):
+    """
+    Runs the selected stages in order, stopping at the first stage that fails. Stages that are
+    up to date in the build cache are skipped.
+
+    :param stages: Sorted list of stage numbers.
+    :param options: Parsed command line options.
+    :return: A list of (stage, title, status, seconds, peak RSS MB, traced peak MB) tuples.
+    """
+    use_cache = options.checkpoints
+    cache = build_cache.load_build_cache(build_cache_path) if use_cache else None
+    if not use_cache:
+        logger.info("Build cache disabled: stages hand off data in memory without checkpoints.")
+
+    context = {"stages": stages}
+    results = []
+    for stage in stages:
+        title, _, stage_function = STAGES[stage]
+        print(seperation_bar)
+        print(f"{title}\n")
+
+        start = time.perf_counter()
+        with instrumentation.stage(f"{stage:02d}") as stage_record:
+            try:
+                status = "ok"
+                if stage == 2 and use_cache and not options.force:
+                    # Clearing would throw away outputs the cache can reuse
+                    logger.info("Build cache enabled; not clearing outputs (use --force to clear them).")
+                    status = "skipped"
+                elif stage == 2 or not use_cache:
+                    stage_function(context, options)
+                else:
+                    stage_key, output_paths = stage_cache_key(stage, options, cache)
+                    if not options.force and build_cache.is_stage_current(cache, str(stage), stage_key):
+                        logger.info("Inputs, code and options unchanged; reusing the cached outputs.")
+                        status = "cached"
+                    else:
+                        build_cache.forget_stage(cache, str(stage))
+                        stage_function(context, options)
+                        # Keyed after the run, so stages that rewrite their inputs (stage 01) match next time
+                        stage_key, output_paths = stage_cache_key(stage, options, cache)
+                        build_cache.record_stage(cache, str(stage), stage_key, output_paths)
+                    build_cache.save_build_cache(cache, build_cache_path)
+
+                if stage == 2 and status == "ok" and use_cache:
+                    # Script 02 clears data/processed, so start from an empty cache
+                    cache = build_cache.load_build_cache(build_cache_path)
+            except Exception as e:
+                logger.error(f"An unexpected error occurred: {e}")
+                print(traceback.format_exc())
+                status = "FAILED"
+            stage_record["title"] = title
+            stage_record["status"] = status.lower()
+        seconds = time.perf_counter() - start
+
+        results.append((stage, title, status, seconds, peak_rss_mb(), stage_record.get("traced_peak_mb")))
+        logger.info(f"\nStage {stage:02d} {status} in {seconds:.2f} s.")
+        if status == "FAILED":
+            break
+    return results
+
+
+def print_stage_summary(results):
+    """
+    Prints the wall time and peak memory of every stage that ran.
+
+    :param results: Stage results returned by `run_pipeline`.
+    """
+    print(seperation_bar)
+    print("Pipeline Summary\n")
+    print(f"{'Stage':<58}{'Status':>8}{'Time (s)':>10}{'Peak RSS (MB)':>15}{'Traced (MB)':>13}")
+    for stage, title, status, seconds, rss, traced_peak in results:
+        rss_text = f"{rss:.1f}" if rss is not None else "-"
+        traced_text = f"{traced_peak:.1f}" if traced_peak is not None else "-"
+        print(
+            f"{title:<58}{status:>8}{seconds:>10.2f}"
+            f"{rss_text:>15}{traced_text:>13}"
+        )
+    print(f"{'Total':<58}{'':>8}{sum(result[3] for result in results):>10.2f}")
+    print(seperation_bar)
+
+
+# Main Script Execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs pipeline stages in one process with in-memory hand-off.")
+    parser.add_argument("--stages", default="01-07", help="Stages to run, e.g. 03-05 or 01,03-06 (default: 01-07).")
+    parser.add_argument(
+        "--format", choices=["json", "columnar"], default="json", dest="intermediate_format",
+        help="Intermediate format of the checkpoints in data/processed."
+    )
+    parser.add_argument(
+        "--export-json", action="store_true",
+        help="Also save JSON checkpoints when using the columnar format."
+    )
+    parser.add_argument(
+        "--no-checkpoints", action="store_false", dest="checkpoints",
+        help="Do not write the intermediate files in data/processed (outputs are still saved)."
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Run every selected stage even if it is up to date in the build cache (stage 02 then clears outputs)."
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Stage 03: only clean raw records not seen by the last run (needs checkpoints)."
+    )
+    parser.add_argument(
+        "--warnings-per-kind", type=int, metavar="N",
+        help="Stage 03: print at most N warning messages of each kind (default: every warning)."
+    )
+    parser.add_argument("--raw-directory", default="data/raw", help="Stage 01: directory of the raw JSON files.")
+    parser.add_argument("--workers", type=int, default=1, help="Stage 01: number of files to reformat in parallel.")
+    parser.add_argument(
+        "--bootstrap-resamples", type=int,
+        default=load_script("05_data_analysis_and_statistics_aggregation").BOOTSTRAP_RESAMPLES,
+        help="Stage 05: bootstrap resamples for the confidence intervals (0 skips them)."
+    )
+    parser.add_argument(
+        "--bootstrap-workers", type=int, default=1, help="Stage 05: number of processes drawing bootstrap resamples."
+    )
+    parser.add_argument(
+        "--charts", choices=CHART_MODES, default="png",
+        help="Stage 06: png charts, JSON/SVG chart specs without matplotlib, or no charts."
+    )
+    parser.add_argument("--chart-workers", type=int, default=1, help="Stage 06: number of processes rendering charts.")
+    parser.add_argument(
+        "--simulations", type=int, default=load_script("07_alliance_simulation").SIMULATIONS,
+        help="Stage 07: simulated matches per alliance."
+    )
+    parser.add_argument(
+        "--simulation-workers", type=int, default=1, help="Stage 07: number of processes simulating alliances."
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="Also report each stage's peak Python allocations with tracemalloc (slower)."
+    )
+    parser.add_argument(
+        "--report", action="store_true",
+        help=f"Write a JSON run report (stage times, memory, counters, timings, warnings) to {run_report_path}."
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help=f"Profile every stage with cProfile (slower): the slowest functions go in the run report, "
+             f"the profiles in {profiles_directory}. Implies --report."
+    )
+    parser.add_argument(
+        "--log-level", choices=[level.lower() for level in instrumentation.LOG_LEVELS], default="info",
+        help="Lowest level of the messages printed."
+    )
+    args = parser.parse_args()
+
+    try:
+        selected_stages = parse_stages(args.stages)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.incremental and not args.checkpoints:
+        parser.error("--incremental needs the cleaning checkpoints; remove --no-checkpoints.")
+
+    instrumentation.set_log_level(args.log_level)
+    if args.report or args.profile or args.trace_memory:
+        instrumentation.start_run(
+            "pipeline", args.profile, args.trace_memory, profiles_directory if args.profile else None
+        )
+    stage_results = run_pipeline(selected_stages, args)
+    if args.report or args.profile:
+        instrumentation.finish_run(run_report_path)
+        logger.info(f"Run report saved to: {run_report_path}")
+    else:
+        instrumentation.finish_run()
+    print_stage_summary(stage_results)
+
+    if any(result[2] == "FAILED" for result in stage_results):
+        sys.exit(1)
@@ -0,0 +1,436 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.instrumentation import logger
+from utility_functions.script_loader import load_script
+from utility_functions.ranking_engine import MetricRankings
+from utility_functions.scoring_model import load_scoring_config
+from utility_functions.latency_histogram import LatencyHistogram
+from utility_functions.lru_cache import LRUCache
+from utility_functions import http_service
+import os
+import json
+import math
+import time
+import asyncio
+import argparse
+import datetime
+import traceback
+
+# Query Service: a local HTTP service over the team statistics and rankings, so the strategy team
+# can query them from the pit laptops instead of opening the output files:
+#   GET /team/<team>              team summary: statistics, metrics and ranks
+#   GET /top?metric=<m>&n=<n>     top N teams by a rankable metric
+#   GET /compare?a=<team>&b=<team> head-to-head comparison of two teams
+#   GET /status                   data version, cache counters and request latencies
+#
+# The statistics file is loaded once into memory (Script 06's advanced analysis by default; Script
+# 05's statistics or the live ingest service's statistics also work, their metrics are
+# calculated on load). Responses are serialized once and kept in an LRU cache, so repeated
+# queries are answered without recomputing anything. On load, the summaries of every team and
+# the top 10 of every metric are precomputed into the cache.
+#
+# The file is checked for changes every --reload-interval seconds. When the aggregation stage
+# republishes it, the new data is loaded in a worker thread and swapped in, and the cache is
+# cleared. A file that cannot be parsed (e.g. still being written) keeps the old data until the
+# next check.
+#
+# Usage:
+#   python scripts/run_query_service.py --port 8766
+#   python scripts/run_query_service.py --statistics outputs/team_data/live_team_statistics.json
+
+# File paths
+statistics_path = "outputs/team_data/team_advanced_comparative_statistical_analysis.json"
+
+DEFAULT_TOP_N = 10
+MAX_TOP_N = 1000
+
+# Metrics compared head to head (lower is better for missedNotes_average and Script 06's
+# ASCENDING_METRICS)
+HEAD_TO_HEAD_METRICS = [
+    "performance_score", "totalNotes_average", "shootNotes_average", "missedNotes_average",
+    "autoNotesSum_average", "teleopNotesSum_average", "shooting_efficiency", "missed_notes_percent",
+    "consistency_metric", "leftStartingZone_percent_true",
+]
+
+
+def to_number(value):
+    """
+    Converts a NumPy or Python number to a JSON-serializable float (None for NaN and infinity).
+
+    :param value: Number.
+    :return: A float or None.
+    """
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def finite_values(value):
+    """
+    Replaces the NaN and infinite floats of loaded statistics with None, e.g. Script 05's
+    _std_dev of a team with a single match, so responses stay valid JSON.
+
+    :param value: Value loaded from a statistics file (dicts and lists are converted recursively).
+    :return: The value without non-finite floats.
+    """
+    if isinstance(value, float):
+        return to_number(value)
+    if isinstance(value, dict):
+        return {key: finite_values(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [finite_values(item) for item in value]
+    return value
+
+
+class QueryData:
+    """
+    One loaded version of the team statistics, with the rankings of every rankable metric.
+    """
+
+    def __init__(self, file_path, version, score_weights):
+        """
+        Loads the statistics file and ranks the teams.
+
+        :param file_path: Team statistics JSON file.
+        :param version: Version number of this load.
+        :param score_weights: Performance score weights, used if the file has no calculated metrics.
+        """
+        script_06 = load_script("06_team_comparison_analysis")
+        signature = file_signature(file_path)
+        with open(file_path, "r") as infile:
+            self.statistics = json.load(infile)
+
+        frame = script_06.team_statistics_to_frame(self.statistics)
+        if not set(script_06.RANKABLE_METRICS) <= set(frame.columns):
+            script_06.add_calculated_metrics(frame, score_weights)
+        # The frame keeps NaN for ranking, the statistics returned in responses use None
+        self.statistics = finite_values(self.statistics)
+
+        self.file_path = file_path
+        self.signature = signature
+        self.version = version
+        self.loaded = datetime.datetime.now().isoformat(timespec="seconds")
+        self.lower_is_better = set(script_06.ASCENDING_METRICS) | {"missedNotes_average"}
+        self.rankings = MetricRankings.from_frame(frame, script_06.RANKABLE_METRICS, script_06.ASCENDING_METRICS)
+        self.teams = [str(team) for team in frame.index]
+        self.rows = {team: row for row, team in enumerate(self.teams)}
+        self.metric_values = {
+            metric: frame[metric].to_numpy(dtype=float) for metric in HEAD_TO_HEAD_METRICS if metric in frame
+        }
+
+    def value(self, metric, row):
+        """
+        Returns a team's value of a metric as saved in the statistics file, or as calculated on
+        load for metrics the file does not have.
+
+        :param metric: Metric name.
+        :param row: Team row.
+        :return: A float or None.
+        """
+        saved = self.statistics[self.teams[row]].get(metric)
+        if saved is not None:
+            return saved
+        values = self.metric_values[metric] if metric in self.metric_values else self.rankings.values(metric)
+        return to_number(values[row])
+
+    def team_summary(self, team):
+        """
+        :param team: Team number (string).
+        :return: The team's statistics, calculated metrics and ranks.
+        """
+        row = self.rows[team]
+        statistics = dict(self.statistics[team])
+        for metric in self.metric_values:
+            statistics[metric] = self.value(metric, row)
+        ranks = {
+            metric: {"value": self.value(metric, row), "rank": to_number(self.rankings.rank(metric)[row])}
+            for metric in self.rankings.metrics
+        }
+        return {"team": team, "teams": len(self.teams), "statistics": statistics, "ranks": ranks}
+
+    def top(self, metric, n):
+        """
+        :param metric: Rankable metric.
+        :param n: Number of teams.
+        :return: The top N teams with their values and ranks, best first.
+        """
+        ranks = self.rankings.rank(metric)
+        return {
+            "metric": metric,
+            "lower_is_better": metric in self.lower_is_better,
+            "teams": [
+                {"team": self.teams[row], "value": self.value(metric, row), "rank": to_number(ranks[row])}
+                for row in self.rankings.top(metric, n).tolist()
+            ],
+        }
+
+    def head_to_head(self, team_a, team_b):
+        """
+        :param team_a: First team number (string).
+        :param team_b: Second team number (string).
+        :return: Both teams' values of every head-to-head metric, the better team of each, and the
+                 number of metrics each team is better at.
+        """
+        row_a, row_b = self.rows[team_a], self.rows[team_b]
+        metrics, wins = [], {team_a: 0, team_b: 0}
+        for metric in self.metric_values:
+            value_a, value_b = self.value(metric, row_a), self.value(metric, row_b)
+            better = None
+            if value_a is not None and value_b is not None and value_a != value_b:
+                a_better = value_a < value_b if metric in self.lower_is_better else value_a > value_b
+                better = team_a if a_better else team_b
+                wins[better] += 1
+            metrics.append({
+                "metric": metric, team_a: value_a, team_b: value_b,
+                "difference": None if value_a is None or value_b is None else value_a - value_b,
+                "better": better,
+            })
+        return {"teams": [team_a, team_b], "metrics": metrics, "wins": wins}
+
+
+def file_signature(file_path):
+    """
+    :param file_path: Path of a file.
+    :return: A (modification time in ns, size) tuple identifying the file's version.
+    """
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class QueryService:
+    """
+    Serves queries from the loaded QueryData through an LRU cache of serialized responses.
+    """
+
+    def __init__(self, file_path=statistics_path, host="127.0.0.1", port=8766, cache_size=512,
+                 reload_interval=1.0, quiet=False):
+        """
+        :param file_path: Team statistics JSON file.
+        :param host: HTTP host.
+        :param port: HTTP port (0 picks a free port).
+        :param cache_size: Maximum number of cached responses (0 computes every response).
+        :param reload_interval: Seconds between checks of the statistics file.
+        :param quiet: Whether to skip the reload log lines.
+        """
+        self.file_path = file_path
+        self.host = host
+        self.port = port
+        self.reload_interval = reload_interval
+        self.quiet = quiet
+        self.score_weights = load_scoring_config(load_script("06_team_comparison_analysis").scoring_config_path)["weights"]
+        self.cache = LRUCache(cache_size)
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.data = None
+        self.server = None
+        self.stopping = None
+        self.watcher = None
+
+    def swap_data(self, data):
+        """
+        Makes a new load of the statistics current, clears the cache and precomputes the team
+        summaries and top 10 of every metric.
+
+        :param data: QueryData.
+        """
+        self.data = data
+        self.cache.clear()
+        for metric in data.rankings.metrics:
+            query = ("top", metric, DEFAULT_TOP_N)
+            self.cache.put(query, self.compute_response(query))
+        for team in data.teams:
+            self.cache.put(("team", team), self.compute_response(("team", team)))
+        if not self.quiet:
+            logger.info(f"Loaded version {data.version} of {data.file_path}: {len(data.teams)} teams.")
+
+    def compute_response(self, query):
+        """
+        Computes and serializes the response of a query from the current data.
+
+        :param query: Normalized query tuple, e.g. ("team", "1288") or ("top", metric, n).
+        :return: The response bytes.
+        """
+        kind, *arguments = query
+        if kind == "team":
+            payload = self.data.team_summary(*arguments)
+        elif kind == "top":
+            payload = self.data.top(*arguments)
+        else:
+            payload = self.data.head_to_head(*arguments)
+        payload["version"] = self.data.version
+        return http_service.json_response(200, payload)
+
+    def respond(self, query):
+        """
+        Returns the cached response of a query, computing and caching it on a miss.
+
+        :param query: Normalized query tuple.
+        :return: The response bytes.
+        """
+        response = self.cache.get(query)
+        if response is None:
+            response = self.compute_response(query)
+            self.cache.put(query, response)
+        return response
+
+    def parse_query(self, path, query):
+        """
+        Validates a request and normalizes it into a query tuple.
+
+        :param path: Request path.
+        :param query: Query string parameters.
+        :return: A tuple of (query tuple or None, error response or None).
+        """
+        data = self.data
+        if path.startswith("/team/"):
+            team = path[len("/team/"):]
+            if team not in data.rows:
+                return None, http_service.json_response(404, {"error": f"Unknown team: {team}"})
+            return ("team", team), None
+        if path == "/top":
+            metric = query.get("metric", "performance_score")
+            if metric not in data.rankings.metrics:
+                return None, http_service.json_response(
+                    400, {"error": f"Unknown metric: {metric}", "metrics": data.rankings.metrics}
+                )
+            try:
+                n = int(query.get("n", DEFAULT_TOP_N))
+            except ValueError:
+                n = 0
+            if not 1 <= n <= MAX_TOP_N:
+                return None, http_service.json_response(400, {"error": f"n must be between 1 and {MAX_TOP_N}."})
+            return ("top", metric, n), None
+        if path == "/compare":
+            teams = [query.get("a"), query.get("b")]
+            unknown = [team for team in teams if team not in data.rows]
+            if unknown:
+                return None, http_service.json_response(404, {"error": f"Unknown teams: {unknown}"})
+            return ("compare", *teams), None
+        return None, http_service.json_response(404, {"error": f"Unknown endpoint: {path}"})
+
+    def status(self):
+        """
+        :return: The data version, cache counters and request latency summary.
+        """
+        return {
+            "version": self.data.version, "loaded": self.data.loaded, "teams": len(self.data.teams),
+            "requests": self.requests, "cache": self.cache.summary(), "latency": self.latency.summary(),
+        }
+
+    async def handle_http(self, reader, writer):
+        """
+        Answers one query. The recorded latency is the time spent answering, after the request
+        has been read.
+        """
+        start = time.perf_counter()
+        try:
+            method, path, query, _ = await http_service.read_request(reader)
+            start = time.perf_counter()
+            if method != "GET":
+                response = http_service.json_response(404, {"error": f"Unknown endpoint: {method} {path}"})
+            elif path == "/status":
+                response = http_service.json_response(200, self.status())
+            else:
+                parsed, response = self.parse_query(path, query)
+                if parsed is not None:
+                    response = self.respond(parsed)
+        except (ValueError, UnicodeDecodeError, asyncio.IncompleteReadError) as e:
+            response = http_service.json_response(400, {"error": f"Malformed request: {e}"})
+        self.requests += 1
+        self.latency.record(time.perf_counter() - start)
+        await http_service.send_response(writer, response)
+
+    async def watch_statistics(self):
+        """
+        Reloads the statistics file when its modification time or size changes.
+        """
+        loop = asyncio.get_running_loop()
+        failed_signature = None
+        while True:
+            try:
+                await asyncio.wait_for(self.stopping.wait(), self.reload_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                signature = file_signature(self.file_path)
+            except OSError:
+                continue  # Being replaced
+            if signature in (self.data.signature, failed_signature):
+                continue
+            try:
+                data = await loop.run_in_executor(
+                    None, QueryData, self.file_path, self.data.version + 1, self.score_weights
+                )
+            except (OSError, ValueError) as error:  # E.g. a partially written file
+                logger.warning(f"Keeping version {self.data.version}; could not reload {self.file_path}: {error}")
+                failed_signature = signature  # Retried once the file changes again
+                continue
+            self.swap_data(data)
+
+    def stop(self):
+        """
+        Asks the service to stop.
+        """
+        self.stopping.set()
+
+    async def start(self):
+        """
+        Loads the statistics, then starts the HTTP server and the file watcher.
+        """
+        self.stopping = asyncio.Event()
+        self.swap_data(QueryData(self.file_path, 1, self.score_weights))
+        self.server = await asyncio.start_server(self.handle_http, self.host, self.port, backlog=1024)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.watcher = asyncio.create_task(self.watch_statistics())
+        logger.info(f"Answering queries on http://{self.host}:{self.port}")
+
+    async def join(self):
+        """
+        Waits for `stop`, then closes the server.
+        """
+        await self.stopping.wait()
+        self.server.close()
+        await self.server.wait_closed()
+        await self.watcher
+
+    async def run(self):
+        """
+        Runs the service until `stop` is called (or SIGINT/SIGTERM).
+        """
+        await self.start()
+        http_service.add_stop_handlers(self.stop)
+        await self.join()
+
+
+# Main Script Execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query Service: team summaries, top N and head-to-head queries.")
+    parser.add_argument("--statistics", default=statistics_path, help="Team statistics JSON file served.")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP host.")
+    parser.add_argument("--port", type=int, default=8766, help="HTTP port.")
+    parser.add_argument("--cache-size", type=int, default=512, help="Maximum number of cached responses.")
+    parser.add_argument("--reload-interval", type=float, default=1.0, help="Seconds between checks of the statistics file.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Query Service\n")
+
+    try:
+        if not os.path.exists(args.statistics):
+            raise FileNotFoundError(f"Team statistics file not found: {args.statistics}")
+        service = QueryService(args.statistics, args.host, args.port, args.cache_size, args.reload_interval)
+        asyncio.run(service.run())
+        logger.info(f"\nAnswered {service.requests} requests. Cache: {service.cache.summary()}")
+        logger.info("Request handling time:")
+        print(service.latency.format())
+
+    except FileNotFoundError as fnf_error:
+        logger.error(f"{fnf_error}")
+    except ValueError as value_error:
+        logger.error(f"Data validation error: {value_error}")
+    except OSError as os_error:
+        logger.error(f"Could not start the service: {os_error}")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {e}")
+        print(traceback.format_exc())
+
+    print(seperation_bar)
@@ -0,0 +1,297 @@
+from utility_functions.print_formats import seperation_bar
+from utility_functions.instrumentation import logger
+from utility_functions.script_loader import SCRIPTS_DIR, load_script
+from utility_functions.team_accumulators import TeamStatisticsTracker
+from utility_functions import build_cache
+from concurrent.futures import ProcessPoolExecutor
+import os
+import io
+import sys
+import glob
+import json
+import time
+import argparse
+import traceback
+import contextlib
+
+# Season Runner: cleans and aggregates every event of a season, one partition per event key,
+# then merges the partitions' team accumulators into season-wide team statistics. Partitions
+# are independent, so they can run in parallel worker processes.
+#
+# Raw data is partitioned by event key under data/raw/events: either one file per event
+# (<event_key>.json) or one directory per event holding several files (e.g. one per scouting
+# tablet), each a JSON array or NDJSON as written by Script 01. Each partition keeps its own
+# cleaned data, record index, cleaning state and team accumulators in
+# data/processed/events/<event_key>/, and its leaderboard and team statistics under
+# outputs/*/events/<event_key>/.
+#
+# The season statistics are computed by merging the saved accumulators, so partitions whose raw
+# data and code are unchanged are not re-read (a build cache records each partition's inputs).
+#
+# Usage:
+#   python scripts/run_season.py --workers 4
+#   python scripts/run_season.py --events 2024cahal,2024casj --format columnar
+
+events_raw_directory = "data/raw/events"
+events_processed_directory = "data/processed/events"
+events_statistics_directory = "outputs/statistics/events"
+events_team_data_directory = "outputs/team_data/events"
+season_statistics_path = "outputs/team_data/season_team_statistics.json"
+season_cache_path = "data/processed/events/build_cache.json"
+utility_functions_dir = os.path.join(os.path.dirname(SCRIPTS_DIR), "utility_functions")
+
+
+def discover_events(raw_directory):
+    """
+    Lists the event partitions of the raw data directory.
+
+    :param raw_directory: Directory holding one <event_key>.json file or <event_key>/ directory per event.
+    :return: Sorted list of event keys.
+    """
+    if not os.path.isdir(raw_directory):
+        return []
+    events = set()
+    for name in os.listdir(raw_directory):
+        path = os.path.join(raw_directory, name)
+        if os.path.isdir(path):
+            events.add(name)
+        elif name.endswith(".json"):
+            events.add(os.path.splitext(name)[0])
+    return sorted(events)
+
+
+def partition_paths(event_key):
+    """
+    Returns the input and output paths of an event partition.
+
+    :param event_key: Event key.
+    :return: A dictionary of path name -> path.
+    """
+    raw_path = os.path.join(events_raw_directory, event_key)
+    processed_directory = os.path.join(events_processed_directory, event_key)
+    return {
+        "raw": raw_path if os.path.isdir(raw_path) else raw_path + ".json",
+        "cleaned_data": os.path.join(processed_directory, "cleaned_matchapps.json"),
+        "cleaning_state": os.path.join(processed_directory, "cleaning_state.json"),
+        "accumulators": os.path.join(processed_directory, "team_accumulators.json"),
+        "scouter_leaderboard": os.path.join(events_statistics_directory, event_key, "scouter_error_leaderboard.txt"),
+        "team_statistics": os.path.join(events_team_data_directory, event_key, "team_statistical_analysis.json"),
+    }
+
+
+def load_partition_records(raw_path, script_03):
+    """
+    Loads an event's raw entries from its file, or from every file of its directory in name order.
+
+    :param raw_path: Partition file or directory.
+    :param script_03: The loaded Script 03 module.
+    :return: List of raw entries.
+    """
+    file_paths = sorted(glob.glob(os.path.join(raw_path, "*.json"))) if os.path.isdir(raw_path) else [raw_path]
+    raw_data = []
+    for file_path in file_paths:
+        entries = script_03.load_raw_data(file_path)
+        if not isinstance(entries, list):
+            raise ValueError(f"Raw data must be a list of matches: {file_path}")
+        raw_data.extend(entries)
+    return raw_data
+
+
+def process_partition(event_key, intermediate_format="json", capture_output=False):
+    """
+    Cleans an event partition and saves its cleaned data, leaderboard, team accumulators and
+    team statistics.
+
+    :param event_key: Event key.
+    :param intermediate_format: Intermediate format of the cleaned data ("json" or "columnar").
+    :param capture_output: Whether to capture the partition's log instead of printing it, so
+                           results from worker processes can be printed in order.
+    :return: A dictionary with the event key, success flag, record/team/warning counts and the
+             captured log text.
+    """
+    result = {"event": event_key, "success": False, "records": 0, "teams": 0, "warnings": 0}
+    log_buffer = io.StringIO()
+    output_context = contextlib.redirect_stdout(log_buffer) if capture_output else contextlib.nullcontext()
+
+    with output_context:
+        logger.info(f"Event {event_key}:")
+        try:
+            script_03 = load_script("03_data_cleaning_and_preprocessing")
+            paths = partition_paths(event_key)
+            logger.info(f"Loading raw data from: {paths['raw']}")
+            raw_data = load_partition_records(paths["raw"], script_03)
+
+            cleaned_data = script_03.clean_raw_data(
+                raw_data, intermediate_format=intermediate_format,
+                cleaned_file_path=paths["cleaned_data"], leaderboard_file_path=paths["scouter_leaderboard"],
+                state_file_path=paths["cleaning_state"],
+            )
+            logger.info(f"Total warnings/errors: {len(script_03.warnings)}")
+
+            tracker = TeamStatisticsTracker()
+            tracker.add_records(cleaned_data)
+            logger.info(f"Saving team accumulators to: {paths['accumulators']}")
+            tracker.save(paths["accumulators"])
+            save_team_statistics(tracker.team_statistics(), paths["team_statistics"])
+
+            result.update(
+                success=True, records=len(cleaned_data), teams=len(tracker.teams), warnings=len(script_03.warnings)
+            )
+        except Exception as e:
+            logger.error(f"Event {event_key} failed: {e}")
+            print(traceback.format_exc())
+
+    result["log"] = log_buffer.getvalue()
+    return result
+
+
+def save_team_statistics(team_statistics, statistics_file_path):
+    """
+    Saves team statistics as JSON.
+
+    :param team_statistics: Dictionary of team -> statistics.
+    :param statistics_file_path: Path to save the statistics.
+    """
+    logger.info(f"Saving team statistics to: {statistics_file_path}")
+    os.makedirs(os.path.dirname(statistics_file_path), exist_ok=True)
+    with open(statistics_file_path, "w") as outfile:
+        json.dump(team_statistics, outfile, indent=4)
+
+
+def partition_cache_key(event_key, intermediate_format, cache):
+    """
+    Computes a partition's build cache key from the code, options and its raw data.
+
+    :param event_key: Event key.
+    :param intermediate_format: Intermediate format of the cleaned data.
+    :param cache: Build cache dictionary.
+    :return: A tuple of (partition key, output paths).
+    """
+    paths = partition_paths(event_key)
+    code_paths = [
+        os.path.join(SCRIPTS_DIR, "03_data_cleaning_and_preprocessing.py"),
+        os.path.abspath(__file__),
+    ] + sorted(glob.glob(os.path.join(utility_functions_dir, "*.py")))
+    config = {"intermediate_format": intermediate_format, "libraries": build_cache.library_versions()}
+    output_paths = [paths["accumulators"], paths["scouter_leaderboard"], paths["team_statistics"]]
+    return build_cache.compute_stage_key(code_paths, config, [paths["raw"]], cache), output_paths
+
+
+def merge_partitions(event_keys):
+    """
+    Merges the saved team accumulators of every partition, in event key order.
+
+    :param event_keys: Event keys.
+    :return: A TeamStatisticsTracker for the whole season.
+    """
+    season = TeamStatisticsTracker()
+    for event_key in event_keys:
+        season.merge(TeamStatisticsTracker.load(partition_paths(event_key)["accumulators"]))
+    return season
+
+
+def run_season(event_keys, workers=1, intermediate_format="json", force=False):
+    """
+    Processes every changed partition (in parallel with `workers` > 1), then merges all
+    partitions into the season team statistics.
+
+    :param event_keys: Event keys to process.
+    :param workers: Number of partitions processed in parallel.
+    :param intermediate_format: Intermediate format of the cleaned data.
+    :param force: Whether to re-process partitions the build cache marks as current.
+    :return: List of per-partition result dictionaries (cached partitions included).
+    """
+    cache = build_cache.load_build_cache(season_cache_path)
+    keys = {event_key: partition_cache_key(event_key, intermediate_format, cache) for event_key in event_keys}
+    pending = [
+        event_key for event_key in event_keys
+        if force or not build_cache.is_stage_current(cache, event_key, keys[event_key][0])
+    ]
+
+    if workers > 1 and len(pending) > 1:
+        logger.info(f"Processing {len(pending)} partitions with {min(workers, len(pending))} worker processes.")
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            futures = [
+                executor.submit(process_partition, event_key, intermediate_format, True) for event_key in pending
+            ]
+            processed = [future.result() for future in futures]
+        for result in processed:
+            print(result["log"], end="")
+    else:
+        processed = [process_partition(event_key, intermediate_format) for event_key in pending]
+
+    results = {result["event"]: result for result in processed}
+    for event_key, result in results.items():
+        if result["success"]:
+            stage_key, output_paths = keys[event_key]
+            build_cache.record_stage(cache, event_key, stage_key, output_paths)
+        else:
+            build_cache.forget_stage(cache, event_key)
+    os.makedirs(os.path.dirname(season_cache_path), exist_ok=True)
+    build_cache.save_build_cache(cache, season_cache_path)
+
+    for event_key in event_keys:
+        if event_key not in results:
+            results[event_key] = {"event": event_key, "success": True, "cached": True}
+    return [results[event_key] for event_key in event_keys]
+
+
+# Main Script Execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Season Runner: clean and aggregate every event partition.")
+    parser.add_argument(
+        "--events", default=None,
+        help=f"Comma-separated event keys (default: every partition in {events_raw_directory})."
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Number of partitions processed in parallel.")
+    parser.add_argument(
+        "--format", choices=["json", "columnar"], default="json", dest="intermediate_format",
+        help="Intermediate format of each partition's cleaned data."
+    )
+    parser.add_argument("--force", action="store_true", help="Re-process partitions even if they are unchanged.")
+    args = parser.parse_args()
+
+    print(seperation_bar)
+    print("Season Runner\n")
+
+    succeeded = False
+    try:
+        event_keys = args.events.split(",") if args.events else discover_events(events_raw_directory)
+        if not event_keys:
+            raise ValueError(f"No event partitions found in: {events_raw_directory}")
+        missing = [event_key for event_key in event_keys if not os.path.exists(partition_paths(event_key)["raw"])]
+        if missing:
+            raise FileNotFoundError(f"No raw data for events: {', '.join(missing)}")
+
+        start = time.perf_counter()
+        results = run_season(event_keys, args.workers, args.intermediate_format, args.force)
+
+        print(f"\n{'Event':<24}{'Status':>10}{'Records':>10}{'Teams':>8}{'Warnings':>10}")
+        for result in results:
+            if result.get("cached"):
+                print(f"{result['event']:<24}{'cached':>10}")
+            else:
+                status = "ok" if result["success"] else "failed"
+                print(f"{result['event']:<24}{status:>10}{result['records']:>10}{result['teams']:>8}"
+                      f"{result['warnings']:>10}")
+
+        failed = [result["event"] for result in results if not result["success"]]
+        if failed:
+            logger.error(f"Season statistics not saved; failed events: {', '.join(failed)}")
+        else:
+            season = merge_partitions(event_keys)
+            print()
+            save_team_statistics(season.team_statistics(), season_statistics_path)
+            logger.info(f"Merged {len(event_keys)} events, {len(season.teams)} teams in "
+                        f"{time.perf_counter() - start:.2f} s.")
+            succeeded = True
+
+    except (FileNotFoundError, ValueError) as error:
+        logger.error(f"{error}")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {e}")
+        print(traceback.format_exc())
+
+    print(seperation_bar)
+    if not succeeded:
+        sys.exit(1)
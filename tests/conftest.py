@@ -0,0 +1,49 @@
+import os
+import sys
+import shutil
+import subprocess
+import pytest
+
+# Shared helpers of the test suite. The pipeline scripts read and write paths relative to the
+# working directory, so they are run as subprocesses in a temporary copy of an event's raw data.
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(REPOSITORY_DIR, "scripts")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Clean synthetic event (12 teams, 8 matches per team, no data-entry errors) with the outputs
+# of the original Scripts 03-06, from before any optimization
+CLEAN_EVENT_DIR = os.path.join(DATA_DIR, "clean_event")
+RAW_DATA_FILE = os.path.join("data", "raw", "raw_port_h_matchapps.json")
+
+if REPOSITORY_DIR not in sys.path:
+    sys.path.insert(0, REPOSITORY_DIR)
+
+
+def run_script(script, work_dir, *arguments):
+    """
+    Runs a pipeline script in a working directory and checks that it reported no error.
+
+    :param script: Script file name.
+    :param work_dir: Working directory holding data/ and outputs/.
+    :param arguments: Extra command line arguments.
+    :return: The script's output.
+    """
+    environment = dict(os.environ, PYTHONPATH=REPOSITORY_DIR, MPLBACKEND="Agg")
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SCRIPTS_DIR, script), *arguments],
+        cwd=work_dir, capture_output=True, text=True, env=environment,
+    )
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    assert "[ERROR]" not in completed.stdout, completed.stdout
+    return completed.stdout
+
+
+@pytest.fixture
+def clean_event_dir(tmp_path):
+    """
+    A working directory with the clean event's raw data.
+    """
+    os.makedirs(tmp_path / "data" / "raw")
+    shutil.copyfile(os.path.join(CLEAN_EVENT_DIR, RAW_DATA_FILE), tmp_path / RAW_DATA_FILE)
+    return tmp_path
@@ -0,0 +1,71 @@
+import os
+import json
+import pytest
+from conftest import CLEAN_EVENT_DIR
+import numpy as np
+from utility_functions.columnar_store import (
+    append_table, read_table, records_to_table, select_rows, table_length, table_to_records, write_table
+)
+
+
+@pytest.fixture(scope="module")
+def cleaned_records():
+    with open(os.path.join(CLEAN_EVENT_DIR, "data", "processed", "cleaned_port_h_matchapps.json")) as infile:
+        return json.load(infile)
+
+
+def test_round_trip(cleaned_records):
+    assert table_to_records(records_to_table(cleaned_records)) == cleaned_records
+
+
+def test_round_trip_with_missing_fields(cleaned_records):
+    records = json.loads(json.dumps(cleaned_records[:12]))
+    del records[0]["climb"]
+    del records[1]["metadata"]["scouterName"]
+    del records[2]["autoNotes"]["near"]
+    records[3]["_id"]["$oid"] = "café"  # Non-ASCII ids are stored as unicode
+    assert table_to_records(records_to_table(records)) == records
+
+
+def test_write_and_read_table(cleaned_records, tmp_path):
+    table = records_to_table(cleaned_records)
+    write_table(str(tmp_path / "cleaned.columns"), table)
+    for memory_map in (True, False):
+        assert table_to_records(read_table(str(tmp_path / "cleaned.columns"), memory_map)) == cleaned_records
+
+
+def test_append_table_matches_one_table(cleaned_records):
+    records = json.loads(json.dumps(cleaned_records))
+    records[-1]["climb"] = "a climb value only in the new rows"
+    half = len(records) // 2
+    appended = append_table(records_to_table(records[:half]), records_to_table(records[half:]))
+    assert table_length(appended) == len(records)
+    assert table_to_records(appended) == records
+    assert appended["categories"] == records_to_table(records)["categories"]
+
+
+def test_round_trip_keeps_values_the_columns_cannot_hold(cleaned_records, tmp_path):
+    # Values Script 03 keeps that the column dtypes do not represent exactly
+    records = json.loads(json.dumps(cleaned_records[:12]))
+    records[0]["autoNotes"]["near"] = True
+    records[1]["autoNotes"] = {}
+    records[2]["_id"]["$oid"] = ""
+    records[3]["teleNotes"]["near"] = 2 ** 40
+    records[4]["metadata"]["robotTeam"] = 2 ** 70
+    table = records_to_table(records)
+
+    assert table["columns"]["autoNotes_near"][0] == 1
+    assert table["columns"]["teleNotes_near"].dtype == np.int64
+    assert table_to_records(table) == records
+    assert json.dumps(table_to_records(table)) == json.dumps(records)
+
+    write_table(str(tmp_path / "edge.columns"), table)
+    assert table_to_records(read_table(str(tmp_path / "edge.columns"))) == records
+
+    half = len(records) // 2
+    for split in (2, half):
+        appended = append_table(records_to_table(records[:split]), records_to_table(records[split:]))
+        assert table_to_records(appended) == records
+
+    row_order = np.array([4, 1, 1, 0, 11])
+    assert table_to_records(select_rows(table, row_order)) == [records[row] for row in row_order]
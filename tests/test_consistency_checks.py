@@ -0,0 +1,35 @@
+import copy
+import pytest
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_event_entries
+from utility_functions.columnar_store import records_to_table
+from utility_functions.consistency_checks import find_statistical_outliers, t_critical_value
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+
+
+@pytest.fixture(scope="module")
+def clean_records():
+    # 30 teams x 10 matches without data-entry errors
+    entries = generate_event_entries(team_count=30, matches_per_team=10, error_rate=0.0)
+    records = [script_03.validate_and_clean_entry(entry) for entry in entries]
+    script_03.reset_tracking_state()
+    return records
+
+
+@pytest.mark.parametrize("alpha, df, expected", [
+    (0.05, 4, 2.7764451052), (0.01, 10, 3.1692726726), (0.001, 1, 636.6192487687), (0.0001, 57, 4.1841468241),
+])
+def test_t_critical_value(alpha, df, expected):
+    assert t_critical_value(alpha, df) == pytest.approx(expected, rel=1e-9)
+
+
+def test_clean_data_has_no_outliers(clean_records):
+    assert find_statistical_outliers(records_to_table(clean_records)) == []
+
+
+def test_data_entry_error_is_an_outlier(clean_records):
+    records = copy.deepcopy(clean_records)
+    records[100]["teleNotes"]["near"] += 40
+    outliers = find_statistical_outliers(records_to_table(records))
+    assert [(issue["metric"], issue["rows"]) for issue in outliers] == [("teleNotes", [100])]
@@ -0,0 +1,100 @@
+import json
+import asyncio
+import pytest
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.tablet_client import post_entries, run_tablets
+from utility_functions.team_accumulators import TeamStatisticsTracker
+
+run_ingest = load_script("run_ingest")
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+
+
+def make_service(work_dir, mode):
+    """
+    :return: An IngestService fed over HTTP or through a watched directory, writing to work_dir.
+    """
+    return run_ingest.IngestService(
+        watch_directory=str(work_dir / "incoming") if mode == "files" else None,
+        port=0 if mode == "http" else None, batch_window=0.05, queue_size=50, poll_interval=0.02,
+        archive_path=str(work_dir / "live_matchapps.ndjson"),
+        statistics_path=str(work_dir / "live_team_statistics.json"),
+        rankings_path=str(work_dir / "live_rankings.json"), quiet=True,
+    )
+
+
+async def feed_service(service, entries, mode):
+    """
+    Starts the service, runs the fake tablets against it and stops it once everything is published.
+    """
+    await service.start()
+    if mode == "http":
+        rejected = await run_tablets(entries, 0, "127.0.0.1", service.port)
+    else:
+        rejected = await run_tablets(entries, 0, directory=service.watch_directory)
+    service.stop()
+    await service.join()
+    return rejected
+
+
+@pytest.mark.parametrize("mode", ["http", "files"])
+def test_published_statistics_match_accumulators(tmp_path, mode):
+    entries = generate_raw_entries(240, team_count=20, seed=7401)
+    service = make_service(tmp_path, mode)
+    rejected = asyncio.run(feed_service(service, entries, mode))
+
+    # The tablets' submissions interleave, so the reference follows the accepted (archive) order
+    with open(service.archive_path) as infile:
+        accepted = [json.loads(line) for line in infile]
+    reference = TeamStatisticsTracker()
+    reference.add_records(script_03.validate_and_clean_entry(entry) for entry in accepted)
+    script_03.reset_tracking_state()
+    with open(service.statistics_path) as infile:
+        published = json.load(infile)
+
+    assert rejected == 0
+    assert sorted(json.dumps(entry) for entry in accepted) == sorted(json.dumps(entry) for entry in entries)
+    assert service.counters["accepted"] == service.counters["published"] == len(entries)
+    assert published == json.loads(json.dumps(reference.team_statistics()))
+    with open(service.rankings_path) as infile:
+        assert json.load(infile)["records"] == len(entries)
+
+
+def test_restart_restores_state(tmp_path):
+    entries = generate_raw_entries(60, team_count=10, seed=7402)
+    asyncio.run(feed_service(make_service(tmp_path, "http"), entries[:30], "http"))
+
+    restarted = make_service(tmp_path, "http")
+    asyncio.run(feed_service(restarted, entries, "http"))
+    # The first 30 entries were archived, plus any entry a tablet resent
+    assert restarted.counters["duplicates"] >= 30
+    assert restarted.counters["published"] == len(entries)
+    with open(restarted.archive_path) as infile:
+        assert len(infile.readlines()) == len(entries)
+
+
+def test_entry_failing_validation_is_skipped(tmp_path):
+    entries = generate_raw_entries(2, team_count=6, seed=7403)
+
+    async def submit():
+        service = make_service(tmp_path, "http")
+        await service.start()
+        # Script 03 raises on this entry; the worker must go on with the next ones
+        statuses = [
+            await post_entries("127.0.0.1", service.port, '[{"metadata": null}]'),
+            await post_entries("127.0.0.1", service.port, json.dumps(entries[0])),
+            await post_entries("127.0.0.1", service.port, '[{"metadata": null}]'),
+            await post_entries("127.0.0.1", service.port, json.dumps(entries[1])),
+        ]
+        service.stop()
+        await service.join()
+        return service, statuses
+
+    service, statuses = asyncio.run(submit())
+    assert statuses == [202] * 4
+    # The failed entry was not recorded as accepted, so its resubmission is not a duplicate
+    assert service.counters["malformed"] == 2
+    assert service.counters["duplicates"] == 0
+    assert service.counters["accepted"] == service.counters["published"] == 2
+    with open(service.statistics_path) as infile:
+        assert sum(team["number_of_matches"] for team in json.load(infile).values()) == 2
@@ -0,0 +1,72 @@
+import os
+import json
+import shutil
+import pytest
+from conftest import CLEAN_EVENT_DIR, RAW_DATA_FILE, run_script
+
+# Scripts 03, 04 and 06 must write the same bytes as the original scripts on clean data. Script
+# 05 and 06 add fields (confidence intervals) to their JSON outputs, so those are compared on
+# the original fields.
+
+BYTE_IDENTICAL_OUTPUTS = [
+    "data/processed/cleaned_port_h_matchapps.json",
+    "outputs/statistics/scouter_error_leaderboard.txt",
+    "data/processed/cleaned_port_h_team_matches.json",
+    "outputs/statistics/team_comparison_stats.txt",
+]
+
+
+@pytest.fixture(scope="module")
+def pipeline_dir(tmp_path_factory):
+    """
+    Runs Scripts 03-06 once on the clean event.
+    """
+    work_dir = tmp_path_factory.mktemp("clean_event")
+    os.makedirs(work_dir / "data" / "raw")
+    shutil.copyfile(os.path.join(CLEAN_EVENT_DIR, RAW_DATA_FILE), work_dir / RAW_DATA_FILE)
+    run_script("03_data_cleaning_and_preprocessing.py", work_dir)
+    run_script("04_team_statistics_and_data_restructuring.py", work_dir)
+    run_script("05_data_analysis_and_statistics_aggregation.py", work_dir)
+    run_script("06_team_comparison_analysis.py", work_dir, "--charts", "none")
+    return work_dir
+
+
+def read_bytes(file_path):
+    with open(file_path, "rb") as infile:
+        return infile.read()
+
+
+@pytest.mark.parametrize("output", BYTE_IDENTICAL_OUTPUTS)
+def test_output_matches_original_scripts(pipeline_dir, output):
+    assert read_bytes(pipeline_dir / output) == read_bytes(os.path.join(CLEAN_EVENT_DIR, output))
+
+
+def test_team_statistics_keep_original_fields(pipeline_dir):
+    output = "outputs/team_data/team_statistical_analysis.json"
+    with open(pipeline_dir / output) as infile:
+        statistics = json.load(infile)
+    with open(os.path.join(CLEAN_EVENT_DIR, output)) as infile:
+        original = json.load(infile)
+
+    # Compared as JSON text, so NaN standard deviations (single-match teams) compare equal
+    assert list(statistics) == list(original)
+    for team, fields in original.items():
+        assert json.dumps({name: statistics[team][name] for name in fields}) == json.dumps(fields)
+
+
+def test_advanced_analysis_keeps_original_fields(pipeline_dir):
+    output = "outputs/team_data/team_advanced_comparative_statistical_analysis.json"
+    with open(pipeline_dir / output) as infile:
+        analysis = json.load(infile)
+    with open(os.path.join(CLEAN_EVENT_DIR, output)) as infile:
+        original = json.load(infile)
+
+    assert list(analysis) == list(original)
+    for team, fields in original.items():
+        assert {name: analysis[team][name] for name in fields} == fields
+
+
+def test_pipeline_runner_matches_scripts(pipeline_dir, clean_event_dir):
+    run_script("run_pipeline.py", clean_event_dir, "--stages", "03-06", "--charts", "none")
+    for output in BYTE_IDENTICAL_OUTPUTS:
+        assert read_bytes(clean_event_dir / output) == read_bytes(pipeline_dir / output)
@@ -0,0 +1,49 @@
+import os
+import json
+import pytest
+from conftest import CLEAN_EVENT_DIR
+from utility_functions.script_loader import load_script
+
+run_query_service = load_script("run_query_service")
+
+
+def strict_json(response):
+    """
+    Parses a response body as strict JSON, which has no NaN or Infinity.
+    """
+    body = response.split(b"\r\n\r\n", 1)[1]
+
+    def reject(constant):
+        raise ValueError(f"Not valid JSON: {constant}")
+
+    return json.loads(body, parse_constant=reject)
+
+
+@pytest.fixture
+def service(tmp_path):
+    """
+    A query service over Script 05's statistics, with one team that played a single match
+    (NaN standard deviations, as Script 05 writes them).
+    """
+    with open(os.path.join(CLEAN_EVENT_DIR, "outputs", "team_data", "team_statistical_analysis.json")) as infile:
+        statistics = json.load(infile)
+    single_match = statistics[next(iter(statistics))]
+    single_match["number_of_matches"] = 1
+    for field in single_match:
+        if field.endswith("_std_dev"):
+            single_match[field] = float("nan")
+    file_path = tmp_path / "team_statistics.json"
+    with open(file_path, "w") as outfile:
+        json.dump(statistics, outfile)
+
+    service = run_query_service.QueryService(str(file_path), quiet=True)
+    service.swap_data(run_query_service.QueryData(str(file_path), 1, service.score_weights))
+    return service
+
+
+def test_responses_are_valid_json_for_single_match_team(service):
+    team_a, team_b = service.data.teams[:2]
+    summary = strict_json(service.respond(("team", team_a)))
+    assert summary["statistics"]["totalNotes_std_dev"] is None
+    strict_json(service.respond(("top", "consistency_metric", len(service.data.teams))))
+    strict_json(service.respond(("compare", team_a, team_b)))
@@ -0,0 +1,69 @@
+import copy
+import json
+import pytest
+from utility_functions.script_loader import load_script
+from utility_functions.synthetic_data import generate_raw_entries
+from utility_functions.columnar_store import records_to_table
+from utility_functions.team_accumulators import TeamStatisticsTracker
+
+script_03 = load_script("03_data_cleaning_and_preprocessing")
+script_04 = load_script("04_team_statistics_and_data_restructuring")
+script_05 = load_script("05_data_analysis_and_statistics_aggregation")
+
+
+@pytest.fixture(scope="module")
+def cleaned_records():
+    # Data-entry errors leave missing fields, which the statistics must skip like Script 05
+    entries = generate_raw_entries(1200, team_count=30, error_rate=0.1, seed=7301)
+    records = [script_03.validate_and_clean_entry(entry) for entry in entries]
+    script_03.reset_tracking_state()
+    return records
+
+
+def serialized(statistics):
+    """
+    Serializes statistics the way Script 05 saves them, so NaN values compare equal.
+    """
+    return json.dumps(script_05.convert_to_serializable(statistics))
+
+
+def script_05_statistics(records):
+    records = copy.deepcopy(records)
+    team_data = script_04.build_team_based_data(records, records_to_table(records))
+    return script_05.calculate_team_statistics({str(team): data for team, data in team_data.items()})
+
+
+def test_tracker_matches_script_05(cleaned_records):
+    tracker = TeamStatisticsTracker()
+    tracker.add_records(cleaned_records)
+    assert serialized(tracker.team_statistics()) == serialized(script_05_statistics(cleaned_records))
+
+
+def test_merged_partitions_match_script_05(cleaned_records):
+    # Three partitions ("events") whose teams overlap, merged in a different order
+    partitions = [cleaned_records[0::3], cleaned_records[1::3], cleaned_records[2::3]]
+    trackers = []
+    for partition in partitions:
+        tracker = TeamStatisticsTracker()
+        tracker.add_records(partition)
+        trackers.append(tracker)
+    merged = TeamStatisticsTracker()
+    for tracker in reversed(trackers):
+        merged.merge(tracker)
+
+    # The merged accumulators hold each team's matches in merged order
+    reference = script_05_statistics(partitions[2] + partitions[1] + partitions[0])
+    assert serialized(merged.team_statistics()) == serialized(reference)
+
+
+def test_save_and_restore(cleaned_records, tmp_path):
+    half = len(cleaned_records) // 2
+    tracker = TeamStatisticsTracker()
+    tracker.add_records(cleaned_records[:half])
+    tracker.save(str(tmp_path / "state.json"))
+    restored = TeamStatisticsTracker.load(str(tmp_path / "state.json"))
+    restored.add_records(cleaned_records[half:])
+
+    reference = TeamStatisticsTracker()
+    reference.add_records(cleaned_records)
+    assert serialized(restored.team_statistics()) == serialized(reference.team_statistics())
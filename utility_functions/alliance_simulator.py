@@ -0,0 +1,180 @@
+from utility_functions.columnar_store import MISSING
+
+# Monte Carlo alliance simulator. Every cleaned match record is scored with the 2024 Crescendo
+# point values, then each simulated match draws one of a team's scouted matches at random, so a
+# team's auto notes, teleop notes, trap notes and climb are sampled together as they happened.
+# An alliance's simulated score is the sum of its three robots' draws (alliance bonuses such as
+# Harmony, Spotlit or the amplified Speaker are not scouted and are left out).
+#
+# Each team's draws are generated once for all simulations and shared by every alliance it is
+# part of (common random numbers), so differences between alliances are not blurred by
+# sampling noise. Alliances are scored in chunks of a bounded size, optionally across a process
+# pool; the results do not depend on the number of workers.
+
+# 2024 Crescendo match point values (per note / per robot)
+POINT_VALUES = {
+    "leave": 2,
+    "auto_speaker": 5,
+    "auto_amp": 2,
+    "teleop_speaker": 2,  # Unamplified; amplification is not scouted
+    "teleop_amp": 1,
+    "trap": 5,
+}
+CLIMB_POINTS = {"park": 1, "center": 3, "amp": 3, "source": 3, "none": 0, "failed": 0}
+
+# Columns of the flattened match records the simulator needs
+SIMULATION_COLUMNS = [
+    "robotTeam", "leftStartingZone",
+    "autoNotes_near", "autoNotes_mid", "autoNotes_far", "autoNotes_amp",
+    "teleNotes_near", "teleNotes_mid", "teleNotes_far", "teleNotes_amp",
+    "trapNotes", "climb",
+]
+
+# Alliance scores held in memory per chunk (alliances x simulations)
+CHUNK_ELEMENTS = 4_000_000
+
+# Summary statistics of each alliance's simulated scores
+SCORE_PERCENTILES = {"p10": 10, "median": 50, "p90": 90}
+
+
+def match_points(table):
+    """
+    Scores every match record with the Crescendo point values. Missing fields score 0.
+
+    :param table: Columnar table of match records with the SIMULATION_COLUMNS.
+    :return: A dictionary of "auto", "teleop", "endgame" and "total" point arrays (one per row).
+    """
+    import numpy as np
+
+    columns = table["columns"]
+
+    def column(name):
+        values = np.asarray(columns[name], dtype=np.int64)
+        return np.where(values == MISSING, 0, values)
+
+    auto_speaker = column("autoNotes_near") + column("autoNotes_mid") + column("autoNotes_far")
+    teleop_speaker = column("teleNotes_near") + column("teleNotes_mid") + column("teleNotes_far")
+
+    # Climb codes index the category points; MISSING (-1) picks the trailing 0
+    climb_lookup = np.array(
+        [CLIMB_POINTS.get(value, 0) for value in table["categories"]["climb"]] + [0], dtype=np.int64
+    )
+
+    points = {
+        "auto": (
+            POINT_VALUES["leave"] * column("leftStartingZone")
+            + POINT_VALUES["auto_speaker"] * auto_speaker
+            + POINT_VALUES["auto_amp"] * column("autoNotes_amp")
+        ),
+        "teleop": (
+            POINT_VALUES["teleop_speaker"] * teleop_speaker
+            + POINT_VALUES["teleop_amp"] * column("teleNotes_amp")
+        ),
+        "endgame": (
+            climb_lookup[np.asarray(columns["climb"], dtype=np.int64)]
+            + POINT_VALUES["trap"] * column("trapNotes")
+        ),
+    }
+    points["total"] = points["auto"] + points["teleop"] + points["endgame"]
+    return points
+
+
+def sample_team_points(teams, match_teams, points, simulations, seed):
+    """
+    Draws every team's points for each simulated match from its scouted matches, for all teams
+    at once.
+
+    :param teams: Team numbers to sample, in order.
+    :param match_teams: Team number of each match record.
+    :param points: Total points of each match record.
+    :param simulations: Number of simulated matches.
+    :param seed: Random seed.
+    :return: A 2D int32 array of points (teams x simulations).
+    """
+    import numpy as np
+
+    match_teams = np.asarray(match_teams)
+    rows_by_team = [np.flatnonzero(match_teams == team) for team in teams]
+    rows = np.concatenate(rows_by_team)
+    sizes = np.array([len(team_rows) for team_rows in rows_by_team])
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    rng = np.random.default_rng(seed)
+    draws = offsets[:, None] + (rng.random((len(teams), simulations)) * sizes[:, None]).astype(np.int64)
+    return np.asarray(points, dtype=np.int32)[rows][draws]
+
+
+def enumerate_alliances(team_count):
+    """
+    Lists every three-team alliance of a pick list.
+
+    :param team_count: Number of teams on the pick list.
+    :return: A 2D int32 array of team positions (alliances x 3).
+    """
+    import numpy as np
+    from itertools import combinations
+
+    alliances = np.fromiter(
+        (position for alliance in combinations(range(team_count), 3) for position in alliance), dtype=np.int32
+    )
+    return alliances.reshape(-1, 3)
+
+
+def simulate_alliance_chunk(team_samples, alliances):
+    """
+    Sums the three robots' simulated points of each alliance and summarizes the scores.
+
+    :param team_samples: 2D array of points (teams x simulations).
+    :param alliances: 2D array of team positions (alliances x 3).
+    :return: A dictionary of statistic name -> array (one value per alliance).
+    """
+    import numpy as np
+
+    scores = team_samples[alliances[:, 0]] + team_samples[alliances[:, 1]] + team_samples[alliances[:, 2]]
+    summary = {"mean": scores.mean(axis=1), "std": scores.std(axis=1)}
+
+    # Sorting the integer scores is much faster than np.percentile's partitioning; the
+    # percentiles are then interpolated like np.percentile's default (linear) method
+    scores.sort(axis=1)
+    last = scores.shape[1] - 1
+    for name, percentile in SCORE_PERCENTILES.items():
+        position = percentile / 100 * last
+        lower = int(np.floor(position))
+        upper = min(lower + 1, last)
+        weight = position - lower
+        low_values = scores[:, lower].astype(float)
+        difference = scores[:, upper] - low_values
+        if weight >= 0.5:
+            summary[name] = scores[:, upper] - difference * (1 - weight)
+        else:
+            summary[name] = low_values + difference * weight
+    return summary
+
+
+def simulate_alliances(team_samples, alliances, workers=1):
+    """
+    Simulates every alliance, in chunks across a process pool when `workers` > 1.
+
+    :param team_samples: 2D array of points (teams x simulations).
+    :param alliances: 2D array of team positions (alliances x 3).
+    :param workers: Number of processes.
+    :return: A dictionary of statistic name -> array (one value per alliance).
+    """
+    import numpy as np
+
+    chunk_size = max(1, CHUNK_ELEMENTS // max(team_samples.shape[1], 1))
+    chunks = [alliances[start:start + chunk_size] for start in range(0, len(alliances), chunk_size)]
+
+    if workers > 1 and len(chunks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            futures = [executor.submit(simulate_alliance_chunk, team_samples, chunk) for chunk in chunks]
+            summaries = [future.result() for future in futures]
+    else:
+        summaries = [simulate_alliance_chunk(team_samples, chunk) for chunk in chunks]
+
+    names = ["mean", "std"] + list(SCORE_PERCENTILES)
+    if not summaries:
+        return {name: np.empty(0) for name in names}
+    return {name: np.concatenate([summary[name] for summary in summaries]) for name in names}
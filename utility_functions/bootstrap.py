@@ -0,0 +1,103 @@
+# Bootstrap resampling of per-team averages. Match rows are stored team by team, and each
+# resample draws every team's matches (with replacement) from that team's own rows. The indices
+# for all teams are generated at once: a row's draw is its team's first row plus a uniform
+# integer below the team's match count, so one `rng.random` call covers every team and
+# `np.add.reduceat` turns the drawn values into per-team sums.
+#
+# Resamples are processed in chunks that bound memory. Each chunk has its own random stream,
+# spawned from the seed, so the results do not depend on how many worker processes run them.
+
+# Resampled values held in memory per chunk (resamples x match rows)
+CHUNK_ELEMENTS = 2_000_000
+
+
+def resample_chunk(values, group_sizes, resamples, seed_sequence):
+    """
+    Draws bootstrap resamples of every group and returns the resampled group means.
+
+    :param values: 2D float array (rows x metrics), rows ordered group by group; NaN is missing.
+    :param group_sizes: 1D integer array of the number of rows of each group.
+    :param resamples: Number of resamples to draw.
+    :param seed_sequence: NumPy SeedSequence of this chunk's random stream.
+    :return: 3D float array of means (resamples x groups x metrics); NaN where a resample drew
+             no value of a metric.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed_sequence)
+    group_offsets = np.concatenate([[0], np.cumsum(group_sizes)[:-1]])
+    row_offsets = np.repeat(group_offsets, group_sizes)
+    row_sizes = np.repeat(group_sizes, group_sizes)
+    indices = row_offsets + (rng.random((resamples, len(row_offsets))) * row_sizes).astype(np.int64)
+
+    means = np.empty((resamples, len(group_sizes), values.shape[1]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for metric in range(values.shape[1]):
+            column = np.ascontiguousarray(values[:, metric])
+            missing = np.isnan(column)
+            if not missing.any():
+                means[:, :, metric] = np.add.reduceat(np.take(column, indices), group_offsets, axis=1) / group_sizes
+                continue
+            # Missing values count neither towards the sum nor the number of values
+            sums = np.add.reduceat(np.take(np.where(missing, 0.0, column), indices), group_offsets, axis=1)
+            counts = np.add.reduceat(np.take(~missing, indices), group_offsets, axis=1, dtype=np.int64)
+            means[:, :, metric] = sums / counts
+    return means
+
+
+def bootstrap_group_means(values, group_sizes, resamples, seed, workers=1):
+    """
+    Bootstrap means of every group and metric.
+
+    :param values: 2D float array (rows x metrics), rows ordered group by group; NaN is missing.
+    :param group_sizes: 1D integer array of the number of rows of each group (all > 0).
+    :param resamples: Number of resamples.
+    :param seed: Random seed; the same seed gives the same resamples for any number of workers.
+    :param workers: Number of processes drawing chunks of resamples.
+    :return: 3D float array of means (resamples x groups x metrics).
+    """
+    import numpy as np
+
+    if len(values) == 0 or len(group_sizes) == 0:
+        return np.empty((resamples, len(group_sizes), values.shape[1] if values.ndim == 2 else 0))
+
+    chunk_size = max(1, CHUNK_ELEMENTS // max(len(values), 1))
+    chunk_counts = [min(chunk_size, resamples - start) for start in range(0, resamples, chunk_size)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(chunk_counts))
+
+    if workers > 1 and len(chunk_counts) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunk_counts))) as executor:
+            futures = [
+                executor.submit(resample_chunk, values, group_sizes, count, seed_sequence)
+                for count, seed_sequence in zip(chunk_counts, seed_sequences)
+            ]
+            chunks = [future.result() for future in futures]
+    else:
+        chunks = [
+            resample_chunk(values, group_sizes, count, seed_sequence)
+            for count, seed_sequence in zip(chunk_counts, seed_sequences)
+        ]
+    return np.concatenate(chunks) if chunks else np.empty((0, len(group_sizes), values.shape[1]))
+
+
+def percentile_interval(samples, confidence):
+    """
+    Percentile bootstrap confidence interval over the first axis, ignoring missing resamples.
+
+    :param samples: Array of resampled statistics (resamples x ...).
+    :param confidence: Confidence level, e.g. 0.95.
+    :return: A tuple of (lower bound array, upper bound array).
+    """
+    import numpy as np
+    import warnings
+
+    tail = (1 - confidence) / 2 * 100
+    if not np.isnan(samples).any():
+        lower, upper = np.percentile(samples, [tail, 100 - tail], axis=0)
+        return lower, upper
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # All-NaN slices give NaN bounds
+        lower, upper = np.nanpercentile(samples, [tail, 100 - tail], axis=0)
+    return lower, upper
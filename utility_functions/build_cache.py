@@ -0,0 +1,173 @@
+from utility_functions.instrumentation import logger
+import os
+import sys
+import json
+import hashlib
+
+# Build cache: records a hash of each pipeline stage's code, configuration and input files, plus
+# the hashes of the outputs it wrote. A stage whose key is unchanged and whose outputs are still
+# on disk as written can be skipped.
+#
+# File hashes are memoized by (size, modification time), so unchanged files are not re-read.
+
+CACHE_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Libraries whose version can change a stage's output
+TRACKED_LIBRARIES = ["numpy", "pandas", "matplotlib"]
+
+
+def load_build_cache(cache_file_path):
+    """
+    Loads the build cache, or starts an empty one if it is missing or from another cache version.
+
+    :param cache_file_path: Path of the cache file.
+    :return: A cache dictionary with "stages" and "file_hashes".
+    """
+    if os.path.exists(cache_file_path):
+        try:
+            with open(cache_file_path, "r") as infile:
+                cache = json.load(infile)
+            if cache.get("cache_version") == CACHE_VERSION:
+                return cache
+        except json.JSONDecodeError:
+            logger.warning(f"Ignoring unreadable build cache: {cache_file_path}")
+    return {"cache_version": CACHE_VERSION, "stages": {}, "file_hashes": {}}
+
+
+def save_build_cache(cache, cache_file_path):
+    """
+    Saves the build cache, forgetting memoized hashes of files that no longer exist.
+
+    :param cache: Cache dictionary.
+    :param cache_file_path: Path of the cache file.
+    """
+    cache["file_hashes"] = {
+        path: entry for path, entry in cache["file_hashes"].items() if os.path.exists(path)
+    }
+    os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+    temp_path = cache_file_path + ".tmp"
+    with open(temp_path, "w") as outfile:
+        json.dump(cache, outfile, indent=4)
+    os.replace(temp_path, cache_file_path)
+
+
+def hash_file(file_path, cache):
+    """
+    Returns the SHA-256 of a file, reusing the memoized hash if its size and modification time
+    are unchanged.
+
+    :param file_path: Path of the file.
+    :param cache: Cache dictionary (its "file_hashes" memo is updated).
+    :return: The hex digest.
+    """
+    file_stat = os.stat(file_path)
+    memo = cache["file_hashes"].get(file_path)
+    if memo and memo[0] == file_stat.st_size and memo[1] == file_stat.st_mtime_ns:
+        return memo[2]
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as infile:
+        for chunk in iter(lambda: infile.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    cache["file_hashes"][file_path] = [file_stat.st_size, file_stat.st_mtime_ns, digest.hexdigest()]
+    return digest.hexdigest()
+
+
+def hash_path(path, cache):
+    """
+    Returns the hash of a file, or of a directory's files and their relative names.
+
+    :param path: File or directory path.
+    :param cache: Cache dictionary.
+    :return: The hex digest, or None if the path does not exist.
+    """
+    if os.path.isfile(path):
+        return hash_file(path, cache)
+    if not os.path.isdir(path):
+        return None
+
+    digest = hashlib.sha256()
+    for root, directories, file_names in os.walk(path):
+        directories.sort()
+        for file_name in sorted(file_names):
+            file_path = os.path.join(root, file_name)
+            digest.update(os.path.relpath(file_path, path).encode())
+            digest.update(hash_file(file_path, cache).encode())
+    return digest.hexdigest()
+
+
+def library_versions():
+    """
+    Returns the Python version and the versions of the tracked libraries.
+
+    :return: A dictionary of name -> version (None for libraries that are not installed).
+    """
+    from importlib import metadata
+
+    versions = {"python": sys.version.split()[0]}
+    for library in TRACKED_LIBRARIES:
+        try:
+            versions[library] = metadata.version(library)
+        except metadata.PackageNotFoundError:
+            versions[library] = None
+    return versions
+
+
+def compute_stage_key(code_paths, config, input_paths, cache):
+    """
+    Hashes everything a stage's outputs depend on.
+
+    :param code_paths: Source files of the stage (its script and the modules it uses).
+    :param config: JSON-serializable stage configuration (options, library versions).
+    :param input_paths: Files or directories the stage reads.
+    :param cache: Cache dictionary.
+    :return: The stage key.
+    """
+    key_data = {
+        "code": {path: hash_path(path, cache) for path in code_paths},
+        "config": config,
+        "inputs": {path: hash_path(path, cache) for path in input_paths},
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+
+def is_stage_current(cache, stage_name, stage_key):
+    """
+    Checks whether a stage can be skipped: its key matches the last successful run and every
+    output it wrote is still on disk, unchanged.
+
+    :param cache: Cache dictionary.
+    :param stage_name: Stage identifier.
+    :param stage_key: Key computed by `compute_stage_key`.
+    :return: True if the cached outputs can be reused.
+    """
+    record = cache["stages"].get(stage_name)
+    if record is None or record["key"] != stage_key:
+        return False
+    return all(hash_path(path, cache) == output_hash for path, output_hash in record["outputs"].items())
+
+
+def record_stage(cache, stage_name, stage_key, output_paths):
+    """
+    Records a successful stage run and the hashes of the outputs it wrote.
+
+    :param cache: Cache dictionary.
+    :param stage_name: Stage identifier.
+    :param stage_key: Key computed by `compute_stage_key` after the run.
+    :param output_paths: Files or directories the stage writes.
+    """
+    cache["stages"][stage_name] = {
+        "key": stage_key,
+        "outputs": {path: hash_path(path, cache) for path in output_paths},
+    }
+
+
+def forget_stage(cache, stage_name):
+    """
+    Removes a stage's record, so it runs next time (e.g. before re-running it or after it failed).
+
+    :param cache: Cache dictionary.
+    :param stage_name: Stage identifier.
+    """
+    cache["stages"].pop(stage_name, None)
@@ -0,0 +1,224 @@
+import os
+import json
+import math
+import hashlib
+from html import escape
+
+# Chart rendering for the ranking charts. Each chart is first described by a small spec (title,
+# team labels and values), which needs no plotting library. PNGs are then rendered with
+# matplotlib's non-interactive Agg backend, optionally across a process pool, and only for
+# charts whose spec changed since the last render. The "spec" mode writes each spec as JSON plus
+# a plain SVG bar chart without importing matplotlib at all.
+
+# Bump when the rendering code changes, so existing PNGs are re-rendered
+RENDER_VERSION = 1
+MANIFEST_FILE = "chart_manifest.json"
+CHART_MODES = ["png", "spec", "none"]
+
+# SVG layout (pixels)
+SVG_WIDTH, SVG_HEIGHT = 640, 480
+SVG_MARGIN_LEFT, SVG_MARGIN_RIGHT, SVG_MARGIN_TOP, SVG_MARGIN_BOTTOM = 70, 20, 40, 90
+
+
+def build_chart_spec(metric, top_teams, top_n=10):
+    """
+    Describes the bar chart of the top teams for a metric.
+
+    :param metric: Ranked metric.
+    :param top_teams: Series of the metric's values for the top teams, best first, indexed by team.
+    :param top_n: Number of teams in the chart.
+    :return: A JSON-serializable chart spec.
+    """
+    return {
+        "metric": metric,
+        "file_name": f"top_{top_n}_{metric}",
+        "title": f"Top {top_n} Teams by {metric.replace('_', ' ').title()}",
+        "ylabel": metric.replace("_", " ").title(),
+        "labels": top_teams.index.tolist(),
+        "values": [float(value) for value in top_teams.tolist()],
+    }
+
+
+def chart_spec_hash(spec):
+    """
+    Hashes a chart spec together with the rendering code version and the matplotlib version.
+
+    :param spec: Chart spec.
+    :return: The hex digest.
+    """
+    from importlib import metadata
+
+    try:
+        matplotlib_version = metadata.version("matplotlib")
+    except metadata.PackageNotFoundError:
+        matplotlib_version = None
+    key_data = {"spec": spec, "render_version": RENDER_VERSION, "matplotlib": matplotlib_version}
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+
+def render_chart_png(spec, output_path):
+    """
+    Renders a chart spec to a PNG with the Agg backend. Runs in worker processes, so matplotlib
+    and pandas are imported here rather than at module level.
+
+    :param spec: Chart spec.
+    :param output_path: Path of the PNG file.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    data = pd.DataFrame({spec["metric"]: spec["values"]}, index=spec["labels"])
+    data.plot(y=spec["metric"], kind="bar", title=spec["title"], legend=False)
+    plt.ylabel(spec["ylabel"])
+    plt.xticks(ticks=range(len(spec["labels"])), labels=spec["labels"], rotation=45, ha="right")
+    plt.tight_layout()
+    plt.savefig(output_path)
+    plt.close()
+
+
+def render_chart_svg(spec):
+    """
+    Renders a chart spec as a plain SVG bar chart, without matplotlib.
+
+    :param spec: Chart spec.
+    :return: The SVG document text.
+    """
+    values = [0.0 if math.isnan(value) else value for value in spec["values"]]
+    plot_width = SVG_WIDTH - SVG_MARGIN_LEFT - SVG_MARGIN_RIGHT
+    plot_height = SVG_HEIGHT - SVG_MARGIN_TOP - SVG_MARGIN_BOTTOM
+
+    # Value range always includes 0, so negative values (e.g. z-scores) hang below the axis
+    low, high = min(values + [0.0]), max(values + [0.0])
+    if high == low:
+        high = low + 1.0
+
+    def y_position(value):
+        return SVG_MARGIN_TOP + (high - value) / (high - low) * plot_height
+
+    zero_y = y_position(0.0)
+    slot_width = plot_width / max(len(values), 1)
+    elements = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" height="{SVG_HEIGHT}" font-family="sans-serif">',
+        f'<rect width="{SVG_WIDTH}" height="{SVG_HEIGHT}" fill="white"/>',
+        f'<text x="{SVG_WIDTH / 2:.1f}" y="24" text-anchor="middle" font-size="16">{escape(spec["title"])}</text>',
+        f'<text x="16" y="{SVG_MARGIN_TOP + plot_height / 2:.1f}" text-anchor="middle" font-size="12" '
+        f'transform="rotate(-90 16 {SVG_MARGIN_TOP + plot_height / 2:.1f})">{escape(spec["ylabel"])}</text>',
+        f'<text x="{SVG_MARGIN_LEFT - 6}" y="{SVG_MARGIN_TOP + 4}" text-anchor="end" font-size="10">{high:.3g}</text>',
+        f'<text x="{SVG_MARGIN_LEFT - 6}" y="{SVG_MARGIN_TOP + plot_height + 4}" text-anchor="end" '
+        f'font-size="10">{low:.3g}</text>',
+    ]
+    for index, (label, value) in enumerate(zip(spec["labels"], values)):
+        bar_x = SVG_MARGIN_LEFT + index * slot_width + slot_width * 0.25
+        bar_top = min(y_position(value), zero_y)
+        bar_height = abs(y_position(value) - zero_y)
+        label_x = bar_x + slot_width * 0.25
+        label_y = SVG_MARGIN_TOP + plot_height + 14
+        elements.append(
+            f'<rect x="{bar_x:.1f}" y="{bar_top:.1f}" width="{slot_width * 0.5:.1f}" '
+            f'height="{bar_height:.1f}" fill="#1f77b4"><title>{escape(str(label))}: {value:.4g}</title></rect>'
+        )
+        elements.append(
+            f'<text x="{label_x:.1f}" y="{label_y:.1f}" text-anchor="end" font-size="10" '
+            f'transform="rotate(-45 {label_x:.1f} {label_y:.1f})">{escape(str(label))}</text>'
+        )
+    elements.append(
+        f'<line x1="{SVG_MARGIN_LEFT}" y1="{zero_y:.1f}" x2="{SVG_WIDTH - SVG_MARGIN_RIGHT}" '
+        f'y2="{zero_y:.1f}" stroke="black"/>'
+    )
+    elements.append("</svg>")
+    return "\n".join(elements) + "\n"
+
+
+def load_chart_manifest(output_dir):
+    """
+    Loads the spec hashes of the last rendered PNGs.
+
+    :param output_dir: Chart directory.
+    :return: A dictionary of chart file name -> spec hash.
+    """
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, "r") as infile:
+            return json.load(infile)
+    except json.JSONDecodeError:
+        return {}
+
+
+def save_chart_manifest(output_dir, manifest):
+    """
+    Saves the spec hashes of the rendered PNGs.
+
+    :param output_dir: Chart directory.
+    :param manifest: A dictionary of chart file name -> spec hash.
+    """
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w") as outfile:
+        json.dump(manifest, outfile, indent=4, sort_keys=True)
+
+
+def write_chart_specs(specs, output_dir):
+    """
+    Writes every chart spec as JSON and as a plain SVG chart.
+
+    :param specs: List of chart specs.
+    :param output_dir: Chart directory.
+    """
+    for spec in specs:
+        with open(os.path.join(output_dir, f"{spec['file_name']}.json"), "w") as outfile:
+            json.dump(spec, outfile, indent=4)
+        with open(os.path.join(output_dir, f"{spec['file_name']}.svg"), "w") as outfile:
+            outfile.write(render_chart_svg(spec))
+
+
+def render_charts(specs, output_dir, mode="png", workers=1, force=False):
+    """
+    Renders chart specs to the chart directory.
+
+    In "png" mode, only charts whose spec hash differs from the last render (or whose PNG is
+    missing) are rendered, across a process pool when `workers` > 1. In "spec" mode, the specs
+    are written as JSON and SVG without importing matplotlib. "none" writes nothing.
+
+    :param specs: List of chart specs.
+    :param output_dir: Chart directory.
+    :param mode: One of CHART_MODES.
+    :param workers: Number of processes rendering PNGs.
+    :param force: Whether to re-render every PNG.
+    :return: A tuple of (charts written, charts unchanged).
+    """
+    if mode == "none":
+        return 0, 0
+
+    os.makedirs(output_dir, exist_ok=True)
+    if mode == "spec":
+        write_chart_specs(specs, output_dir)
+        return len(specs), 0
+
+    manifest = load_chart_manifest(output_dir)
+    stale = []
+    for spec in specs:
+        spec_hash = chart_spec_hash(spec)
+        output_path = os.path.join(output_dir, f"{spec['file_name']}.png")
+        if force or manifest.get(spec["file_name"]) != spec_hash or not os.path.exists(output_path):
+            manifest.pop(spec["file_name"], None)
+            stale.append((spec, output_path, spec_hash))
+    # Forget the stale charts first, so an interrupted render is redone next time
+    save_chart_manifest(output_dir, manifest)
+
+    if workers > 1 and len(stale) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(stale))) as executor:
+            futures = [executor.submit(render_chart_png, spec, output_path) for spec, output_path, _ in stale]
+            for future in futures:
+                future.result()
+    else:
+        for spec, output_path, _ in stale:
+            render_chart_png(spec, output_path)
+
+    for spec, _, spec_hash in stale:
+        manifest[spec["file_name"]] = spec_hash
+    save_chart_manifest(output_dir, manifest)
+    return len(stale), len(specs) - len(stale)
@@ -0,0 +1,477 @@
+import os
+import json
+import shutil
+
+# Columnar intermediate format: a directory with one .npy file per column and a manifest.json
+# describing the column kinds and categorical values. Columns are read back memory-mapped, so
+# loading a table does not parse or copy any data.
+#
+# Missing values (fields dropped during cleaning) are stored as -1 in int, bool and categorical
+# columns (cleaning never keeps a negative integer) and as "" in string columns.
+#
+# Values a column's dtype cannot represent exactly are kept in the table's "exact_values"
+# (column name -> [row, value] pairs, written to the manifest) and restored by `table_to_records`:
+# bools in int fields (stored in the column as 0/1), "" strings (stored as "", which otherwise
+# means missing), and negative integers, integers beyond int64 and values of any other type
+# (stored as missing). Nested objects that are present but empty (e.g. "autoNotes": {}) are
+# kept in "empty_objects" (parent key -> rows). Code that reads the columns directly sees the
+# stored values, so a bool counts as 0/1 and an integer beyond int64 as missing.
+#
+# A table is also the compact in-memory form of the match records: each column uses the
+# narrowest dtype that holds all its values (see `compact_column`), so a match record takes
+# about 40 bytes plus its string id, instead of the nested dictionaries of the JSON shape.
+# `records_to_table` and `table_to_records` convert between the two losslessly for any record
+# Script 03 can produce (JSON values other than the nested objects of MATCH_RECORD_COLUMNS).
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+MISSING = -1
+
+# Flattened match record: (column name, path in the cleaned JSON record, column kind)
+MATCH_RECORD_COLUMNS = [
+    ("oid", ("_id", "$oid"), "string"),
+    ("scouterName", ("metadata", "scouterName"), "category"),
+    ("matchNumber", ("metadata", "matchNumber"), "int"),
+    ("robotTeam", ("metadata", "robotTeam"), "int"),
+    ("robotPosition", ("metadata", "robotPosition"), "category"),
+    ("leftStartingZone", ("leftStartingZone",), "bool"),
+    ("autoNotes_near", ("autoNotes", "near"), "int"),
+    ("autoNotes_mid", ("autoNotes", "mid"), "int"),
+    ("autoNotes_far", ("autoNotes", "far"), "int"),
+    ("autoNotes_amp", ("autoNotes", "amp"), "int"),
+    ("autoNotes_miss", ("autoNotes", "miss"), "int"),
+    ("teleNotes_near", ("teleNotes", "near"), "int"),
+    ("teleNotes_mid", ("teleNotes", "mid"), "int"),
+    ("teleNotes_far", ("teleNotes", "far"), "int"),
+    ("teleNotes_amp", ("teleNotes", "amp"), "int"),
+    ("teleNotes_miss", ("teleNotes", "miss"), "int"),
+    ("trapNotes", ("trapNotes",), "int"),
+    ("climb", ("climb",), "category"),
+]
+
+COLUMN_DTYPES = {"int": "int32", "bool": "int8", "category": "int16"}
+
+# Integers that fit in neither are stored as int64 (larger ones are kept as exact values)
+WIDE_DTYPE = "int64"
+INT64_MAX = 2 ** 63 - 1
+
+# Narrower dtypes used when every value of a column fits: note counts, team and match numbers
+# fit in int16, and the climb, robot position and scouter codes in int8
+COMPACT_DTYPES = {"int": "int16", "bool": "int8", "category": "int8"}
+
+
+def columnar_path(json_path):
+    """
+    Returns the columnar table directory that stands in for a JSON intermediate file.
+
+    :param json_path: Path of the JSON intermediate file (e.g. "data/processed/x.json").
+    :return: Path of the columnar table directory (e.g. "data/processed/x.columns").
+    """
+    return os.path.splitext(json_path)[0] + ".columns"
+
+
+def compact_column(values, kind):
+    """
+    Stores a column with the compact dtype of its kind when every value fits, then the regular
+    dtype, then int64, so the conversion is always lossless.
+
+    :param values: Array or list of the column's values (MISSING for missing values), each
+                   within int64.
+    :param kind: Column kind ("int", "bool" or "category").
+    :return: A NumPy array.
+    """
+    import numpy as np
+
+    values = np.asarray(values, dtype=WIDE_DTYPE)
+    if len(values) == 0:
+        return values.astype(COMPACT_DTYPES[kind])
+    low, high = values.min(), values.max()
+    for dtype in (COMPACT_DTYPES[kind], COLUMN_DTYPES[kind]):
+        dtype_info = np.iinfo(dtype)
+        if low >= dtype_info.min and high <= dtype_info.max:
+            return values.astype(dtype)
+    return values
+
+
+def split_exact_values(values, kind):
+    """
+    Splits a column's values into the values its dtype stores and the values it cannot
+    represent exactly (see the module comment).
+
+    :param values: List of the column's values (None for missing values).
+    :param kind: Column kind ("string", "int", "bool" or "category").
+    :return: A tuple of (stored values, and a list of [row, value] pairs of exact values). The
+             stored values of int and bool columns use MISSING for missing values (an int64
+             array when every int fits), those of string and category columns use None.
+    """
+    import numpy as np
+
+    value_types = set(map(type, values))
+    if kind == "string":
+        if value_types <= {str, type(None)} and "" not in values:
+            return values, []
+    elif kind == "category":
+        if value_types <= {str, type(None)}:
+            return values, []
+    elif value_types <= {int if kind == "int" else bool, type(None)}:
+        stored = [MISSING if value is None else value for value in values] if None in values else values
+        if kind == "bool":
+            return stored, []
+        try:
+            stored = np.asarray(stored, dtype=WIDE_DTYPE)
+        except OverflowError:
+            stored = None
+        # Only the missing values may be negative
+        if stored is not None and (
+            len(stored) == 0 or stored.min() >= 0
+            or (stored.min() >= MISSING and (stored == MISSING).sum() == values.count(None))
+        ):
+            return stored, []
+
+    missing = None if kind in ("string", "category") else MISSING
+    stored, exact_values = [], []
+    for row, value in enumerate(values):
+        if value is None:
+            stored.append(missing)
+        elif kind == "string" and type(value) is str and value:
+            stored.append(value)
+        elif kind == "int" and type(value) is int and 0 <= value <= INT64_MAX:
+            stored.append(value)
+        elif (kind == "bool" and type(value) is bool) or (kind == "category" and type(value) is str):
+            stored.append(value)
+        else:
+            # A bool in an int field keeps its 0/1 value in the column; "" and other values are
+            # stored as missing
+            stored.append(int(value) if kind == "int" and type(value) is bool else missing)
+            exact_values.append([row, value])
+    return stored, exact_values
+
+
+def records_to_table(records, column_names=None):
+    """
+    Flattens cleaned match records into typed columns.
+
+    :param records: Cleaned match records in the JSON shape written by Script 03.
+    :param column_names: Optional subset of MATCH_RECORD_COLUMNS to flatten (default: all).
+    :return: A table dictionary with "columns" (name -> NumPy array), "kinds" (name -> kind),
+             "categories" (name -> list of category values), "exact_values" (name -> [row, value]
+             pairs) and "empty_objects" (parent key -> rows).
+    """
+    import numpy as np
+
+    columns, kinds, categories, exact_values, empty_objects = {}, {}, {}, {}, {}
+
+    # Look up each nested dictionary once per record rather than once per column
+    parents = {(): records}
+    for name, path, kind in MATCH_RECORD_COLUMNS:
+        if column_names is not None and name not in column_names:
+            continue
+
+        parent_path = path[:-1]
+        if parent_path not in parents:
+            parent_values = [parent.get(parent_path[-1]) for parent in parents[parent_path[:-1]]]
+            parents[parent_path] = [value if isinstance(value, dict) else {} for value in parent_values]
+            if {} in parent_values:
+                empty_objects[".".join(parent_path)] = [row for row, value in enumerate(parent_values) if value == {}]
+        values = [parent.get(path[-1]) for parent in parents[parent_path]]
+
+        values, column_exact_values = split_exact_values(values, kind)
+        if column_exact_values:
+            exact_values[name] = column_exact_values
+
+        kinds[name] = kind
+        if kind == "string":
+            strings = ["" if value is None else value for value in values]
+            try:
+                # ASCII strings (e.g. the hex record ids) take one byte per character
+                columns[name] = np.array([value.encode("ascii") for value in strings], dtype=bytes)
+            except UnicodeEncodeError:
+                columns[name] = np.array(strings, dtype=str)
+        elif kind == "category":
+            category_values = list(dict.fromkeys(value for value in values if value is not None))
+            codes = {value: code for code, value in enumerate(category_values)}
+            categories[name] = category_values
+            columns[name] = compact_column([MISSING if value is None else codes[value] for value in values], kind)
+        else:
+            columns[name] = compact_column(values, kind)
+
+    return {
+        "columns": columns,
+        "kinds": kinds,
+        "categories": categories,
+        "exact_values": exact_values,
+        "empty_objects": empty_objects,
+    }
+
+
+def decode_strings(values):
+    """
+    Decodes a string column, stored as ASCII bytes or as unicode.
+
+    :param values: Array of a string column.
+    :return: List of strings, with None for missing values.
+    """
+    if values.dtype.kind == "S":
+        return [value.decode("ascii") if value else None for value in values.tolist()]
+    return [value if value else None for value in values.tolist()]
+
+
+def table_to_records(table):
+    """
+    Converts a table back into match records in the cleaned JSON shape, with any extra int
+    columns as top-level fields. Missing values are left out of the records, as in the JSON,
+    and the table's exact values and empty objects are restored.
+
+    :param table: A table dictionary (see `records_to_table`).
+    :return: A list of match records.
+    """
+    columns, kinds, categories = table["columns"], table["kinds"], table["categories"]
+    paths = {name: path for name, path, _ in MATCH_RECORD_COLUMNS}
+    empty_objects = {parent_key: set(rows) for parent_key, rows in table["empty_objects"].items()}
+
+    decoded_columns = []
+    for name, values in columns.items():
+        kind = kinds[name]
+        if kind == "string":
+            decoded = decode_strings(values)
+        elif kind == "category":
+            category_values = categories[name]
+            decoded = [None if code == MISSING else category_values[code] for code in values.tolist()]
+        elif kind == "bool":
+            decoded = [None if value == MISSING else bool(value) for value in values.tolist()]
+        else:
+            decoded = [None if value == MISSING else value for value in values.tolist()]
+        for row, value in table["exact_values"].get(name, ()):
+            decoded[row] = value
+        path = paths.get(name, (name,))
+        decoded_columns.append((path, decoded, empty_objects.get(".".join(path[:-1]), ())))
+
+    records = []
+    for row in range(table_length(table)):
+        record = {}
+        for path, decoded, empty_rows in decoded_columns:
+            value = decoded[row]
+            if value is None:
+                if row in empty_rows:
+                    # The first column of an empty object adds it, in its place in the record
+                    target = record
+                    for key in path[:-1]:
+                        target = target.setdefault(key, {})
+                continue
+            target = record
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+        records.append(record)
+    return records
+
+
+def table_length(table):
+    """
+    Returns the number of rows in a table.
+
+    :param table: A table dictionary.
+    :return: The row count.
+    """
+    return len(next(iter(table["columns"].values()))) if table["columns"] else 0
+
+
+def select_rows(table, row_indices):
+    """
+    Returns a table with only the given rows, in the given order.
+
+    :param table: A table dictionary.
+    :param row_indices: Array of row indices (a row may be selected more than once).
+    :return: A new table dictionary sharing the kinds and categories of the original.
+    """
+    exact_values, empty_objects = {}, {}
+    if table["exact_values"] or table["empty_objects"]:
+        new_rows = {}
+        for new_row, row in enumerate(row_indices.tolist()):
+            new_rows.setdefault(row, []).append(new_row)
+        for name, pairs in table["exact_values"].items():
+            selected = sorted([new_row, value] for row, value in pairs for new_row in new_rows.get(row, ()))
+            if selected:
+                exact_values[name] = selected
+        for parent_key, rows in table["empty_objects"].items():
+            selected = sorted(new_row for row in rows for new_row in new_rows.get(row, ()))
+            if selected:
+                empty_objects[parent_key] = selected
+
+    return {
+        "columns": {name: values[row_indices] for name, values in table["columns"].items()},
+        "kinds": table["kinds"],
+        "categories": table["categories"],
+        "exact_values": exact_values,
+        "empty_objects": empty_objects,
+    }
+
+
+def append_table(table, new_table):
+    """
+    Appends the rows of one table to another. Category codes of the new rows are mapped onto
+    the first table's categories (unseen values are added in order of first appearance), so
+    the result is the table `records_to_table` builds from both tables' records.
+
+    :param table: A table dictionary.
+    :param new_table: A table dictionary with the same columns.
+    :return: A new table dictionary.
+    """
+    import numpy as np
+
+    columns, categories = {}, {}
+    for name, values in table["columns"].items():
+        kind, new_values = table["kinds"][name], new_table["columns"][name]
+        if kind == "string":
+            if values.dtype.kind != new_values.dtype.kind:
+                # One of the tables has non-ASCII strings, so both are stored as unicode
+                values, new_values = values.astype(str), new_values.astype(str)
+            columns[name] = np.concatenate([values, new_values])
+            continue
+
+        if kind == "category":
+            category_values = list(table["categories"][name])
+            codes = {value: code for code, value in enumerate(category_values)}
+            for value in new_table["categories"][name]:
+                if value not in codes:
+                    codes[value] = len(category_values)
+                    category_values.append(value)
+            categories[name] = category_values
+            # The trailing MISSING maps the new rows' MISSING codes (index -1) to MISSING
+            remap = np.array([codes[value] for value in new_table["categories"][name]] + [MISSING], dtype=np.int64)
+            new_values = remap[new_values]
+        columns[name] = compact_column(np.concatenate([values.astype(np.int64), np.asarray(new_values, dtype=np.int64)]), kind)
+
+    # Exact values and empty objects of the new rows move past the first table's rows
+    row_offset = table_length(table)
+    exact_values = {
+        name: table["exact_values"].get(name, []) + [
+            [row + row_offset, value] for row, value in new_table["exact_values"].get(name, ())
+        ]
+        for name in {**table["exact_values"], **new_table["exact_values"]}
+    }
+    empty_objects = {
+        parent_key: table["empty_objects"].get(parent_key, []) + [
+            row + row_offset for row in new_table["empty_objects"].get(parent_key, ())
+        ]
+        for parent_key in {**table["empty_objects"], **new_table["empty_objects"]}
+    }
+    return {
+        "columns": columns,
+        "kinds": table["kinds"],
+        "categories": categories,
+        "exact_values": exact_values,
+        "empty_objects": empty_objects,
+    }
+
+
+def write_table(directory, table):
+    """
+    Writes a table as one .npy file per column plus a manifest, replacing any existing table.
+
+    :param directory: Path of the table directory.
+    :param table: A table dictionary (see `records_to_table`).
+    """
+    import numpy as np
+
+    temp_directory = directory + ".tmp"
+    shutil.rmtree(temp_directory, ignore_errors=True)
+    os.makedirs(temp_directory)
+
+    for name, values in table["columns"].items():
+        np.save(os.path.join(temp_directory, f"{name}.npy"), values)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "row_count": table_length(table),
+        "columns": list(table["columns"]),
+        "kinds": table["kinds"],
+        "categories": table["categories"],
+        "exact_values": table["exact_values"],
+        "empty_objects": table["empty_objects"],
+    }
+    with open(os.path.join(temp_directory, MANIFEST_FILE), "w") as outfile:
+        json.dump(manifest, outfile, indent=4)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(temp_directory, directory)
+
+
+def read_manifest(directory):
+    """
+    Reads the manifest of a table written by `write_table` (its row count, columns, kinds and
+    categories), without loading any column.
+
+    :param directory: Path of the table directory.
+    :return: The manifest dictionary.
+    """
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Columnar table not found: {directory}")
+
+    with open(manifest_path, "r") as infile:
+        manifest = json.load(infile)
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar table version in: {directory}")
+    return manifest
+
+
+def read_table(directory, memory_map=True):
+    """
+    Reads a table written by `write_table`.
+
+    :param directory: Path of the table directory.
+    :param memory_map: Whether to memory-map the column files instead of reading them.
+    :return: A table dictionary (see `records_to_table`).
+    """
+    import numpy as np
+
+    manifest = read_manifest(directory)
+    mmap_mode = "r" if memory_map else None
+    columns = {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+        for name in manifest["columns"]
+    }
+    return {
+        "columns": columns,
+        "kinds": manifest["kinds"],
+        "categories": manifest["categories"],
+        "exact_values": manifest.get("exact_values", {}),
+        "empty_objects": manifest.get("empty_objects", {}),
+    }
+
+
+def table_to_dataframe(table):
+    """
+    Builds a pandas DataFrame from a table. Categorical columns are decoded to their values, and
+    missing values become NaN (or None for categorical and string columns). Columns with exact
+    values hold them in place of the stored values, as object columns.
+
+    :param table: A table dictionary.
+    :return: A DataFrame with one row per match record.
+    """
+    import numpy as np
+    import pandas as pd
+
+    data = {}
+    for name, values in table["columns"].items():
+        kind = table["kinds"][name]
+        if kind == "string":
+            data[name] = pd.Series(decode_strings(values), dtype=object)
+        elif kind == "category":
+            category_values = np.array(table["categories"][name] + [None], dtype=object)
+            data[name] = category_values[values]
+        elif kind == "bool":
+            data[name] = values.astype(bool) if (values != MISSING).all() else np.where(
+                values == MISSING, np.nan, values
+            )
+        else:
+            data[name] = values if (values != MISSING).all() else np.where(
+                values == MISSING, np.nan, values
+            )
+        if name in table["exact_values"]:
+            data[name] = np.array(data[name], dtype=object)
+            for row, value in table["exact_values"][name]:
+                data[name][row] = value
+    return pd.DataFrame(data)
@@ -0,0 +1,273 @@
+from utility_functions.columnar_store import MISSING
+from utility_functions.record_index import MATCH_KEY_STRIDE, ROBOT_POSITIONS, position_slots
+import math
+
+# Cross-match consistency checks over the cleaned match table. Records are grouped with NumPy
+# sort-based grouping (the record index's match/position groups and `np.unique` on integer
+# keys), so every check runs in O(n log n) over a whole season of matches:
+#   - duplicate_submission: more than one record of the same team in a match slot
+#     (match number + robot position); the first record is kept as the reference.
+#   - conflicting_teams: different teams recorded for the same match slot.
+#   - team_in_multiple_positions: the same team recorded in more than one slot of a match.
+#   - statistical_outlier: a record whose note count is outside the prediction interval of
+#     the team's other matches (leave-one-out Student t test against the team's own distribution).
+#
+# Each issue is charged to the scouters of the records involved, weighted by SEVERITY_WEIGHTS,
+# which gives every scouter a severity score for the error leaderboard.
+#
+# The scouting data has no official alliance scores, so the checks only compare the records
+# with each other.
+
+# Note counts compared against each team's own distribution: metric -> summed columns
+OUTLIER_METRICS = {
+    "autoNotes": ["autoNotes_near", "autoNotes_mid", "autoNotes_far", "autoNotes_amp", "autoNotes_miss"],
+    "teleNotes": ["teleNotes_near", "teleNotes_mid", "teleNotes_far", "teleNotes_amp", "teleNotes_miss"],
+}
+OUTLIER_ALPHA = 0.0001  # Chance that a record of the team's usual distribution is flagged
+OUTLIER_MIN_MATCHES = 6  # Teams with fewer scouted matches are not checked for outliers
+OUTLIER_MIN_STD = 1.0  # Floor of the team's standard deviation, in notes
+
+SEVERITY_WEIGHTS = {
+    "duplicate_submission": 1.0,
+    "conflicting_teams": 3.0,
+    "team_in_multiple_positions": 3.0,
+    "statistical_outlier": 2.0,
+}
+
+
+def match_number(value):
+    """
+    :param value: Match number column value.
+    :return: The match number, or None if it is missing.
+    """
+    return None if value == MISSING else int(value)
+
+
+def find_slot_issues(table, index):
+    """
+    Finds duplicate submissions and conflicting teams in the match slots, and teams recorded in
+    more than one slot of a match.
+
+    :param table: Columnar match table with the record index columns.
+    :param index: RecordIndex of the same table.
+    :return: List of issue dictionaries with "kind", "match" (None if the records have no match
+             number), "team(s)" and "rows".
+    """
+    import numpy as np
+
+    teams = np.asarray(table["columns"]["robotTeam"], dtype=np.int64)
+    matches = np.asarray(table["columns"]["matchNumber"], dtype=np.int64)
+    issues = []
+
+    # Slots with more than one record (the "unknown" position is not a slot)
+    keys, offsets, rows = index.arrays["match_keys"], index.arrays["match_offsets"], index.arrays["match_rows"]
+    key_slots = keys % MATCH_KEY_STRIDE
+    unknown = ROBOT_POSITIONS.index("unknown")
+    for group in np.flatnonzero((np.diff(offsets) > 1) & (key_slots != unknown)).tolist():
+        group_rows = rows[offsets[group]:offsets[group + 1]].tolist()
+        match, position = match_number(keys[group] // MATCH_KEY_STRIDE), ROBOT_POSITIONS[int(key_slots[group])]
+        slot_teams = list(dict.fromkeys(teams[group_rows].tolist()))
+        if len(slot_teams) > 1:
+            issues.append({
+                "kind": "conflicting_teams", "match": match, "position": position,
+                "teams": slot_teams, "rows": group_rows,
+            })
+        else:
+            issues.append({
+                "kind": "duplicate_submission", "match": match, "position": position,
+                "team": slot_teams[0], "rows": group_rows,
+            })
+
+    # Teams recorded in more than one slot of a match
+    slots = position_slots(table)
+    scouted = np.flatnonzero((teams != MISSING) & (matches != MISSING) & (slots != unknown))
+    pairs, pair_codes, pair_sizes = np.unique(
+        np.stack([matches[scouted], teams[scouted]], axis=1), axis=0, return_inverse=True, return_counts=True
+    )
+    pair_rows = np.split(scouted[np.argsort(pair_codes.reshape(-1), kind="stable")], np.cumsum(pair_sizes)[:-1])
+    for pair in np.flatnonzero(pair_sizes > 1).tolist():
+        positions = list(dict.fromkeys(ROBOT_POSITIONS[slot] for slot in slots[pair_rows[pair]].tolist()))
+        if len(positions) > 1:
+            issues.append({
+                "kind": "team_in_multiple_positions", "match": int(pairs[pair][0]), "team": int(pairs[pair][1]),
+                "positions": positions, "rows": pair_rows[pair].tolist(),
+            })
+    return issues
+
+
+def t_central_probability(t, df):
+    """
+    Probability that a Student t variable lies within [-t, t], from the closed form for an
+    integer number of degrees of freedom (Abramowitz and Stegun 26.7.3 and 26.7.4).
+
+    :param t: Non-negative t value.
+    :param df: Degrees of freedom (a positive integer).
+    :return: The probability.
+    """
+    theta = math.atan(t / math.sqrt(df))
+    cos_squared = math.cos(theta) ** 2
+    if df % 2:
+        term, total = math.cos(theta), 0.0
+        if df > 1:
+            total = term
+            for k in range(3, df - 1, 2):
+                term *= cos_squared * (k - 1) / k
+                total += term
+        return 2 / math.pi * (theta + math.sin(theta) * total)
+    term, total = 1.0, 1.0
+    for k in range(2, df, 2):
+        term *= cos_squared * (k - 1) / k
+        total += term
+    return math.sin(theta) * total
+
+
+def t_critical_value(alpha, df):
+    """
+    Two-sided critical value of the Student t distribution: the t beyond which a value falls
+    with probability alpha.
+
+    :param alpha: Two-sided tail probability.
+    :param df: Degrees of freedom (a positive integer).
+    :return: The critical value.
+    """
+    low, high = 0.0, 1.0
+    while 1 - t_central_probability(high, df) > alpha:
+        low, high = high, high * 2
+    for _ in range(100):
+        middle = (low + high) / 2
+        if 1 - t_central_probability(middle, df) > alpha:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def find_statistical_outliers(table, alpha=OUTLIER_ALPHA, min_matches=OUTLIER_MIN_MATCHES):
+    """
+    Finds records whose note counts are far from the same team's other matches.
+
+    Each record is compared with the mean and standard deviation of the team's n - 1 other
+    records (leave one out), so a single bad record does not hide itself by shifting the team's
+    mean. A record of the team's usual distribution then follows the prediction distribution of
+    a new value: a Student t with n - 2 degrees of freedom, scaled by std * sqrt(1 + 1 / (n - 1)).
+    Records beyond its two-sided `alpha` critical value are outliers, so a team with few matches
+    is not flagged more often than one with many.
+
+    :param table: Columnar match table with the OUTLIER_METRICS columns.
+    :param alpha: Two-sided probability of flagging a record of the team's usual distribution.
+    :param min_matches: Minimum number of records of a team for its records to be checked.
+    :return: List of issue dictionaries with "kind", "match", "team", "metric", "value",
+             "team_mean", "t" and "rows".
+    """
+    import numpy as np
+
+    columns = table["columns"]
+    teams = np.asarray(columns["robotTeam"], dtype=np.int64)
+    matches = np.asarray(columns["matchNumber"], dtype=np.int64)
+    _, team_codes, team_sizes = np.unique(teams, return_inverse=True, return_counts=True)
+    team_codes = team_codes.reshape(-1)
+    sizes = team_sizes[team_codes].astype(float)
+    checked = (teams != MISSING) & (sizes >= max(min_matches, 3))
+    critical_values = np.array([
+        t_critical_value(alpha, int(size) - 2) if size >= 3 else np.inf for size in team_sizes.tolist()
+    ])[team_codes]
+
+    issues = []
+    for metric, metric_columns in OUTLIER_METRICS.items():
+        values = np.zeros(len(teams))
+        for column in metric_columns:
+            column_values = np.asarray(columns[column])
+            values += np.where(column_values == MISSING, 0, column_values)
+
+        sums = np.bincount(team_codes, weights=values)[team_codes]
+        squares = np.bincount(team_codes, weights=values * values)[team_codes]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            others = sizes - 1
+            mean = (sums - values) / others
+            variance = (squares - values * values - others * mean * mean) / (others - 1)
+            std = np.maximum(np.sqrt(np.maximum(variance, 0)), OUTLIER_MIN_STD)
+            t_values = (values - mean) / (std * np.sqrt(1 + 1 / others))
+
+        for row in np.flatnonzero(checked & (np.abs(t_values) >= critical_values)).tolist():
+            issues.append({
+                "kind": "statistical_outlier", "match": match_number(matches[row]), "team": int(teams[row]),
+                "metric": metric, "value": int(values[row]), "team_mean": float(mean[row]),
+                "t": float(t_values[row]), "rows": [row],
+            })
+    return issues
+
+
+def blamed_rows(issue):
+    """
+    Returns the records an issue is charged to: every record but the first of a duplicate
+    submission, and every record involved in the other issues.
+
+    :param issue: Issue dictionary.
+    :return: List of row ids.
+    """
+    return issue["rows"][1:] if issue["kind"] == "duplicate_submission" else issue["rows"]
+
+
+def row_scouter(table, row):
+    """
+    Returns the scouter name of a record.
+
+    :param table: Columnar match table with the scouterName column.
+    :param row: Row id.
+    :return: The scouter name ("Unknown" if missing).
+    """
+    code = int(table["columns"]["scouterName"][row])
+    return table["categories"]["scouterName"][code] if code != MISSING else "Unknown"
+
+
+def describe_issue(table, issue):
+    """
+    Formats an issue as a warning message.
+
+    :param table: Columnar match table with the scouterName column.
+    :param issue: Issue dictionary.
+    :return: The warning message.
+    """
+    scouters = ", ".join(row_scouter(table, row) for row in issue["rows"])
+    kind = issue["kind"]
+    match = f"Match {issue['match']}" if issue["match"] is not None else "Match (missing match number)"
+    if kind == "duplicate_submission":
+        return (f"{match} {issue['position']}: {len(issue['rows'])} submissions for team "
+                f"{issue['team']} (scouters: {scouters}).")
+    if kind == "conflicting_teams":
+        return f"{match} {issue['position']}: conflicting teams {issue['teams']} (scouters: {scouters})."
+    if kind == "team_in_multiple_positions":
+        return (f"{match}: team {issue['team']} recorded in positions {issue['positions']} "
+                f"(scouters: {scouters}).")
+    return (f"{match}: team {issue['team']} {issue['metric']} = {issue['value']} is an outlier "
+            f"(team mean {issue['team_mean']:.1f}, t = {issue['t']:.1f}, scouter: {scouters}).")
+
+
+def scouter_severity(table, issues):
+    """
+    Adds up each scouter's severity score from the issues charged to their records.
+
+    :param table: Columnar match table with the scouterName column.
+    :param issues: Issues found by `find_slot_issues` and `find_statistical_outliers`.
+    :return: A dictionary of scouter -> {"severity": score, "issues": {kind: count}}.
+    """
+    severity = {}
+    for issue in issues:
+        for row in blamed_rows(issue):
+            scouter = row_scouter(table, row)
+            entry = severity.setdefault(scouter, {"severity": 0.0, "issues": {}})
+            entry["severity"] += SEVERITY_WEIGHTS[issue["kind"]]
+            entry["issues"][issue["kind"]] = entry["issues"].get(issue["kind"], 0) + 1
+    return severity
+
+
+def check_consistency(table, index):
+    """
+    Runs every consistency check.
+
+    :param table: Columnar match table.
+    :param index: RecordIndex of the same table.
+    :return: A tuple of (issues, scouter severity dictionary).
+    """
+    issues = find_slot_issues(table, index) + find_statistical_outliers(table)
+    return issues, scouter_severity(table, issues)
@@ -0,0 +1,108 @@
+import json
+from urllib.parse import parse_qs, urlsplit
+
+# Minimal HTTP/1.1 helpers for the asyncio services (scripts/run_ingest.py and
+# scripts/run_query_service.py): one request per connection, JSON responses. The services only
+# listen on the local network, so there is no TLS, chunked encoding or keep-alive.
+# `add_stop_handlers` stops a service on SIGINT or SIGTERM.
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+HTTP_REASONS = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+async def read_request(reader):
+    """
+    Reads the request line and headers of an HTTP request.
+
+    :param reader: asyncio StreamReader of the connection.
+    :return: A tuple of (method, path, query dictionary of name -> last value, headers dictionary
+             with lowercase names).
+    """
+    request_line = (await reader.readline()).decode("latin-1")
+    method, target = request_line.split(" ")[:2]
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    url = urlsplit(target)
+    query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+    return method, url.path, query, headers
+
+
+async def read_body(reader, headers, max_body_bytes=MAX_BODY_BYTES):
+    """
+    Reads the body of a request.
+
+    :param reader: asyncio StreamReader of the connection.
+    :param headers: Request headers from `read_request`.
+    :param max_body_bytes: Largest accepted body.
+    :return: The body bytes, or None if the body is larger than `max_body_bytes`.
+    """
+    length = int(headers.get("content-length", 0))
+    if length > max_body_bytes:
+        return None
+    return await reader.readexactly(length)
+
+
+def json_response(status, payload):
+    """
+    Serializes a JSON response.
+
+    :param status: HTTP status code.
+    :param payload: Serializable payload.
+    :return: The response bytes.
+    """
+    return encode_response(status, json.dumps(payload).encode("utf-8"))
+
+
+def encode_response(status, body):
+    """
+    Adds the status line and headers to a JSON response body.
+
+    :param status: HTTP status code.
+    :param body: JSON body bytes.
+    :return: The response bytes.
+    """
+    return (
+        f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+    )
+
+
+async def send_response(writer, response):
+    """
+    Sends a response and closes the connection.
+
+    :param writer: asyncio StreamWriter of the connection.
+    :param response: Response bytes from `json_response` or `encode_response`.
+    """
+    writer.write(response)
+    try:
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+def add_stop_handlers(stop):
+    """
+    Calls a service's stop function on SIGINT or SIGTERM. Must be called from the running event
+    loop; does nothing where the loop has no signal handlers (Windows).
+
+    :param stop: Function stopping the service.
+    """
+    import signal
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop)
+        except (NotImplementedError, RuntimeError):  # Not available on Windows
+            pass
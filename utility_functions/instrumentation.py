@@ -0,0 +1,358 @@
+import os
+import sys
+import time
+import functools
+import contextlib
+
+# Instrumentation: leveled logging, timers, record counters and per-stage cProfile/tracemalloc
+# capture, collected into a JSON run report.
+#
+# Logging goes through `logger` and is always on. Messages print as before ("[INFO] ...", with
+# leading spaces or newlines of the message kept in front of the level tag), to the current
+# sys.stdout, so redirecting stdout still captures them. The `logging` logger behind `logger` is
+# set up by its first use, so loading a stage does not import `logging`.
+#
+# Timers, counters and stage capture only record anything between `start_run` and `finish_run`.
+# Outside a run, `timed` functions make one extra check per call, and `timer`, `stage` and
+# `count` return at once, so instrumented code runs at full speed when nothing is measured.
+#
+# Usage:
+#   instrumentation.start_run("pipeline", profile=True)
+#   with instrumentation.stage("03"):
+#       instrumentation.count("entries_cleaned", len(cleaned_data))
+#   instrumentation.finish_run("outputs/statistics/run_report.json")
+
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+LOGGER_NAME = "frc_pipeline"
+MAX_REPORTED_MESSAGES = 200
+PROFILE_TOP_FUNCTIONS = 25
+WARNING_LEVEL = 30  # logging.WARNING
+
+# Active run report (None when instrumentation is disabled)
+active_report = None
+
+
+def report_log(record):
+    """
+    Adds a log record to the active run report, if any.
+
+    :param record: logging.LogRecord.
+    """
+    if active_report is not None:
+        active_report.record_log(record)
+
+
+def create_logger(name=LOGGER_NAME):
+    """
+    Sets up the pipeline's `logging` logger: INFO and above, printed by a StdoutHandler.
+
+    :param name: Logger name.
+    :return: The logging.Logger.
+    """
+    import logging
+    from utility_functions.log_output import StdoutHandler, TaggedFormatter
+
+    created_logger = logging.getLogger(name)
+    if not created_logger.handlers:
+        created_logger.setLevel(logging.INFO)
+        created_logger.propagate = False
+        handler = StdoutHandler(report_log)
+        handler.setFormatter(TaggedFormatter())
+        created_logger.addHandler(handler)
+    return created_logger
+
+
+class LazyLogger:
+    """
+    Stands in for the pipeline's logger: the first attribute used (info, warning, setLevel, ...)
+    sets up the `logging` logger, and every call is forwarded to it.
+    """
+
+    def __init__(self, name=LOGGER_NAME):
+        self.name = name
+        self.logger = None
+
+    def __getattr__(self, attribute):
+        if self.logger is None:
+            self.logger = create_logger(self.name)
+        return getattr(self.logger, attribute)
+
+
+logger = LazyLogger()
+
+
+def set_log_level(level):
+    """
+    Sets the lowest level of the messages printed.
+
+    :param level: One of LOG_LEVELS.
+    """
+    logger.setLevel(level.upper())
+
+
+def peak_rss_mb():
+    """
+    Returns the peak resident memory of the process so far.
+
+    :return: Peak RSS in megabytes, or None where the `resource` module is unavailable.
+    """
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class RunReport:
+    """
+    Collects the stages, timers, counters and log messages of one run.
+    """
+
+    def __init__(self, name, profile=False, trace_memory=False, profile_directory=None):
+        """
+        :param name: Name of the run (e.g. "pipeline").
+        :param profile: Whether to capture a cProfile profile of every stage.
+        :param trace_memory: Whether to trace every stage's peak Python allocations with tracemalloc.
+        :param profile_directory: Directory where each stage's .prof file is saved (optional).
+        """
+        import datetime
+
+        self.name = name
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_directory = profile_directory
+        self.started = datetime.datetime.now().isoformat(timespec="seconds")
+        self.start_time = time.perf_counter()
+        self.stages = []
+        self.current_stage = None
+        self.counters = {}
+        self.timings = {}
+        self.log_counts = {}
+        self.messages = []
+        self.profiles = {}
+
+    def count(self, name, amount=1):
+        """
+        Adds to a counter of the run and of the current stage.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+        if self.current_stage is not None:
+            counters = self.current_stage["counters"]
+            counters[name] = counters.get(name, 0) + amount
+
+    def add_timing(self, name, seconds):
+        """
+        Adds one call of a timer to the run and to the current stage.
+        """
+        targets = [self.timings]
+        if self.current_stage is not None:
+            targets.append(self.current_stage["timings"])
+        for timings in targets:
+            timing = timings.setdefault(name, {"calls": 0, "seconds": 0.0})
+            timing["calls"] += 1
+            timing["seconds"] += seconds
+
+    def record_log(self, record):
+        """
+        Counts a log record by level, and keeps warnings and errors (up to MAX_REPORTED_MESSAGES).
+        """
+        self.log_counts[record.levelname] = self.log_counts.get(record.levelname, 0) + 1
+        if record.levelno >= WARNING_LEVEL and len(self.messages) < MAX_REPORTED_MESSAGES:
+            self.messages.append({
+                "level": record.levelname,
+                "stage": self.current_stage["name"] if self.current_stage is not None else None,
+                "message": record.getMessage().strip(),
+            })
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Measures a stage: wall time, peak RSS and, if enabled, a cProfile profile and the peak
+        traced allocations. Counters and timers recorded meanwhile are attributed to the stage.
+
+        :param name: Stage name.
+        :return: The stage record (callers may add fields, such as a status).
+        """
+        record = {"name": name, "status": "ok", "seconds": None, "counters": {}, "timings": {}}
+        self.stages.append(record)
+        previous_stage, self.current_stage = self.current_stage, record
+
+        profiler = None
+        if self.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        except BaseException:
+            record["status"] = "failed"
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record["seconds"] = time.perf_counter() - start
+            record["peak_rss_mb"] = peak_rss_mb()
+            if self.trace_memory:
+                record["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                tracemalloc.stop()
+            if profiler is not None:
+                record["profile"] = self.summarize_profile(profiler, name)
+            self.current_stage = previous_stage
+
+    def summarize_profile(self, profiler, stage_name):
+        """
+        Lists a profile's slowest functions by cumulative time. The profile is kept, to be saved
+        for pstats/snakeviz with the report.
+
+        :param profiler: Disabled cProfile.Profile.
+        :param stage_name: Stage name.
+        :return: A list of {"function", "calls", "total_seconds", "cumulative_seconds"}.
+        """
+        import pstats
+        self.profiles[stage_name] = profiler
+        stats = pstats.Stats(profiler).stats
+        slowest = sorted(stats.items(), key=lambda item: -item[1][3])[:PROFILE_TOP_FUNCTIONS]
+        return [
+            {
+                "function": f"{os.path.basename(file_name)}:{line}({function})",
+                "calls": calls, "total_seconds": round(total, 6), "cumulative_seconds": round(cumulative, 6),
+            }
+            for (file_name, line, function), (_, calls, total, cumulative, _) in slowest
+        ]
+
+    def to_dict(self):
+        """
+        :return: The JSON-serializable report.
+        """
+        return {
+            "run": self.name,
+            "started": self.started,
+            "seconds": time.perf_counter() - self.start_time,
+            "python": sys.version.split()[0],
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": self.stages,
+            "counters": self.counters,
+            "timings": self.timings,
+            "log": {"counts": self.log_counts, "messages": self.messages},
+        }
+
+    def write(self, file_path):
+        """
+        Writes the report as JSON, replacing the previous report atomically, and saves each
+        stage's profile as <profile_directory>/stage_<name>.prof if a profile directory is set.
+
+        :param file_path: Destination path.
+        """
+        import json
+
+        if self.profile_directory and self.profiles:
+            os.makedirs(self.profile_directory, exist_ok=True)
+            for stage_name, profiler in self.profiles.items():
+                profiler.dump_stats(os.path.join(self.profile_directory, f"stage_{stage_name}.prof"))
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "w") as outfile:
+            json.dump(self.to_dict(), outfile, indent=4)
+        os.replace(temp_path, file_path)
+
+
+def start_run(name, profile=False, trace_memory=False, profile_directory=None):
+    """
+    Enables instrumentation: timers, counters and stages are recorded into a new run report.
+
+    :param name: Name of the run.
+    :param profile: Whether to capture a cProfile profile of every stage.
+    :param trace_memory: Whether to trace every stage's peak allocations with tracemalloc.
+    :param profile_directory: Directory where each stage's .prof file is saved (optional).
+    :return: The run report.
+    """
+    global active_report
+    active_report = RunReport(name, profile, trace_memory, profile_directory)
+    return active_report
+
+
+def finish_run(file_path=None):
+    """
+    Disables instrumentation and optionally writes the run report.
+
+    :param file_path: Path of the JSON report (None to not write it).
+    :return: The finished run report, or None if no run was started.
+    """
+    global active_report
+    report, active_report = active_report, None
+    if report is not None and file_path:
+        report.write(file_path)
+    return report
+
+
+def stage(name):
+    """
+    Measures a stage of the active run (see `RunReport.stage`).
+
+    :param name: Stage name.
+    :return: A context manager yielding the stage record (an unused dictionary when disabled).
+    """
+    if active_report is None:
+        return contextlib.nullcontext({})
+    return active_report.stage(name)
+
+
+def count(name, amount=1):
+    """
+    Adds to a counter of the active run (e.g. entries cleaned, teams aggregated).
+
+    :param name: Counter name.
+    :param amount: Amount to add.
+    """
+    if active_report is not None:
+        active_report.count(name, amount)
+
+
+@contextlib.contextmanager
+def _timer(report, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        report.add_timing(name, time.perf_counter() - start)
+
+
+def timer(name):
+    """
+    Times a block of code into the active run's timings.
+
+    :param name: Timer name.
+    :return: A context manager.
+    """
+    if active_report is None:
+        return contextlib.nullcontext()
+    return _timer(active_report, name)
+
+
+def timed(function):
+    """
+    Decorator timing every call of a function into the active run's timings, under
+    "<file name>.<function name>" (scripts run directly and loaded with `load_script` have
+    different module names).
+    """
+    file_name = os.path.splitext(os.path.basename(function.__code__.co_filename))[0]
+    name = f"{file_name}.{function.__qualname__}"
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        report = active_report
+        if report is None:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            report.add_timing(name, time.perf_counter() - start)
+    return wrapper
@@ -0,0 +1,114 @@
+import bisect
+
+# Latency histogram with fixed, roughly logarithmic bucket bounds (1-2-5 steps from 1 ms to
+# 60 s). Recording a value is a binary search over the bounds, so the histogram can be updated
+# for every record of a live stream. Percentiles are estimated by linear interpolation inside
+# the bucket the percentile falls in, with the buckets clipped to the recorded min and max.
+
+DEFAULT_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 60000]
+
+
+class LatencyHistogram:
+    """
+    Counts latencies in fixed buckets and keeps their count, sum, minimum and maximum.
+    """
+
+    def __init__(self, bounds_ms=DEFAULT_BOUNDS_MS):
+        """
+        :param bounds_ms: Increasing upper bounds of the buckets, in milliseconds. Latencies above
+                          the last bound go to an overflow bucket.
+        """
+        self.bounds_ms = list(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def record(self, seconds):
+        """
+        Adds one latency.
+
+        :param seconds: Latency in seconds.
+        """
+        milliseconds = seconds * 1000
+        self.counts[bisect.bisect_left(self.bounds_ms, milliseconds)] += 1
+        self.count += 1
+        self.total_ms += milliseconds
+        self.min_ms = milliseconds if self.min_ms is None else min(self.min_ms, milliseconds)
+        self.max_ms = milliseconds if self.max_ms is None else max(self.max_ms, milliseconds)
+
+    def merge(self, other):
+        """
+        Adds another histogram's latencies to this one.
+
+        :param other: A LatencyHistogram with the same bounds.
+        """
+        if other.bounds_ms != self.bounds_ms:
+            raise ValueError("Cannot merge latency histograms with different bucket bounds.")
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        for value in (other.min_ms, other.max_ms):
+            if value is not None:
+                self.min_ms = value if self.min_ms is None else min(self.min_ms, value)
+                self.max_ms = value if self.max_ms is None else max(self.max_ms, value)
+
+    def percentile(self, percent):
+        """
+        Estimates a percentile by linear interpolation inside the bucket it falls in.
+
+        :param percent: Percentile between 0 and 100.
+        :return: The latency in milliseconds, or None if nothing was recorded.
+        """
+        if self.count == 0:
+            return None
+        target = self.count * percent / 100
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            if count and seen + count >= target:
+                lower = max(self.bounds_ms[bucket - 1] if bucket else 0, self.min_ms)
+                upper = min(self.bounds_ms[bucket], self.max_ms) if bucket < len(self.bounds_ms) else self.max_ms
+                return lower + (upper - lower) * max(0, target - seen) / count
+            seen += count
+        return self.max_ms
+
+    def summary(self):
+        """
+        Returns the count, mean, minimum, maximum, p50, p90 and p99 latencies and the bucket counts.
+
+        :return: A dictionary of summary values in milliseconds.
+        """
+        labels = [f"<={bound}ms" for bound in self.bounds_ms] + [f">{self.bounds_ms[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "min_ms": self.min_ms,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+    def format(self, width=40):
+        """
+        Formats the non-empty buckets as a text bar chart.
+
+        :param width: Width of the longest bar, in characters.
+        :return: The formatted histogram.
+        """
+        if self.count == 0:
+            return "(no latencies recorded)"
+        lines = []
+        largest = max(self.counts)
+        labels = [f"<= {bound} ms" for bound in self.bounds_ms] + [f"> {self.bounds_ms[-1]} ms"]
+        for label, count in zip(labels, self.counts):
+            if count:
+                lines.append(f"{label:>12} {count:>8} {'#' * max(1, round(count / largest * width))}")
+        summary = self.summary()
+        lines.append(
+            f"count {summary['count']}, mean {summary['mean_ms']:.1f} ms, p50 {summary['p50_ms']:.1f} ms, "
+            f"p90 {summary['p90_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms, max {summary['max_ms']:.1f} ms"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,36 @@
+import logging
+
+# Output of the pipeline's logger (see utility_functions/instrumentation.py), imported when the
+# logger is first used.
+
+
+class TaggedFormatter(logging.Formatter):
+    """
+    Formats records like the scripts' original prints: "[LEVEL] message".
+    """
+
+    def format(self, record):
+        message = record.getMessage()
+        stripped = message.lstrip(" \n")
+        return f"{message[:len(message) - len(stripped)]}[{record.levelname}] {stripped}"
+
+
+class StdoutHandler(logging.Handler):
+    """
+    Prints records to the current sys.stdout and passes them on (e.g. to the active run report).
+    """
+
+    def __init__(self, on_record=None):
+        """
+        :param on_record: Function called with every record printed (optional).
+        """
+        super().__init__()
+        self.on_record = on_record
+
+    def emit(self, record):
+        try:
+            print(self.format(record))
+        except Exception:
+            self.handleError(record)
+        if self.on_record is not None:
+            self.on_record(record)
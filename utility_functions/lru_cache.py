@@ -0,0 +1,67 @@
+from collections import OrderedDict
+
+# Least-recently-used cache with hit/miss counters. Unlike `functools.lru_cache`, it is an object
+# that can be cleared as a whole when the data its values were computed from changes, and its
+# counters can be reported by a service.
+
+
+class LRUCache:
+    """
+    Keeps up to `maxsize` values, evicting the least recently used one when full.
+    """
+
+    def __init__(self, maxsize=256):
+        """
+        :param maxsize: Maximum number of values (0 disables caching).
+        """
+        self.maxsize = maxsize
+        self.values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Returns a cached value and marks it as most recently used.
+
+        :param key: Hashable key.
+        :return: The value, or None if it is not cached.
+        """
+        value = self.values.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.values.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Caches a value, evicting the least recently used value if the cache is full.
+
+        :param key: Hashable key.
+        :param value: Value (not None).
+        """
+        if self.maxsize <= 0:
+            return
+        self.values[key] = value
+        self.values.move_to_end(key)
+        if len(self.values) > self.maxsize:
+            self.values.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Removes every value (the counters are kept).
+        """
+        self.values.clear()
+
+    def summary(self):
+        """
+        :return: A dictionary with the size, capacity, hits, misses, evictions and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.values), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses,
+            "evictions": self.evictions, "hit_rate": self.hits / lookups if lookups else None,
+        }
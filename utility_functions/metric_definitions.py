@@ -0,0 +1,21 @@
+# Metric definitions shared by Scripts 04 and 05 and the streaming team statistics
+# (utility_functions/team_accumulators.py), so every path computes the same metrics.
+
+# Per-match metrics added to every match, in the order they are added. Each metric is the sum of
+# match table columns or previously derived metrics, so new metrics only need a new entry here.
+DERIVED_METRICS = [
+    ("autoNotesSum", ["autoNotes_near", "autoNotes_mid", "autoNotes_far", "autoNotes_amp", "autoNotes_miss"]),
+    ("teleopNotesSum", ["teleNotes_near", "teleNotes_mid", "teleNotes_far", "teleNotes_amp", "teleNotes_miss"]),
+    ("totalNotes", ["autoNotesSum", "teleopNotesSum"]),
+    ("autoShootNotes", ["autoNotes_near", "autoNotes_mid", "autoNotes_far"]),
+    ("teleopShootNotes", ["teleNotes_near", "teleNotes_mid", "teleNotes_far"]),
+    ("autoMissedNotes", ["autoNotes_miss"]),
+    ("teleopMissedNotes", ["teleNotes_miss"]),
+    ("missedNotes", ["autoMissedNotes", "teleopMissedNotes"]),
+    ("shootNotes", ["autoShootNotes", "teleopShootNotes"]),
+]
+
+# Metrics aggregated for every team
+QUANTITATIVE_METRICS = ["totalNotes", "missedNotes", "shootNotes", "autoNotesSum", "teleopNotesSum"]
+CATEGORICAL_METRICS = ["climb"]
+BINARY_METRICS = ["leftStartingZone"]
@@ -0,0 +1,160 @@
+# Ranking engine for the team comparison metrics. The rankable metrics are copied once into a
+# NumPy matrix (teams x metrics) and every metric's ranks are computed in a single vectorized
+# pass over it. Orders are kept as arrays of row positions into that matrix, so a ranking is a
+# lightweight index view rather than a sorted copy of the team DataFrame:
+#
+# - `order(metric)` is the full ranking, computed on demand and identical to
+#   `DataFrame.sort_values(by=metric)` (same sort kind, NaN last), so saved rankings do not change.
+# - `top(metric, k)` answers top-K queries with `argpartition`, sorting only the K selected
+#   teams. Ties are ordered by row position.
+
+
+def average_ranks(matrix, ascending):
+    """
+    Ranks every column of a matrix at once, like `Series.rank()` with its defaults (ties get the
+    average of their ranks, NaN stays NaN).
+
+    :param matrix: 2D float array (rows x columns).
+    :param ascending: Sequence of booleans, one per column (True ranks the smallest value first).
+    :return: 2D float array of ranks with the same shape.
+    """
+    import numpy as np
+
+    row_count = matrix.shape[0]
+    # Negating the descending columns ranks every column in ascending order
+    signs = np.where(np.asarray(ascending, dtype=bool), 1.0, -1.0)
+    keys = matrix * signs
+    order = np.argsort(keys, axis=0, kind="stable")  # NaN sorts last
+    sorted_keys = np.take_along_axis(keys, order, axis=0)
+
+    # Tie groups are runs of equal values in each sorted column
+    positions = np.broadcast_to(np.arange(row_count)[:, None], keys.shape)
+    group_start = np.ones(keys.shape, dtype=bool)
+    group_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    group_end = np.ones(keys.shape, dtype=bool)
+    group_end[:-1] = group_start[1:]
+    first = np.maximum.accumulate(np.where(group_start, positions, 0), axis=0)
+    last = np.minimum.accumulate(np.where(group_end, positions, row_count - 1)[::-1], axis=0)[::-1]
+
+    ranks = np.empty(keys.shape)
+    np.put_along_axis(ranks, order, (first + last) / 2 + 1, axis=0)
+    ranks[np.isnan(keys)] = np.nan
+    return ranks
+
+
+def sort_order(values, ascending=True):
+    """
+    Orders the row positions of a column exactly like `DataFrame.sort_values` (quicksort, NaN
+    last), so ties keep the same order as pandas.
+
+    :param values: 1D float array.
+    :param ascending: Whether the smallest value comes first.
+    :return: Integer array of row positions.
+    """
+    import numpy as np
+
+    values = np.asarray(values)
+    missing = np.isnan(values)
+    present = np.flatnonzero(~missing)
+    present_values = values[present]
+    if not ascending:
+        present, present_values = present[::-1], present_values[::-1]
+    order = present[present_values.argsort(kind="quicksort")]
+    if not ascending:
+        order = order[::-1]
+    return np.concatenate([order, np.flatnonzero(missing)])
+
+
+def top_k(values, k, ascending=True):
+    """
+    Returns the row positions of the K best values with `argpartition`, sorting only those K.
+    NaN values are never selected; ties are ordered by row position.
+
+    :param values: 1D float array.
+    :param k: Number of rows to return.
+    :param ascending: Whether the smallest value is best.
+    :return: Integer array of at most K row positions, best first.
+    """
+    import numpy as np
+
+    values = np.asarray(values)
+    present = np.flatnonzero(~np.isnan(values))
+    keys = values[present] if ascending else -values[present]
+    k = min(k, len(present))
+    if k == 0:
+        return present[:0]
+    if k < len(present):
+        candidates = np.argpartition(keys, k - 1)[:k]
+    else:
+        candidates = np.arange(len(present))
+    candidates = candidates[np.lexsort((present[candidates], keys[candidates]))]
+    return present[candidates]
+
+
+class MetricRankings:
+    """
+    Ranks of several metrics over the same teams, with full orders and top-K queries returned as
+    arrays of row positions.
+    """
+
+    def __init__(self, index, metrics, matrix, ascending_metrics=()):
+        """
+        :param index: Team labels, one per matrix row.
+        :param metrics: Metric names, one per matrix column.
+        :param matrix: 2D float array of metric values (teams x metrics).
+        :param ascending_metrics: Metrics where the smallest value ranks first.
+        """
+        self.index = index
+        self.metrics = list(metrics)
+        self.matrix = matrix
+        self.ascending = [metric in ascending_metrics for metric in self.metrics]
+        self.ranks = average_ranks(matrix, self.ascending)
+        self._columns = {metric: position for position, metric in enumerate(self.metrics)}
+        self._orders = {}
+
+    @classmethod
+    def from_frame(cls, frame, metrics, ascending_metrics=()):
+        """
+        Ranks metric columns of a DataFrame.
+
+        :param frame: DataFrame with one row per team.
+        :param metrics: Columns to rank.
+        :param ascending_metrics: Metrics where the smallest value ranks first.
+        :return: A MetricRankings.
+        """
+        return cls(frame.index, metrics, frame[list(metrics)].to_numpy(dtype=float), ascending_metrics)
+
+    def values(self, metric):
+        """
+        :param metric: Metric name.
+        :return: The metric's column of the matrix (a view).
+        """
+        return self.matrix[:, self._columns[metric]]
+
+    def rank(self, metric):
+        """
+        :param metric: Metric name.
+        :return: The metric's column of ranks (a view).
+        """
+        return self.ranks[:, self._columns[metric]]
+
+    def order(self, metric):
+        """
+        Full ranking of a metric, computed once and cached.
+
+        :param metric: Metric name.
+        :return: Integer array of row positions, best first (NaN last).
+        """
+        if metric not in self._orders:
+            self._orders[metric] = sort_order(self.values(metric), self.ascending[self._columns[metric]])
+        return self._orders[metric]
+
+    def top(self, metric, k):
+        """
+        Top-K query for a metric.
+
+        :param metric: Metric name.
+        :param k: Number of teams.
+        :return: Integer array of at most K row positions, best first.
+        """
+        return top_k(self.values(metric), k, self.ascending[self._columns[metric]])
@@ -0,0 +1,290 @@
+import os
+import json
+import shutil
+from bisect import bisect_left
+
+from utility_functions.columnar_store import MISSING
+
+# Record index: built once over the cleaned match records and saved next to them, so single
+# lookups ("all matches of team 4201", "who scouted match 37 blue_2") do not need to reload and
+# regroup the whole dataset.
+#
+# Each key (team number, match number and robot position, scouter name) is stored like a
+# compressed sparse row matrix: a sorted array of the distinct keys, an offsets array and the
+# row ids grouped by key (in their original order). A lookup is a binary search on the keys
+# followed by a slice of the row ids. The index is a directory of .npy files plus a manifest,
+# read back memory-mapped like the columnar tables.
+#
+# Row ids are positions in the cleaned data list (and rows of its columnar table).
+
+INDEX_FORMAT_VERSION = 1
+INDEX_MANIFEST_FILE = "manifest.json"
+
+# Columns of the flattened match records the index is built from
+INDEX_COLUMNS = ["scouterName", "matchNumber", "robotTeam", "robotPosition"]
+
+# Robot positions in match order; any other position is stored under "unknown"
+ROBOT_POSITIONS = ["red_1", "red_2", "red_3", "blue_1", "blue_2", "blue_3", "unknown"]
+
+# A match and position are combined into one key: match number * MATCH_KEY_STRIDE + position
+MATCH_KEY_STRIDE = 8
+
+INDEX_ARRAYS = [
+    "team_keys", "team_offsets", "team_rows",
+    "match_keys", "match_offsets", "match_rows",
+    "scouter_offsets", "scouter_rows",
+    "row_teams", "row_matches", "row_scouters",
+]
+
+
+def index_path(json_path):
+    """
+    Returns the record index directory saved next to a cleaned JSON file.
+
+    :param json_path: Path of the cleaned JSON file (e.g. "data/processed/x.json").
+    :return: Path of the index directory (e.g. "data/processed/x.index").
+    """
+    return os.path.splitext(json_path)[0] + ".index"
+
+
+def group_row_ids(keys):
+    """
+    Groups row ids by key.
+
+    :param keys: 1D integer array with the key of every row.
+    :return: A tuple of (sorted distinct keys, offsets into the row ids, row ids grouped by key).
+    """
+    import numpy as np
+
+    order = np.argsort(keys, kind="stable")
+    distinct_keys, starts = np.unique(keys[order], return_index=True)
+    offsets = np.append(starts, len(keys)).astype(np.int64)
+    return distinct_keys, offsets, order.astype(np.int32)
+
+
+def position_slots(table):
+    """
+    Returns the robot position slot of every row (its index in ROBOT_POSITIONS).
+
+    :param table: Columnar table with the robotPosition column.
+    :return: 1D int64 array of slots; missing and unexpected positions are "unknown".
+    """
+    import numpy as np
+
+    unknown = ROBOT_POSITIONS.index("unknown")
+    slot_of_code = np.array(
+        [ROBOT_POSITIONS.index(value) if value in ROBOT_POSITIONS else unknown
+         for value in table["categories"]["robotPosition"]] + [unknown], dtype=np.int64
+    )
+    return slot_of_code[np.asarray(table["columns"]["robotPosition"], dtype=np.int64)]
+
+
+class RecordIndex:
+    """
+    Team, match/position and scouter lookups over the cleaned match records.
+    """
+
+    def __init__(self, arrays, scouter_names, row_count):
+        """
+        :param arrays: Dictionary of the INDEX_ARRAYS.
+        :param scouter_names: Sorted scouter names (the scouter keys).
+        :param row_count: Number of indexed records.
+        """
+        self.arrays = arrays
+        self.scouter_names = scouter_names
+        self.row_count = row_count
+
+    @classmethod
+    def from_table(cls, table):
+        """
+        Builds the index from a columnar match table.
+
+        :param table: Columnar table with the INDEX_COLUMNS.
+        :return: A RecordIndex.
+        """
+        import numpy as np
+
+        columns, categories = table["columns"], table["categories"]
+        teams = np.asarray(columns["robotTeam"], dtype=np.int64)
+        matches = np.asarray(columns["matchNumber"], dtype=np.int64)
+
+        slots = position_slots(table)
+
+        # Category codes -> ranks of the sorted scouter names (MISSING stays MISSING)
+        scouter_names = sorted(categories["scouterName"])
+        rank_of = {name: rank for rank, name in enumerate(scouter_names)}
+        scouter_ranks = np.array([rank_of[name] for name in categories["scouterName"]] + [MISSING], dtype=np.int64)
+        scouters = scouter_ranks[np.asarray(columns["scouterName"], dtype=np.int64)]
+
+        arrays = {}
+        arrays["team_keys"], arrays["team_offsets"], arrays["team_rows"] = group_row_ids(teams)
+        arrays["match_keys"], arrays["match_offsets"], arrays["match_rows"] = group_row_ids(
+            matches * MATCH_KEY_STRIDE + slots
+        )
+
+        # Every scouter name is a key, so the offsets are indexed by the name's rank directly
+        scouted = np.flatnonzero(scouters != MISSING)
+        order = np.argsort(scouters[scouted], kind="stable")
+        arrays["scouter_rows"] = scouted[order].astype(np.int32)
+        arrays["scouter_offsets"] = np.concatenate(
+            [[0], np.cumsum(np.bincount(scouters[scouted], minlength=len(scouter_names)))]
+        ).astype(np.int64)
+
+        arrays["row_teams"] = teams.astype(np.int32)
+        arrays["row_matches"] = matches.astype(np.int32)
+        arrays["row_scouters"] = scouters.astype(np.int16)
+        return cls(arrays, scouter_names, len(teams))
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Builds the index from cleaned match records.
+
+        :param records: Cleaned match records in the JSON shape written by Script 03.
+        :return: A RecordIndex.
+        """
+        from utility_functions.columnar_store import records_to_table
+
+        return cls.from_table(records_to_table(records, INDEX_COLUMNS))
+
+    def save(self, directory):
+        """
+        Saves the index as one .npy file per array plus a manifest, replacing any existing index.
+
+        :param directory: Path of the index directory.
+        """
+        import numpy as np
+
+        temp_directory = directory + ".tmp"
+        shutil.rmtree(temp_directory, ignore_errors=True)
+        os.makedirs(temp_directory)
+
+        for name in INDEX_ARRAYS:
+            np.save(os.path.join(temp_directory, f"{name}.npy"), self.arrays[name])
+
+        manifest = {
+            "format_version": INDEX_FORMAT_VERSION,
+            "row_count": self.row_count,
+            "robot_positions": ROBOT_POSITIONS,
+            "scouter_names": self.scouter_names,
+        }
+        with open(os.path.join(temp_directory, INDEX_MANIFEST_FILE), "w") as outfile:
+            json.dump(manifest, outfile, indent=4)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(temp_directory, directory)
+
+    @classmethod
+    def load(cls, directory, memory_map=True):
+        """
+        Loads an index saved by `save`.
+
+        :param directory: Path of the index directory.
+        :param memory_map: Whether to memory-map the array files instead of reading them.
+        :return: A RecordIndex.
+        """
+        import numpy as np
+
+        manifest_path = os.path.join(directory, INDEX_MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"Record index not found: {directory}")
+
+        with open(manifest_path, "r") as infile:
+            manifest = json.load(infile)
+
+        if manifest.get("format_version") != INDEX_FORMAT_VERSION or manifest.get("robot_positions") != ROBOT_POSITIONS:
+            raise ValueError(f"Unsupported record index version in: {directory}")
+
+        mmap_mode = "r" if memory_map else None
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode) for name in INDEX_ARRAYS}
+        return cls(arrays, manifest["scouter_names"], manifest["row_count"])
+
+    def _key_range(self, name, first_key, last_key):
+        """
+        Returns the row ids of the keys in [first_key, last_key] of one of the sorted key arrays.
+        """
+        import numpy as np
+
+        keys = self.arrays[f"{name}_keys"]
+        first = np.searchsorted(keys, first_key, side="left")
+        last = np.searchsorted(keys, last_key, side="right")
+        offsets = self.arrays[f"{name}_offsets"]
+        return self.arrays[f"{name}_rows"][offsets[first]:offsets[last]]
+
+    def team_rows(self, team):
+        """
+        Row ids of every match record of a team, in their original order.
+
+        :param team: Team number.
+        :return: 1D int32 array of row ids.
+        """
+        return self._key_range("team", team, team)
+
+    def match_rows(self, match_number, position=None):
+        """
+        Row ids of the records of a match, ordered by robot position (red_1 ... blue_3), or of
+        a single robot position of the match.
+
+        :param match_number: Match number.
+        :param position: Optional robot position (e.g. "blue_2").
+        :return: 1D int32 array of row ids.
+        """
+        first_key = match_number * MATCH_KEY_STRIDE
+        if position is None:
+            return self._key_range("match", first_key, first_key + MATCH_KEY_STRIDE - 1)
+        if position not in ROBOT_POSITIONS:
+            raise ValueError(f"Unknown robot position: {position}")
+        key = first_key + ROBOT_POSITIONS.index(position)
+        return self._key_range("match", key, key)
+
+    def match_positions(self, match_number):
+        """
+        The records of each robot position of a match.
+
+        :param match_number: Match number.
+        :return: A dictionary of robot position -> list of row ids (scouted positions only).
+        """
+        import numpy as np
+
+        keys = self.arrays["match_keys"]
+        offsets = self.arrays["match_offsets"]
+        first_key = match_number * MATCH_KEY_STRIDE
+        first = np.searchsorted(keys, first_key, side="left")
+        last = np.searchsorted(keys, first_key + MATCH_KEY_STRIDE, side="left")
+        return {
+            ROBOT_POSITIONS[int(keys[key]) - first_key]: self.arrays["match_rows"][offsets[key]:offsets[key + 1]].tolist()
+            for key in range(first, last)
+        }
+
+    def scouter_rows(self, scouter_name):
+        """
+        Row ids of every record a scouter submitted, in their original order.
+
+        :param scouter_name: Scouter name.
+        :return: 1D int32 array of row ids.
+        """
+        rank = bisect_left(self.scouter_names, scouter_name)
+        if rank == len(self.scouter_names) or self.scouter_names[rank] != scouter_name:
+            return self.arrays["scouter_rows"][:0]
+        offsets = self.arrays["scouter_offsets"]
+        return self.arrays["scouter_rows"][offsets[rank]:offsets[rank + 1]]
+
+    def scouters_of(self, match_number, position):
+        """
+        Names of the scouters who scouted a robot position of a match.
+
+        :param match_number: Match number.
+        :param position: Robot position (e.g. "blue_2").
+        :return: List of scouter names (None for a record without a scouter name).
+        """
+        ranks = self.arrays["row_scouters"][self.match_rows(match_number, position)]
+        return [self.scouter_names[rank] if rank != MISSING else None for rank in ranks.tolist()]
+
+    def team_matches(self, team):
+        """
+        Match numbers a team was scouted in.
+
+        :param team: Team number.
+        :return: Sorted list of distinct match numbers.
+        """
+        return sorted(set(self.arrays["row_matches"][self.team_rows(team)].tolist()))
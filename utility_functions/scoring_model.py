@@ -0,0 +1,143 @@
+import os
+import json
+
+# Scoring model for the team comparison. A score is a weighted sum of team metric columns; the
+# weights come from a JSON config, and the original performance score formula is the default.
+#
+# For alliance selection, a weight sweep scores every team under many weight vectors at once
+# (one matrix multiply of the team metric matrix by the weight matrix) and reports how stable
+# each team's rank is across the vectors.
+
+# performance_score = 0.5 * totalNotes_average + 0.3 * shootNotes_average - 0.2 * missed_notes_percent
+DEFAULT_SCORE_WEIGHTS = {
+    "totalNotes_average": 0.5,
+    "shootNotes_average": 0.3,
+    "missed_notes_percent": -0.2,
+}
+
+# Weight sweep: `samples` weight vectors, each weight scaled by a uniform factor in
+# [1 - spread, 1 + spread]. The first vector is always the configured weights.
+DEFAULT_WEIGHT_SWEEP = {
+    "samples": 1000,
+    "spread": 0.25,
+    "seed": 1402,
+    "top_n": 8,
+}
+
+
+def load_scoring_config(config_file_path):
+    """
+    Loads the score weights and weight sweep settings, using the defaults for anything the config
+    does not set (or for everything if the file does not exist).
+
+    :param config_file_path: Path of the JSON scoring config.
+    :return: A dictionary with "weights" (metric -> weight) and "weight_sweep" settings.
+    """
+    config = {}
+    if os.path.exists(config_file_path):
+        with open(config_file_path, "r") as infile:
+            config = json.load(infile)
+
+    weights = config.get("weights", DEFAULT_SCORE_WEIGHTS)
+    if not weights or not all(isinstance(weight, (int, float)) for weight in weights.values()):
+        raise ValueError(f"Score weights must map metrics to numbers: {config_file_path}")
+
+    weight_sweep = {**DEFAULT_WEIGHT_SWEEP, **config.get("weight_sweep", {})}
+    unknown = set(weight_sweep) - set(DEFAULT_WEIGHT_SWEEP)
+    if unknown:
+        raise ValueError(f"Unknown weight sweep settings {sorted(unknown)} in: {config_file_path}")
+    if weight_sweep["samples"] < 0 or not 0 <= weight_sweep["spread"] < 1 or weight_sweep["top_n"] < 1:
+        raise ValueError(f"Invalid weight sweep settings in: {config_file_path}")
+    return {"weights": dict(weights), "weight_sweep": weight_sweep}
+
+
+def score_teams(team_statistics, weights):
+    """
+    Scores every team under one weight vector. Terms are added in the order of `weights`, so the
+    default weights give exactly the original performance score.
+
+    :param team_statistics: DataFrame with one row per team, or a dictionary of metric -> array.
+    :param weights: Dictionary of metric column -> weight.
+    :return: The scores (a Series indexed by team for a DataFrame).
+    """
+    missing = [metric for metric in weights if metric not in team_statistics]
+    if missing:
+        raise ValueError(f"Score weights refer to unknown metrics: {missing}")
+
+    score = None
+    for metric, weight in weights.items():
+        if weight < 0:
+            term = -weight * team_statistics[metric]
+            score = -term if score is None else score - term
+        else:
+            term = weight * team_statistics[metric]
+            score = term if score is None else score + term
+    return score
+
+
+def sample_weight_vectors(weights, samples, spread, seed):
+    """
+    Draws weight vectors around the configured weights.
+
+    :param weights: Dictionary of metric -> weight.
+    :param samples: Number of weight vectors (the first one is `weights` itself).
+    :param spread: Relative perturbation of each weight.
+    :param seed: Random seed.
+    :return: A 2D float array (samples x metrics).
+    """
+    import numpy as np
+
+    base = np.array(list(weights.values()), dtype=float)
+    rng = np.random.default_rng(seed)
+    factors = rng.uniform(1 - spread, 1 + spread, size=(samples, len(base)))
+    factors[0] = 1.0
+    return factors * base
+
+
+def sweep_scores(metric_matrix, weight_vectors):
+    """
+    Scores every team under every weight vector with one matrix multiply.
+
+    :param metric_matrix: 2D float array (teams x metrics).
+    :param weight_vectors: 2D float array (vectors x metrics).
+    :return: 2D float array of scores (teams x vectors).
+    """
+    return metric_matrix @ weight_vectors.T
+
+
+def rank_stability(team_statistics, weights, samples, spread, seed, top_n):
+    """
+    Ranks the teams under many weight vectors and summarizes how stable each team's rank is.
+
+    Teams with a missing metric have no score, so they are never ranked or counted in the top N.
+
+    :param team_statistics: DataFrame with one row per team.
+    :param weights: Dictionary of metric -> weight.
+    :param samples: Number of weight vectors.
+    :param spread: Relative perturbation of each weight.
+    :param seed: Random seed.
+    :param top_n: Size of the top group counted (e.g. 8 alliance captains).
+    :return: A DataFrame indexed by team with the top N rate and the rank statistics, most
+             stable top teams first.
+    """
+    import pandas as pd
+    from utility_functions.ranking_engine import average_ranks
+
+    missing = [metric for metric in weights if metric not in team_statistics.columns]
+    if missing:
+        raise ValueError(f"Score weights refer to unknown metrics: {missing}")
+
+    metric_matrix = team_statistics[list(weights)].to_numpy(dtype=float)
+    weight_vectors = sample_weight_vectors(weights, samples, spread, seed)
+    ranks = average_ranks(sweep_scores(metric_matrix, weight_vectors), [False] * samples)
+
+    # A team's scores are either all missing or all present, so its rank statistics are too
+    stability = pd.DataFrame({
+        f"top_{top_n}_rate": (ranks <= top_n).mean(axis=1),
+        "rank_default": ranks[:, 0],
+        "rank_mean": ranks.mean(axis=1),
+        "rank_std": ranks.std(axis=1),
+        "rank_best": ranks.min(axis=1),
+        "rank_worst": ranks.max(axis=1),
+    }, index=team_statistics.index)
+    return stability.sort_values(by=[f"top_{top_n}_rate", "rank_mean"], ascending=[False, True], kind="stable")
@@ -0,0 +1,35 @@
+import os
+import sys
+import importlib.util
+
+# Root of the numbered pipeline scripts (e.g. "01_json_structure_fixes.py")
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+
+def load_script(script_name):
+    """
+    Imports a numbered pipeline script as a module without running its main block.
+
+    Script file names start with a digit, so they cannot be imported with a regular
+    `import` statement. Loaded scripts are cached in `sys.modules` under their file name.
+
+    :param script_name: Script file name, with or without the `.py` extension.
+    :return: The imported script module.
+    """
+    module_name = script_name[:-3] if script_name.endswith(".py") else script_name
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    script_path = os.path.join(SCRIPTS_DIR, f"{module_name}.py")
+    if not os.path.exists(script_path):
+        raise FileNotFoundError(f"Pipeline script not found: {script_path}")
+
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        del sys.modules[module_name]
+        raise
+    return module
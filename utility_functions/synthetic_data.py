@@ -0,0 +1,245 @@
+import os
+import json
+import math
+import random
+
+# Value pools for synthetic scouting entries
+ROBOT_POSITIONS = ["red_1", "red_2", "red_3", "blue_1", "blue_2", "blue_3"]
+CLIMB_VALUES = ["park", "center", "none", "amp", "source", "failed"]
+NOTE_BUCKETS = ["near", "mid", "far", "amp", "miss"]
+
+# Average number of events a team attends in a synthetic season (e.g. a district team's two events)
+EVENTS_PER_TEAM = 2
+
+
+def generate_raw_entry(rng, oid, match_number, robot_team, robot_position, scouter_name):
+    """
+    Generates one valid raw scouting entry, shaped like the scouting app's database export.
+
+    :param rng: A `random.Random` instance.
+    :param oid: Integer used to build the entry's `_id.$oid`.
+    :param match_number: Match number.
+    :param robot_team: Team number.
+    :param robot_position: Alliance station (e.g. "red_1").
+    :param scouter_name: Name of the scouter.
+    :return: The raw entry dictionary.
+    """
+    return {
+        "_id": {"$oid": f"{oid:024x}"},
+        "metadata": {
+            "scouterName": scouter_name,
+            "matchNumber": match_number,
+            "robotTeam": robot_team,
+            "robotPosition": robot_position,
+        },
+        "leftStartingZone": rng.random() < 0.8,
+        "autoNotes": {bucket: rng.randint(0, 3) for bucket in NOTE_BUCKETS},
+        "teleNotes": {bucket: rng.randint(0, 8) for bucket in NOTE_BUCKETS},
+        "trapNotes": 1 if rng.random() < 0.15 else 0,
+        "climb": rng.choice(CLIMB_VALUES),
+        "__v": 0,
+    }
+
+
+def corrupt_entry(rng, entry):
+    """
+    Introduces one random data-entry error into a raw entry (wrong type, out-of-range value,
+    invalid enum value, missing key or extra key), in place.
+
+    :param rng: A `random.Random` instance.
+    :param entry: The raw entry to corrupt.
+    :return: The corrupted entry.
+    """
+    error_kind = rng.randrange(7)
+    if error_kind == 0:
+        entry["teleNotes"][rng.choice(NOTE_BUCKETS)] = str(rng.randint(0, 8))
+    elif error_kind == 1:
+        entry["autoNotes"][rng.choice(NOTE_BUCKETS)] = -rng.randint(1, 3)
+    elif error_kind == 2:
+        entry["trapNotes"] = rng.randint(4, 9)
+    elif error_kind == 3:
+        entry["climb"] = "hanging"
+    elif error_kind == 4:
+        entry["metadata"]["robotPosition"] = "red_4"
+    elif error_kind == 5:
+        del entry["leftStartingZone"]
+    else:
+        entry["comments"] = "defended the whole match"
+    return entry
+
+
+def generate_team_pool(team_count, seed=4201):
+    """
+    Draws distinct team numbers.
+
+    :param team_count: Number of teams.
+    :param seed: Random seed for reproducible output.
+    :return: A list of team numbers.
+    """
+    return random.Random(seed).sample(range(1, max(10000, team_count * 2)), team_count)
+
+
+def season_team_pool(event_count, team_count, season_team_count=None, team_seed=4201):
+    """
+    Draws the teams of a synthetic season, from which every event draws its attending teams, so
+    teams play at several events like in a real season.
+
+    :param event_count: Number of events.
+    :param team_count: Number of teams attending each event.
+    :param season_team_count: Number of teams in the season (default: enough for each team to
+                              attend EVENTS_PER_TEAM events on average).
+    :param team_seed: Random seed of the team numbers, separate from the events' seeds.
+    :return: A list of team numbers.
+    """
+    if season_team_count is None:
+        season_team_count = math.ceil(event_count * team_count / EVENTS_PER_TEAM)
+    return generate_team_pool(max(season_team_count, team_count), team_seed)
+
+
+def generate_raw_entries(entry_count, team_count=40, scouter_count=12, error_rate=0.05, seed=4201, team_pool=None):
+    """
+    Generates a list of raw scouting entries for a synthetic event, six entries per match.
+
+    :param entry_count: Number of entries to generate.
+    :param team_count: Number of teams attending the event.
+    :param scouter_count: Number of scouters submitting entries.
+    :param error_rate: Fraction of entries with one data-entry error.
+    :param seed: Random seed for reproducible output.
+    :param team_pool: Team numbers the attending teams are drawn from (default: random team
+                      numbers drawn with the seed).
+    :return: A list of raw entries.
+    """
+    rng = random.Random(seed)
+    if team_pool is None:
+        teams = rng.sample(range(1, max(10000, team_count * 2)), team_count)
+    else:
+        teams = rng.sample(team_pool, min(team_count, len(team_pool)))
+    scouters = [f"scouter_{index + 1}" for index in range(scouter_count)]
+
+    entries = []
+    match_teams = []
+    for oid in range(entry_count):
+        match_number, position_index = divmod(oid, len(ROBOT_POSITIONS))
+        if position_index == 0:
+            match_teams = rng.sample(teams, len(ROBOT_POSITIONS))
+
+        entry = generate_raw_entry(
+            rng, oid, match_number + 1, match_teams[position_index],
+            ROBOT_POSITIONS[position_index], scouters[oid % scouter_count],
+        )
+        if rng.random() < error_rate:
+            corrupt_entry(rng, entry)
+        entries.append(entry)
+    return entries
+
+
+def generate_event_entries(team_count=45, matches_per_team=20, scouter_count=12, error_rate=0.05, seed=4201,
+                           team_pool=None):
+    """
+    Generates the raw scouting entries of a synthetic event sized by its teams and the number of
+    matches each team plays (on average, as the teams of each match are drawn at random).
+
+    :param team_count: Number of teams attending the event.
+    :param matches_per_team: Average number of matches scouted per team.
+    :param scouter_count: Number of scouters submitting entries.
+    :param error_rate: Fraction of entries with one data-entry error.
+    :param seed: Random seed for reproducible output.
+    :param team_pool: Team numbers the attending teams are drawn from (optional).
+    :return: A list of raw entries.
+    """
+    match_count = math.ceil(team_count * matches_per_team / len(ROBOT_POSITIONS))
+    return generate_raw_entries(
+        match_count * len(ROBOT_POSITIONS), team_count=team_count, scouter_count=scouter_count,
+        error_rate=error_rate, seed=seed, team_pool=team_pool,
+    )
+
+
+def generate_season_entries(event_count, team_count=45, matches_per_team=20, scouter_count=12, error_rate=0.05,
+                            seed=4201, team_pool=None):
+    """
+    Generates the raw scouting entries of several synthetic events as one export, with match
+    numbers and record ids continuing from one event to the next.
+
+    :param event_count: Number of events.
+    :param team_count: Number of teams attending each event.
+    :param matches_per_team: Average number of matches scouted per team at each event.
+    :param scouter_count: Number of scouters submitting entries.
+    :param error_rate: Fraction of entries with one data-entry error.
+    :param seed: Random seed of the first event (event i uses seed + i).
+    :param team_pool: Team numbers the events draw their teams from (default: `season_team_pool`
+                      with the seed).
+    :return: A list of raw entries.
+    """
+    if team_pool is None:
+        team_pool = season_team_pool(event_count, team_count, team_seed=seed)
+
+    entries = []
+    match_offset = 0
+    for event in range(event_count):
+        event_entries = generate_event_entries(
+            team_count, matches_per_team, scouter_count, error_rate, seed=seed + event, team_pool=team_pool
+        )
+        for entry in event_entries:
+            entry["_id"]["$oid"] = f"{len(entries):024x}"
+            entry["metadata"]["matchNumber"] += match_offset
+            entries.append(entry)
+        match_offset = entries[-1]["metadata"]["matchNumber"]
+    return entries
+
+
+def write_raw_ndjson(file_path, entries, malformed_rate=0.0, seed=4201):
+    """
+    Writes raw entries one per line, like the scouting app's export before Script 01 fixes it.
+    A fraction of the lines is cut short, as when a tablet's export is interrupted; Script 01
+    skips these lines, so their entries are lost.
+
+    :param file_path: Destination path.
+    :param entries: Raw entries.
+    :param malformed_rate: Fraction of lines that are truncated.
+    :param seed: Random seed for reproducible output.
+    :return: The number of malformed lines written.
+    """
+    rng = random.Random(seed)
+    malformed_lines = 0
+    with open(file_path, "w") as outfile:
+        for entry in entries:
+            line = json.dumps(entry)
+            if rng.random() < malformed_rate:
+                line = line[:rng.randrange(1, len(line) - 1)]
+                malformed_lines += 1
+            outfile.write(line + "\n")
+    return malformed_lines
+
+
+def write_synthetic_events(directory, event_count=1, team_count=45, matches_per_team=20, scouter_count=12,
+                           error_rate=0.05, malformed_rate=0.0, seed=4201, season_team_count=None, team_seed=None):
+    """
+    Writes one raw NDJSON file per synthetic event (synthetic_01.json, synthetic_02.json, ...),
+    laid out like the season runner's event partitions. The events draw their teams from one
+    season pool (see `season_team_pool`), so teams appear at several events.
+
+    :param directory: Destination directory (created if needed).
+    :param event_count: Number of events.
+    :param team_count: Number of teams attending each event.
+    :param matches_per_team: Average number of matches scouted per team.
+    :param scouter_count: Number of scouters submitting entries at each event.
+    :param error_rate: Fraction of entries with one data-entry error.
+    :param malformed_rate: Fraction of lines that are truncated.
+    :param seed: Random seed of the first event (event i uses seed + i).
+    :param season_team_count: Number of teams in the season (default: see `season_team_pool`).
+    :param team_seed: Random seed of the season's team numbers (default: the seed).
+    :return: A list of (file path, entries, malformed lines) tuples.
+    """
+    os.makedirs(directory, exist_ok=True)
+    team_pool = season_team_pool(
+        event_count, team_count, season_team_count, seed if team_seed is None else team_seed
+    )
+    written = []
+    for event in range(event_count):
+        entries = generate_event_entries(
+            team_count, matches_per_team, scouter_count, error_rate, seed=seed + event, team_pool=team_pool
+        )
+        file_path = os.path.join(directory, f"synthetic_{event + 1:02d}.json")
+        malformed_lines = write_raw_ndjson(file_path, entries, malformed_rate, seed=seed + event)
+        written.append((file_path, len(entries), malformed_lines))
+    return written
@@ -0,0 +1,82 @@
+from utility_functions.synthetic_data import ROBOT_POSITIONS
+import os
+import json
+import random
+import asyncio
+
+# Fake tablet clients of the live ingest service (scripts/run_ingest.py), used by its benchmark
+# and tests: each tablet submits its entries one at a time over HTTP (POST /matches) or by
+# appending NDJSON lines to its file in the watched directory.
+
+
+async def post_entries(host, port, body):
+    """
+    POSTs NDJSON text to /matches.
+
+    :param host: Service host.
+    :param port: Service port.
+    :param body: Request body text.
+    :return: The HTTP status code.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    data = body.encode("utf-8")
+    writer.write(
+        f"POST /matches HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/x-ndjson\r\n"
+        f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1") + data
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return status
+
+
+async def fake_tablet(entries, rate, seed, host=None, port=None, file_path=None):
+    """
+    Submits a tablet's entries one at a time, over HTTP or by appending to an NDJSON file.
+    About 2% of submissions resend the previous entry and 1% add a malformed line.
+
+    :param entries: Raw entries of the tablet.
+    :param rate: Entries per second (0 submits as fast as possible).
+    :param seed: Random seed.
+    :param host: Service host (HTTP mode).
+    :param port: Service port (HTTP mode).
+    :param file_path: NDJSON file appended to (file mode).
+    :return: Number of rejected HTTP submissions.
+    """
+    rng = random.Random(seed)
+    rejected = 0
+    for position, entry in enumerate(entries):
+        lines = [json.dumps(entry)]
+        if position and rng.random() < 0.02:
+            lines.append(json.dumps(entries[position - 1]))
+        if rng.random() < 0.01:
+            lines.append('{"metadata": {"scouterName": ')
+        body = "\n".join(lines) + "\n"
+
+        if file_path is not None:
+            with open(file_path, "a") as outfile:
+                outfile.write(body)
+        elif await post_entries(host, port, body) != 202:
+            rejected += 1
+        await asyncio.sleep(1 / rate if rate else 0)
+    return rejected
+
+
+async def run_tablets(entries, rate, host=None, port=None, directory=None):
+    """
+    Runs one fake tablet per robot position concurrently.
+
+    :param entries: Raw entries of the event (six per match, in position order).
+    :param rate: Entries per second per tablet.
+    :param host: Service host (HTTP mode).
+    :param port: Service port (HTTP mode).
+    :param directory: Watched directory (file mode).
+    :return: Number of rejected HTTP submissions.
+    """
+    tablets = []
+    for tablet, position in enumerate(ROBOT_POSITIONS):
+        file_path = os.path.join(directory, f"tablet_{position}.ndjson") if directory else None
+        tablets.append(fake_tablet(entries[tablet::len(ROBOT_POSITIONS)], rate, tablet, host, port, file_path))
+    return sum(await asyncio.gather(*tablets))
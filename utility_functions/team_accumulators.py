@@ -0,0 +1,325 @@
+import json
+from utility_functions.columnar_store import MATCH_RECORD_COLUMNS
+from utility_functions.metric_definitions import (
+    DERIVED_METRICS, QUANTITATIVE_METRICS, CATEGORICAL_METRICS, BINARY_METRICS
+)
+
+# Streaming team statistics: one accumulator per team absorbs a match at a time in O(1) and
+# produces the same statistics as Script 05's `calculate_team_statistics`.
+#
+# Each quantitative metric keeps its exact count and sum as Python integers (every aggregated
+# metric is integer-valued, so the sums never lose precision and the averages are rounded the
+# same way as in Script 05), plus the values themselves in match order. Standard deviations are
+# computed from the values like pandas' Series.std (see `sample_std_devs`), so they match
+# Script 05 to the last bit; a merged accumulator matches Script 05 run on the matches in
+# merged order.
+
+STATE_VERSION = 2
+
+# Match record paths of the flat match columns the derived metrics are computed from
+COLUMN_PATHS = {name: path for name, path, _ in MATCH_RECORD_COLUMNS}
+
+
+def get_record_value(record, path):
+    """
+    Reads a nested value from a match record.
+
+    :param record: Match record.
+    :param path: Tuple of keys.
+    :return: The value, or None if any key is missing.
+    """
+    value = record
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def sample_std_devs(values):
+    """
+    Sample standard deviations (ddof=1) of each row of a matrix, skipping NaN values, computed
+    the way pandas' Series.std does: the squared deviations from the mean are summed with
+    NumPy's pairwise summation over each contiguous row, so the results are identical to it.
+
+    :param values: 2-D float array, one row per metric and one column per match (NaN for
+                   missing values).
+    :return: Array of standard deviations, NaN for rows with fewer than two values.
+    """
+    import numpy as np
+
+    mask = np.isnan(values)
+    # The summation order depends on the memory layout, so each row must be contiguous
+    values = np.ascontiguousarray(np.where(mask, 0.0, values))
+    counts = (~mask).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = values.sum(axis=1) / counts
+        squared = (means[:, None] - values) ** 2
+        squared[mask] = 0
+        return np.where(counts > 1, np.sqrt(squared.sum(axis=1) / (counts - 1)), np.nan)
+
+
+def derive_match_metrics(record, derived_metrics=None):
+    """
+    Computes Script 04's derived metrics (e.g. totalNotes) for one cleaned match record. Note
+    buckets dropped during cleaning count as 0, as in Script 04.
+
+    :param record: Cleaned match record.
+    :param derived_metrics: Derived metric definitions (default: DERIVED_METRICS).
+    :return: A dictionary of derived metric name -> value.
+    """
+    if derived_metrics is None:
+        derived_metrics = DERIVED_METRICS
+
+    derived = {}
+    for metric, terms in derived_metrics:
+        total = 0
+        for term in terms:
+            if term in derived:
+                total += derived[term]
+            else:
+                total += get_record_value(record, COLUMN_PATHS[term]) or 0
+        derived[metric] = total
+    return derived
+
+
+class TeamStatisticsAccumulator:
+    """
+    Running statistics of one team's matches.
+    """
+
+    def __init__(self, quantitative_metrics, categorical_metrics, binary_metrics):
+        """
+        :param quantitative_metrics: Integer metrics with average, min, max and std_dev statistics.
+        :param categorical_metrics: Metrics with value counts.
+        :param binary_metrics: True/False metrics with a percentage of true values.
+        """
+        self.number_of_matches = 0
+        self.moments = {metric: [0, 0, None, None] for metric in quantitative_metrics}
+        self.values = {metric: [] for metric in quantitative_metrics}
+        # Standard deviations of the values, kept until the next match or merge
+        self.std_devs = None
+        self.value_counts = {metric: {} for metric in categorical_metrics}
+        self.binary_counts = {metric: [0, 0] for metric in binary_metrics}
+
+    def add_match(self, match):
+        """
+        Absorbs one match. Metrics missing from the match are skipped, like NaN values in Script 05.
+
+        :param match: Match record with the derived metrics (a team-based record from Script 04).
+        """
+        self.number_of_matches += 1
+        self.std_devs = None
+
+        for metric, moments in self.moments.items():
+            value = match.get(metric)
+            self.values[metric].append(value)
+            if value is None:
+                continue
+            moments[0] += 1
+            moments[1] += value
+            moments[2] = value if moments[2] is None else min(moments[2], value)
+            moments[3] = value if moments[3] is None else max(moments[3], value)
+
+        for metric, counts in self.value_counts.items():
+            value = match.get(metric)
+            if value is not None:
+                counts[value] = counts.get(value, 0) + 1
+
+        for metric, counts in self.binary_counts.items():
+            value = match.get(metric)
+            if value is not None:
+                counts[0] += 1
+                counts[1] += int(bool(value))
+
+    def merge(self, other):
+        """
+        Adds another accumulator's matches (e.g. from another event) to this one, after this
+        accumulator's matches: value counts from `other` are placed after this accumulator's
+        values on ties, and its values after this accumulator's values.
+
+        :param other: A TeamStatisticsAccumulator with the same metrics.
+        """
+        self.number_of_matches += other.number_of_matches
+        self.std_devs = None
+
+        for metric, moments in self.moments.items():
+            self.values[metric].extend(other.values[metric])
+            other_moments = other.moments[metric]
+            if not other_moments[0]:
+                continue
+            moments[2] = other_moments[2] if moments[2] is None else min(moments[2], other_moments[2])
+            moments[3] = other_moments[3] if moments[3] is None else max(moments[3], other_moments[3])
+            moments[0] += other_moments[0]
+            moments[1] += other_moments[1]
+
+        for metric, counts in self.value_counts.items():
+            for value, count in other.value_counts[metric].items():
+                counts[value] = counts.get(value, 0) + count
+
+        for metric, counts in self.binary_counts.items():
+            counts[0] += other.binary_counts[metric][0]
+            counts[1] += other.binary_counts[metric][1]
+
+    def to_statistics(self):
+        """
+        Returns the team's statistics, with the keys, key order and values of Script 05.
+
+        :return: A dictionary of aggregated statistics.
+        """
+        import numpy as np
+
+        if self.std_devs is None:
+            self.std_devs = {}
+            if self.moments and self.number_of_matches:
+                values = np.array(list(self.values.values()), dtype=np.float64)
+                self.std_devs = dict(zip(self.values, sample_std_devs(values).tolist()))
+
+        stats = {"number_of_matches": self.number_of_matches}
+        for metric, (count, total, minimum, maximum) in self.moments.items():
+            if not count:
+                continue
+            # Same float conversions as Script 05's NumPy division of the int64 moments
+            stats[f"{metric}_average"] = float(total) / float(count)
+            stats[f"{metric}_min"] = minimum
+            stats[f"{metric}_max"] = maximum
+            stats[f"{metric}_std_dev"] = self.std_devs[metric]
+
+        # Value counts ordered like Series.value_counts (by count, ties by first appearance)
+        for metric, counts in self.value_counts.items():
+            if counts:
+                stats[f"{metric}_value_counts"] = dict(sorted(counts.items(), key=lambda item: -item[1]))
+        for metric, (count, true_count) in self.binary_counts.items():
+            if count:
+                stats[f"{metric}_percent_true"] = float(true_count) / float(count) * 100
+        return stats
+
+    def to_dict(self):
+        """
+        Returns the accumulator state as JSON-serializable data.
+
+        :return: A dictionary of the running counts.
+        """
+        return {
+            "number_of_matches": self.number_of_matches,
+            "moments": self.moments,
+            "values": self.values,
+            "value_counts": self.value_counts,
+            "binary_counts": self.binary_counts,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Restores an accumulator saved with `to_dict`.
+
+        :param state: Dictionary of the running counts.
+        :return: A TeamStatisticsAccumulator.
+        """
+        accumulator = cls([], [], [])
+        accumulator.number_of_matches = state["number_of_matches"]
+        accumulator.moments = {metric: list(moments) for metric, moments in state["moments"].items()}
+        accumulator.values = {metric: list(values) for metric, values in state["values"].items()}
+        accumulator.value_counts = {metric: dict(counts) for metric, counts in state["value_counts"].items()}
+        accumulator.binary_counts = {metric: list(counts) for metric, counts in state["binary_counts"].items()}
+        return accumulator
+
+
+class TeamStatisticsTracker:
+    """
+    Accumulators for every team, fed one cleaned match record at a time.
+    """
+
+    def __init__(self):
+        self.derived_metrics = DERIVED_METRICS
+        self.quantitative_metrics = QUANTITATIVE_METRICS
+        self.categorical_metrics = CATEGORICAL_METRICS
+        self.binary_metrics = BINARY_METRICS
+        self.teams = {}
+
+    def get_accumulator(self, team):
+        """
+        Returns a team's accumulator, creating it on the team's first match.
+
+        :param team: Team key (the team number as a string, like the team-based JSON keys).
+        :return: The team's TeamStatisticsAccumulator.
+        """
+        if team not in self.teams:
+            self.teams[team] = TeamStatisticsAccumulator(
+                self.quantitative_metrics, self.categorical_metrics, self.binary_metrics
+            )
+        return self.teams[team]
+
+    def add_record(self, record):
+        """
+        Absorbs one cleaned match record (the output of Script 03), computing its derived metrics.
+
+        :param record: Cleaned match record.
+        :return: The team key the match was added to.
+        """
+        team = str(get_record_value(record, ("metadata", "robotTeam")))
+        match = dict(record)
+        match.update(derive_match_metrics(record, self.derived_metrics))
+        self.get_accumulator(team).add_match(match)
+        return team
+
+    def add_records(self, records):
+        """
+        Absorbs cleaned match records in order.
+
+        :param records: Iterable of cleaned match records.
+        """
+        for record in records:
+            self.add_record(record)
+
+    def merge(self, other):
+        """
+        Adds another tracker's matches to this one. Teams new to this tracker are added after
+        the existing teams.
+
+        :param other: A TeamStatisticsTracker.
+        """
+        for team, accumulator in other.teams.items():
+            self.get_accumulator(team).merge(accumulator)
+
+    def team_statistics(self):
+        """
+        Returns the statistics of every team, like Script 05's `calculate_team_statistics`.
+
+        :return: A dictionary of team -> aggregated statistics, with teams in order of first match.
+        """
+        return {team: accumulator.to_statistics() for team, accumulator in self.teams.items()}
+
+    def save(self, file_path):
+        """
+        Saves the tracker state to a JSON file.
+
+        :param file_path: Path of the state file.
+        """
+        state = {
+            "state_version": STATE_VERSION,
+            "teams": {team: accumulator.to_dict() for team, accumulator in self.teams.items()},
+        }
+        with open(file_path, "w") as outfile:
+            json.dump(state, outfile)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Restores a tracker saved with `save`.
+
+        :param file_path: Path of the state file.
+        :return: A TeamStatisticsTracker.
+        """
+        with open(file_path, "r") as infile:
+            state = json.load(infile)
+
+        if state.get("state_version") != STATE_VERSION:
+            raise ValueError(f"Unsupported team statistics state version in: {file_path}")
+
+        tracker = cls()
+        tracker.teams = {
+            team: TeamStatisticsAccumulator.from_dict(accumulator_state)
+            for team, accumulator_state in state["teams"].items()
+        }
+        return tracker
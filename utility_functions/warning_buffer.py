@@ -0,0 +1,176 @@
+from array import array
+
+# Structured warning buffer. Each warning is stored as codes in preallocated parallel columns:
+#   - kind: index into the buffer's kinds (e.g. "missing_key", "negative_value"),
+#   - record: row id of the record it was found in (-1 for warnings about the whole data),
+#   - path: interned field path (-1 for none),
+#   - scouter: interned scouter name (-1 for none),
+# plus the offending value and an optional detail object (e.g. the expected type or the default
+# value) needed to describe it. The columns grow by doubling, so recording a warning is a few
+# index assignments, whatever the amount of messy data.
+#
+# Nothing is formatted while warnings are recorded: they are counted by kind and scouter from the
+# codes, and the human-readable text is built on demand by the `describe` function given to the
+# buffer, optionally capped to the first N warnings of each kind.
+
+
+class WarningBuffer:
+    """
+    Records warnings as compact codes and formats them only when asked.
+    """
+
+    def __init__(self, kinds, describe, capacity=1024):
+        """
+        :param kinds: Names of the warning kinds.
+        :param describe: Function (kind, path, value, detail) -> message formatting one warning.
+        :param capacity: Number of warnings preallocated (the buffer grows past it).
+        """
+        self.kinds = list(kinds)
+        self.kind_codes = {kind: code for code, kind in enumerate(self.kinds)}
+        self.describe = describe
+        self.paths, self.path_codes = [], {None: -1}
+        self.scouters, self.scouter_codes = [], {None: -1}
+        self.kind_column, self.record_column = array("b"), array("q")
+        self.path_column, self.scouter_column = array("i"), array("i")
+        self.values, self.details = [], []
+        self.size, self.capacity = 0, 0
+        self.allocate(max(1, capacity))
+
+    def allocate(self, capacity):
+        """
+        Sets the capacity of the columns, keeping the recorded warnings.
+
+        :param capacity: New number of slots.
+        """
+        extra = capacity - self.capacity
+        self.kind_column.extend(array("b", [0]) * extra)
+        self.record_column.extend(array("q", [0]) * extra)
+        self.path_column.extend(array("i", [0]) * extra)
+        self.scouter_column.extend(array("i", [0]) * extra)
+        self.values.extend([None] * extra)
+        self.details.extend([None] * extra)
+        self.capacity = capacity
+
+    def intern(self, value, names, codes):
+        """
+        :return: The code of a new path or scouter name.
+        """
+        code = codes[value] = len(names)
+        names.append(value)
+        return code
+
+    def add(self, kind, record=-1, path=None, scouter=None, value=None, detail=None):
+        """
+        Records one warning.
+
+        :param kind: Warning kind (one of the buffer's kinds).
+        :param record: Row id of the record (-1 for none).
+        :param path: Field path (optional).
+        :param scouter: Scouter responsible for the data (optional).
+        :param value: Offending value (optional).
+        :param detail: Anything else `describe` needs (optional).
+        """
+        index = self.size
+        if index == self.capacity:
+            self.allocate(self.capacity * 2)
+        self.kind_column[index] = self.kind_codes[kind]
+        self.record_column[index] = record
+        # Paths and scouters repeat, so their codes are almost always found at once
+        path_code = self.path_codes.get(path)
+        if path_code is None:
+            path_code = self.intern(path, self.paths, self.path_codes)
+        scouter_code = self.scouter_codes.get(scouter)
+        if scouter_code is None:
+            scouter_code = self.intern(scouter, self.scouters, self.scouter_codes)
+        self.path_column[index] = path_code
+        self.scouter_column[index] = scouter_code
+        self.values[index] = value
+        self.details[index] = detail
+        self.size = index + 1
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        """
+        Removes every warning (the capacity is kept).
+        """
+        for index in range(self.size):
+            self.values[index] = self.details[index] = None
+        self.size = 0
+
+    def get(self, index):
+        """
+        :param index: Warning index, in recording order.
+        :return: The warning as a dictionary of kind, record, path, scouter and value.
+        """
+        path_code, scouter_code = self.path_column[index], self.scouter_column[index]
+        return {
+            "kind": self.kinds[self.kind_column[index]],
+            "record": self.record_column[index],
+            "path": self.paths[path_code] if path_code >= 0 else None,
+            "scouter": self.scouters[scouter_code] if scouter_code >= 0 else None,
+            "value": self.values[index],
+        }
+
+    def format(self, index):
+        """
+        :param index: Warning index, in recording order.
+        :return: The human-readable message of the warning.
+        """
+        path_code = self.path_column[index]
+        return self.describe(
+            self.kinds[self.kind_column[index]], self.paths[path_code] if path_code >= 0 else None,
+            self.values[index], self.details[index],
+        )
+
+    def messages(self, limit_per_kind=None):
+        """
+        Formats the warnings in recording order.
+
+        :param limit_per_kind: Maximum number of messages of each kind (None for all).
+        :return: A generator of messages.
+        """
+        shown = [0] * len(self.kinds)
+        for index in range(self.size):
+            if limit_per_kind is not None:
+                kind_code = self.kind_column[index]
+                if shown[kind_code] >= limit_per_kind:
+                    continue
+                shown[kind_code] += 1
+            yield self.format(index)
+
+    def __iter__(self):
+        return self.messages()
+
+    def counts_by_kind(self):
+        """
+        :return: A dictionary of kind -> number of warnings, in order of first occurrence.
+        """
+        counts = {}
+        for kind_code in self.kind_column[:self.size]:
+            counts[kind_code] = counts.get(kind_code, 0) + 1
+        return {self.kinds[kind_code]: count for kind_code, count in counts.items()}
+
+    def counts_by_scouter(self):
+        """
+        :return: A dictionary of scouter -> number of warnings, in order of first occurrence
+                 (warnings without a scouter are not counted).
+        """
+        counts = {}
+        for scouter_code in self.scouter_column[:self.size]:
+            if scouter_code >= 0:
+                counts[scouter_code] = counts.get(scouter_code, 0) + 1
+        return {self.scouters[scouter_code]: count for scouter_code, count in counts.items()}
+
+    def counts_by_scouter_and_kind(self):
+        """
+        :return: A dictionary of scouter -> {kind: number of warnings}.
+        """
+        counts = {}
+        for scouter_code, kind_code in zip(self.scouter_column[:self.size], self.kind_column[:self.size]):
+            if scouter_code >= 0:
+                kinds = counts.setdefault(self.scouters[scouter_code], {})
+                kind = self.kinds[kind_code]
+                kinds[kind] = kinds.get(kind, 0) + 1
+        return counts